@@ -1,7 +1,8 @@
-from scipy.optimize import curve_fit
 import numpy as np
 import matplotlib.pyplot as plt
 
+from MDO.auxTools.polyFit import polyFit
+
 
 def polar(results, aircraftInfo):
     """
@@ -29,9 +30,9 @@ def polar(results, aircraftInfo):
     cDParasite = _parasiteDrag(aircraftInfo)
 
     cDs = [cD + cDParasite for cD in cDs]
-    popt, _ = curve_fit(_objective, cLs, cDs)
+    coefficients, _ = polyFit(cLs, cDs, degree=2)
     dataPolar = [cLs, cDs]
-    cD0, cD1, k = popt
+    cD0, cD1, k = coefficients.tolist()
     return [cD0, cD1, k, dataPolar]
 
 
@@ -78,10 +79,6 @@ def plotPolar(aircraftInfo):
     plt.show()
 
 
-def _objective(x, cD0, cD1, k):
-    return cD0 + cD1 * x + k * x ** 2
-
-
 def getRun(results, aircraftInfo):
     """
     # Description:
@@ -80,8 +80,10 @@ def _getcLmaxAircraft(results, aoaStall):
 
 
 def _updateAircraftInfo(aircraftInfo, yStrips, alphaStalls, clStrips, surface="Wing"):
-    exec(f"aircraftInfo.yStrips{surface} = yStrips")
-    exec(f"aircraftInfo.alphaStalls{surface} = alphaStalls")
-    exec(f"aircraftInfo.alphaStall{surface} = min(alphaStalls)")
-    exec(f"aircraftInfo.clStrips{surface} = clStrips")
-    exec(f"aircraftInfo.stallPosition{surface} = yStrips[alphaStalls.index(aircraftInfo.alphaStall{surface})]")
\ No newline at end of file
+    # fields declared in AircraftInfo.__slots__, ex: aircraftInfo.alphaStallWing
+    alphaStall = min(alphaStalls)
+    setattr(aircraftInfo, f"yStrips{surface}", yStrips)
+    setattr(aircraftInfo, f"alphaStalls{surface}", alphaStalls)
+    setattr(aircraftInfo, f"alphaStall{surface}", alphaStall)
+    setattr(aircraftInfo, f"clStrips{surface}", clStrips)
+    setattr(aircraftInfo, f"stallPosition{surface}", yStrips[alphaStalls.index(alphaStall)])
\ No newline at end of file
@@ -1 +1,3 @@
-from .airfoilData import AirfoilData
+from .airfoilData import (AirfoilData, AirfoilRegistry, airfoilRegistry, getAirfoil, sectionAirfoil,
+                          sectionPolar, sectionReynolds)
+from .polarStore import MISSION_REYNOLDS, MISSION_SPEEDS, PolarStore, buildPolarStore, getPolarStore
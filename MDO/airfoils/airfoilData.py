@@ -1,15 +1,221 @@
-import json
+import threading
+
+import numpy as np
+
+from MDO.auxTools.atmosphere import atmosphere
+from MDO.auxTools.polyFit import polyFit
+from .polarStore import MISSION_REYNOLDS, POLAR_STORE_FILE, getPolarStore
+
+# Section polars are fitted on the points below this alpha [deg], see fitXfoil.py
+FIT_ALPHA = 8
+# Reynolds numbers between the stored ones are rounded to this step, the registry keeps one
+# airfoil per step
+REYNOLDS_STEP = 1000
 
 
 class AirfoilData:
-    def __init__(self, name):
-        with open("MDO/airfoils/airfoilPolar.json", "r") as file:
-            self.airfoils = json.load(file)
-            self.name = name.split('_')[0]
-            self.cl = self.airfoils[name]["cl"]
-            self.cd = self.airfoils[name]["cd"]
-            self.claf = self.airfoils[name]["claf"]
-            self.clmax = self.airfoils[name]["clmax"]
+    """
+    # Description:
+        Section data of an airfoil at a Reynolds number and flap deflection, immutable. Instances
+        are shared, get them from getAirfoil. Shared instances are pickled by key and resolved
+        again by the registry.
+
+    ## Parameters (Required):
+    - name [str]: airfoil, optionally with a mission. Ex: "naca4415" or "naca4415_cruise".
+
+    ## Parameters (Optional):
+    - reynolds [float]: Reynolds number, see getAirfoil.
+    - flap [float]: flap deflection [deg].
+    - polar [dict]: "cl", "cd", "claf" and "clmax", see sectionPolar. Defaults to the fit of the
+    polar store.
+    """
+    __slots__ = ("key", "name", "reynolds", "flap", "cl", "cd", "claf", "clmax", "_shared")
+
+    def __init__(self, name, reynolds=None, flap=0.0, polar=None, shared=False):
+        if polar is None:
+            name, reynolds, flap = airfoilRegistry.resolve(name, reynolds, flap)
+            polar = sectionPolar(airfoilRegistry.store.polar(name, reynolds, flap))
+        object.__setattr__(self, "name", name.split('_')[0])
+        object.__setattr__(self, "reynolds", reynolds)
+        object.__setattr__(self, "flap", flap)
+        object.__setattr__(self, "key", (self.name, reynolds, flap))
+        object.__setattr__(self, "_shared", shared)
+        object.__setattr__(self, "cl", tuple(polar["cl"]))
+        object.__setattr__(self, "cd", tuple(polar["cd"]))
+        object.__setattr__(self, "claf", polar["claf"])
+        object.__setattr__(self, "clmax", polar["clmax"])
+
+    def __setattr__(self, key, value):
+        raise AttributeError("AirfoilData is immutable")
+
+    def __delattr__(self, key):
+        raise AttributeError("AirfoilData is immutable")
+
+    def __reduce__(self):
+        if self._shared:
+            return getAirfoil, self.key
+        return AirfoilData, self.key + ({"cl": self.cl, "cd": self.cd,
+                                         "claf": self.claf, "clmax": self.clmax},)
+
+    def atReynolds(self, reynolds, flap=0.0):
+        """
+        # Description:
+            Shared AirfoilData of the same airfoil at another Reynolds number, see getAirfoil.
+        """
+        return getAirfoil(self.name, reynolds=reynolds, flap=flap)
+
+    def polar(self, reynolds=None, flap=None):
+        """
+        # Description:
+            XFOIL polar of the airfoil, see PolarStore.polar. Defaults to the Reynolds number
+            and flap deflection of the section data.
+        """
+        reynolds = self.reynolds if reynolds is None else reynolds
+        flap = self.flap if flap is None else flap
+        return getPolarStore().polar(self.name, reynolds=reynolds, flap=flap)
 
     def __str__(self):
         return f"{self.name}"
+
+
+def sectionPolar(polar, polarCoefficients=None, slopeCoefficients=None):
+    """
+    # Description:
+        AVL section data of an XFOIL polar: drag parabola CD(CL) and CL/alpha slope fitted on the
+        points below FIT_ALPHA, CD given at the CL of minimum drag and at CL -1.5 and 1.8.
+
+    ## Parameters (Required):
+    - polar [dict]: "alphas", "CLs" and "CDs", see PolarStore.polar.
+
+    ## Parameters (Optional):
+    - polarCoefficients [list]: cD0, cD1, k of the drag parabola, when already fitted.
+    - slopeCoefficients [list]: cL0, cLAlpha [1/deg] of the slope, when already fitted.
+
+    ## Returns:
+    - section [dict]: "cl", "cd", "claf", "clmax", "cd_min" and "alpha_cd_min".
+    """
+    alphas = np.asarray(polar["alphas"], dtype=float)
+    cLs = np.asarray(polar["CLs"], dtype=float)
+    cDs = np.asarray(polar["CDs"], dtype=float)
+    if polarCoefficients is None or slopeCoefficients is None:
+        fitted = alphas < FIT_ALPHA
+        polarCoefficients, _ = polyFit(cLs[fitted], cDs[fitted], degree=2)
+        slopeCoefficients, _ = polyFit(alphas[fitted], cLs[fitted], degree=1)
+    cD0, cD1, k = (float(value) for value in polarCoefficients)
+    _, a = (float(value) for value in slopeCoefficients)
+
+    iCDmin = int(np.nanargmin(cDs))
+    cL = [-1.5, float(cLs[iCDmin]), 1.8]  # TODO: Adjust to get best value (CLmax is too much)
+    return {
+        "cl": cL,
+        "cd": [cD0 + cD1 * x + k * x ** 2 for x in cL],
+        "claf": a * 180 / 3.1415 / (2 * 3.1415),
+        "clmax": float(np.nanmax(cLs)),
+        "cd_min": float(cDs[iCDmin]),
+        "alpha_cd_min": float(alphas[iCDmin]),
+    }
+
+
+def sectionReynolds(chord, velocity, altitude=0.0):
+    """
+    # Description:
+        Reynolds number of a section, rho*velocity*chord/mi of the standard atmosphere.
+
+    ## Parameters (Required):
+    - chord [float, array]: section chord [m].
+    - velocity [float, array]: flight speed [m/s].
+
+    ## Parameters (Optional):
+    - altitude [float, array]: [m].
+    """
+    _, _, rho, mi = atmosphere(altitude)
+    return rho * velocity * chord / mi
+
+
+class AirfoilRegistry:
+    """
+    # Description:
+        Process-wide cache of the section data, one AirfoilData per airfoil, Reynolds number and
+        flap deflection. The polars come from the polar store, the cache is emptied when the
+        store file changes.
+
+    ## Parameters (Optional):
+    - path [str]: polar store, defaults to MDO/airfoils/airfoilPolars.npz.
+    """
+    def __init__(self, path=POLAR_STORE_FILE):
+        self.path = path
+        self._lock = threading.RLock()
+        self._store = None
+        self._airfoils = {}
+
+    @property
+    def store(self):
+        with self._lock:
+            store = getPolarStore(self.path)
+            if store is not self._store:
+                self._store = store
+                self._airfoils = {}
+            return store
+
+    def resolve(self, name, reynolds=None, flap=0.0):
+        """
+        # Description:
+            Key of the section data: airfoil, Reynolds number and flap deflection. Without a
+            Reynolds number the mission of the name gives it (MISSION_REYNOLDS), or the highest
+            stored. Reynolds numbers are limited to the stored ones, rounded to REYNOLDS_STEP
+            between them.
+        """
+        airfoil, _, mission = name.partition('_')
+        flap = float(flap)
+        stored = np.array(self.store.reynolds(airfoil, flap))
+        if reynolds is None:
+            reynolds = MISSION_REYNOLDS[mission] if mission else stored[-1]
+        reynolds = min(max(float(reynolds), stored[0]), stored[-1])
+        nearest = float(stored[np.argmin(np.abs(stored - reynolds))])
+        if abs(nearest - reynolds) > REYNOLDS_STEP / 2:
+            nearest = float(round(reynolds / REYNOLDS_STEP) * REYNOLDS_STEP)
+        return airfoil, nearest, flap
+
+    def getAirfoil(self, name, reynolds=None, flap=0.0):
+        with self._lock:
+            key = self.resolve(name, reynolds, flap)
+            if key not in self._airfoils:
+                polar = sectionPolar(self._store.polar(*key))
+                self._airfoils[key] = AirfoilData(*key, polar=polar, shared=True)
+            return self._airfoils[key]
+
+    def clear(self):
+        with self._lock:
+            self._store = None
+            self._airfoils = {}
+
+
+airfoilRegistry = AirfoilRegistry()
+
+
+def getAirfoil(name, reynolds=None, flap=0.0):
+    """
+    # Description:
+        Shared AirfoilData of an airfoil, fitted on the polar store at the Reynolds number and
+        flap deflection of the section.
+
+    ## Parameters (Required):
+    - name [str]: airfoil, optionally with a mission. Ex: "naca4415" or "naca4415_cruise", the
+    mission gives the default Reynolds number.
+
+    ## Parameters (Optional):
+    - reynolds [float]: section Reynolds number, see sectionReynolds.
+    - flap [float]: flap deflection [deg].
+
+    ## Returns:
+    - airfoil [AirfoilData]: immutable section data.
+    """
+    return airfoilRegistry.getAirfoil(name, reynolds, flap)
+
+
+def sectionAirfoil(name, chord, velocity, altitude=0.0, flap=0.0):
+    """
+    # Description:
+        Shared AirfoilData of a section of chord flying at velocity and altitude.
+    """
+    return getAirfoil(name, reynolds=sectionReynolds(chord, velocity, altitude), flap=flap)
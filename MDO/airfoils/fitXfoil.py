@@ -1,7 +1,14 @@
 import json
-import codecs
 import os
-from scipy.optimize import curve_fit
+import sys
+
+import numpy as np
+
+from polarStore import MISSION_REYNOLDS, getPolarStore
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from MDO.airfoils.airfoilData import sectionPolar
+from MDO.auxTools.polyFit import polyFit
 
 missionsSwitch = ["cruise", "takeOff"]
 airfoilSwitch = {
@@ -36,6 +43,7 @@ airfoilSwitch = {
 # ------------------------
 mission = missionsSwitch[0]
 flapOn = False
+flapAngle = 20.0  # see coord_seligFmt/xfoilOriginal.py
 # ------------------------
 airfoilPolar = {
     'cl': None,
@@ -48,45 +56,23 @@ airfoilPolar = {
 def loadData():
     """
     # Description:
-        Loadd data from Xfoil analysed airfoils
+        Loadd data from Xfoil analysed airfoils, polars at the mission Reynolds numbers
+        from the polar store (python polarStore.py rebuilds it from the Xfoil results)
     """
-    dirPath = os.getcwd()
-    if flapOn:
-        folderPath = f"{dirPath}\\coord_seligFmt\\xfoilDataFlap"
-    else:
-        folderPath = f"{dirPath}\\coord_seligFmt\\xfoilData"
-    savedDatas = [filename for filename in os.listdir(folderPath)]
-
-    dataCruiseList = []
-    dataTakeOffList = []
-
-    for filename in savedDatas:
-        obj_text = codecs.open(os.path.join(folderPath, filename), 'r', encoding='utf-8').read()
-        dataLoaded = json.loads(obj_text)
-
-        ReStr = filename.split('_')[1].split('.')[0]
-        if int(ReStr) > 800:  # Separate Cruise from TakeOff
-            dataCruiseList.append(dataLoaded)
-        else:
-            dataTakeOffList.append(dataLoaded)
+    flap = flapAngle if flapOn else 0.0
+    store = getPolarStore()
 
-    return dataCruiseList, dataTakeOffList
+    dataLists = {"cruise": [], "takeOff": []}
+    for airfoil in store.airfoils(flap):
+        for missionName, dataList in dataLists.items():
+            reynolds = MISSION_REYNOLDS[missionName]
+            if not store.covers(airfoil, reynolds, flap):
+                continue
+            polar = store.polar(airfoil, reynolds, flap)
+            dataList.append({k: v.tolist() if hasattr(v, "tolist") else v
+                             for k, v in polar.items()})
 
-
-def _objectivePolar(x, cD0, cD1, k):
-    """
-    # Description:
-        Objective function for polar fitting.
-    """
-    return cD0 + cD1 * x + k * x ** 2
-
-
-def _objectiveSlope(x, b, a):
-    """
-    # Description:
-        Objective function for CL/alpha fitting.
-    """
-    return b + x*a
+    return dataLists["cruise"], dataLists["takeOff"]
 
 
 def _polarData(dataList, mission="cruise"):
@@ -96,37 +82,34 @@ def _polarData(dataList, mission="cruise"):
     """
     jsonList = []
 
+    fitDataList = []
     for data in dataList:
+        if 8 in data["alphas"] and np.all(np.isfinite(data["CLs"] + data["CDs"])):
+            fitDataList.append(data)
+        else:
+            print(f"Erro on : {data['airfoil']}")
+    if not fitDataList:
+        return jsonList
+
+    # Polar and CL/alpha slope of every airfoil fitted in one call, points up to alpha 8,
+    # shorter polars are padded with nan
+    nPoints = max(data["alphas"].index(8) for data in fitDataList)
+    alphas, cLs, cDs = (np.full((len(fitDataList), nPoints), np.nan) for _ in range(3))
+    for i, data in enumerate(fitDataList):
+        index12Alpha = data["alphas"].index(8)
+        alphas[i, :index12Alpha] = data["alphas"][0:index12Alpha]
+        cLs[i, :index12Alpha] = data["CLs"][0:index12Alpha]
+        cDs[i, :index12Alpha] = data["CDs"][0:index12Alpha]
+    polarCoefficients, _ = polyFit(cLs, cDs, degree=2)
+    slopeCoefficients, _ = polyFit(alphas, cLs, degree=1)
+
+    for data, popt, poptSlope in zip(fitDataList, polarCoefficients.tolist(), slopeCoefficients.tolist()):
         try:
-            index12Alpha = data["alphas"].index(8)
-            popt, _ = curve_fit(_objectivePolar, data["CLs"][0:index12Alpha], data["CDs"][0:index12Alpha])
-            cD0, cD1, k = popt
-            poptSlope, _ = curve_fit(_objectiveSlope, data["alphas"][0:index12Alpha], data["CLs"][0:index12Alpha])
-            b, a = poptSlope
-
-            CLs = []
-            CDs = []
-            cLmax = max(data["CLs"])
-            cDmin = min(data["CDs"])
-            alphaCDmin = data["alphas"][data["CDs"].index(cDmin)]
-            cLCDmin = data["CLs"][data["CDs"].index(cDmin)]
-
-            for CL in [-1.5, cLCDmin, 1.8]:  # TODO: Adjust to get best value (CLmax is too much)
-                CD = _objectivePolar(CL, cD0, cD1, k)
-                CLs.append(CL)
-                CDs.append(CD)
-
-            exec(f"""{data['airfoil']}_{mission} = airfoilPolar.copy() """)
-            exec(f"""{data['airfoil']}_{mission}['cl'] = CLs.copy() """)
-            exec(f"""{data['airfoil']}_{mission}['cd'] = CDs.copy() """)
-            exec(f"""{data['airfoil']}_{mission}['claf'] = a*180/3.1415/(2*3.1415) """)
-            exec(f"""{data['airfoil']}_{mission}['clmax'] = cLmax """)
-            exec(f"""{data['airfoil']}_{mission}['cd_min'] = cDmin """)
-            exec(f"""{data['airfoil']}_{mission}['alpha_cd_min'] = alphaCDmin """)
-
-            name = data['airfoil'] + '_' + mission
-
-            exec(f"""jsonList.append([name,{data['airfoil']}_{mission}])""")
+            # same section data as MDO.airfoils.getAirfoil at the mission Reynolds number
+            polar = airfoilPolar.copy()
+            polar.update(sectionPolar(data, popt, poptSlope))
+
+            jsonList.append([data['airfoil'] + '_' + mission, polar])
         except ValueError:
             print(f"Erro on : {data['airfoil']}")
 
@@ -1,9 +1,8 @@
-import json
-import codecs
-import os
 import matplotlib.pyplot as plt
 from matplotlib.font_manager import FontProperties
 
+from polarStore import MISSION_REYNOLDS, getPolarStore
+
 fontP = FontProperties()
 my_dpi = 600
 size = 5
@@ -41,6 +40,7 @@ airfoilSwitch = {
 # ------------------------
 mission = missionsSwitch[0]
 flapOn = False
+flapAngle = 20.0  # see coord_seligFmt/xfoilOriginal.py
 # ------------------------
 
 
@@ -64,37 +64,23 @@ def _plotData(xValueStr, yValueStr, dataList=None, xlim=None, ylim =None):
     plt.show()
 
 
-dirPath = os.getcwd()
 if flapOn:
-    folderPath = f"{dirPath}\\coord_seligFmt\\xfoilDataFlap"
+    flap = flapAngle
     mission = missionsSwitch[1]
 else:
-    folderPath = f"{dirPath}\\coord_seligFmt\\xfoilData"
-
-savedDatas = [filename for filename in os.listdir(folderPath)]
+    flap = 0.0
 
 xtr_top = 0.1
 xtr_bot = 0.1
 
-dataList = []
-dataCruiseList = []
-dataTakeOffList = []
-
-for filename in savedDatas:
-    if airfoilSwitch[filename.split('_')[0]] == 1:
-        obj_text = codecs.open(os.path.join(folderPath, filename), 'r', encoding='utf-8').read()
-        dataLoaded = json.loads(obj_text)
+store = getPolarStore()
+MISSION = {"cruise": [], "takeOff": []}
 
-        ReStr = filename.split('_')[1].split('.')[0]
-        if int(ReStr) > 800:
-            dataCruiseList.append(dataLoaded)
-        else:
-            dataTakeOffList.append(dataLoaded)
-
-MISSION = {
-    "cruise": dataCruiseList,
-    "takeOff": dataTakeOffList,
-}
+for airfoil in store.airfoils(flap):
+    if airfoilSwitch[airfoil] == 1:
+        for missionName, dataList in MISSION.items():
+            if store.covers(airfoil, MISSION_REYNOLDS[missionName], flap):
+                dataList.append(store.polar(airfoil, MISSION_REYNOLDS[missionName], flap))
 
 _plotData("alphas", "CLs", MISSION[mission])
 _plotData("alphas", "Cms", MISSION[mission])
@@ -0,0 +1,191 @@
+import codecs
+import json
+import os
+import threading
+
+import numpy as np
+
+AIRFOILS_DIR = os.path.dirname(os.path.abspath(__file__))
+POLAR_STORE_FILE = os.path.join(AIRFOILS_DIR, "airfoilPolars.npz")
+
+# XFOIL result folders by flap deflection [deg], see coord_seligFmt/xfoilOriginal.py
+XFOIL_DATA_DIRS = {
+    0.0: os.path.join(AIRFOILS_DIR, "coord_seligFmt", "xfoilData"),
+    20.0: os.path.join(AIRFOILS_DIR, "coord_seligFmt", "xfoilDataFlap"),
+}
+
+# Flight condition of the XFOIL runs, see coord_seligFmt/xfoilOriginal.py
+MISSION_SPEEDS = {"cruise": 28, "takeOff": 14}  # [m/s]
+MISSION_CHORD = 0.5  # [m]
+KINEMATIC_VISCOSITY = 1.42e-5  # [m^2/s]
+
+# Reynolds numbers of the XFOIL runs: speed*meanChord/mu
+MISSION_REYNOLDS = {mission: round(speed * MISSION_CHORD / KINEMATIC_VISCOSITY, 0)
+                    for mission, speed in MISSION_SPEEDS.items()}
+
+COLUMNS = ("alphas", "CLs", "CDs", "Cms")
+
+
+def buildPolarStore(dataDirs=None, path=POLAR_STORE_FILE):
+    """
+    # Description:
+        Pack the XFOIL results (one json file per airfoil and Reynolds number) into a
+        single npz file. Polars are stored one after the other in column arrays, the
+        index arrays give the airfoil, Reynolds number, flap deflection and rows of each.
+
+    ## Parameters (Optional):
+    - dataDirs [dict]: XFOIL result folders by flap deflection. Defaults to XFOIL_DATA_DIRS.
+    - path [str]: store file. Defaults to MDO/airfoils/airfoilPolars.npz.
+
+    ## Returns:
+    - nPolars [int]: number of polars stored.
+    """
+    if dataDirs is None:
+        dataDirs = XFOIL_DATA_DIRS
+
+    airfoils, reynolds, flaps, offsets = [], [], [], [0]
+    columns = {column: [] for column in COLUMNS}
+    for flap, folderPath in sorted(dataDirs.items()):
+        for filename in sorted(os.listdir(folderPath)):
+            if not filename.endswith(".dat"):
+                continue
+            obj_text = codecs.open(os.path.join(folderPath, filename), 'r', encoding='utf-8').read()
+            dataLoaded = json.loads(obj_text)
+
+            airfoils.append(dataLoaded["airfoil"])
+            reynolds.append(dataLoaded["Re"])
+            flaps.append(flap)
+            for column in COLUMNS:
+                columns[column].append(np.asarray(dataLoaded[column], dtype=float))
+            offsets.append(offsets[-1] + len(dataLoaded["alphas"]))
+
+    np.savez(path,
+             airfoils=np.array(airfoils),
+             reynolds=np.array(reynolds, dtype=float),
+             flaps=np.array(flaps, dtype=float),
+             offsets=np.array(offsets, dtype=np.int64),
+             **{column: np.concatenate(values) for column, values in columns.items()})
+    return len(airfoils)
+
+
+class PolarStore:
+    """
+    # Description:
+        Airfoil polars from the npz store, indexed by airfoil, flap deflection and Reynolds
+        number. Polars between the stored Reynolds numbers are interpolated.
+
+    ## Parameters (Optional):
+    - path [str]: store file. Defaults to MDO/airfoils/airfoilPolars.npz.
+    """
+    def __init__(self, path=POLAR_STORE_FILE):
+        self.path = path
+        with np.load(path) as data:
+            self._columns = {column: data[column] for column in COLUMNS}
+            for values in self._columns.values():
+                # polars are views of the columns and shared between callers
+                values.flags.writeable = False
+            airfoils = data["airfoils"]
+            reynolds = data["reynolds"]
+            flaps = data["flaps"]
+            offsets = data["offsets"]
+
+        # (airfoil, flap): (sorted Reynolds numbers, row slices)
+        index = {}
+        for i in range(len(airfoils)):
+            key = (str(airfoils[i]), float(flaps[i]))
+            index.setdefault(key, []).append((float(reynolds[i]), slice(offsets[i], offsets[i + 1])))
+        self._index = {}
+        for key, polars in index.items():
+            polars.sort(key=lambda polar: polar[0])
+            self._index[key] = (np.array([re for re, _ in polars]), [rows for _, rows in polars])
+
+    def airfoils(self, flap=0.0):
+        return sorted(airfoil for airfoil, f in self._index if f == flap)
+
+    def reynolds(self, airfoil, flap=0.0):
+        return self._get(airfoil, flap)[0].tolist()
+
+    def covers(self, airfoil, reynolds, flap=0.0):
+        """Whether the polar at reynolds is stored or interpolated, not extrapolated"""
+        if (airfoil, float(flap)) not in self._index:
+            return False
+        reynoldsList = self._index[(airfoil, float(flap))][0]
+        return reynoldsList[0] <= reynolds <= reynoldsList[-1]
+
+    def polar(self, airfoil, reynolds=None, flap=0.0):
+        """
+        # Description:
+            Polar of an airfoil. Between stored Reynolds numbers the coefficients are
+            interpolated linearly on the common alphas, outside they are taken from the
+            closest Reynolds number.
+
+        ## Parameters (Required):
+        - airfoil [str]: airfoil name. Ex: "naca4415".
+
+        ## Parameters (Optional):
+        - reynolds [float]: Reynolds number. Defaults to the highest stored.
+        - flap [float]: flap deflection [deg].
+
+        ## Returns:
+        - polar [dict]: "alphas", "CLs", "CDs", "Cms" arrays, "Re" and "airfoil".
+        """
+        reynoldsList, rows = self._get(airfoil, flap)
+        if reynolds is None or reynolds >= reynoldsList[-1]:
+            i = len(reynoldsList) - 1
+            return self._polar(airfoil, reynoldsList[i], rows[i])
+        if reynolds <= reynoldsList[0]:
+            return self._polar(airfoil, reynoldsList[0], rows[0])
+
+        i = int(np.searchsorted(reynoldsList, reynolds))
+        if reynoldsList[i] == reynolds:
+            return self._polar(airfoil, reynoldsList[i], rows[i])
+        weight = (reynolds - reynoldsList[i - 1]) / (reynoldsList[i] - reynoldsList[i - 1])
+
+        lowAlphas = self._columns["alphas"][rows[i - 1]]
+        highAlphas = self._columns["alphas"][rows[i]]
+        # alphas XFOIL did not converge on are missing, only common alphas are kept
+        alphas = np.intersect1d(lowAlphas, highAlphas)
+        lowRows = np.searchsorted(lowAlphas, alphas)
+        highRows = np.searchsorted(highAlphas, alphas)
+
+        polar = {"alphas": alphas, "Re": float(reynolds), "airfoil": airfoil}
+        for column in COLUMNS[1:]:
+            low = self._columns[column][rows[i - 1]][lowRows]
+            high = self._columns[column][rows[i]][highRows]
+            polar[column] = (1 - weight) * low + weight * high
+        return polar
+
+    def _get(self, airfoil, flap):
+        key = (airfoil, float(flap))
+        if key not in self._index:
+            raise KeyError(f"No polar of {airfoil} with flap {flap} in {self.path}")
+        return self._index[key]
+
+    def _polar(self, airfoil, reynolds, rows):
+        polar = {column: self._columns[column][rows] for column in COLUMNS}
+        polar.update({"Re": float(reynolds), "airfoil": airfoil})
+        return polar
+
+
+# store file: (mtime, PolarStore)
+_polarStores = {}
+_polarStoreLock = threading.Lock()
+
+
+def getPolarStore(path=POLAR_STORE_FILE):
+    """
+    # Description:
+        Process-wide PolarStore, loaded on first use and again when the store file changes.
+
+    ## Parameters (Optional):
+    - path [str]: store file. Defaults to MDO/airfoils/airfoilPolars.npz.
+    """
+    with _polarStoreLock:
+        mtime = os.stat(path).st_mtime_ns
+        if path not in _polarStores or _polarStores[path][0] != mtime:
+            _polarStores[path] = (mtime, PolarStore(path))
+        return _polarStores[path][1]
+
+
+if __name__ == "__main__":
+    print(f"{buildPolarStore()} polars saved to {POLAR_STORE_FILE}")
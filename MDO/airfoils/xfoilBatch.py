@@ -0,0 +1,227 @@
+import argparse
+import codecs
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from polarStore import AIRFOILS_DIR, XFOIL_DATA_DIRS, buildPolarStore
+
+COORDINATES_DIR = os.path.join(AIRFOILS_DIR, "coord_seligFmt")
+MANIFEST_FILE = "manifest.json"
+
+# Settings of coord_seligFmt/xfoilOriginal.py
+XFOIL_SETTINGS = {
+    "aMin": -5.0,
+    "aMax": 18.0,
+    "aStep": 0.5,
+    "xFlap": 0.7,  # posicao como perc. da corda
+    "tFlap": 0.5,  # posicao como perc. da espessura
+    "xtrTop": 0.1,
+    "xtrBot": 0.1,
+    "maxIter": 800,
+}
+
+
+def defaultXfoilPath():
+    """
+    # Description:
+        XFOIL executable, environment variable XFOIL or the executable in MDO/airfoils.
+    """
+    if "XFOIL" in os.environ:
+        return os.environ["XFOIL"]
+    if os.name == "nt":
+        return os.path.join(AIRFOILS_DIR, "xfoil.exe")
+    return "xfoil"
+
+
+def jobKey(airfoil, reynolds, mach, flapAngle, npans):
+    """
+    # Description:
+        Manifest key of an XFOIL run, all inputs that change the polar.
+    """
+    return f"{airfoil}|Re={round(reynolds, 0):.0f}|M={mach:g}|flap={flapAngle:g}|n={npans}"
+
+
+def polarFilename(airfoil, reynolds):
+    return '%s_%.0f.dat' % (airfoil, round(reynolds/1000, 0))
+
+
+def xfoilCommands(job, polarFile="polar.txt"):
+    """
+    # Description:
+        XFOIL commands of a job, same sequence as coord_seligFmt/xfoilOriginal.py.
+    """
+    settings = XFOIL_SETTINGS
+    coms = ['load', job["airfoil"] + '.dat',
+            # flap
+            'gdes', 'flap', str(settings["xFlap"]), '999', str(settings["tFlap"]), str(job["flapAngle"]),
+            ' ', 'pcop',
+            # discretizacao
+            'ppar', 'n', str(job["npans"]), ' ', ' ',
+            # operacao
+            'oper', 'visc', str(job["reynolds"]), 'Mach', str(job["mach"]),
+            # parametros de camada limite (transicoes forcadas)
+            'vpar', 'xtr', str(settings["xtrTop"]), str(settings["xtrBot"]), ' ',
+            'iter', str(settings["maxIter"]),
+            # arquivo
+            'pacc', polarFile, ' ',
+            # angulos de ataque
+            'aseq', str(settings["aMin"]), str(settings["aMax"]), str(settings["aStep"]),
+            ' ', 'quit']
+    return '\n'.join(coms) + '\n'
+
+
+def runXfoilJob(job, xfoilPath, coordinatesDir=COORDINATES_DIR, timeout=None):
+    """
+    # Description:
+        Run XFOIL for one airfoil and Reynolds number in a private working directory.
+
+    ## Parameters (Required):
+    - job [dict]: "airfoil", "reynolds", "mach", "flapAngle", "npans" and "outputDir".
+    - xfoilPath [str]: XFOIL executable.
+
+    ## Parameters (Optional):
+    - coordinatesDir [str]: folder with the airfoil coordinate files.
+    - timeout [float]: seconds until XFOIL is killed.
+
+    ## Returns:
+    - filename [str]: result file in job["outputDir"], same json format as xfoilOriginal.py.
+    """
+    with tempfile.TemporaryDirectory(prefix="xfoil_") as workDir:
+        shutil.copy(os.path.join(coordinatesDir, job["airfoil"] + '.dat'), workDir)
+        subprocess.run([xfoilPath], input=xfoilCommands(job).encode(), cwd=workDir,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT, timeout=timeout)
+
+        polarPath = os.path.join(workDir, "polar.txt")
+        if not os.path.exists(polarPath):
+            raise RuntimeError(f"XFOIL wrote no polar for {job['airfoil']}")
+        data = np.loadtxt(polarPath, skiprows=12, ndmin=2)
+    if data.shape[0] == 0:
+        raise RuntimeError(f"XFOIL did not converge for {job['airfoil']}")
+
+    dataJson = {
+        "alphas": data[:, 0].tolist(),
+        "CLs": data[:, 1].tolist(),
+        "CDs": data[:, 2].tolist(),
+        "Cms": data[:, 4].tolist(),
+        "airfoil": job["airfoil"],
+        "Re": round(job["reynolds"], 0)
+    }
+    filename = polarFilename(job["airfoil"], job["reynolds"])
+    # written next to the result and renamed, a killed run leaves no partial file
+    filePath = os.path.join(job["outputDir"], filename)
+    with codecs.open(filePath + ".tmp", 'w', encoding='utf-8') as file:
+        json.dump(dataJson, file, separators=(',', ':'), sort_keys=True, indent=4)
+    os.replace(filePath + ".tmp", filePath)
+    return filename
+
+
+def loadManifest(outputDir):
+    path = os.path.join(outputDir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+def _saveManifest(outputDir, manifest):
+    path = os.path.join(outputDir, MANIFEST_FILE)
+    with open(path + ".tmp", 'w') as file:
+        json.dump(manifest, file, indent=4, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def runXfoilBatch(airfoils, reynoldsList, mach=0.03, flapAngle=0.0, npans=200, outputDir=None,
+                  xfoilPath=None, workers=None, timeout=300, coordinatesDir=COORDINATES_DIR,
+                  updateStore=True):
+    """
+    # Description:
+        Run XFOIL for every airfoil and Reynolds number in a process pool. Every run has
+        its own working directory. Completed runs are kept in a manifest in the output
+        folder and skipped when the batch is run again, failed runs are retried.
+
+    ## Parameters (Required):
+    - airfoils [list(str)]: airfoil names, coordinate files <name>.dat in coordinatesDir.
+    - reynoldsList [list(float)]: Reynolds numbers.
+
+    ## Parameters (Optional):
+    - mach [float]: Mach number.
+    - flapAngle [float]: flap deflection [deg].
+    - npans [int]: number of panels.
+    - outputDir [str]: result folder. Defaults to xfoilData, or xfoilDataFlap with flap.
+    - xfoilPath [str]: XFOIL executable. Defaults to defaultXfoilPath().
+    - workers [int]: number of processes. Defaults to the number of CPUs.
+    - timeout [float]: seconds until a single XFOIL run is killed.
+    - updateStore [bool]: rebuild the polar store after new results.
+
+    ## Returns:
+    - manifest [dict]: run status by job key.
+    """
+    if outputDir is None:
+        outputDir = XFOIL_DATA_DIRS[20.0] if flapAngle else XFOIL_DATA_DIRS[0.0]
+    if xfoilPath is None:
+        xfoilPath = defaultXfoilPath()
+    os.makedirs(outputDir, exist_ok=True)
+
+    manifest = loadManifest(outputDir)
+    jobs = {}
+    for reynolds in reynoldsList:
+        for airfoil in airfoils:
+            key = jobKey(airfoil, reynolds, mach, flapAngle, npans)
+            if manifest.get(key, {}).get("status") == "done":
+                continue
+            jobs[key] = {"airfoil": airfoil, "reynolds": reynolds, "mach": mach,
+                         "flapAngle": flapAngle, "npans": npans, "outputDir": outputDir}
+
+    if not jobs:
+        print("All airfoils from list are saved")
+        return manifest
+
+    nDone = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(runXfoilJob, job, xfoilPath, coordinatesDir, timeout): key
+                   for key, job in jobs.items()}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                manifest[key] = {"status": "done", "file": future.result()}
+                nDone += 1
+            except (OSError, RuntimeError, ValueError, subprocess.TimeoutExpired) as error:
+                manifest[key] = {"status": "failed", "error": str(error)}
+                print(f"Xfoil failed on {key}: {error}")
+            # saved after every run, an interrupted batch resumes from here
+            _saveManifest(outputDir, manifest)
+
+    if updateStore and nDone:
+        buildPolarStore()
+    return manifest
+
+
+def _parseArguments():
+    parser = argparse.ArgumentParser(description="Parallel XFOIL polars of Selig airfoil files")
+    parser.add_argument("airfoils", nargs="*",
+                        help="airfoil names, defaults to every coordinate file in coord_seligFmt")
+    parser.add_argument("--re", type=float, nargs="+", default=[14*0.5/1.42e-5, 28*0.5/1.42e-5],
+                        help="Reynolds numbers")
+    parser.add_argument("--mach", type=float, default=0.03)
+    parser.add_argument("--flap", type=float, default=0.0, help="flap deflection [deg]")
+    parser.add_argument("--npans", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--xfoil", default=None, help="XFOIL executable")
+    parser.add_argument("--output", default=None, help="result folder")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parseArguments()
+    airfoils = args.airfoils or sorted(filename[:-4] for filename in os.listdir(COORDINATES_DIR)
+                                       if filename.endswith(".dat"))
+    manifest = runXfoilBatch(airfoils, args.re, mach=args.mach, flapAngle=args.flap, npans=args.npans,
+                             outputDir=args.output, xfoilPath=args.xfoil, workers=args.workers)
+    failed = [key for key, run in manifest.items() if run["status"] != "done"]
+    print(f"{len(manifest) - len(failed)} polars done, {len(failed)} failed")
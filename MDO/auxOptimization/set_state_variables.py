@@ -1,8 +1,11 @@
-import time
 from _collections import OrderedDict
 import numpy as np
 import MDO
 
+# Cruise condition of the avl cases, the section polars are taken at its Reynolds numbers
+CRUISE_ALTITUDE = 1500  # [m]
+CRUISE_VELOCITY = 148 / 3.6  # [m/s] TODO: Variable cruise speed
+
 
 def set_state_variables(wingRootChord=None, wingAirfoil=None, wingMiddleChord=None,
                         wingSecPosition=None, wingTipChord=None, wingPosSec=None,
@@ -21,7 +24,7 @@ def set_state_variables(wingRootChord=None, wingAirfoil=None, wingMiddleChord=No
                 "x": 0,
                 "y": 0,
                 "z": 0,
-                "airfoil": MDO.airfoils.AirfoilData(wingAirfoil)
+                "airfoil": MDO.airfoils.sectionAirfoil(wingAirfoil, wingRootChord, CRUISE_VELOCITY, CRUISE_ALTITUDE)
             },
             "middle": {
                 "chord": wingMiddleChord,
@@ -29,7 +32,7 @@ def set_state_variables(wingRootChord=None, wingAirfoil=None, wingMiddleChord=No
                 "sweepLE": np.arctan((wingRootChord - wingMiddleChord) / 4 / wingSecPosition),
                 "aoa": 0,
                 "dihedral": 0,
-                "airfoil": MDO.airfoils.AirfoilData(wingAirfoil)
+                "airfoil": MDO.airfoils.sectionAirfoil(wingAirfoil, wingMiddleChord, CRUISE_VELOCITY, CRUISE_ALTITUDE)
             },
             "tip": {
                 "chord": wingTipChord,
@@ -37,7 +40,7 @@ def set_state_variables(wingRootChord=None, wingAirfoil=None, wingMiddleChord=No
                 "sweepLE": np.arctan((wingMiddleChord - wingTipChord) / 4 / wingPosSec),
                 "aoa": 0,
                 "dihedral": 0,
-                "airfoil": MDO.airfoils.AirfoilData(wingAirfoil)
+                "airfoil": MDO.airfoils.sectionAirfoil(wingAirfoil, wingTipChord, CRUISE_VELOCITY, CRUISE_ALTITUDE)
             },
         }),
         # "horizontal": OrderedDict({  # TODO: Add V case
@@ -47,7 +50,7 @@ def set_state_variables(wingRootChord=None, wingAirfoil=None, wingMiddleChord=No
         #         "x": horizontalXPosition if horizontalXPosition is not None else 0,
         #         "y": 0,
         #         "z": 0.5,
-        #         "airfoil": MDO.airfoils.AirfoilData(stabAirfoil)
+        #         "airfoil": MDO.airfoils.getAirfoil(stabAirfoil)
         #     },
         #     "tip": {
         #         "chord": horizontalTipChord,
@@ -55,7 +58,7 @@ def set_state_variables(wingRootChord=None, wingAirfoil=None, wingMiddleChord=No
         #         "sweepLE": np.arctan((horizontalRootChord - horizontalTipChord) / 4 / horizontalSpan / 2) if horizontalSpan is not None else 0,
         #         "aoa": 0,
         #         "dihedral": 0,
-        #         "airfoil": MDO.airfoils.AirfoilData(stabAirfoil)
+        #         "airfoil": MDO.airfoils.getAirfoil(stabAirfoil)
         #     }
         # }),
         "vertical": OrderedDict({
@@ -65,7 +68,7 @@ def set_state_variables(wingRootChord=None, wingAirfoil=None, wingMiddleChord=No
                 "x": verticalXPosition,
                 "y": 0,
                 "z": 0.5,
-                "airfoil": MDO.airfoils.AirfoilData(stabAirfoil)
+                "airfoil": MDO.airfoils.sectionAirfoil(stabAirfoil, verticalRootChord, CRUISE_VELOCITY, CRUISE_ALTITUDE)
             },
             "tip": {
                 "chord": verticalTipChord,
@@ -73,12 +76,12 @@ def set_state_variables(wingRootChord=None, wingAirfoil=None, wingMiddleChord=No
                 "sweepLE": np.arctan((verticalRootChord - verticalTipChord) / 4 / verticalSpan / 2),
                 "aoa": 0,
                 "dihedral": 0,
-                "airfoil": MDO.airfoils.AirfoilData(stabAirfoil)
+                "airfoil": MDO.airfoils.sectionAirfoil(stabAirfoil, verticalTipChord, CRUISE_VELOCITY, CRUISE_ALTITUDE)
             }
         }),
         # "endPlate": OrderedDict({
         #     "root": {
-        #         "airfoil": MDO.airfoils.AirfoilData(stabAirfoil)
+        #         "airfoil": MDO.airfoils.getAirfoil(stabAirfoil)
         #     },
         #     "tip": {
         #         "chord": 0,
@@ -86,7 +89,7 @@ def set_state_variables(wingRootChord=None, wingAirfoil=None, wingMiddleChord=No
         #         "sweepLE": 0,
         #         "aoa": 0,
         #         "dihedral": 0,
-        #         "airfoil": MDO.airfoils.AirfoilData(stabAirfoil)
+        #         "airfoil": MDO.airfoils.getAirfoil(stabAirfoil)
         #     }
         # })
         "fuselage": OrderedDict({
@@ -126,8 +129,8 @@ def set_state_variables(wingRootChord=None, wingAirfoil=None, wingMiddleChord=No
     # ---- Avl Cases to analyse --------------------------------------------
     avlCases = {
         "cruise": {
-            "altitude": 1500,
-            "vCruise": 148 / 3.6,  # TODO: Variable cruise speed
+            "altitude": CRUISE_ALTITUDE,
+            "vCruise": CRUISE_VELOCITY,
         },  # Cruise trimmed (W/L = 1), change
         # "dive": {
         #     "altitude": 1000,
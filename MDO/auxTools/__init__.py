@@ -1,4 +1,6 @@
-from .atmosphere import atmosphere
+from .atmosphere import atmosphere, atmosphereTable
 from .fowardEuler import forward_euler
-from .parseConfig import parseConfig
+from .integrate import integrate, Event, thresholdEvent, METHODS
+from .parseConfig import parseConfig, Settings, readSettings, defaultSettings
 from .parseStateVariables import parseStateVariable
+from .polyFit import polyFit, polyVal
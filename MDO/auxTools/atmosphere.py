@@ -1,76 +1,153 @@
+from bisect import bisect_left
+from functools import lru_cache
+
 import numpy as np
 
+# DEFINING CONSTANTS
+# Earth radius
+r = 6356766
+# gravity
+g0 = 9.80665
+# air gas constant
+R = 287.05287
+# layer boundaries
+Ht = np.array([0, 11000, 20000, 32000, 47000, 50000], dtype=float)
+# temperature slope in each layer
+A = np.array([-6.5e-3, 0, 1e-3, 2.8e-3, 0])
+# pressure at the base of each layer
+pb = np.array([101325, 22632, 5474.87, 868.014, 110.906])
+# temperature at the base of each layer
+Tstdb = np.array([288.15, 216.65, 216.65, 228.65, 270.65])
+# air viscosity
+mi0 = 18.27e-6  # [Pa s]
+T0 = 291.15  # [K]
+C = 120  # [K]
+
+# python floats of the tables, used by the scalar path
+_HT, _A, _PB, _TSTDB = (values.tolist() for values in (Ht, A, pb, Tstdb))
+
+# Altitude band of the lookup table [m], where the aircraft flies
+TABLE_HEIGHTS = (0.0, 5000.0)
+TABLE_STEP = 1.0
+
 
-def atmosphere(z, tba=288.15):
+def atmosphere(z, tba=288.15, table=False):
     """
      - Description:
          Funçao que retorna a Temperatura, Pressao e Densidade para uma determinada
     altitude z [m]. Essa funçao usa o modelo padrao de atmosfera para a
-    temperatura no solo de Tba.
+    temperatura no solo de Tba. Altitudes and ground temperatures can be arrays, they are
+    broadcast together.
 
     -Inputs:
-        z [float]: Altitude in meters.
-        Tba [float]:
+        z [float or array]: Altitude in meters.
+        Tba [float or array]:
+        table [bool]: interpolate a table computed once for every Tba, see atmosphereTable.
+        Only the altitudes in TABLE_HEIGHTS use the table.
 
     - Outputs:
-        T [float]: Temperature in kelvins.
-        p [float]: Pressure in Pascals.
-        rho [float]: Density in kg/m^3.
-        mi [float]: Viscosity in .
+        T [float or array]: Temperature in kelvins.
+        p [float or array]: Pressure in Pascals.
+        rho [float or array]: Density in kg/m^3.
+        mi [float or array]: Viscosity in .
     """
+    if isinstance(z, (int, float)) and isinstance(tba, (int, float)) and not table:
+        return _atmosphereScalar(z, tba)
+
+    z = np.asarray(z, dtype=float)
+    tba = np.asarray(tba, dtype=float)
+    if table and tba.ndim == 0:
+        values = _atmosphereInterp(z, float(tba))
+    else:
+        values = _atmosphere(z, tba)
+
+    if z.ndim == 0 and tba.ndim == 0:
+        return tuple(float(value) for value in values)
+    return values
+
+
+def atmosphereTable(tba=288.15):
+    """
+    # Description:
+        Lookup table of the atmosphere in TABLE_HEIGHTS, computed once for every ground
+        temperature.
+
+    ## Returns:
+    - heights [array]: table altitudes [m], TABLE_STEP apart.
+    - values [array]: (4, nHeights) T, p, rho and mi at the heights.
+    """
+    return _atmosphereTable(float(tba))
+
+
+@lru_cache(maxsize=32)
+def _atmosphereTable(tba):
+    nHeights = int(round((TABLE_HEIGHTS[1] - TABLE_HEIGHTS[0]) / TABLE_STEP)) + 1
+    heights = np.linspace(TABLE_HEIGHTS[0], TABLE_HEIGHTS[1], nHeights)
+    values = np.array(_atmosphere(heights, np.asarray(tba)))
+    # shared by every call, read only
+    heights.flags.writeable = False
+    values.flags.writeable = False
+    return heights, values
+
 
+def _atmosphereInterp(z, tba):
+    heights, table = _atmosphereTable(tba)
+    inTable = (z >= heights[0]) & (z <= heights[-1])
+    if not np.all(inTable):
+        # altitudes out of the table are computed exactly
+        exact = _atmosphere(z, np.asarray(tba))
+        return tuple(np.where(inTable, np.interp(z, heights, column), value)
+                     for column, value in zip(table, exact))
+    return tuple(np.interp(z, heights, column) for column in table)
+
+
+def _atmosphereScalar(z, tba):
+    # one altitude, same model as _atmosphere without the array overhead
+    Tb = tba - _TSTDB[0]
+    H = r * z / (r + z)
+
+    if H < _HT[0]:
+        raise ValueError('Under sealevel')
+    if H > _HT[-1]:
+        raise ValueError('Altitude beyond model boundaries')
+    i = bisect_left(_HT, H, 1, len(_HT) - 1) - 1
+
+    T = _TSTDB[i] + _A[i] * (H - _HT[i]) + Tb
+    if _A[i] == 0:
+        p = _PB[i] * np.exp(-g0 * (H - _HT[i]) / R / (_TSTDB[i] + Tb))
+    else:
+        p = _PB[i] * (T / (_TSTDB[i] + Tb)) ** (-g0 / _A[i] / R)
+    rho = p / R / T
+    mi = mi0 * (T0 + C) / (T + C) * (T / T0) ** 1.5
+    return T, p, rho, mi
+
+
+def _atmosphere(z, tba):
     # Zbase (so para referencia)
     # 0 11019.1 20063.1 32161.9 47350.1 50396.4
 
-    # DEFINING CONSTANTS
-    # Earth radius
-    r = 6356766
-    # gravity
-    g0 = 9.80665
-    # air gas constant
-    R = 287.05287
-    # layer boundaries
-    Ht = [0, 11000, 20000, 32000, 47000, 50000]
-    # temperature slope in each layer
-    A = [-6.5e-3, 0, 1e-3, 2.8e-3, 0]
-    # pressure at the base of each layer
-    pb = [101325, 22632, 5474.87, 868.014, 110.906]
-    # temperature at the base of each layer
-    Tstdb = [288.15, 216.65, 216.65, 228.65, 270.65]
     # temperature correction
     Tb = tba - Tstdb[0]
-    # air viscosity
-    mi0 = 18.27e-6  # [Pa s]
-    T0 = 291.15  # [K]
-    C = 120  # [K]
 
     # geopotential altitude
     H = r * z / (r + z)
 
-    # selecting layer
-    if H < Ht[0]:
+    # selecting layer, H on a layer boundary belongs to the lower layer
+    if np.any(H < Ht[0]):
         raise ValueError('Under sealevel')
-    elif H <= Ht[1]:
-        i = 0
-    elif H <= Ht[2]:
-        i = 1
-    elif H <= Ht[3]:
-        i = 2
-    elif H <= Ht[4]:
-        i = 3
-    elif H <= Ht[5]:
-        i = 4
-    else:
+    if np.any(H > Ht[-1]):
         raise ValueError('Altitude beyond model boundaries')
+    i = np.searchsorted(Ht[1:-1], H, side='left')
 
     # Calculating temperature
     T = Tstdb[i] + A[i] * (H - Ht[i]) + Tb
 
     # Calculating pressure
-    if A[i] == 0:
-        p = pb[i] * np.exp(-g0 * (H - Ht[i]) / R / (Tstdb[i] + Tb))
-    else:
-        p = pb[i] * (T / (Tstdb[i] + Tb)) ** (-g0 / A[i] / R)
+    isothermal = A[i] == 0
+    slope = np.where(isothermal, 1.0, A[i])
+    p = np.where(isothermal,
+                 pb[i] * np.exp(-g0 * (H - Ht[i]) / R / (Tstdb[i] + Tb)),
+                 pb[i] * (T / (Tstdb[i] + Tb)) ** (-g0 / slope / R))
 
     # Calculating density
     rho = p / R / T
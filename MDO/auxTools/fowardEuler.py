@@ -1,14 +1,15 @@
-import numpy as np
+from .integrate import integrate
 
-def forward_euler(q0, qd, dt=0.01, nsteps=6000):
-    stts = [q0]
-    ts = [0.0]
-
-    for _ in range(nsteps):
-        qdt = qd(stts[-1])
-        q = stts[-1] + qdt * dt
 
-        stts.append(q)
-        ts.append(ts[-1] + dt)
-
-    return ts, np.vstack(stts)
\ No newline at end of file
+def forward_euler(q0, qd, dt=0.01, nsteps=6000):
+    """
+    # Description:
+        First order Euler integration of dq/dt = qd(q) for nsteps steps, see integrate for the
+        other methods and events.
+
+    ## Returns:
+    - ts [list]: time of every step.
+    - qs [array]: (nsteps + 1, nStates) state of every step.
+    """
+    solution = integrate(lambda t, q: qd(q), q0, tEnd=nsteps*dt, dt=dt, method="euler")
+    return list(solution.t), solution.q
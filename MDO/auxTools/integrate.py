@@ -0,0 +1,331 @@
+import numpy as np
+
+
+class Tableau:
+    """
+    # Description:
+        Butcher tableau of an explicit Runge-Kutta method. Methods with errorWeights are
+        embedded pairs and the step size is adapted. Methods with dense coefficients have a
+        continuous extension, q(t + theta*h) = q + h*sum(k_i*(dense_i @ [theta, ..., theta**4])),
+        the others are interpolated with a cubic Hermite polynomial.
+    """
+    def __init__(self, a, b, c, errorWeights=None, order=1, dense=None):
+        self.a = [np.asarray(row, dtype=float) for row in a]
+        self.b = np.asarray(b, dtype=float)
+        self.c = np.asarray(c, dtype=float)
+        self.errorWeights = None if errorWeights is None else np.asarray(errorWeights, dtype=float)
+        self.order = order
+        self.dense = None if dense is None else np.asarray(dense, dtype=float)
+
+    @property
+    def adaptive(self):
+        return self.errorWeights is not None
+
+
+METHODS = {
+    "euler": Tableau(a=[[]], b=[1.0], c=[0.0], order=1),
+    "rk4": Tableau(a=[[], [1/2], [0, 1/2], [0, 0, 1]],
+                   b=[1/6, 1/3, 1/3, 1/6],
+                   c=[0, 1/2, 1/2, 1], order=4),
+    # Dormand-Prince 5(4), the last stage is the derivative at the end of the step
+    "rk45": Tableau(a=[[],
+                       [1/5],
+                       [3/40, 9/40],
+                       [44/45, -56/15, 32/9],
+                       [19372/6561, -25360/2187, 64448/6561, -212/729],
+                       [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+                       [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84]],
+                    b=[35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0],
+                    c=[0, 1/5, 3/10, 4/5, 8/9, 1, 1],
+                    errorWeights=[35/384 - 5179/57600, 0, 500/1113 - 7571/16695, 125/192 - 393/640,
+                                  -2187/6784 + 92097/339200, 11/84 - 187/2100, -1/40],
+                    order=5,
+                    # fourth order continuous extension, Hairer, Norsett and Wanner
+                    dense=[[1, -8048581381/2820520608, 8663915743/2820520608, -12715105075/11282082432],
+                           [0, 0, 0, 0],
+                           [0, 131558114200/32700410799, -68118460800/10900136933, 87487479700/32700410799],
+                           [0, -1754552775/470086768, 14199869525/1410260304, -10690763975/1880347072],
+                           [0, 127303824393/49829197408, -318862633887/49829197408, 701980252875/199316789632],
+                           [0, -282668133/205662961, 2019193451/616988883, -1453857185/822651844],
+                           [0, 40617522/29380423, -110615467/29380423, 69997945/29380423]]),
+}
+
+
+class Event:
+    """
+    # Description:
+        Terminal event of integrate, the integration of a design stops where fun(t, q) crosses
+        zero. Ex: Event(lambda t, q: q[..., 1] - vTakeOff, direction=1).
+
+    ## Parameters (Required):
+    - fun [function]: fun(t, q), same arguments as the derivative function of integrate.
+
+    ## Parameters (Optional):
+    - direction [int]: 1 only rising crossings, -1 only falling crossings, 0 both.
+    """
+    def __init__(self, fun, direction=0):
+        self.fun = fun
+        self.direction = direction
+
+    def crossed(self, before, after):
+        rising = (before < 0) & (after >= 0)
+        falling = (before > 0) & (after <= 0)
+        if self.direction > 0:
+            return rising
+        if self.direction < 0:
+            return falling
+        return rising | falling
+
+
+def thresholdEvent(index, value, direction=1):
+    """
+    # Description:
+        Event of a state reaching a value. Ex: thresholdEvent(1, vTakeOff) for V >= Vto.
+
+    ## Parameters (Required):
+    - index [int]: state index.
+    - value [float or array]: threshold, one value per design in the batched mode.
+    """
+    return Event(lambda t, q: q[..., index] - value, direction=direction)
+
+
+class Solution:
+    """
+    # Description:
+        Result of integrate. In the batched mode every value has a first axis with the
+        designs, t and q are padded with nan after the last step of a design.
+
+    ## Atributes:
+    - t [array]: time of every step, (nSteps + 1,) or (nDesigns, nSteps + 1).
+    - q [array]: state of every step, (nSteps + 1, nStates) or (nDesigns, nSteps + 1, nStates).
+    None if the steps were not saved.
+    - nSteps [int or array]: number of steps.
+    - tEnd, qEnd: time and state at the end, at the event if one was found.
+    - event [int or array]: index of the terminal event, -1 if the integration reached tEnd.
+    """
+    __slots__ = ("t", "q", "nSteps", "tEnd", "qEnd", "event")
+
+    def __init__(self, t, q, nSteps, tEnd, qEnd, event):
+        self.t = t
+        self.q = q
+        self.nSteps = nSteps
+        self.tEnd = tEnd
+        self.qEnd = qEnd
+        self.event = event
+
+
+def integrate(fun, q0, tEnd, dt, t0=0.0, method="rk4", events=(), rtol=1e-6, atol=1e-9, maxSteps=10**6,
+              saveSteps=True):
+    """
+    # Description:
+        Integrate dq/dt = fun(t, q) with an explicit Runge-Kutta method, until tEnd or a
+        terminal event. States are written to preallocated buffers. A stacked state of many
+        designs is integrated at once (batched mode), each design with its own step size, end
+        time and events; designs that are done keep their state.
+
+    ## Parameters (Required):
+    - fun [function]: fun(t, q) -> dq/dt. In the batched mode t has shape (nDesigns,) and q
+    (nDesigns, nStates).
+    - q0 [array]: initial state (nStates,), or (nDesigns, nStates) for the batched mode.
+    - tEnd [float or array]: end time, one per design in the batched mode.
+    - dt [float]: step of the fixed step methods, first step of the adaptive ones.
+
+    ## Parameters (Optional):
+    - t0 [float]: initial time.
+    - method [str]: "euler", "rk4" or "rk45" (adaptive Dormand-Prince), see METHODS.
+    - events [list(Event)]: terminal events.
+    - rtol, atol [float]: tolerances of the adaptive methods.
+    - maxSteps [int]: steps until the integration stops.
+    - saveSteps [bool]: keep every step, only the end is kept otherwise.
+
+    ## Returns:
+    - solution [Solution]
+    """
+    tableau = METHODS[method]
+    q0 = np.asarray(q0, dtype=float)
+    batched = q0.ndim == 2
+    q = np.atleast_2d(q0).copy()
+    nDesigns, nStates = q.shape
+
+    if batched:
+        derivative = fun
+        eventFuns = [event.fun for event in events]
+    else:
+        derivative = _single(fun)
+        eventFuns = [_single(event.fun) for event in events]
+
+    t = np.full(nDesigns, float(t0))
+    tEnd = np.broadcast_to(np.asarray(tEnd, dtype=float), (nDesigns,)).copy()
+    h = np.full(nDesigns, float(dt))
+    if tableau.adaptive:
+        stepsLeft = None
+    else:
+        # fixed steps, the last one ends at tEnd
+        stepsLeft = np.maximum(np.ceil((tEnd - t0)/dt - 1e-9), 0).astype(int)
+        lastStep = (tEnd - t0) - (stepsLeft - 1)*dt
+
+    capacity = (int(np.max(stepsLeft)) + 1 if stepsLeft is not None else 256) if saveSteps else 0
+    buffer = _StepBuffer(nDesigns, nStates, min(capacity, maxSteps + 1)) if saveSteps else None
+    if buffer is not None:
+        buffer.append(np.ones(nDesigns, dtype=bool), t, q)
+
+    eventIndex = np.full(nDesigns, -1)
+    eventValues = [np.broadcast_to(eventFun(t, q), (nDesigns,)) for eventFun in eventFuns]
+    active = stepsLeft > 0 if stepsLeft is not None else tEnd > t
+    k1 = derivative(t, q)
+
+    for _ in range(maxSteps):
+        if not active.any():
+            break
+
+        if stepsLeft is not None:
+            h = np.where(stepsLeft == 1, lastStep, dt)
+        else:
+            h = np.minimum(h, tEnd - t)
+        h = np.where(active, h, 0.0)
+
+        qNew, stages = _step(tableau, derivative, t, q, h, k1)
+        if tableau.adaptive:
+            error = h[:, np.newaxis]*np.tensordot(tableau.errorWeights, stages, axes=1)
+            scale = atol + rtol*np.maximum(np.abs(q), np.abs(qNew))
+            errorNorm = np.sqrt(np.mean((error/scale)**2, axis=1))
+            accept = active & (errorNorm <= 1)
+            with np.errstate(divide="ignore"):
+                factor = np.clip(0.9*errorNorm**(-1/tableau.order), 0.2, 5.0)
+            hNext = h*factor
+            kEnd = stages[-1]
+        else:
+            accept = active
+            kEnd = None
+        tNew = t + h
+
+        # terminal events, the crossing is found on the interpolant of the step
+        valuesNew = [np.broadcast_to(eventFun(tNew, qNew), (nDesigns,)) for eventFun in eventFuns]
+        theta = np.full(nDesigns, np.inf)
+        interpolate = None
+        for i, (event, before, after) in enumerate(zip(events, eventValues, valuesNew)):
+            crossed = accept & event.crossed(before, after)
+            if not crossed.any():
+                continue
+            if interpolate is None:
+                interpolate = _interpolant(tableau, derivative, q, qNew, stages, k1, kEnd, tNew, h)
+            thetaEvent = _locateEvent(eventFuns[i], t, h, interpolate, before, after, crossed)
+            first = crossed & (thetaEvent < theta)
+            theta = np.where(first, thetaEvent, theta)
+            eventIndex = np.where(first, i, eventIndex)
+
+        stopped = np.isfinite(theta)
+        if stopped.any():
+            thetaStop = np.where(stopped, theta, 1.0)
+            tNew = np.where(stopped, t + thetaStop*h, tNew)
+            qNew = np.where(stopped[:, np.newaxis], interpolate(thetaStop), qNew)
+
+        t = np.where(accept, tNew, t)
+        q = np.where(accept[:, np.newaxis], qNew, q)
+        if buffer is not None:
+            buffer.append(accept, t, q)
+        for i in range(len(eventValues)):
+            eventValues[i] = np.where(accept, valuesNew[i], eventValues[i])
+
+        if tableau.adaptive:
+            h = np.where(active, hNext, h)
+            active = active & ~stopped & (tEnd - t > 1e-12*np.maximum(np.abs(tEnd), 1.0))
+            # first same as last, the derivative at the end of an accepted step starts the next one
+            k1 = np.where(accept[:, np.newaxis], stages[-1], k1)
+            if stopped.any():
+                k1 = derivative(t, q)
+        else:
+            stepsLeft = np.where(accept, stepsLeft - 1, stepsLeft)
+            active = active & ~stopped & (stepsLeft > 0)
+            k1 = derivative(t, q)
+
+    if buffer is not None:
+        tSteps, qSteps, nSteps = buffer.result()
+    else:
+        tSteps, qSteps, nSteps = None, None, None
+    if batched:
+        return Solution(tSteps, qSteps, nSteps, t, q, eventIndex)
+    return Solution(None if tSteps is None else tSteps[0], None if qSteps is None else qSteps[0],
+                    None if nSteps is None else int(nSteps[0]), float(t[0]), q[0], int(eventIndex[0]))
+
+
+def _single(fun):
+    # function of one design called with the stacked arrays of the batched mode
+    def stacked(t, q):
+        return np.asarray(fun(t[0], q[0]))[np.newaxis]
+    return stacked
+
+
+def _step(tableau, derivative, t, q, h, k1):
+    stages = [k1]
+    for c, a in zip(tableau.c[1:], tableau.a[1:]):
+        increment = np.tensordot(a, np.array(stages), axes=1)
+        stages.append(derivative(t + c*h, q + h[:, np.newaxis]*increment))
+    stages = np.array(stages)
+    qNew = q + h[:, np.newaxis]*np.tensordot(tableau.b, stages, axes=1)
+    return qNew, stages
+
+
+def _interpolant(tableau, derivative, q, qNew, stages, k1, kEnd, tNew, h):
+    # state inside the step as a function of theta in [0, 1]
+    if tableau.dense is not None:
+        def dense(theta):
+            powers = theta[:, np.newaxis]**np.arange(1, tableau.dense.shape[1] + 1)
+            weights = powers @ tableau.dense.T
+            return q + h[:, np.newaxis]*np.einsum("ds,sdn->dn", weights, stages)
+        return dense
+
+    if kEnd is None:
+        kEnd = derivative(tNew, qNew)
+    return lambda theta: _hermite(q, qNew, k1, kEnd, h, theta)
+
+
+def _hermite(q, qNew, k1, kEnd, h, theta):
+    theta = theta[:, np.newaxis]
+    h = h[:, np.newaxis]
+    return ((2*theta**3 - 3*theta**2 + 1)*q + (theta**3 - 2*theta**2 + theta)*h*k1
+            + (-2*theta**3 + 3*theta**2)*qNew + (theta**3 - theta**2)*h*kEnd)
+
+
+def _locateEvent(eventFun, t, h, interpolate, before, after, crossed, nIterations=20):
+    # Illinois method on the interpolant, the event value changes sign between 0 and 1
+    low = np.zeros_like(t)
+    high = np.ones_like(t)
+    valueLow = np.where(crossed, before, -1.0)
+    valueHigh = np.where(crossed, after, 1.0)
+    side = np.zeros(len(t), dtype=int)
+    for _ in range(nIterations):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            theta = (low*valueHigh - high*valueLow)/(valueHigh - valueLow)
+        theta = np.where(np.isfinite(theta), np.clip(theta, low, high), (low + high)/2)
+        value = np.broadcast_to(eventFun(t + theta*h, interpolate(theta)), t.shape)
+        sameAsLow = np.sign(value) == np.sign(valueLow)
+        low, valueLow = np.where(sameAsLow, theta, low), np.where(sameAsLow, value, valueLow)
+        high, valueHigh = np.where(sameAsLow, high, theta), np.where(sameAsLow, valueHigh, value)
+        # Illinois, the value of an end kept twice is halved
+        valueHigh = np.where(sameAsLow & (side == 1), valueHigh/2, valueHigh)
+        valueLow = np.where(~sameAsLow & (side == -1), valueLow/2, valueLow)
+        side = np.where(sameAsLow, 1, -1)
+    # the state at the event is on the side where the event is reached
+    return np.where(crossed, high, np.inf)
+
+
+class _StepBuffer:
+    # preallocated steps of every design, the capacity doubles when it is full
+    def __init__(self, nDesigns, nStates, capacity):
+        self.t = np.full((nDesigns, max(capacity, 2)), np.nan)
+        self.q = np.full((nDesigns, max(capacity, 2), nStates), np.nan)
+        self.count = np.zeros(nDesigns, dtype=int)
+
+    def append(self, mask, t, q):
+        if self.count.max() >= self.t.shape[1]:
+            self.t = np.concatenate([self.t, np.full_like(self.t, np.nan)], axis=1)
+            self.q = np.concatenate([self.q, np.full_like(self.q, np.nan)], axis=1)
+        rows = np.flatnonzero(mask)
+        self.t[rows, self.count[rows]] = t[rows]
+        self.q[rows, self.count[rows]] = q[rows]
+        self.count[rows] += 1
+
+    def result(self):
+        size = self.count.max()
+        return self.t[:, :size], self.q[:, :size], self.count - 1
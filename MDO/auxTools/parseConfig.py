@@ -1,17 +1,22 @@
 from configparser import ConfigParser
 import os
 
+# Settings of the last parseConfig call, see defaultSettings
+_settings = None
+
 
 def parseConfig(pathToFile="outputsConfig.cfg"):
     """
     # Description:
-        Read cfg file and pass to environment variables
+        Read cfg file and pass to environment variables. The settings are kept as the default
+        settings of main and AircraftInfo, the file is not read again.
 
     ## Parameters:
         - pathToFile[str]:
     ## Returns:
-        None
+        - settings [Settings]
     """
+    global _settings
     config = ConfigParser()
     config.read(os.path.join(pathToFile))
 
@@ -20,3 +25,101 @@ def parseConfig(pathToFile="outputsConfig.cfg"):
     os.environ['PRINT'] = config['env']['PRINT']
     os.environ['WEIGHT'] = config['methods']['WEIGHT']
     os.environ['MTOW'] = config['methods']['MTOW']
+
+    # the LOW_MEMORY environment variable turns on low-memory mode for the whole process
+    lowMemory = os.getenv('LOW_MEMORY', config['env'].get('LOW_MEMORY', 'no'))
+    _settings = _settingsFromConfig(config).replace(lowMemory=_isYes(lowMemory))
+    return _settings
+
+
+class Settings:
+    """
+    # Description:
+        Settings of one evaluation of main, given explicitly instead of through the environment
+        variables so designs can be evaluated concurrently in threads.
+
+    ## Atributes:
+    - debug, plot, print [bool]: [env] section of outputsConfig.cfg.
+    - weight [str]: weight method, "Raymer" or the aircraft weight in kg.
+    - mtow [float]: MTOW of the Raymer method [kg].
+    - output [dict]: [output] section, name: bool. Ex: output['TAKEOFF'].
+    - lowMemory [bool]: see AircraftInfo.dropRawTables.
+    - workspace [str]: folder of the debug files (AVL input files and results.json).
+    """
+    __slots__ = ("debug", "plot", "print", "weight", "mtow", "output", "lowMemory", "workspace")
+
+    def __init__(self, debug=False, plot=False, print=False, weight="Raymer", mtow=144, output=None,
+                 lowMemory=False, workspace="aircraft"):
+        self.debug = debug
+        self.plot = plot
+        self.print = print
+        self.weight = weight
+        self.mtow = mtow
+        self.output = dict(output or {})
+        self.lowMemory = lowMemory
+        self.workspace = workspace
+
+    def replace(self, **changes):
+        """
+        # Description:
+            Copy of the settings with some values changed. Ex: settings.replace(workspace="design_1").
+        """
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return Settings(**values)
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"Settings({values})"
+
+
+def readSettings(pathToFile="outputsConfig.cfg", **changes):
+    """
+    # Description:
+        Read the cfg file to a Settings object, the environment variables are not changed.
+
+    ## Parameters (Optional):
+    - pathToFile [str]: cfg file.
+    - changes: Settings values replacing the ones of the file. Ex: debug=False.
+
+    ## Returns:
+    - settings [Settings]
+    """
+    config = ConfigParser()
+    config.read(os.path.join(pathToFile))
+
+    return _settingsFromConfig(config).replace(**changes)
+
+
+def defaultSettings():
+    """
+    # Description:
+        Settings of the last parseConfig call, used when main or AircraftInfo are called
+        without settings. Nothing is read from disk.
+
+    ## Returns:
+    - settings [Settings]
+    """
+    if _settings is None:
+        raise RuntimeError("No settings, call MDO.parseConfig first or pass the settings")
+    return _settings
+
+
+def _settingsFromConfig(config):
+    return Settings(debug=_isYes(config['env']['DEBUG']),
+                    plot=_isYes(config['env']['PLOT']),
+                    print=_isYes(config['env']['PRINT']),
+                    weight=config['methods']['WEIGHT'],
+                    mtow=float(config['methods']['MTOW']),
+                    output=_readOutput(config),
+                    lowMemory=_isYes(config['env'].get('LOW_MEMORY', 'no')))
+
+
+def _readOutput(config):
+    if not config.has_section('output'):
+        return {}
+    return {name.upper(): _isYes(value) for name, value in config['output'].items()}
+
+
+def _isYes(value):
+    return 'y' in value.lower()
@@ -1,5 +1,4 @@
 import numpy as np
-import os
 
 
 def parseStateVariable(x_states_global, variables='short', x_states_default_values=None):
@@ -71,6 +70,11 @@ def parseStateVariable(x_states_global, variables='short', x_states_default_valu
         elif isinstance(x_states_global, dict):
             x_states_global = _parse_dict_to_list(x_states_global, x_states_default_values=x_states_default_values)
             x_states = _parse_from_list(x_states_global)
+        elif isinstance(x_states_global, np.ndarray) and x_states_global.ndim == 2:
+            # one design per row, all designs are parsed at once column by column
+            x_states = np.column_stack(_parse_from_list(list(x_states_global.T)))
+        elif isinstance(x_states_global, np.ndarray):
+            x_states = _parse_from_list(list(x_states_global))
         return x_states
 
 
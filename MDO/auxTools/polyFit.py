@@ -0,0 +1,89 @@
+import numpy as np
+
+
+def polyFit(x, y, degree=2):
+    """
+    # Description:
+        Linear least-squares polynomial fit of one or many curves, y = c0 + c1*x + c2*x**2 + ...
+        Curves sharing the same x are solved with a single lstsq call, curves with their own x
+        with a stacked pseudo-inverse. Missing points are given as nan, curves of different
+        length can be padded with nan.
+
+    ## Parameters (Required):
+    - x [array]: shape (n,) shared by all curves, or (m, n) for m curves.
+    - y [array]: shape (n,) for one curve, or (m, n) for m curves.
+
+    ## Parameters (Optional):
+    - degree [int]: polynomial degree.
+
+    ## Returns:
+    - coefficients [array]: shape (degree+1,) or (m, degree+1), lowest order first.
+    - diagnostics [dict]: "residuals" y - fit (nan where missing), "rms" of the residuals,
+    "rSquared" and "nPoints" of every curve.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    single = y.ndim == 1
+    y = np.atleast_2d(y)
+    x = np.broadcast_to(x, y.shape) if x.ndim == 1 else x
+    if x.shape != y.shape:
+        raise ValueError(f"x of shape {x.shape} does not match y of shape {y.shape}")
+
+    valid = np.isfinite(x) & np.isfinite(y)
+    nPoints = valid.sum(axis=1)
+    if np.any(nPoints < degree + 1):
+        raise ValueError(f"A degree {degree} fit needs at least {degree + 1} points")
+
+    xFilled = np.where(valid, x, 0.0)
+    yFilled = np.where(valid, y, 0.0)
+    vandermonde = xFilled[..., np.newaxis] ** np.arange(degree + 1)
+
+    if valid.all() and np.all(x == x[0]):
+        # one matrix for all curves, every curve is a right-hand side
+        coefficients = np.linalg.lstsq(vandermonde[0], yFilled.T, rcond=None)[0].T
+    else:
+        # missing points get an empty row and do not change the solution
+        vandermonde = vandermonde * valid[..., np.newaxis]
+        coefficients = np.einsum("mkn,mn->mk", np.linalg.pinv(vandermonde), yFilled)
+
+    residuals = np.where(valid, y - polyVal(coefficients, xFilled), np.nan)
+    sumSquares = np.nansum(residuals ** 2, axis=1)
+    yMean = np.nansum(yFilled, axis=1) / nPoints
+    totalSquares = np.sum(np.where(valid, y - yMean[:, np.newaxis], 0.0) ** 2, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rSquared = np.where(totalSquares > 0, 1 - sumSquares / totalSquares, 1.0)
+    diagnostics = {
+        "residuals": residuals,
+        "rms": np.sqrt(sumSquares / nPoints),
+        "rSquared": rSquared,
+        "nPoints": nPoints,
+    }
+
+    if single:
+        coefficients = coefficients[0]
+        diagnostics = {key: value[0] for key, value in diagnostics.items()}
+    return coefficients, diagnostics
+
+
+def polyVal(coefficients, x):
+    """
+    # Description:
+        Evaluate polynomials with coefficients from polyFit, lowest order first.
+
+    ## Parameters (Required):
+    - coefficients [array]: shape (degree+1,) or (m, degree+1).
+    - x [array]: shape (n,) or (m, n).
+
+    ## Returns:
+    - y [array]: polynomial values, shape of x broadcast over the curves.
+    """
+    coefficients = np.asarray(coefficients, dtype=float)
+    x = np.asarray(x, dtype=float)
+    if coefficients.ndim > 1 and x.ndim > 0:
+        # one row of x values per curve
+        coefficients = coefficients[:, np.newaxis, :]
+    y = np.zeros(np.broadcast_shapes(coefficients.shape[:-1], x.shape))
+    # Horner scheme, highest order first
+    for i in range(coefficients.shape[-1] - 1, -1, -1):
+        y = y * x + coefficients[..., i]
+    return y
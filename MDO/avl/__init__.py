@@ -2,3 +2,5 @@ from .avlMain import *
 from .avlRunBuild import *
 from .avlGeoBuild import *
 from .avlRun import *
+from .avlGeoBatch import *
+from .surfaceProperties import *
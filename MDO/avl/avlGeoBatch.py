@@ -0,0 +1,160 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from MDO.airfoils import sectionAirfoil
+from MDO.auxOptimization.set_state_variables import CRUISE_ALTITUDE, CRUISE_VELOCITY
+from MDO.auxTools.parseStateVariables import parseStateVariable
+from .avlGeoBuild import avlGeoBuild
+from .surfaceProperties import infoSurfaceBatch
+
+# Column order of the optimizer design matrix, see parseStateVariable
+OPTIMIZATION_VARIABLES = ('aspectRatio', 'wingSecPercentage', 'wingArea', 'taperRatio1', 'taperRatio2',
+                          'aspectRatioV', 'areaV', 'taperV', 'posXV', 'fuselageLength')
+
+
+def geometryBatch(xStatesGlobal):
+    """
+    # Description:
+        Geometry of many designs at once, every value is an array with one entry per design.
+
+    ## Parameters (Required):
+    - xStatesGlobal [array]: design matrix (nDesigns, 10), columns in OPTIMIZATION_VARIABLES order.
+
+    ## Returns:
+    - geometry [dict]: section chords, spans and sweeps as in set_state_variables and
+    "wingInfo"/"verticalInfo" with area, meanChord, span, sweep, tipX, xMeanChord and
+    yMeanChord of the surfaces (see infoSurface and xyMeanChord).
+    """
+    xStates = parseStateVariable(np.atleast_2d(np.asarray(xStatesGlobal, dtype=float)))
+
+    wingSpan = xStates[:, 0]
+    wingSecPercentage = xStates[:, 1]
+    geometry = {
+        "wingSpan": wingSpan,
+        "wingRootChord": xStates[:, 2],
+        "wingMiddleChord": xStates[:, 3],
+        "wingTipChord": xStates[:, 4],
+        "wingSecPosition": wingSpan / 2 * wingSecPercentage,
+        "wingPosSec": wingSpan / 2 * (1 - wingSecPercentage),
+        "verticalSpan": xStates[:, 5],
+        "verticalRootChord": xStates[:, 6],
+        "verticalTipChord": xStates[:, 7],
+        "verticalXPosition": xStates[:, 8],
+        "fuselageLength": xStates[:, 9],
+    }
+    geometry["wingMiddleSweepLE"] = np.arctan((geometry["wingRootChord"] - geometry["wingMiddleChord"]) / 4
+                                              / geometry["wingSecPosition"])
+    geometry["wingTipSweepLE"] = np.arctan((geometry["wingMiddleChord"] - geometry["wingTipChord"]) / 4
+                                           / geometry["wingPosSec"])
+    geometry["verticalSweepLE"] = np.arctan((geometry["verticalRootChord"] - geometry["verticalTipChord"]) / 4
+                                            / geometry["verticalSpan"] / 2)
+
+    geometry["wingInfo"] = infoSurfaceBatch(
+        chords=np.column_stack([geometry["wingRootChord"], geometry["wingMiddleChord"], geometry["wingTipChord"]]),
+        spans=np.column_stack([geometry["wingSecPosition"], geometry["wingPosSec"]]),
+        sweeps=np.column_stack([geometry["wingMiddleSweepLE"], geometry["wingTipSweepLE"]]))
+    geometry["verticalInfo"] = infoSurfaceBatch(
+        chords=np.column_stack([geometry["verticalRootChord"], geometry["verticalTipChord"]]),
+        spans=geometry["verticalSpan"][:, np.newaxis],
+        sweeps=geometry["verticalSweepLE"][:, np.newaxis])
+    return geometry
+
+
+def stateVariablesBatch(geometry, wingAirfoil, stabAirfoil, fuselageDiameter=0.18):
+    """
+    # Description:
+        stateVariables of set_state_variables for every design of geometryBatch.
+
+    ## Returns:
+    - stateVariablesList [list(dict)]: one stateVariables dict per design.
+    """
+    def airfoil(name, chord):
+        # section polars at the cruise condition, as in set_state_variables
+        return sectionAirfoil(name, chord, CRUISE_VELOCITY, CRUISE_ALTITUDE)
+
+    # python floats, the AVL files are identical to the ones of the single design path
+    values = {key: value.tolist() for key, value in geometry.items() if isinstance(value, np.ndarray)}
+
+    stateVariablesList = []
+    for i in range(len(values["wingSpan"])):
+        stateVariablesList.append({
+            "wing": OrderedDict({
+                "root": {
+                    "chord": values["wingRootChord"][i],
+                    "aoa": 0,
+                    "x": 0,
+                    "y": 0,
+                    "z": 0,
+                    "airfoil": airfoil(wingAirfoil, values["wingRootChord"][i])
+                },
+                "middle": {
+                    "chord": values["wingMiddleChord"][i],
+                    "b": values["wingSecPosition"][i],
+                    "sweepLE": values["wingMiddleSweepLE"][i],
+                    "aoa": 0,
+                    "dihedral": 0,
+                    "airfoil": airfoil(wingAirfoil, values["wingMiddleChord"][i])
+                },
+                "tip": {
+                    "chord": values["wingTipChord"][i],
+                    "b": values["wingPosSec"][i],
+                    "sweepLE": values["wingTipSweepLE"][i],
+                    "aoa": 0,
+                    "dihedral": 0,
+                    "airfoil": airfoil(wingAirfoil, values["wingTipChord"][i])
+                },
+            }),
+            "vertical": OrderedDict({
+                "root": {
+                    "chord": values["verticalRootChord"][i],
+                    "aoa": 0,
+                    "x": values["verticalXPosition"][i],
+                    "y": 0,
+                    "z": 0.5,
+                    "airfoil": airfoil(stabAirfoil, values["verticalRootChord"][i])
+                },
+                "tip": {
+                    "chord": values["verticalTipChord"][i],
+                    "b": values["verticalSpan"][i],
+                    "sweepLE": values["verticalSweepLE"][i],
+                    "aoa": 0,
+                    "dihedral": 0,
+                    "airfoil": airfoil(stabAirfoil, values["verticalTipChord"][i])
+                }
+            }),
+            "fuselage": OrderedDict({
+                'length': values["fuselageLength"][i],
+                'diameter': fuselageDiameter
+            }),
+        })
+    return stateVariablesList
+
+
+def avlGeoBuildBatch(xStatesGlobal, controlVariables, verticalType, wingAirfoil="naca4415_cruise",
+                     stabAirfoil="naca0012_cruise", serialize=False):
+    """
+    # Description:
+        AVL geometries of a whole population. The geometry is computed for all designs at
+        once, only the avl objects are built one by one.
+
+    ## Parameters (Required):
+    - xStatesGlobal [array]: design matrix (nDesigns, 10), columns in OPTIMIZATION_VARIABLES order.
+    - controlVariables [dict]: control surfaces, see set_state_variables.
+    - verticalType [str]: "conventional", "v" or "h", as in avlGeoBuild. Required, the design
+    matrix has no horizontal tail columns.
+
+    ## Parameters (Optional):
+    - wingAirfoil [str]: wing airfoil.
+    - stabAirfoil [str]: stabilizer airfoil.
+    - serialize [bool]: return the AVL geometry files instead of the avl objects.
+
+    ## Returns:
+    - geometries [list]: avl.Aircraft (or its file content) of every design.
+    """
+    geometry = geometryBatch(xStatesGlobal)
+    geometries = [avlGeoBuild(stateVariables, controlVariables, verticalType)
+                  for stateVariables in stateVariablesBatch(geometry, wingAirfoil, stabAirfoil)]
+    if serialize:
+        return [str(aircraft) for aircraft in geometries]
+    return geometries
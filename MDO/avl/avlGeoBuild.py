@@ -2,6 +2,8 @@ from math import tan
 import avl
 from numpy import pi
 
+from .surfaceProperties import surfaceProperties
+
 
 def avlGeoBuild(stateVariables, controlVariables, verticalType="conventional"):
     stateVariables = _addControl2States(stateVariables, controlVariables, verticalType)
@@ -59,17 +61,17 @@ def avlGeoBuild(stateVariables, controlVariables, verticalType="conventional"):
         surface = _surfaceVerticalV(stateVariables["vertical"])
         surfaces.append(surface)
 
-    surfaceArea, surfaceMAC, surfaceSpan, surfaceSweep, surfaceTipX = infoSurface(stateVariables['wing'])
+    wing = surfaceProperties(stateVariables['wing'])
 
     if "endPlate" in stateVariables:
-        surfaceEndPlate = _surfaceEndPlate(surfaceTipX, surfaceSpan/2, stateVariables["wing"], stateVariables["endPlate"])
+        surfaceEndPlate = _surfaceEndPlate(wing.tipX, wing.span/2, stateVariables["wing"], stateVariables["endPlate"])
         surfaces.append(surfaceEndPlate)
 
     ref_pnt = avl.Point(x=0, y=0, z=0)
     aircraftAvl = avl.Aircraft(name='aircraft',
-                               reference_area=surfaceArea,
-                               reference_chord=surfaceMAC,
-                               reference_span=surfaceSpan,
+                               reference_area=wing.area,
+                               reference_chord=wing.meanChord,
+                               reference_span=wing.span,
                                reference_point=ref_pnt,
                                mach=0,
                                surfaces=surfaces)
@@ -486,36 +488,9 @@ def infoSurface(surfaceDict):
     - surfaceArea [float]:
     - surfaceMAC [float]:
     - surfaceSpan [float]:
+    - surfaceSweep [float]:
+    - surfaceTipX [float]:
+    Values of surfaceProperties, computed once per surface.
     """
-    keysSurfaceDict = list(surfaceDict.keys())
-    surfaceArea = 0
-    surfaceMAC = 0
-    surfaceSpan = 0
-    surfaceTipX = 0
-
-    for i in range(len(keysSurfaceDict) - 1):
-        chordRootSec = surfaceDict[keysSurfaceDict[i]]['chord']
-        chordTipSec = surfaceDict[keysSurfaceDict[i + 1]]['chord']
-        spanSec = surfaceDict[keysSurfaceDict[i + 1]]['b']
-
-        # Surface Sweep
-        surfaceTipX += surfaceDict[keysSurfaceDict[i + 1]]['sweepLE']*surfaceDict[keysSurfaceDict[i + 1]]['b']
-
-        # Surface Area
-        secArea = spanSec * (chordRootSec + chordTipSec) / 2
-        surfaceArea += secArea
-
-        # Surface MAC
-        taperRatio = chordTipSec / chordRootSec
-        secMAC = 2 / 3 * chordRootSec * (1 + taperRatio + taperRatio ** 2) / (1 + taperRatio)
-        surfaceMAC += secArea * secMAC
-
-        surfaceSpan += spanSec
-
-    # Sweep at 1/4 wing
-    surfaceSweep = (surfaceTipX + (surfaceDict['tip']['chord']-surfaceDict['root']['chord'])*1/4)/surfaceSpan
-
-    # Mean MAC from Sections
-    surfaceMAC = surfaceMAC / surfaceArea
-
-    return 2*surfaceArea, surfaceMAC, 2*surfaceSpan, surfaceSweep, surfaceTipX
\ No newline at end of file
+    properties = surfaceProperties(surfaceDict)
+    return properties.area, properties.meanChord, properties.span, properties.sweep, properties.tipX
\ No newline at end of file
@@ -21,13 +21,129 @@ def avlMain(aircraftInfo, mission, verticalType="conventional"):
                                  aircraftInfo.controlVariables,
                                  verticalType=verticalType),
         cases=avl.avlRunBuild(mission,
-                              aircraftInfo)
+                              aircraftInfo),
+        **_exportArgs(aircraftInfo)
     )
 
     # -----Save results-----------------------------------------
-    if 'y' in os.getenv('DEBUG').lower():
-        with open("aircraft/results.json", "w", encoding="utf-8") as file:
-            json.dump(results, file, indent=4)
-            file.close()
+    _saveResults(aircraftInfo, results)
+
+    return results
+
+
+def avlMainStaged(aircraftInfo, firstMission, mission, updateAircraft, verticalType="conventional"):
+    """
+    # Description:
+        Run all AVL related processes in two stages sharing one AVL session. The first stage
+        results are given to updateAircraft before the second stage cases are built.
+
+    ## Params:
+        aircraftInfo [Instance]: Aircraft info class object.
+        firstMission [json]: Mission details of the first stage. Ex: neutral point cases.
+        mission [json]: Mission details of the second stage.
+        updateAircraft [function]: Updates aircraftInfo with the first stage results.
+
+    ## Returns:
+        results [json]: AVL results of the second stage.
+    """
+    def _updateCases(firstResults):
+        updateAircraft(firstResults)
+        return avl.avlRunBuild(mission, aircraftInfo)
+
+    # -----Avl Run-----------------------------------------
+    results = avl.avlRunStaged(
+        geometry=avl.avlGeoBuild(aircraftInfo.stateVariables,
+                                 aircraftInfo.controlVariables,
+                                 verticalType=verticalType),
+        cases=avl.avlRunBuild(firstMission,
+                              aircraftInfo),
+        updateCases=_updateCases,
+        **_exportArgs(aircraftInfo)
+    )
+
+    # -----Save results-----------------------------------------
+    _saveResults(aircraftInfo, results)
+
+    return results
+
+
+async def avlMainStagedAsync(aircraftInfo, firstMission, mission, updateAircraft, verticalType="conventional",
+                             limiter=None):
+    """
+    # Description:
+        Asynchronous avlMainStaged, many aircraft can be evaluated concurrently from one event loop.
+
+    ## Params:
+        aircraftInfo [Instance]: Aircraft info class object.
+        firstMission [json]: Mission details of the first stage. Ex: neutral point cases.
+        mission [json]: Mission details of the second stage.
+        updateAircraft [function]: Updates aircraftInfo with the first stage results.
+        limiter [asyncio.Semaphore]: Limits the number of AVL processes.
+
+    ## Returns:
+        results [json]: AVL results of the second stage.
+    """
+    def _updateCases(firstResults):
+        updateAircraft(firstResults)
+        return avl.avlRunBuild(mission, aircraftInfo)
+
+    # -----Avl Run-----------------------------------------
+    results = await avl.avlRunStagedAsync(
+        geometry=avl.avlGeoBuild(aircraftInfo.stateVariables,
+                                 aircraftInfo.controlVariables,
+                                 verticalType=verticalType),
+        cases=avl.avlRunBuild(firstMission,
+                              aircraftInfo),
+        updateCases=_updateCases,
+        limiter=limiter,
+        **_exportArgs(aircraftInfo)
+    )
+
+    # -----Save results-----------------------------------------
+    _saveResults(aircraftInfo, results)
+
+    return results
+
+
+async def avlMainAsync(aircraftInfo, mission, verticalType="conventional", limiter=None):
+    """
+    # Description:
+        Asynchronous avlMain, many aircraft can be evaluated concurrently from one event loop.
+
+    ## Params:
+        aircraftInfo [Instance]: Aircraft info class object.
+        mission [json]: Mission details.
+        limiter [asyncio.Semaphore]: Limits the number of AVL processes.
+
+    ## Returns:
+        results [json]: AVL results.
+    """
+    # -----Avl Run-----------------------------------------
+    results = await avl.avlRunAsync(
+        geometry=avl.avlGeoBuild(aircraftInfo.stateVariables,
+                                 aircraftInfo.controlVariables,
+                                 verticalType=verticalType),
+        cases=avl.avlRunBuild(mission,
+                              aircraftInfo),
+        limiter=limiter,
+        **_exportArgs(aircraftInfo)
+    )
+
+    # -----Save results-----------------------------------------
+    _saveResults(aircraftInfo, results)
 
     return results
+
+
+def _exportArgs(aircraftInfo):
+    # AVL files of the debug mode go to the workspace of this evaluation
+    settings = aircraftInfo.settings
+    return {"debug": settings.debug, "exportDir": settings.workspace}
+
+
+def _saveResults(aircraftInfo, results):
+    settings = aircraftInfo.settings
+    if settings.debug:
+        os.makedirs(settings.workspace, exist_ok=True)
+        with open(os.path.join(settings.workspace, "results.json"), "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=4)
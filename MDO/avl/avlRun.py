@@ -2,7 +2,7 @@ import avl as avl
 import os
 
 
-def avlRun(geometry=None, cases=None):
+def avlRun(geometry=None, cases=None, debug=None, exportDir=None):
     """
     # Description:
         Call the Avl Wrapper and run it with the aircraft object and cases list.
@@ -11,16 +11,114 @@ def avlRun(geometry=None, cases=None):
     - geometry [Object]: Avl Wrapper Object.
     - cases [List]: list of case objects.
 
+    ## Parameters (Optional):
+    - debug [bool]: export the AVL files for manual testing. Defaults to the environment variable DEBUG.
+    - exportDir [str]: folder of the exported files. Defaults to ./<geometry name>.
+
     ## Returns:
     - results [dict]: dict with results.
     """
-    session = avl.Session(geometry=geometry, cases=cases)
-    # ---------------------------------------------------------------------------------------------------------
-    # # Exporting geometry files
-    session.export_run_files()
+    session = avl.Session(geometry=geometry, cases=cases, pool=avl.default_pool(),
+                          cache=avl.default_cache())
     results = session.run_all_cases()
 
     # Export avl for manual testing
-    if 'y' in os.getenv('DEBUG'):
-        session.export_run_files()
+    if _exportRunFiles(debug):
+        session.export_run_files(exportDir)
+    return results
+
+
+def avlRunStaged(geometry=None, cases=None, updateCases=None, debug=None, exportDir=None):
+    """
+    # Description:
+        Run two sets of cases on the same AVL process, loading the geometry only once.
+
+    ## Parameters (Required):
+    - geometry [Object]: Avl Wrapper Object.
+    - cases [List]: list of case objects of the first stage.
+    - updateCases [function]: receives the first stage results and returns the second stage cases.
+
+    ## Parameters (Optional):
+    - debug [bool]: export the AVL files for manual testing. Defaults to the environment variable DEBUG.
+    - exportDir [str]: folder of the exported files. Defaults to ./<geometry name>.
+
+    ## Returns:
+    - results [dict]: dict with results of the second stage.
+    """
+    session = avl.Session(geometry=geometry, cases=cases, pool=avl.default_pool(),
+                          cache=avl.default_cache())
+    secondCases = []
+
+    def _updateCases(firstResults):
+        secondCases.extend(updateCases(firstResults))
+        return secondCases
+
+    firstResults, results = session.run_staged(_updateCases)
+
+    # Export avl for manual testing
+    if _exportRunFiles(debug):
+        avl.Session(geometry=geometry, cases=secondCases).export_run_files(exportDir)
     return results
+
+
+async def avlRunAsync(geometry=None, cases=None, limiter=None, debug=None, exportDir=None):
+    """
+    # Description:
+        Asynchronous avlRun, AVL runs as an asyncio subprocess.
+
+    ## Parameters (Required):
+    - geometry [Object]: Avl Wrapper Object.
+    - cases [List]: list of case objects.
+
+    ## Parameters (Optional):
+    - limiter [asyncio.Semaphore]: limits the number of AVL processes.
+    - debug [bool], exportDir [str]: see avlRun.
+
+    ## Returns:
+    - results [dict]: dict with results.
+    """
+    session = avl.Session(geometry=geometry, cases=cases, cache=avl.default_cache())
+    results = await session.run_all_cases_async(limiter)
+
+    # Export avl for manual testing
+    if _exportRunFiles(debug):
+        session.export_run_files(exportDir)
+    return results
+
+
+async def avlRunStagedAsync(geometry=None, cases=None, updateCases=None, limiter=None, debug=None, exportDir=None):
+    """
+    # Description:
+        Asynchronous avlRunStaged, AVL runs as an asyncio subprocess.
+
+    ## Parameters (Required):
+    - geometry [Object]: Avl Wrapper Object.
+    - cases [List]: list of case objects of the first stage.
+    - updateCases [function]: receives the first stage results and returns the second stage cases.
+
+    ## Parameters (Optional):
+    - limiter [asyncio.Semaphore]: limits the number of AVL processes.
+    - debug [bool], exportDir [str]: see avlRun.
+
+    ## Returns:
+    - results [dict]: dict with results of the second stage.
+    """
+    session = avl.Session(geometry=geometry, cases=cases, cache=avl.default_cache())
+    secondCases = []
+
+    def _updateCases(firstResults):
+        secondCases.extend(updateCases(firstResults))
+        return secondCases
+
+    firstResults, results = await session.run_staged_async(_updateCases, limiter)
+
+    # Export avl for manual testing
+    if _exportRunFiles(debug):
+        avl.Session(geometry=geometry, cases=secondCases).export_run_files(exportDir)
+    return results
+
+
+def _exportRunFiles(debug):
+    if debug is None:
+        return 'y' in os.getenv('DEBUG', 'no').lower()
+    return debug
@@ -1,7 +1,32 @@
+import json
+
 import avl as avlW
 import numpy as np
 from MDO.auxTools import atmosphere
 
+# Outputs read from the results of each case, other outputs are not written by AVL
+# - Totals: control deflections of every case (MDO.Deflections), polar and trim
+# - StabilityDerivatives: neutral point (MDO.stability)
+# - StripForces: wing stall (MDO.stall)
+# - HingeMoments: MDO.checks.getHingeMoment
+TRIMMED_OUTPUTS = ("Totals", "StabilityDerivatives")
+MANEUVER_OUTPUTS = ("Totals",)
+POLAR_OUTPUTS = ("Totals", "StripForces")
+TAKE_OFF_OUTPUTS = ("Totals",)
+HINGE_MOMENT_OUTPUTS = ("Totals", "HingeMoments")
+NEUTRAL_POINT_OUTPUTS = ("StabilityDerivatives",)
+
+
+# Values of the cases that change with the design, the rest of the case file only depends
+# on the mission and is compiled once to an avl.CaseTemplate
+DESIGN_SLOTS = {
+    "cruise": ("trimmed.alpha", "trimmed.X_cg"),
+    "roll": ("rollRate.alpha",),
+    "dive": ("dive.alpha", "dive.roll_rate"),
+}
+
+_caseTemplates = {}
+
 
 def avlRunBuild(mission, aircraftInfo):
     """
@@ -13,54 +38,103 @@ def avlRunBuild(mission, aircraftInfo):
     - aircraftInfo [class object]: Info about the aircraft. Ex: aircraftInfo.mass.
 
     ## Returns:
-    - cases [list(dict)]: Cases to run on AVL.
+    - cases [list(avl.TemplateCase)]: Cases to run on AVL.
     """
+    return _caseTemplate(mission).cases(_designValues(mission, aircraftInfo))
+
+
+def avlRunBuildBatch(mission, aircraftInfoList):
+    """
+    # Description:
+        Build the cases of many designs with the same mission, the case file is compiled once
+        and filled with the values of every design.
+
+    ## Parameters (Required):
+    - mission [dict]: Conditions for AVL cases. Ex: mission["cruize"]["altitude"].
+    - aircraftInfoList [list(class object)]: Info about every aircraft.
+
+    ## Returns:
+    - casesList [list(list(avl.TemplateCase))]: Cases to run on AVL of every design.
+    """
+    template = _caseTemplate(mission)
+    designValues = [_designValues(mission, aircraftInfo) for aircraftInfo in aircraftInfoList]
+    if not template.slots:
+        return [template.cases() for _ in designValues]
+    return template.cases_batch({slot: [values[slot] for values in designValues]
+                                 for slot in template.slots})
+
+
+def _caseTemplate(mission):
+    key = json.dumps(mission, sort_keys=True, default=str)
+    if key not in _caseTemplates:
+        slots = [slot for missionName, missionSlots in DESIGN_SLOTS.items() if missionName in mission
+                 for slot in missionSlots]
+        _caseTemplates[key] = avlW.CaseTemplate(_buildCases(mission, dict.fromkeys(slots)), slots)
+    return _caseTemplates[key]
+
+
+def _designValues(mission, aircraftInfo):
     g = 9.81
     weight = aircraftInfo.weight.MTOW
     wingArea = aircraftInfo.wing.area
     meanChord = aircraftInfo.wing.meanChord
     # cLMax = aircraftInfo.cLMax
-    cases = []
+    values = {}
     if "cruise" in mission:
         T, p, rho, mi = atmosphere(mission["cruise"]["altitude"])
         vCruise = mission["cruise"]["vCruise"]
         aircraftInfo.cLCruise = 2 * weight / (rho * vCruise ** 2 * wingArea)
-        clParam = avlW.Parameter(name='alpha', setting='CL', value=aircraftInfo.cLCruise)
-        trimParam = avlW.Parameter(name='elevator', setting='Cm', value=0.0)
-        cases.append(avlW.Case(name='trimmed',
-                               alpha=clParam,
-                               elevator=trimParam,
-                               X_cg=aircraftInfo.cg.calc))
+        values["trimmed.alpha"] = aircraftInfo.cLCruise
+        values["trimmed.X_cg"] = aircraftInfo.cg.calc
 
     if "roll" in mission:
         # AVL good in: -0.10 < pb/2V < 0.10
         T, p, rho, mi = atmosphere(mission["roll"]["altitude"])
         vCruise = mission["roll"]["vCruise"]
-        cl = 2 * weight / (rho * vCruise ** 2 * wingArea)
-        clParam = avlW.Parameter(name='alpha', setting='CL', value=cl)
-        rParam = avlW.Parameter(name='roll_rate', setting='pb/2V', value=mission["roll"]["rollRate"])
-        trimParam = avlW.Parameter(name='aileron', setting='Cl', value=0.0)
-        cases.append(avlW.Case(name='rollRate',
-                               alpha=clParam,
-                               roll_rate=rParam,
-                               elevator=trimParam))
+        values["rollRate.alpha"] = 2 * weight / (rho * vCruise ** 2 * wingArea)
 
     if "dive" in mission:
         #AVL good in: -0.03 < qc/2V < 0.03
-        T, p, rho, mi = _atmosphere(mission["dive"]["altitude"])
+        T, p, rho, mi = atmosphere(mission["dive"]["altitude"])
         loadFactor = mission["dive"]["loadFactor"]
         cLDive = aircraftInfo.cLMax
         vDive = np.sqrt(2 * weight * (loadFactor + 1) / (rho * cLDive * wingArea))
         q = g*loadFactor/vDive
-        qc2v = q*meanChord/(2*vDive)
+        values["dive.alpha"] = cLDive
+        values["dive.roll_rate"] = q*meanChord/(2*vDive)
+    return values
 
-        clParam = avlW.Parameter(name='alpha', setting='CL', value=cLDive)
-        qParam = avlW.Parameter(name='pitch_rate', setting='qc/2V', value=qc2v)
+
+def _buildCases(mission, values):
+    cases = []
+    if "cruise" in mission:
+        clParam = avlW.Parameter(name='alpha', setting='CL', value=values["trimmed.alpha"])
+        trimParam = avlW.Parameter(name='elevator', setting='Cm', value=0.0)
+        cases.append(avlW.Case(name='trimmed',
+                               alpha=clParam,
+                               elevator=trimParam,
+                               X_cg=values["trimmed.X_cg"],
+                               outputs=TRIMMED_OUTPUTS))
+
+    if "roll" in mission:
+        clParam = avlW.Parameter(name='alpha', setting='CL', value=values["rollRate.alpha"])
+        rParam = avlW.Parameter(name='roll_rate', setting='pb/2V', value=mission["roll"]["rollRate"])
+        trimParam = avlW.Parameter(name='aileron', setting='Cl', value=0.0)
+        cases.append(avlW.Case(name='rollRate',
+                               alpha=clParam,
+                               roll_rate=rParam,
+                               elevator=trimParam,
+                               outputs=MANEUVER_OUTPUTS))
+
+    if "dive" in mission:
+        clParam = avlW.Parameter(name='alpha', setting='CL', value=values["dive.alpha"])
+        qParam = avlW.Parameter(name='pitch_rate', setting='qc/2V', value=values["dive.roll_rate"])
         trimParam = avlW.Parameter(name='elevator', setting='Cm', value=0.0)
         cases.append(avlW.Case(name='dive',
                                alpha=clParam,
                                roll_rate=qParam,
-                               elevator=trimParam))
+                               elevator=trimParam,
+                               outputs=MANEUVER_OUTPUTS))
 
     if "polar" in mission:
         for i, cL in enumerate(mission["polar"]["cLPoints"]):
@@ -68,14 +142,16 @@ def avlRunBuild(mission, aircraftInfo):
             trimParam = avlW.Parameter(name='elevator', setting='Cm', value=0.0)
             cases.append(avlW.Case(name="PolarTrimmed_" + str(i),
                                    alpha=clParam,
-                                   elevator=trimParam))
+                                   elevator=trimParam,
+                                   outputs=POLAR_OUTPUTS))
 
     if "untrimmed_polar" in mission:
         for i, cL in enumerate(mission["untrimmed_polar"]["cLPoints"]):
             clParam = avlW.Parameter(name='alpha', setting='CL', value=cL)
             # trimParam = avl.Parameter(name='elevator', setting='Cm', value=0.0)
             cases.append(avlW.Case(name="PolarUntrimmed_" + str(i),
-                                   alpha=clParam))
+                                   alpha=clParam,
+                                   outputs=POLAR_OUTPUTS))
 
     if "takeOffRun" in mission:
         alphaParam = avlW.Parameter(name='alpha', setting='alpha', value=mission['takeOffRun']['alpha'])
@@ -87,7 +163,8 @@ def avlRunBuild(mission, aircraftInfo):
         cases.append(avlW.Case(name="TakeOffRun",
                                alpha=alphaParam,
                                flap=flapParam,
-                               aileorn=aileronParam))
+                               aileorn=aileronParam,
+                               outputs=TAKE_OFF_OUTPUTS))
     if "hingeMoment" in mission:
         alphaParam = avlW.Parameter(name='alpha', setting='alpha', value=mission['hingeMoment']['alpha'])
         flapParam = avlW.Parameter(name='flap', setting='flap', value=mission['hingeMoment']['flap'])
@@ -97,7 +174,8 @@ def avlRunBuild(mission, aircraftInfo):
                                alpha=alphaParam,
                                flap=flapParam,
                                aileorn=aileronParam,
-                               elevator=elevatorParam))
+                               elevator=elevatorParam,
+                               outputs=HINGE_MOMENT_OUTPUTS))
 
     if "neutralPoint" in mission:
 
@@ -106,7 +184,8 @@ def avlRunBuild(mission, aircraftInfo):
             clParam = avlW.Parameter(name='alpha', setting='alpha', value=alpha)
             # trimParam = avl.Parameter(name='elevator', setting='Cm', value=0.0)
             cases.append(avlW.Case(name="NeutralPoint_" + str(i),
-                                   alpha=clParam))
+                                   alpha=clParam,
+                                   outputs=NEUTRAL_POINT_OUTPUTS))
 
         # Method of vCruise 80 and 120
         # for i, vCruise in enumerate(mission["neutralPoint"]["vCruise"]):
@@ -0,0 +1,119 @@
+from functools import lru_cache
+
+import numpy as np
+
+
+class SurfaceProperties:
+    """
+    # Description:
+        Planform values of a surface (wing, horizontal or vertical), immutable. Instances are
+        shared, get them from surfaceProperties.
+
+    ## Atributes:
+    - area [float]: full surface area.
+    - meanChord [float]: mean aerodynamic chord.
+    - span [float]: full surface span.
+    - sweep [float]: 1/4 chord sweep, see infoSurface.
+    - tipX [float]: x of the tip leading edge, see infoSurface.
+    - xMeanChord, yMeanChord [float]: position of the mean aerodynamic chord from the root LE.
+    - taperRatio [float]: tip/root chord.
+    - aspectRatio [float]: span**2/area.
+    - rootX [float]: x of the root leading edge.
+    """
+    __slots__ = ("area", "meanChord", "span", "sweep", "tipX", "xMeanChord", "yMeanChord",
+                 "taperRatio", "aspectRatio", "rootX")
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+
+    def __setattr__(self, key, value):
+        raise AttributeError("SurfaceProperties is immutable")
+
+    def __delattr__(self, key):
+        raise AttributeError("SurfaceProperties is immutable")
+
+    def __reduce__(self):
+        return _fromValues, ({name: getattr(self, name) for name in self.__slots__},)
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)}" for name in self.__slots__)
+        return f"SurfaceProperties({values})"
+
+
+def _fromValues(values):
+    return SurfaceProperties(**values)
+
+
+def surfaceProperties(surfaceDict):
+    """
+    # Description:
+        Planform values of a surface, computed once for every set of sections. Any number of
+        sections is accepted, the first one is the root.
+
+    ## Parameters (Required):
+    - surfaceDict [dict]: surface in stateVariables. Ex: stateVariables['wing'].
+
+    ## Returns:
+    - properties [SurfaceProperties]: shared planform values.
+    """
+    sections = list(surfaceDict.values())
+    return _surfaceProperties(tuple(float(section['chord']) for section in sections),
+                              tuple(float(section['b']) for section in sections[1:]),
+                              tuple(float(section['sweepLE']) for section in sections[1:]),
+                              float(sections[0].get('x', 0.0)))
+
+
+@lru_cache(maxsize=1024)
+def _surfaceProperties(chords, spans, sweeps, rootX):
+    info = infoSurfaceBatch(np.array([chords]), np.array([spans]), np.array([sweeps]))
+    values = {name: float(value[0]) for name, value in info.items()}
+    values["taperRatio"] = chords[-1] / chords[0]
+    values["aspectRatio"] = values["span"] ** 2 / values["area"]
+    values["rootX"] = rootX
+    return SurfaceProperties(**values)
+
+
+def infoSurfaceBatch(chords, spans, sweeps):
+    """
+    # Description:
+        infoSurface and xyMeanChord of many surfaces at once.
+
+    ## Parameters (Required):
+    - chords [array]: (nDesigns, nSections) section chords from root to tip.
+    - spans [array]: (nDesigns, nSections - 1) span of every panel.
+    - sweeps [array]: (nDesigns, nSections - 1) leading edge sweep of every panel [rad].
+
+    ## Returns:
+    - info [dict]: area, meanChord, span and sweep of the full surface, tipX, xMeanChord and
+    yMeanChord of the half surface.
+    """
+    chordRoot = chords[:, :-1]
+    chordTip = chords[:, 1:]
+    rows = np.arange(chords.shape[0])
+
+    secArea = spans * (chordRoot + chordTip) / 2
+    taperRatio = chordTip / chordRoot
+    secMAC = 2 / 3 * chordRoot * (1 + taperRatio + taperRatio ** 2) / (1 + taperRatio)
+    surfaceArea = secArea.sum(axis=1)
+    surfaceSpan = spans.sum(axis=1)
+    surfaceTipX = (sweeps * spans).sum(axis=1)
+
+    # Mean chord position, the panel containing the mean chord is found for every design
+    spanStart = np.cumsum(spans, axis=1) - spans
+    d = spans / 3 * (chordRoot + 2 * chordTip) / (chordRoot + chordTip) + spanStart
+    yMeanChord = (d * secArea).sum(axis=1) / surfaceArea
+    xStart = np.cumsum(spans * np.tan(sweeps), axis=1) - spans * np.tan(sweeps)
+    inPanel = (spanStart <= yMeanChord[:, np.newaxis]) & (yMeanChord[:, np.newaxis] < spanStart + spans)
+    panel = np.argmax(inPanel, axis=1)
+    xMeanChord = xStart[rows, panel] + (yMeanChord - spanStart[rows, panel]) * np.tan(sweeps[rows, panel])
+
+    return {
+        "area": 2 * surfaceArea,
+        "meanChord": (secArea * secMAC).sum(axis=1) / surfaceArea,
+        "span": 2 * surfaceSpan,
+        "sweep": (surfaceTipX + (chords[:, -1] - chords[:, 0]) * 1 / 4) / surfaceSpan,
+        "tipX": surfaceTipX,
+        "xMeanChord": xMeanChord,
+        "yMeanChord": yMeanChord,
+    }
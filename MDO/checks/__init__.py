@@ -1,6 +1,6 @@
 from .deflections import Deflections
 from .hingeMoment import getHingeMoment
-from .flightEnvelope import flightEnvelop, plotDragThrust
+from .flightEnvelope import flightEnvelop, flightEnvelopBatch, flightEnvelopeGrid, envelopeParameters, plotDragThrust
 from .cgPositionable import cgPositionable
 from .checkOutputValues import checkOutputValues
 
@@ -3,63 +3,178 @@ import numpy as np
 import matplotlib.pyplot as plt
 
 
-def flightEnvelop(aircraftInfo, maxheight=4*10**3):
-    mtow = aircraftInfo.weight.MTOW
-    wingArea = aircraftInfo.wing.area
-    cD0 = aircraftInfo.cD0
-    cD1 = aircraftInfo.cD1
-    cD2 = aircraftInfo.k
-    t0 = aircraftInfo.thrust.v0
-    t1 = aircraftInfo.thrust.v1
-    t2 = aircraftInfo.thrust.v2
-    cLMax = aircraftInfo.cLMax
-    slopeAltitude = aircraftInfo.engineInfo["altitudeCorrection"]['slope']
-
-    ceilingHeight = 0
-    vMin = []
+# Minimum rate of climb of the service ceiling [m/s], UAV Gundlach page 358
+CEILING_RATE_OF_CLIMB = 100*0.00508
+
+# Values of a design used by the envelope, see envelopeParameters
+ENVELOPE_PARAMETERS = ("mtow", "wingArea", "cD0", "cD1", "cD2", "t0", "t1", "t2", "cLMax", "slopeAltitude")
+
+
+def flightEnvelop(aircraftInfo, maxheight=4*10**3, nHeights=150, nVelocities=100, velocityRange=(10, 50),
+                  ceilingTolerance=1.0):
+    """
+    # Description:
+        Flight envelope of the aircraft, see flightEnvelopeGrid.
+
+    ## Parameters (Optional):
+    - maxheight [float]: top of the envelope [m].
+    - nHeights, nVelocities [int]: resolution of the height x velocity grid.
+    - velocityRange [tuple]: lowest and highest velocity of the grid [m/s].
+    - ceilingTolerance [float]: height tolerance of the service ceiling [m].
+
+    ## Returns:
+    - envelope [Envelope]
+    """
+    return flightEnvelopBatch([aircraftInfo], maxheight=maxheight, nHeights=nHeights, nVelocities=nVelocities,
+                              velocityRange=velocityRange, ceilingTolerance=ceilingTolerance)[0]
+
+
+def flightEnvelopBatch(aircraftInfoList, maxheight=4*10**3, nHeights=150, nVelocities=100, velocityRange=(10, 50),
+                       ceilingTolerance=1.0):
+    """
+    # Description:
+        Flight envelopes of many aircraft, computed together. Parameters as in flightEnvelop.
+
+    ## Returns:
+    - envelopes [list(Envelope)]: envelope of every aircraft, in order.
+    """
+    parameters = envelopeParameters(aircraftInfoList)
+    heights = np.linspace(1, maxheight, nHeights)
+    velocities = np.linspace(velocityRange[0], velocityRange[1], nVelocities)
+    grid = flightEnvelopeGrid(parameters, heights, velocities, ceilingTolerance=ceilingTolerance)
+
+    envelopes = []
+    for i in range(len(aircraftInfoList)):
+        hasMin = ~np.isnan(grid["vMinEngine"][i])
+        hasMax = ~np.isnan(grid["vMaxEngine"][i])
+        envelopes.append(Envelope(heights, grid["ceiling"][i], grid["vStall"][i], grid["vMaxStruct"][i],
+                                  list(zip(heights[hasMin], grid["vMinEngine"][i][hasMin])),
+                                  list(zip(heights[hasMax], grid["vMaxEngine"][i][hasMax]))))
+    return envelopes
+
+
+def envelopeParameters(aircraftInfoList):
+    """
+    # Description:
+        Values of ENVELOPE_PARAMETERS of many aircraft, input of flightEnvelopeGrid.
+
+    ## Returns:
+    - parameters [dict]: name: array with one value per aircraft.
+    """
+    values = [(aircraftInfo.weight.MTOW, aircraftInfo.wing.area, aircraftInfo.cD0, aircraftInfo.cD1,
+               aircraftInfo.k, aircraftInfo.thrust.v0, aircraftInfo.thrust.v1, aircraftInfo.thrust.v2,
+               aircraftInfo.cLMax, aircraftInfo.engineInfo["altitudeCorrection"]['slope'])
+              for aircraftInfo in aircraftInfoList]
+    return dict(zip(ENVELOPE_PARAMETERS, np.array(values, dtype=float).T))
+
+
+def flightEnvelopeGrid(parameters, heights, velocities, ceilingTolerance=1.0):
+    """
+    # Description:
+        Flight envelope of many designs on a height x velocity grid, evaluated at once. The engine
+        limits are the thrust = drag crossings of every height, interpolated between the grid
+        velocities. The service ceiling is found by bisection on the maximum rate of climb.
+
+    ## Parameters (Required):
+    - parameters [dict]: ENVELOPE_PARAMETERS, floats or arrays of shape (nDesigns,).
+    - heights [array]: grid heights [m], increasing.
+    - velocities [array]: grid velocities [m/s], increasing.
+
+    ## Parameters (Optional):
+    - ceilingTolerance [float]: height tolerance of the service ceiling [m].
+
+    ## Returns:
+    - envelope [dict]: arrays of shape (nDesigns, nHeights) with "vStall", "vMaxStruct",
+    "vMinEngine" and "vMaxEngine" (nan where thrust is always below drag) and "ceiling" of shape
+    (nDesigns,), the highest height with CEILING_RATE_OF_CLIMB or 0.
+    """
+    design = {name: np.atleast_1d(np.asarray(parameters[name], dtype=float))[:, np.newaxis]
+              for name in ENVELOPE_PARAMETERS}
+    heights = np.asarray(heights, dtype=float)
+    velocities = np.asarray(velocities, dtype=float)
+
+    T, p, rho, mi = atmosphere(heights)
 
     nLoad = 2.5
     rho0 = 1.2
-    vSeaStruct = np.sqrt(2*nLoad*mtow/(cLMax*wingArea*rho0))
-    vMaxStruct = []
-    vMinEngine = []
-    vMaxEngine = []
-
-    heights = np.linspace(1, maxheight, 150)
-    velocities = np.linspace(10, 50, 100)
-    for height in heights:
+    vSeaStruct = np.sqrt(2*nLoad*design["mtow"]/(design["cLMax"]*design["wingArea"]*rho0))
+    vStall = np.sqrt(2*design["mtow"]/(design["cLMax"]*design["wingArea"]*rho))
+    vMaxStruct = vSeaStruct*np.sqrt(rho0/rho)
+
+    # Engine limits, axes (design, height, velocity)
+    designGrid = {name: value[:, np.newaxis] for name, value in design.items()}
+    excess = _excessThrust(designGrid, heights[:, np.newaxis], rho[:, np.newaxis], velocities)
+    vMinEngine, vMaxEngine = _thrustDragCrossings(excess, velocities)
+
+    return {
+        "vStall": np.broadcast_to(vStall, vMinEngine.shape),
+        "vMaxStruct": np.broadcast_to(vMaxStruct, vMinEngine.shape),
+        "vMinEngine": vMinEngine,
+        "vMaxEngine": vMaxEngine,
+        "ceiling": _serviceCeiling(design, heights[0], heights[-1], velocities, ceilingTolerance),
+    }
+
+
+def _excessThrust(design, height, rho, velocity):
+    # thrust - drag, the values are broadcast together
+    cL = 2*design["mtow"]/(velocity**2*design["wingArea"]*rho)
+    cD = design["cD0"] + design["cD1"]*cL + design["cD2"]*cL**2
+    drag = 1/2*rho*velocity**2*design["wingArea"]*cD
+    thrust = (design["t0"] + design["t1"]*velocity + design["t2"]*velocity**2) \
+        * (1 + design["slopeAltitude"]*height)
+    return thrust - drag
+
+
+def _thrustDragCrossings(excess, velocities):
+    # first velocity with thrust > drag, then the first velocity after it with drag > thrust
+    positive = excess > 0
+    iMin = np.argmax(positive, axis=-1)[..., np.newaxis]
+    hasMin = positive.any(axis=-1)
+
+    index = np.arange(len(velocities))
+    negative = (excess < 0) & (index > iMin)
+    iMax = np.argmax(negative, axis=-1)[..., np.newaxis]
+    hasMax = negative.any(axis=-1) & hasMin
+
+    vMinEngine = _interpolateCrossing(excess, velocities, iMin)
+    vMaxEngine = _interpolateCrossing(excess, velocities, iMax)
+    return np.where(hasMin, vMinEngine, np.nan), np.where(hasMax, vMaxEngine, np.nan)
+
+
+def _interpolateCrossing(excess, velocities, index):
+    # zero of excess between index - 1 and index, the first grid velocity when index is 0
+    before = np.maximum(index - 1, 0)
+    excessBefore = np.take_along_axis(excess, before, axis=-1)[..., 0]
+    excessAfter = np.take_along_axis(excess, index, axis=-1)[..., 0]
+    vBefore = velocities[before[..., 0]]
+    vAfter = velocities[index[..., 0]]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.where(index[..., 0] > 0, excessBefore/(excessBefore - excessAfter), 1.0)
+    return vBefore + (vAfter - vBefore)*fraction
+
+
+def _serviceCeiling(design, heightLow, heightHigh, velocities, tolerance):
+    # bisection on the maximum rate of climb over the velocity grid, it decreases with height
+    def climbMargin(height):
         T, p, rho, mi = atmosphere(height)
-        gotVmin = False
-        gotVmax = False
-        gotCeiling = False
-        efficiencyAltitude = 1 + slopeAltitude * height
-
-        for velocity in velocities:
-            cL = 2*mtow/(velocity**2*wingArea*rho)
-            cD = cD0 + cD1*cL + cD2*cL**2
-            drag = 1/2*rho*velocity**2*wingArea*cD
-            thrust = (t0 + t1*velocity + t2*velocity**2)*efficiencyAltitude
-            rateOffClimb = (thrust - drag)/mtow * velocity
-
-            if drag < thrust and not gotVmin:
-                vMinEngine.append((height, velocity))
-                gotVmin = True
-
-            if drag > thrust and gotVmin and not gotVmax:
-                vMaxEngine.append((height, velocity))
-                gotVmax = True
-
-            if rateOffClimb > 100*0.00508:  # UAV Gundlach page 358
-                ceilingHeight = height
-                gotCeiling = True
-
-            if gotCeiling and gotVmin and gotVmax:
-                break
-
-        vMin.append(np.sqrt(2*mtow/(cLMax*wingArea*rho)))
-        vMaxStruct.append(vSeaStruct*np.sqrt(rho0/rho))
-
-    return Envelope(heights, ceilingHeight, vMin, vMaxStruct, vMinEngine, vMaxEngine)
+        excess = _excessThrust(design, height[:, np.newaxis], rho[:, np.newaxis], velocities)
+        rateOfClimb = excess/design["mtow"]*velocities
+        return rateOfClimb.max(axis=-1) - CEILING_RATE_OF_CLIMB
+
+    nDesigns = design["mtow"].shape[0]
+    low = np.full(nDesigns, float(heightLow))
+    high = np.full(nDesigns, float(heightHigh))
+    climbsLow = climbMargin(low) > 0
+    climbsHigh = climbMargin(high) > 0
+
+    nIterations = max(int(np.ceil(np.log2(max(heightHigh - heightLow, tolerance)/tolerance))), 0)
+    for _ in range(nIterations):
+        middle = (low + high)/2
+        climbs = climbMargin(middle) > 0
+        low = np.where(climbs, middle, low)
+        high = np.where(climbs, high, middle)
+
+    return np.where(climbsHigh, heightHigh, np.where(climbsLow, low, 0.0))
 
 
 def plotDragThrust(aircraftInfo, height=1500):
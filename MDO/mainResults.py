@@ -1,16 +1,14 @@
-import os
-from configparser import ConfigParser
 import MDO
 import matplotlib.pyplot as plt
 import math
 
-config = ConfigParser()
-config.read(os.path.join("outputsConfig.cfg"))
-
 
 def mainResults(results=None, aircraftInfo=None, avlCases=None, missionProfile=None, logger=None):
-    PRINT = os.getenv('PRINT').lower() == 'yes'
-    PLOT = os.getenv('PLOT').lower() == 'yes'
+    # Settings of this evaluation, see MDO.Settings
+    settings = aircraftInfo.settings
+    output = settings.output
+    PRINT = settings.print
+    PLOT = settings.plot
 
     output_dict = {}
 
@@ -18,7 +16,7 @@ def mainResults(results=None, aircraftInfo=None, avlCases=None, missionProfile=N
         print("------------------------------")
 
     # ---- Neutral Point ------------------------------------------
-    if 'y' in config['output']['NEUTRAL_POINT'].lower():
+    if output['NEUTRAL_POINT']:
         MDO.stability.getNeutralPoint(results, aircraftInfo)
         if PRINT:
             print("Neutral Point: ", round(aircraftInfo.xNeutralPoint, 4))
@@ -28,7 +26,7 @@ def mainResults(results=None, aircraftInfo=None, avlCases=None, missionProfile=N
         output_dict['static_margin'] = aircraftInfo.staticMargin
 
     # ---- Deflections Check --------------------------------------
-    if 'y' in config['output']['DEFLECTIONS'].lower():
+    if output['DEFLECTIONS']:
         deflections = MDO.Deflections(results, aircraftInfo.controlVariables)
         if PRINT:
             print("Deflections:", deflections.cruise)
@@ -39,7 +37,7 @@ def mainResults(results=None, aircraftInfo=None, avlCases=None, missionProfile=N
         output_dict['deflection_cruise_flap'] = deflections.cruise['flap']
 
     # ---- Polar --------------------------------------------------
-    if 'y' in config['output']['POLAR'].lower():
+    if output['POLAR']:
         [aircraftInfo.cD0, aircraftInfo.cD1, aircraftInfo.k, aircraftInfo.dataPolar] = MDO.polar(results, aircraftInfo)
         if PRINT:
             print("Polar:", round(aircraftInfo.cD0, 4), round(aircraftInfo.cD1, 4), round(aircraftInfo.k, 4))
@@ -51,8 +49,8 @@ def mainResults(results=None, aircraftInfo=None, avlCases=None, missionProfile=N
         output_dict['cd2'] = aircraftInfo.k
 
     # ---- Stall --------------------------------------------------
-    if 'y' in config['output']['STALL'].lower() \
-            or 'y' in config['output']['TAKEOFF'].lower():  # TODO: Improve Clmax for takeOff
+    if output['STALL'] \
+            or output['TAKEOFF']:  # TODO: Improve Clmax for takeOff
         MDO.stall(results, aircraftInfo)
         if PRINT:
             print("Wing Stall: ", round(aircraftInfo.alphaStallWing, 1), "deg at ",
@@ -66,21 +64,21 @@ def mainResults(results=None, aircraftInfo=None, avlCases=None, missionProfile=N
         output_dict['stallPositionWing'] = 2 * aircraftInfo.stallPositionWing / aircraftInfo.wing.span * 100
 
     # ---- Range (Raymer)------------------------------------------
-    if 'y' in config['output']['RANGE'].lower():
+    if output['RANGE']:
         rangeCruise = MDO.rangeCruise(aircraftInfo.engineInfo['engineFC'], avlCases, aircraftInfo)
         if PRINT:
             print(f"Range Brequet: {round(rangeCruise, 1)}")
 
     # ---- Thrust ---------------------------------
-    if 'y' in config['output']['THRUST'].lower() \
-            or 'y' in config['output']['TAKEOFF'].lower():
+    if output['THRUST'] \
+            or output['TAKEOFF']:
         [aircraftInfo.thrust.v0, aircraftInfo.thrust.v1, aircraftInfo.thrust.v2] = MDO.performance.dynamicThrustCurve(
             aircraftInfo.engineInfo, method="actuatorDisk")
         if PRINT:
             print(f"Thrust: {round(aircraftInfo.thrust.v0, 2)}, {round(aircraftInfo.thrust.v1, 2)}, {round(aircraftInfo.thrust.v2, 2)}")
 
     # ---- Take Off ---------------------------------
-    if 'y' in config['output']['TAKEOFF'].lower():
+    if output['TAKEOFF']:
         if "takeOffRun" in avlCases:
             [aircraftInfo.cDRunAvl, cDParasite, aircraftInfo.cDRun, aircraftInfo.cLRun] = MDO.getRun(results,
                                                                                                      aircraftInfo)
@@ -113,7 +111,7 @@ def mainResults(results=None, aircraftInfo=None, avlCases=None, missionProfile=N
             output_dict['alphaRun'] = aircraftInfo.alphaRun
 
     # ---- Descent ---------------------------------
-    if 'y' in config['output']['DESCENT']:
+    if output['DESCENT']:
         MDO.descentFuel(aircraftInfo=aircraftInfo,
                         heightInitial=missionProfile['cruise']['altitude'],
                         heightFinal=missionProfile['descent']['endAltitude'],
@@ -129,7 +127,7 @@ def mainResults(results=None, aircraftInfo=None, avlCases=None, missionProfile=N
         output_dict['descentTime'] = aircraftInfo.performance.descent.time
 
     # ---- Climb ---------------------------------
-    if 'y' in config['output']['CLIMB'].lower():
+    if output['CLIMB']:
         MDO.climbFuel(aircraftInfo=aircraftInfo,
                       heightInitial=missionProfile['climb']['initialAltitude'],
                       heightFinal=missionProfile['climb']['endAltitude'],
@@ -144,7 +142,7 @@ def mainResults(results=None, aircraftInfo=None, avlCases=None, missionProfile=N
         output_dict['timeClimb'] = aircraftInfo.performance.climb.time
 
     # ---- Cruise ---------------------------------
-    if 'y' in config['output']['CRUISE'].lower():
+    if output['CRUISE']:
         fuelKg = (aircraftInfo.weight.fuel - aircraftInfo.weight.fuelTakeOff - aircraftInfo.weight.fuelClimb) / 9.8
         fuelDescentKg = (aircraftInfo.weight.fuelReserve + aircraftInfo.weight.fuelDescent) / 9.8
 
@@ -166,7 +164,7 @@ def mainResults(results=None, aircraftInfo=None, avlCases=None, missionProfile=N
     # TODO: lift distribution
 
     # ---- Hinge Moment ---------------------------
-    if 'y' in config['output']['TOTAL_HINGE_MOMENT'].lower():
+    if output['TOTAL_HINGE_MOMENT']:
         momentPerPressure = MDO.getHingeMoment(results, aircraftInfo)
         velocity = 20
         rho = 1.2
@@ -176,15 +174,19 @@ def mainResults(results=None, aircraftInfo=None, avlCases=None, missionProfile=N
             print(f"[Aileron, Flap, Elevator moments] {momentKgCm} Kg.cm")
 
     # ---- Flight Envelope ---------------------------
-    if 'y' in config['output']['FLIGHT_ENVELOPE'].lower():
+    if output['FLIGHT_ENVELOPE']:
+        envelope = MDO.flightEnvelop(aircraftInfo)
+        if PRINT:
+            print(f"Service Ceiling: {round(float(envelope.ceiling), 1)} m")
         if PLOT:
-            envelope = MDO.flightEnvelop(aircraftInfo)
             envelope.plot()
 
+        output_dict['ceiling'] = float(envelope.ceiling)
+
     # ---- Plot Mission Profile ---------------------------
-    if 'y' in config['output']['CRUISE'].lower() and \
-            'y' in config['output']['CLIMB'].lower() and \
-            'y' in config['output']['DESCENT'].lower():
+    if output['CRUISE'] and \
+            output['CLIMB'] and \
+            output['DESCENT']:
 
         rangeClimb = aircraftInfo.performance.climb.range
         rangeCruise = aircraftInfo.performance.cruise.range
@@ -207,7 +209,7 @@ def mainResults(results=None, aircraftInfo=None, avlCases=None, missionProfile=N
         output_dict['range_all'] = rangeAll / 1000
 
     # ---- Check CG Positionable ---------------------------
-    if 'y' in config['output']['CG_POSITIONABLE'].lower():
+    if output['CG_POSITIONABLE']:
         cgPositionable, allElseCgPercentFuselage= MDO.cgPositionable(aircraftInfo)
 
         if PRINT:
@@ -223,4 +225,7 @@ def mainResults(results=None, aircraftInfo=None, avlCases=None, missionProfile=N
     if PRINT:
         print("------------------------------")
 
+    if aircraftInfo.lowMemory:
+        aircraftInfo.dropRawTables()
+
     return output_dict
@@ -1,5 +1,5 @@
 from .dynamicThrust import dynamicThrust, plotDynamicThrust, dynamicThrustCurve
-from .takeOff import takeOffRoll
+from .takeOff import takeOffRoll, takeOffRun, takeOffRunIntegrated, takeOffParameters
 from .range import rangeCruise
 from .climb import climbFuel
 from .cruise import cruise
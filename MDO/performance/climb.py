@@ -2,7 +2,6 @@ from MDO.auxTools import atmosphere
 import numpy as np
 import scipy
 
-import sys
 import matplotlib.pyplot as plt
 
 
@@ -28,10 +27,13 @@ def climbFuel(aircraftInfo=None, heightInitial=0, heightFinal=1500, rateOfClimb=
 
     xDist = 0
     totalFuelKg = 0.0  # Weird: I declare as float but it becomes a np.array
+    # Atmosphere of every segment in one call
+    heightsSegment = (heights[:-1] + heights[1:]) / 2
+    T, p, rhos, mi = atmosphere(heightsSegment)
     for i in range(len(heights) - 1):
         weight = weightTakeOff - totalFuelKg * 9.8
-        height = (heights[i] + heights[i + 1]) / 2
-        T, p, rho, mi = atmosphere(height)
+        height = heightsSegment[i]
+        rho = rhos[i]
         velocityClimb = analytical_velocity(wingArea=wingArea, weight=weight, rho=rho, height=height,
                                             cD0=cD0, cD2=cD2, rateOfClimb=rateOfClimb)
         thrustMax = (t0 + t1 * velocityClimb + t2 * velocityClimb ** 2) * (1 + heightSlope * height)
@@ -106,10 +108,13 @@ def climbFuel_iterative(aircraftInfo=None, heightInitial=0, heightFinal=1500, ra
     velocityClimb = 30
     xDist = 0
     totalFuelKg = 0.0  # Weird: I declare as float but it becomes a np.array
+    # Atmosphere of every segment in one call
+    heightsSegment = (heights[:-1] + heights[1:]) / 2
+    T, p, rhos, mi = atmosphere(heightsSegment)
     for i in range(len(heights) - 1):
         weight = weightTakeOff - totalFuelKg * 9.8
-        height = (heights[i] + heights[i + 1]) / 2
-        T, p, rho, mi = atmosphere(height)
+        height = heightsSegment[i]
+        rho = rhos[i]
         r = scipy.optimize.minimize(funThrottleRequired,
                                     velocityClimb,
                                     constraints=cons,
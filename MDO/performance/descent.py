@@ -2,8 +2,23 @@ import numpy as np
 from MDO.auxTools import atmosphere
 import scipy
 
+# Throttle of the engine at idle, limits the descent rate
+IDLE_THROTTLE = 0.1
+MAX_DESCENT_VELOCITY = 90
+
 
 def descentFuel(aircraftInfo=None, heightInitial=1500, heightFinal=0, rateOfDescent=1, nSteps=20, logger=None):
+    """
+    # Description:
+        Fuel, time and range of the descent. The speed of every segment minimizes the throttle,
+        it is found for all segments at once by descentVelocity. The fuel matches the former
+        SLSQP loop, the range can differ from it by about 1% where SLSQP stopped early.
+
+    ## Parameters (Optional):
+    - heightInitial, heightFinal [float]: descent heights [m].
+    - rateOfDescent [float]: [m/s].
+    - nSteps [int]: number of heights, nSteps - 1 segments.
+    """
     wingArea = aircraftInfo.wing.area
     weightLand = aircraftInfo.weight.empty + aircraftInfo.weight.fuelReserve
     v0 = aircraftInfo.thrust.v0
@@ -13,24 +28,142 @@ def descentFuel(aircraftInfo=None, heightInitial=1500, heightFinal=0, rateOfDesc
     cD0 = aircraftInfo.cD0
     cD1 = aircraftInfo.cD1
     cD2 = aircraftInfo.k
+    fuelFlowMax = aircraftInfo.engine.consumptionMaxLperH*aircraftInfo.engine.fuelDensity/3600
 
     heights = np.linspace(heightFinal, heightInitial, nSteps)
 
+    # Atmosphere of every segment in one call
+    heightsSegment = (heights[:-1] + heights[1:]) / 2
+    T, p, rhos, mi = atmosphere(heightsSegment)
+    times = (heights[1:] - heights[:-1])/rateOfDescent
+
+    # The segments are integrated from the ground up, the weight of a segment has the fuel of the
+    # segments below it. The fuel is small, a few passes over all segments converge the weights.
+    weights = np.full(len(heightsSegment), float(weightLand))
+    for _ in range(10):
+        velocities, throttles = descentVelocity(rhos, weights, wingArea, cD0, cD1, cD2, v0, v1, v2,
+                                                1 + heightSlope*heightsSegment, rateOfDescent, logger=logger)
+        fuelKg = fuelFlowMax*throttles*times
+        weightsNew = weightLand + np.concatenate([[0.0], np.cumsum(fuelKg)[:-1]])*9.8
+        converged = np.allclose(weightsNew, weights, rtol=1e-13, atol=0)
+        weights = weightsNew
+        if converged:
+            break
+
+    aircraftInfo.weight.fuelDescent = float(np.sum(fuelKg))*9.8
+    aircraftInfo.performance.descent.time = (heightInitial - heightFinal) / rateOfDescent
+    aircraftInfo.performance.descent.range = float(np.sum(velocities*times))
+
+    return
+
+
+def descentVelocity(rho, weight, wingArea, cD0, cD1, cD2, t0, t1, t2, thrustFactor, rateOfDescent, logger=None,
+                    velocityDescent=15):
+    """
+    # Description:
+        Speed of minimum throttle of descent segments, throttle = (D - rateOfDescent*W/V)/Tmax,
+        with the descent rate reached at idle and V <= MAX_DESCENT_VELOCITY. The optimum is a
+        root of the stationary condition (a polynomial of degree 6), a root of the idle
+        constraint (degree 4) or the speed limit. The roots of all segments are found at once
+        from batched companion matrices. SLSQP is used only for segments without a real
+        candidate.
+        When the throttle is at idle it is the same at the slow and the fast root of the idle
+        constraint; the root SLSQP reaches from velocityDescent is taken, the one where the
+        throttle slopes as at velocityDescent.
+        The throttle is never above the SLSQP one, SLSQP can stop short of the optimum, so the
+        speed and the descent range can differ from it by about 1% where it does.
+
+    ## Parameters (Required):
+    - rho, weight, thrustFactor [array]: density, weight and thrust altitude correction of every segment.
+    - t0, t1, t2 [float]: thrust curve Tmax = (t0 + t1*V + t2*V**2)*thrustFactor.
+
+    ## Parameters (Optional):
+    - velocityDescent [float]: initial speed of SLSQP, picks the root at idle [m/s].
+
+    ## Returns:
+    - velocities [array]: descent speed of every segment [m/s].
+    - throttles [array]: throttle of every segment.
+    """
+    rho, weight, thrustFactor = np.broadcast_arrays(*(np.atleast_1d(np.asarray(value, dtype=float))
+                                                      for value in (rho, weight, thrustFactor)))
+    nSegments = len(rho)
+    ones = np.ones(nSegments)
+
+    # numerator*V**2 = a*V**4 + b*V**2 - s*W*V + c, thrust T = t0 + t1*V + t2*V**2 (lowest order first)
+    a = rho*wingArea*cD0/2
+    b = cD1*weight
+    c = 2*cD2*weight**2/(rho*wingArea)
+    sW = rateOfDescent*weight
+    thrust = np.stack([t0*ones, t1*ones, t2*ones], axis=1)
+
+    # d(throttle)/dV = 0: (2aV**4 + sWV - 2c)*T - (aV**5 + bV**3 + cV - sWV**2)*T' = 0
+    numeratorDerivative = np.stack([-2*c, sW, 0*ones, 0*ones, 2*a], axis=1)
+    numerator = np.stack([0*ones, c, -sW, b, 0*ones, a], axis=1)
+    thrustDerivative = np.stack([t1*ones, 2*t2*ones], axis=1)
+    stationary = _polyMul(numeratorDerivative, thrust)
+    stationary -= _polyMul(numerator, thrustDerivative)
+
+    # throttle = IDLE_THROTTLE, bound of the descent rate constraint
+    idle = np.stack([c, -sW, b, 0*ones, a], axis=1)
+    idle[:, 2:] -= IDLE_THROTTLE*thrustFactor[:, np.newaxis]*thrust
+
+    # speeds up to the limit or the first speed without thrust
+    thrustZero = _polyRoots(thrust)
+    vMax = np.minimum(MAX_DESCENT_VELOCITY,
+                      np.min(np.where(thrustZero > 0, thrustZero, np.inf), axis=1))
+    candidates = np.concatenate([_polyRoots(stationary), _polyRoots(idle),
+                                 np.where(vMax == MAX_DESCENT_VELOCITY, vMax, np.nan)[:, np.newaxis]], axis=1)
+
+    def throttleOf(velocity):
+        numeratorValue = (a[:, np.newaxis]*velocity**2 + b[:, np.newaxis] + c[:, np.newaxis]/velocity**2
+                          - sW[:, np.newaxis]/velocity)
+        thrustMax = (t0 + t1*velocity + t2*velocity**2)*thrustFactor[:, np.newaxis]
+        return numeratorValue/thrustMax
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        throttles = throttleOf(candidates)
+        feasible = (candidates > 0) & (candidates <= vMax[:, np.newaxis]) \
+            & (throttles >= IDLE_THROTTLE*(1 - 1e-9))
+    throttles = np.where(feasible, throttles, np.inf)
+
+    # equal throttles (idle) take the speed closest to velocityDescent with the same throttle slope
+    best = np.min(throttles, axis=1)
+    ties = feasible & (throttles <= best[:, np.newaxis] + 1e-9*np.maximum(np.abs(best[:, np.newaxis]), 1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        start = np.full((nSegments, 1), float(velocityDescent))
+        slopeStart = np.sign(throttleOf(start*(1 + 1e-6)) - throttleOf(start*(1 - 1e-6)))
+        slopeTies = np.sign(throttleOf(candidates*(1 + 1e-6)) - throttleOf(candidates*(1 - 1e-6)))
+    sameSlope = ties & (slopeTies == slopeStart)
+    ties = np.where(sameSlope.any(axis=1)[:, np.newaxis], sameSlope, ties)
+    distance = np.where(ties, np.abs(candidates - velocityDescent), np.inf)
+    velocities = np.take_along_axis(candidates, np.argmin(distance, axis=1)[:, np.newaxis], axis=1)[:, 0]
+    velocities = np.where(np.isfinite(best), velocities, np.inf)
+    throttles = best
+
+    for i in np.flatnonzero(~np.isfinite(velocities)):
+        velocities[i], throttles[i] = _descentVelocitySLSQP(rho[i], weight[i], wingArea, cD0, cD1, cD2,
+                                                            t0, t1, t2, thrustFactor[i], rateOfDescent, logger,
+                                                            velocityDescent)
+    return velocities, throttles
+
+
+def _descentVelocitySLSQP(rho, weight, wingArea, cD0, cD1, cD2, t0, t1, t2, thrustFactor, rateOfDescent,
+                          logger=None, velocityDescent=15):
     def funDrag(velocity):
         cL = 2 * weight / (wingArea * velocity ** 2 * rho)
         return 1/2*rho*velocity**2*wingArea*(cD0 + cD1 * cL + cD2 * cL ** 2)
 
     def funThrottleRequired(velocity):
-        thrustMax = (v0 + v1 * velocity + v2 * velocity ** 2) * (1 + heightSlope * height)
+        thrustMax = (t0 + t1 * velocity + t2 * velocity ** 2) * thrustFactor
         return (funDrag(velocity) - rateOfDescent*weight/velocity)/thrustMax
 
     def rateConstraint(velocity):
-        thrustMin = (v0 + v1 * velocity + v2 * velocity ** 2) * (1 + heightSlope * height)*0.1
+        thrustMin = (t0 + t1 * velocity + t2 * velocity ** 2) * thrustFactor*IDLE_THROTTLE
         drag = funDrag(velocity)
         return (drag - thrustMin) * velocity / weight - rateOfDescent
 
     def velocityUpperConstraint(velocity):
-        return 90 - velocity
+        return MAX_DESCENT_VELOCITY - velocity
 
     def velocityLowerConstraint(velocity):
         return velocity
@@ -39,27 +172,39 @@ def descentFuel(aircraftInfo=None, heightInitial=1500, heightFinal=0, rateOfDesc
             {'type': 'ineq', 'fun': velocityUpperConstraint},
             {'type': 'ineq', 'fun': velocityLowerConstraint}]
 
-    velocityDescent = 15
-    xDist = 0
-    totalFuelKg = 0.0  # Weird: I declare as float but it becomes a np.array
-
-    for i in range(len(heights)-1):
-        weight = weightLand + totalFuelKg * 9.8
-        height = (heights[i]+heights[i+1])/2
-        T, p, rho, mi = atmosphere(height)
-        r = scipy.optimize.minimize(funThrottleRequired, velocityDescent, constraints=cons)
-        velocityDescent = r.x
-        if not r.success:
-            logger.warning(f"Descent speed convergence failed {r.fun}")
-        throttle = r.fun
-        time = (heights[i+1] - heights[i])/rateOfDescent
-        xDist += r.x[0] * time
-        fuelKgS = aircraftInfo.engine.consumptionMaxLperH*aircraftInfo.engine.fuelDensity*throttle/3600
-        totalFuelKg += fuelKgS*time
-
-    aircraftInfo.weight.fuelDescent = totalFuelKg[0]*9.8
-    aircraftInfo.performance.descent.time = (heightInitial - heightFinal) / rateOfDescent
-    aircraftInfo.performance.descent.range = xDist
+    r = scipy.optimize.minimize(funThrottleRequired, velocityDescent, constraints=cons)
+    if not r.success and logger is not None:
+        logger.warning(f"Descent speed convergence failed {r.fun}")
+    return float(np.ravel(r.x)[0]), float(np.ravel(r.fun)[0])
 
-    return
 
+def _polyMul(p, q):
+    # product of the polynomials of every row, lowest order first
+    product = np.zeros((p.shape[0], p.shape[1] + q.shape[1] - 1))
+    for j in range(q.shape[1]):
+        product[:, j:j + p.shape[1]] += p*q[:, j:j + 1]
+    return product
+
+
+def _polyRoots(coefficients, tolerance=1e-12):
+    # real roots of the polynomial of every row (nan padded), eigenvalues of the companion
+    # matrices of all rows with the same degree at once
+    coefficients = np.asarray(coefficients, dtype=float)
+    nRows, nCoefficients = coefficients.shape
+    scale = np.max(np.abs(coefficients), axis=1, keepdims=True)
+    significant = np.abs(coefficients) > tolerance*np.where(scale > 0, scale, 1)
+    degrees = np.where(significant.any(axis=1), nCoefficients - 1 - np.argmax(significant[:, ::-1], axis=1), 0)
+
+    roots = np.full((nRows, nCoefficients - 1), np.nan)
+    for degree in np.unique(degrees):
+        if degree == 0:
+            continue
+        rows = np.flatnonzero(degrees == degree)
+        monic = coefficients[rows, :degree]/coefficients[rows, degree:degree + 1]
+        companion = np.zeros((len(rows), degree, degree))
+        companion[:, 1:, :-1] = np.eye(degree - 1)
+        companion[:, :, -1] = -monic
+        eigenvalues = np.linalg.eigvals(companion)
+        isReal = np.abs(eigenvalues.imag) <= 1e-9*np.maximum(np.abs(eigenvalues.real), 1)
+        roots[rows, :degree] = np.where(isReal, eigenvalues.real, np.nan)
+    return roots
@@ -1,9 +1,11 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.optimize import fsolve, curve_fit
+from scipy.optimize import fsolve
 import os
 import pandas as pd
 
+from MDO.auxTools.polyFit import polyFit
+
 
 def dynamicThrust(engineInfo, velocity, method="actuatorDisk"):
     """
@@ -69,11 +71,8 @@ def dynamicThrustCurve(engineInfo, method="actuatorDisk"):
     velocityList = np.linspace(0.5, 50, 10)
     thrustList = [dynamicThrust(engineInfo, velocity, method=method) for velocity in velocityList]
 
-    def _objective(x, cD0, cD1, k):
-        return cD0 + cD1 * x + k * x ** 2
-
-    popt, _ = curve_fit(_objective, velocityList, thrustList)
-    cD0, cD1, k = popt
+    coefficients, _ = polyFit(velocityList, thrustList, degree=2)
+    cD0, cD1, k = coefficients.tolist()
 
     return [cD0, cD1, k]
 
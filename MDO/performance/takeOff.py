@@ -1,62 +1,219 @@
 import numpy as np
-from MDO.auxTools import forward_euler
+from MDO.auxTools import integrate, thresholdEvent
 
+# Runway length given when the take off speed is not reached [m]
+NO_TAKEOFF_RUNWAY = 9000
 
-def takeOffRoll(aircraftInfo, mu=0.03, ksafety=1.1, dt=0.01, nsteps=8000):
-    rho = 1.225  # TODO:
-    CLmax = aircraftInfo.cLMax*1.6  # TODO: Add flap to takeOff
-
-    Sref = aircraftInfo.wing.area
-    TOW = aircraftInfo.weight.MTOW
+# Gauss-Legendre nodes of the integrals without a closed form
+_GAUSS_NODES, _GAUSS_WEIGHTS = np.polynomial.legendre.leggauss(64)
 
-    _polar = lambda CL: aircraftInfo.cD0Run + aircraftInfo.cD1Run * CL + aircraftInfo.kRun * CL ** 2
-    _tCurve = lambda velocity: aircraftInfo.thrust.v0 + aircraftInfo.thrust.v1 * velocity \
-                               + aircraftInfo.thrust.v2 * velocity ** 2
-    W = TOW
 
+def takeOffRoll(aircraftInfo, mu=0.03, ksafety=1.1, dt=0.01, nsteps=8000):
+    """
+    # Description:
+        Take off ground roll, the integrals of the equation of motion in velocity are solved
+        in closed form (see takeOffRun).
+
+    ## Parameters (Optional):
+    - mu [float]: rolling friction coefficient.
+    - ksafety [float]: take off speed over stall speed.
+    - dt, nsteps [float, int]: the take off must end before nsteps*dt seconds.
+
+    ## Returns:
+    - runway [float]: ground roll distance [m], NO_TAKEOFF_RUNWAY if the take off speed is not reached.
+    - velocity [float]: take off speed, or the speed reached after nsteps*dt seconds [m/s].
+    - time [float]: ground roll time [s].
+    """
+    runway, velocity, time = takeOffRun(**takeOffParameters(aircraftInfo), mu=mu, ksafety=ksafety,
+                                        timeLimit=dt*nsteps)
+    return float(runway), float(velocity), float(time)
+
+
+def takeOffParameters(aircraftInfo):
+    """
+    # Description:
+        Inputs of takeOffRun of an aircraft. The parameters of many aircraft can be stacked to
+        arrays to solve a population at once.
+    """
     if aircraftInfo.cDRun:
         cLRun = aircraftInfo.cLRun
         cDRun = aircraftInfo.cDRun
     else:
         cLRun = aircraftInfo.cLAlpha0
-        cDRun = _polar(cLRun)
-
-    Vstall = np.sqrt(2.0 * W / (Sref * rho * CLmax))
-
-    Vto = Vstall * ksafety
-    q0 = np.array([0.0, 0.0])  # state vector, [x, Uinf]t
-
-    def qdot(q):
-        Uinf = q[1]
-
-        qdyn = Uinf ** 2 * rho / 2
-
-        L = qdyn * Sref * cLRun
-        D = qdyn * Sref * cDRun
-
-        N = (
-            W - L if L < W else 0.0
-        )
-        Fat = N * mu
-
-        FX = _tCurve(Uinf) - Fat - D
-
-        return np.array(
-            [
-                q[1], FX / (TOW/9.81)
-            ]
-        )
-
-    ts, qs = forward_euler(q0, qdot, dt=dt, nsteps=nsteps)
-
-    finished_q = False
-    for i, q in enumerate(qs):
-        if q[1] >= Vto:
-            finished_q = True
-            return q[0], q[1], i*dt
-
-    if not finished_q:
-        qs[-1, 0] = 9000
-
-    timeTakeOff = len(qs[:, 0])*dt
-    return qs[-1, 0], qs[-1, 1], timeTakeOff
+        cDRun = aircraftInfo.cD0Run + aircraftInfo.cD1Run * cLRun + aircraftInfo.kRun * cLRun ** 2
+
+    return {
+        "weight": aircraftInfo.weight.MTOW,
+        "wingArea": aircraftInfo.wing.area,
+        "cLMax": aircraftInfo.cLMax*1.6,  # TODO: Add flap to takeOff
+        "cLRun": cLRun,
+        "cDRun": cDRun,
+        "t0": aircraftInfo.thrust.v0,
+        "t1": aircraftInfo.thrust.v1,
+        "t2": aircraftInfo.thrust.v2,
+    }
+
+
+def takeOffRun(weight, wingArea, cLMax, cLRun, cDRun, t0, t1, t2, mu=0.03, ksafety=1.1, rho=1.225,
+               timeLimit=np.inf):
+    """
+    # Description:
+        Take off ground roll of one or many designs. The acceleration is a quadratic of the
+        velocity, a = (T(V) - mu*N - D)/m with N = W - L while the wheels are on the ground, so
+        time = integral dV/a and distance = integral V/a dV from rest to the take off speed,
+        without time stepping.
+
+    ## Parameters (Required):
+    - weight, wingArea, cLMax, cLRun, cDRun [float or array]: aircraft, cLMax with flaps.
+    - t0, t1, t2 [float or array]: thrust curve T = t0 + t1*V + t2*V**2.
+
+    ## Parameters (Optional):
+    - mu [float]: rolling friction coefficient.
+    - ksafety [float]: take off speed over stall speed.
+    - rho [float]: air density.
+    - timeLimit [float]: runs longer than this do not take off.
+
+    ## Returns:
+    - runway [array]: ground roll distance [m], NO_TAKEOFF_RUNWAY if the take off speed is not reached.
+    - velocity [array]: take off speed, or the speed reached at timeLimit (the speed where the
+    acceleration ends if timeLimit is inf) [m/s].
+    - time [array]: ground roll time [s], timeLimit if the take off speed is not reached.
+    """
+    weight, wingArea, cLMax, cLRun, cDRun, t0, t1, t2 = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in (weight, wingArea, cLMax, cLRun, cDRun, t0, t1, t2)))
+    mass = weight/9.81
+
+    vTakeOff = ksafety*np.sqrt(2.0*weight/(wingArea*rho*cLMax))
+    # above the lift off speed the lift carries the weight and there is no friction
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vLiftOff = np.where(cLRun > 0, np.sqrt(2.0*weight/(wingArea*rho*np.maximum(cLRun, 0))), np.inf)
+    vSplit = np.minimum(vLiftOff, vTakeOff)
+
+    # acceleration coefficients, a = c0 + c1*V + c2*V**2
+    rolling = ((t0 - mu*weight)/mass, t1/mass, (t2 + rho*wingArea*(mu*cLRun - cDRun)/2)/mass)
+    flying = (t0/mass, t1/mass, (t2 - rho*wingArea*cDRun/2)/mass)
+
+    stopRolling = _firstStop(*rolling, np.zeros_like(vSplit), vSplit)
+    stopFlying = _firstStop(*flying, vSplit, vTakeOff)
+    vStop = np.where(np.isfinite(stopRolling), stopRolling, stopFlying)
+    reached = ~np.isfinite(vStop)
+
+    # integrals up to the take off speed, or a speed that is never reached
+    time, distance = _runIntegrals(rolling, flying, vSplit, np.where(reached, vTakeOff, 0.0))
+
+    reached = reached & (time <= timeLimit)
+    runway = np.where(reached, distance, NO_TAKEOFF_RUNWAY)
+    velocity = vTakeOff
+    if not np.all(reached):
+        # speed at the time limit, below the speed where the acceleration ends
+        vLimit = np.where(np.isfinite(vStop), vStop, vTakeOff)
+        if np.isfinite(timeLimit):
+            vLimit = _runVelocity(rolling, flying, vSplit, vLimit, timeLimit)
+        velocity = np.where(reached, vTakeOff, vLimit)
+    time = np.where(reached, time, timeLimit)
+    return runway, velocity, time
+
+
+def takeOffRunIntegrated(weight, wingArea, cLMax, cLRun, cDRun, t0, t1, t2, mu=0.03, ksafety=1.1, rho=1.225,
+                         timeLimit=150.0, dt=0.05, method="rk4"):
+    """
+    # Description:
+        takeOffRun with the equation of motion integrated in time until the take off speed,
+        same parameters and returns. For models without a closed form.
+
+    ## Parameters (Optional):
+    - dt [float]: time step, first step of the adaptive methods.
+    - method [str]: integration method, see MDO.auxTools.integrate.
+    """
+    weight, wingArea, cLMax, cLRun, cDRun, t0, t1, t2 = (np.atleast_1d(value) for value in np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in (weight, wingArea, cLMax, cLRun, cDRun, t0, t1, t2))))
+    mass = weight/9.81
+    vTakeOff = ksafety*np.sqrt(2.0*weight/(wingArea*rho*cLMax))
+
+    def qdot(t, q):
+        velocity = q[:, 1]
+        qdyn = velocity**2*rho/2
+        normal = np.maximum(weight - qdyn*wingArea*cLRun, 0.0)
+        force = t0 + t1*velocity + t2*velocity**2 - mu*normal - qdyn*wingArea*cDRun
+        return np.stack([velocity, force/mass], axis=1)
+
+    solution = integrate(qdot, np.zeros((len(weight), 2)), timeLimit, dt, method=method,
+                         events=[thresholdEvent(1, vTakeOff)], saveSteps=False)
+    reached = solution.event == 0
+    runway = np.where(reached, solution.qEnd[:, 0], NO_TAKEOFF_RUNWAY)
+    return runway, solution.qEnd[:, 1], solution.tEnd
+
+
+def _runIntegrals(rolling, flying, vSplit, vEnd):
+    # time and distance from rest to vEnd, rolling below vSplit and flying above it
+    vEndRolling = np.minimum(vSplit, vEnd)
+    timeRolling, distanceRolling = _rollIntegrals(*rolling, np.zeros_like(vEnd), vEndRolling)
+    timeFlying, distanceFlying = _rollIntegrals(*flying, vEndRolling, np.maximum(vEnd, vEndRolling))
+    return timeRolling + timeFlying, distanceRolling + distanceFlying
+
+
+def _runVelocity(rolling, flying, vSplit, vHigh, time, nIterations=60):
+    # velocity reached at time, below vHigh, by bisection of the run time that increases with velocity
+    low = np.zeros_like(vHigh)
+    high = vHigh.copy()
+    for _ in range(nIterations):
+        middle = (low + high)/2
+        early = _runIntegrals(rolling, flying, vSplit, middle)[0] < time
+        low = np.where(early, middle, low)
+        high = np.where(early, high, middle)
+    return (low + high)/2
+
+
+def _firstStop(c0, c1, c2, vLow, vHigh):
+    # lowest velocity of [vLow, vHigh] where the acceleration is not positive, inf if there is none
+    def acceleration(v):
+        return c0 + c1*v + c2*v**2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discriminant = c1**2 - 4*c2*c0
+        sqrtDiscriminant = np.sqrt(np.maximum(discriminant, 0))
+        linear = c2 == 0
+        roots = np.stack([np.where(linear, -c0/c1, (-c1 - sqrtDiscriminant)/(2*c2)),
+                          np.where(linear, np.inf, (-c1 + sqrtDiscriminant)/(2*c2))])
+    roots = np.where((discriminant >= 0) | linear, roots, np.inf)
+    roots = np.where((roots >= vLow) & (roots < vHigh), roots, np.inf)
+    stop = roots.min(axis=0)
+    stop = np.where(acceleration(vLow) <= 0, vLow, stop)
+    return np.where(vHigh > vLow, stop, np.inf)
+
+
+def _rollIntegrals(c0, c1, c2, vLow, vHigh):
+    # integrals of dV/a and V/a dV in [vLow, vHigh], a positive in the interval
+    # partial fractions with the (complex) roots of a, the logarithms stay on one branch
+    # because a has no root in the interval:
+    # 1/a = (1/(V - r1) - 1/(V - r2))/(c2*(r1 - r2))
+    # V/a = (r1/(V - r1) - r2/(V - r2))/(c2*(r1 - r2))
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        sqrtDiscriminant = np.sqrt((c1**2 - 4*c2*c0).astype(complex))
+        r1 = (-c1 - sqrtDiscriminant)/(2*c2)
+        r2 = (-c1 + sqrtDiscriminant)/(2*c2)
+        logRatio1 = np.log((vHigh - r1)/(vLow - r1))
+        logRatio2 = np.log((vHigh - r2)/(vLow - r2))
+        scale = c2*(r1 - r2)
+        time = (logRatio1 - logRatio2)/scale
+        distance = (r1*logRatio1 - r2*logRatio2)/scale
+
+    # linear acceleration or a double root, Gauss-Legendre instead
+    span = np.maximum(np.abs(vHigh), np.abs(vLow))
+    closedForm = (np.abs(r1 - r2) > 1e-6*(np.abs(r1) + span)) & np.isfinite(time) & np.isfinite(distance)
+    if not np.all(closedForm):
+        timeGauss, distanceGauss = _rollIntegralsGauss(c0, c1, c2, vLow, vHigh)
+        time = np.where(closedForm, time, timeGauss)
+        distance = np.where(closedForm, distance, distanceGauss)
+
+    empty = vHigh <= vLow
+    return np.where(empty, 0.0, time.real), np.where(empty, 0.0, distance.real)
+
+
+def _rollIntegralsGauss(c0, c1, c2, vLow, vHigh):
+    half = (vHigh - vLow)[..., np.newaxis]/2
+    velocity = (vHigh + vLow)[..., np.newaxis]/2 + half*_GAUSS_NODES
+    inverse = 1/(c0[..., np.newaxis] + c1[..., np.newaxis]*velocity + c2[..., np.newaxis]*velocity**2)
+    time = (half*_GAUSS_WEIGHTS*inverse).sum(axis=-1)
+    distance = (half*_GAUSS_WEIGHTS*inverse*velocity).sum(axis=-1)
+    return time, distance
@@ -1,8 +1,6 @@
 """
 Weight estimation
 """
-import os
-
 import numpy as np
 
 
@@ -13,7 +11,7 @@ def weightCalc(aircraftInfo, weightInfo=None, method="Raymer"):
     # Wing
     wingArea = aircraftInfo.wing.area
     aileronArea = aircraftInfo.wing.aileronArea
-    arWing = aircraftInfo.wing.span ** 2 / wingArea
+    arWing = aircraftInfo.wing.aspectRatio
     tcRootWing = aircraftInfo.tcRootWing
     taperRatioWing = aircraftInfo.wing.taperRatio
     wingSweep = aircraftInfo.wing.sweep
@@ -68,7 +66,7 @@ def weightCalc(aircraftInfo, weightInfo=None, method="Raymer"):
         aircraftInfo.cg.wing = [xCgWing, 0, 0]
         aircraftInfo.weight.wing = wingWeight
 
-        if os.environ["DEBUG"].lower() == 'yes':
+        if aircraftInfo.settings.debug:
             print("-"*10)
             print(f'Wing Weight and CG: {wingWeight/9.81} kg', xCgWing)
             print(f'Wing area: {wingArea}')
@@ -90,7 +88,7 @@ def weightCalc(aircraftInfo, weightInfo=None, method="Raymer"):
             aircraftInfo.cg.vertical = [xcg, 0, 0]
             aircraftInfo.weight.vertical = weight
 
-        if os.environ["DEBUG"].lower() == 'yes':
+        if aircraftInfo.settings.debug:
             print("-" * 10)
             print(f'Horizontal or Vertical Weight and CG: {weight/9.81} kg,', xcg)
             print(f'Weight/Area: {weight / surfaceArea / 9.81}')
@@ -103,7 +101,7 @@ def weightCalc(aircraftInfo, weightInfo=None, method="Raymer"):
         aircraftInfo.cg.fuselage = [xcgf, 0, 0]
         aircraftInfo.weight.fuselage = Wf
 
-        if os.environ["DEBUG"].lower() == 'yes':
+        if aircraftInfo.settings.debug:
             print("-" * 10)
             print(f'Fuselage Weight and CG: {Wf/9.81} kg,', xcgf)
             print(f'Weight/Area: {Wf / fuselageWetArea / 9.81}')
@@ -111,13 +109,13 @@ def weightCalc(aircraftInfo, weightInfo=None, method="Raymer"):
 
     def _raymerLandingGear(W0, xCG, loadPercentage, weightFactor=0.043):
         weightLandingGear = loadPercentage * weightFactor * W0
-        if os.environ["DEBUG"].lower() == 'yes':
+        if aircraftInfo.settings.debug:
             print("-" * 10)
             print(f'Landing Gear Weight and CG: {weightLandingGear/9.81} kg,', xCG)
         return weightLandingGear, xCG
 
     def _engineWeight():
-        if os.environ["DEBUG"].lower() == 'yes':
+        if aircraftInfo.settings.debug:
             print("-" * 10)
             print(f'Engine Weight and CG: {weightInfo.engine/9.81} kg,', aircraftInfo.cg.engine[0])
         return weightInfo.engine, aircraftInfo.cg.engine[0]
@@ -125,7 +123,7 @@ def weightCalc(aircraftInfo, weightInfo=None, method="Raymer"):
     def _allElseWeight():
         allElseWeight = sum([v[0] for v in weightInfo.allElse.values()])
         allElseWeightCG = sum([v[1] for v in weightInfo.allElse.values()])
-        if os.environ["DEBUG"].lower() == 'yes':
+        if aircraftInfo.settings.debug:
             print("-" * 10)
             print(f'All else Weight and CG: {allElseWeight/9.81} kg,', allElseWeightCG)
         return allElseWeight, allElseWeightCG
@@ -1,12 +1,20 @@
 import MDO
 import numpy as np
-from math import tan
-import os
 from dataclasses import dataclass
 
 
 class AircraftInfo:
-    def __init__(self, stateVariables, controlVariables, engineInfo=None, optimizationVariables=None):
+    # Every field is declared, the state pickles compactly (airfoils by name, see AirfoilData)
+    # and can be sent to the workers of a process pool
+    __slots__ = ("stateVariables", "optimizationVariables", "controlVariables", "engineInfo", "engine",
+                 "settings", "lowMemory", "machCalc", "reynoldsCalc", "wing", "vertical", "fuselage", "xNoseLG", "xMainLG",
+                 "cLMaxWingAirfoil", "tcRootWing", "cD0", "cD1", "k", "dataPolar", "cLRun", "cDRunAvl", "cDRun",
+                 "alphaRun", "cLMax", "cLAlpha0", "cLSlope", "performance", "cLCruise", "dragCruise", "loiterTime",
+                 "weight", "cg", "alphaStalls", "stallPosition", "yStrips", "alphaStallWing", "stallPositionWing",
+                 "alphaStallsWing", "yStripsWing", "clStripsWing", "xNeutralPoint", "staticMargin", "thrust")
+
+    def __init__(self, stateVariables, controlVariables, engineInfo=None, optimizationVariables=None,
+                 lowMemory=None, settings=None):
         """
         # Description:
         - Aircraft Info that can be useful on AVL and other calculations.
@@ -14,12 +22,24 @@ class AircraftInfo:
         ## Parameters (required):
         - stateVariables [dict]: Project stateVariables.
 
+        ## Parameters (Optional):
+        - lowMemory [bool]: drop the AVL tables once they are summarized, see dropRawTables.
+        Defaults to settings.lowMemory.
+        - settings [MDO.Settings]: settings of this evaluation. Defaults to the settings read by
+        MDO.parseConfig, see MDO.defaultSettings.
+
         ## Atributes (return only):
         - stateVariables [dict]: Copy of Project stateVariables.
         - wingArea [float]: Area of wing.
         - meanChord [float]: Mean Aerodynamic Chord of wing.
         - wingSpan [float]: Wing span.
         """
+        if settings is None:
+            settings = MDO.defaultSettings()
+        if lowMemory is None:
+            lowMemory = settings.lowMemory
+        self.settings = settings
+        self.lowMemory = lowMemory
         self.stateVariables = stateVariables.copy()
         self.optimizationVariables = optimizationVariables
         self.controlVariables = controlVariables
@@ -55,7 +75,10 @@ class AircraftInfo:
         self.xMainLG = -0.22
 
         # Airfoil Info
-        self.cLMaxWingAirfoil = stateVariables["wing"]["root"]["airfoil"].clmax
+        # Stall at the take-off speed of the XFOIL runs, Reynolds number of the root chord
+        wingRoot = stateVariables["wing"]["root"]
+        reynoldsStall = MDO.airfoils.sectionReynolds(wingRoot["chord"], MDO.airfoils.MISSION_SPEEDS["takeOff"])
+        self.cLMaxWingAirfoil = wingRoot["airfoil"].atReynolds(reynoldsStall).clmax
 
         # self.cLMaxHorizontalAirfoil = stateVariables["horizontal"]["root"]["airfoil"].clmax  # TODO: Add V case
         self.tcRootWing = 0.123  # TODO:
@@ -64,6 +87,7 @@ class AircraftInfo:
         self.cD0 = None
         self.cD1 = None
         self.k = None
+        self.dataPolar = None
 
         # self.cD0Run = None
         # self.cD1Run = None
@@ -72,6 +96,7 @@ class AircraftInfo:
         self.cLRun = None
         self.cDRunAvl = None
         self.cDRun = None
+        self.alphaRun = None
         self.cLMax = None
         self.cLAlpha0 = None
         self.cLSlope = None
@@ -79,6 +104,7 @@ class AircraftInfo:
         # Flight Info
         self.performance = Performance()
         self.cLCruise = None
+        self.dragCruise = None
         self.loiterTime = 3600
 
         # Weight and Cg Info
@@ -95,6 +121,9 @@ class AircraftInfo:
 
         self.alphaStallWing = None
         self.stallPositionWing = None
+        self.alphaStallsWing = None
+        self.yStripsWing = None
+        self.clStripsWing = None
         self.cLSlope = None
         self.cLAlpha0 = None
 
@@ -113,20 +142,31 @@ class AircraftInfo:
         else:
             self.cg.calc = cgFixed
 
-        if 'y' in os.getenv('DEBUG').lower():
+        if self.settings.debug:
             print("-"*10)
             print(f"xNeutralPoint: {self.xNeutralPoint}")
             print(f"xCG: {self.cg.calc}")
             print(f"MeanChord: {self.wing.meanChord}")
 
+    def dropRawTables(self):
+        """
+        # Description:
+        - Low memory mode: drop the AVL tables kept after they are summarized (polar points and
+        wing strips). The summaries (cD0, k, alphaStallWing, ...) are kept.
+        """
+        self.dataPolar = None
+        self.alphaStallsWing = None
+        self.yStripsWing = None
+        self.clStripsWing = None
+
 
 class Surface:
+    __slots__ = ("properties", "aileronArea", "elevatorArea", "rudderArea")
+
     def __init__(self, surfaceDict=None, controlVariables=None, name=None):
-        self.xMeanChord, self.yMeanChord = xyMeanChord(surfaceDict)
-        self.area, self.meanChord, self.span, self.sweep, self.tipX = MDO.infoSurface(surfaceDict)
-        self.taperRatio = surfaceDict['tip']['chord']/surfaceDict['root']['chord']
-        self.aspectRatio = self.span**2/self.area
-        self.rootX = surfaceDict['root']['x']
+        # area, meanChord, span, sweep, tipX, xMeanChord, yMeanChord, taperRatio, aspectRatio and rootX
+        # are read from the shared SurfaceProperties, the same values avlGeoBuild and weightCalc use
+        self.properties = MDO.surfaceProperties(surfaceDict)
 
         if "aileron" in controlVariables and name == 'wing':
             self.aileronArea = self.area*controlVariables["aileron"]["spanStartPercentage"]*\
@@ -149,8 +189,16 @@ class Surface:
         else:
             self.rudderArea = self.area * 0.4 * 0.2
 
+    def __getattr__(self, name):
+        if name == "properties":
+            raise AttributeError(name)
+        return getattr(self.properties, name)
+
 
 class Fuselage:
+    __slots__ = ("finenessRatio", "wetArea", "length", "interferenceFactor", "coefficientFriction",
+                 "gimbalFrontalArea")
+
     def __init__(self, length=None, diameter=None, reynoldsCalc=None, machCalc=None):
         self.finenessRatio = length / diameter
         self.wetArea = np.pi * diameter * length * (1 - 2 / self.finenessRatio) ** (2.0 / 3.0) * (1 + 1 / self.finenessRatio ** 2)
@@ -162,6 +210,8 @@ class Fuselage:
 
 
 class Thrust:
+    __slots__ = ("v0", "v1", "v2", "slopeHeight")
+
     def __init__(self, engineInfo):
         self.v0 = None
         self.v1 = None
@@ -170,6 +220,10 @@ class Thrust:
 
 
 class Weight:
+    __slots__ = ("engine", "initialMTOW", "fuelReserve", "fuelDescent", "fuelCruise", "fuelClimb", "fuelTakeOff",
+                 "allElse", "payload", "wing", "horizontal", "vertical", "fuselage", "empty", "MTOW", "fuel",
+                 "fuelActual")
+
     def __init__(self, initialMTOW=100 * 9.81):
         self.engine = 12.7 * 9.8  # Atobá Data
 
@@ -199,10 +253,10 @@ class Weight:
         self.fuselage = None
 
     def calc(self, aircraftInfo):
-        weightVar = os.getenv("WEIGHT")
+        weightVar = aircraftInfo.settings.weight
         if weightVar == 'Raymer':
             self.empty, _ = MDO.weightCalc(aircraftInfo, weightInfo=self, method="Raymer")
-            self.MTOW = int(os.getenv("MTOW"))*9.81  # TODO: ADD MTOW variable
+            self.MTOW = aircraftInfo.settings.mtow*9.81  # TODO: ADD MTOW variable
             self.fuel = self.MTOW - self.empty - self.payload
 
             if self.fuel < 0:
@@ -228,6 +282,9 @@ class Weight:
 
 
 class Cg:
+    __slots__ = ("engine", "wing", "horizontal", "vertical", "fuselage", "fuel", "full", "empty", "calc",
+                 "cg_cruise")
+
     def __init__(self, aircraftInfo):
         self.engine = [aircraftInfo.fuselage.length, 0, 0]  # TODO
         self.wing = None
@@ -251,6 +308,8 @@ class Cg:
 
 
 class Engine:
+    __slots__ = ("name", "consumptionMaxLperH", "fuelDensity")
+
     def __init__(self, engineInfo):
         self.name = engineInfo['name']
         self.consumptionMaxLperH = engineInfo['engineFC']['consumptionMaxLperH']
@@ -258,6 +317,8 @@ class Engine:
 
 
 class Performance:
+    __slots__ = ("cruise", "climb", "descent")
+
     def __init__(self):
         self.cruise = FlightInfo()
         self.climb = FlightInfo()
@@ -272,39 +333,10 @@ def xyMeanChord(surfDict):
     A Comprehensive Approach-American Institute of Aeronautics and Astronautics (2012) for equations.
 
     ## Params:
-        -
+        - surfDict [dict]: surface in stateVariables. Ex: stateVariables['wing'].
     """
-    keysSurfaceDict = list(surfDict.keys())
-    spanSum = 0
-    dArea = 0
-    areaTotal = 0
-    for i in range(len(keysSurfaceDict) - 1):
-        cRoot = surfDict[keysSurfaceDict[i]]['chord']
-        cTip = surfDict[keysSurfaceDict[i+1]]['chord']
-        span = surfDict[keysSurfaceDict[i+1]]['b']
-
-        d = span/3*(cRoot + 2*cTip)/(cRoot + cTip) + spanSum
-        area = (cTip+cRoot)/2*span
-
-        dArea += d*area
-        spanSum += span
-        areaTotal += area
-
-    yMeanChord = dArea/areaTotal
-    spanSum = 0
-    xSec = 0
-    for i in range(len(keysSurfaceDict) - 1):
-        span = surfDict[keysSurfaceDict[i+1]]['b']
-        sweepLE = surfDict[keysSurfaceDict[i+1]]['sweepLE']
-
-        if spanSum <= yMeanChord < spanSum + span:
-            ySec = yMeanChord-spanSum
-            xMeanChord = xSec + ySec*tan(sweepLE)
-            break
-        xSec += span*tan(sweepLE)
-        spanSum += span
-
-    return [xMeanChord, yMeanChord]
+    properties = MDO.surfaceProperties(surfDict)
+    return [properties.xMeanChord, properties.yMeanChord]
 
 
 @dataclass
@@ -3,9 +3,14 @@
 VERSION = "0.3.0"
 
 from .config import default_config, Configuration
+from .cache import ResultCache, default_cache
 from .model import (Aircraft, Case, Control, DataAirfoil, DesignVar,
                     Geometry, FileAirfoil, NacaAirfoil, Parameter, Point,
                     ProfileDrag, Section, Symmetry, Spacing, Surface, Vector)
 from .output import OutputReader
+from .pool import WorkerPool, default_pool
+from .watchdog import (AVLConvergenceError, AVLProcessError, AVLTimeoutError,
+                       Watchdog)
 from .session import Session
+from .template import CaseTemplate, TemplateCase
 from .tools import create_sweep_cases, partitioned_cases, show_image
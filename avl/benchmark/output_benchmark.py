@@ -0,0 +1,88 @@
+""" Benchmark of the output readers
+
+Run from the repository root:
+    python -m avl.benchmark.output_benchmark [--repeat N] [file ...]
+
+Times the legacy and the numpy readers on AVL output files and reports
+whether both readers return the same values. The default files in
+synthetic/ are not recorded from an AVL run: they were written after the
+format statements of AVL 3.35 (a wing and a V-tail, both with YDUP
+images) and only show the timing of tables of a realistic size. Agreement
+of the readers on them says nothing about real AVL output, pass recorded
+.fs/.fe/.fn files to check that.
+"""
+import argparse
+import glob
+import math
+import os
+import timeit
+
+from avl import OutputReader
+from avl.fast_output import FastOutputReader
+
+SYNTHETIC_DIR = os.path.join(os.path.dirname(__file__), 'synthetic')
+
+
+def compare(legacy, fast, path=''):
+    """Differences between legacy and fast results, the fast reader may
+    find more entries (e.g. strips numbered above 99)"""
+    if isinstance(legacy, dict):
+        differences = []
+        for key, value in legacy.items():
+            if key not in fast:
+                differences.append("{}/{}: missing".format(path, key))
+            else:
+                differences += compare(value, fast[key],
+                                       "{}/{}".format(path, key))
+        return differences
+
+    legacy_values = legacy if isinstance(legacy, list) else [legacy]
+    fast_values = list(fast) if hasattr(fast, '__len__') else [fast]
+    if len(legacy_values) != len(fast_values):
+        return ["{}: length {} != {}".format(path, len(legacy_values),
+                                             len(fast_values))]
+    for a, b in zip(legacy_values, fast_values):
+        if not (math.isclose(a, b, abs_tol=1e-12)
+                or (math.isnan(a) and math.isnan(b))):
+            return ["{}: {} != {}".format(path, a, b)]
+    return []
+
+
+def benchmark(file_path, repeat=20):
+    legacy_time = min(timeit.repeat(
+        lambda: OutputReader(file_path).get_content(),
+        number=1, repeat=repeat))
+    fast_time = min(timeit.repeat(
+        lambda: FastOutputReader(file_path).get_content(),
+        number=1, repeat=repeat))
+    differences = compare(OutputReader(file_path).get_content(),
+                          FastOutputReader(file_path).get_content())
+    return legacy_time, fast_time, differences
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('files', nargs='*',
+                        help="output files, defaults to the synthetic files")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    files = args.files or sorted(
+        glob.glob(os.path.join(SYNTHETIC_DIR, '*')))
+
+    print("{:<20} {:>12} {:>12} {:>8}  {}".format(
+        "file", "legacy [ms]", "numpy [ms]", "speedup", "readers"))
+    for file_path in files:
+        legacy_time, fast_time, differences = benchmark(file_path,
+                                                        args.repeat)
+        print("{:<20} {:>12.3f} {:>12.3f} {:>7.1f}x  {}".format(
+            os.path.basename(file_path), legacy_time * 1e3, fast_time * 1e3,
+            legacy_time / fast_time,
+            "agree" if not differences else "{} differences".format(
+                len(differences))))
+        for difference in differences:
+            print("    " + difference)
+
+
+if __name__ == '__main__':
+    main()
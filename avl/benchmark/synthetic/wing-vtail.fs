@@ -0,0 +1,176 @@
+ ---------------------------------------------------------------
+ Surface and Strip Forces by surface
+
+  Forces referred to Sref, Cref, Bref about Xref, Yref, Zref
+ Standard axis orientation,  X fwd, Z down         
+
+  Surface # 1     Wing
+     # Chordwise = 12   # Spanwise = 40     First strip =  1
+     Surface area =    1.075000       Ave. chord =    0.550000
+     CLsurf  =   0.31000     Clsurf  =  -0.04400
+     CYsurf  =   0.00060     Cmsurf  =  -0.06270
+     CDsurf  =   0.00570     Cnsurf  =   0.00090
+     CDisurf =   0.00570     CDvsurf =   0.00000
+
+  Forces referred to Ssurf, Cave about hinge axis thru LE
+     CLsurf  =   0.62000     CDsurf  =   0.01100
+     Deflect =   0.00000     CmLEsurf=  -0.15500
+
+ Strip Forces referred to Strip Area, Chord
+    j      Yle    Chord     Area     c cl      ai      cl_norm  cl       cd       cdv    cm_c/4    cm_LE  C.P.x/c
+     1   0.0244   0.6050   0.0295   0.3990   0.0400   0.6595   0.6595   0.0040   0.0000  -0.0790  -0.2440    0.375
+     2   0.0731   0.6023   0.0294   0.3972   0.0398   0.6595   0.6595   0.0040   0.0000  -0.0790  -0.2440    0.376
+     3   0.1219   0.5995   0.0292   0.3953   0.0395   0.6594   0.6594   0.0040   0.0000  -0.0790  -0.2440    0.371
+     4   0.1706   0.5968   0.0291   0.3922   0.0393   0.6572   0.6572   0.0039   0.0000  -0.0790  -0.2440    0.378
+     5   0.2194   0.5940   0.0290   0.3898   0.0390   0.6562   0.6562   0.0039   0.0000  -0.0790  -0.2440    0.372
+     6   0.2681   0.5913   0.0288   0.3878   0.0387   0.6558   0.6558   0.0039   0.0000  -0.0790  -0.2440    0.375
+     7   0.3169   0.5885   0.0287   0.3844   0.0385   0.6532   0.6532   0.0039   0.0000  -0.0790  -0.2440    0.375
+     8   0.3656   0.5858   0.0286   0.3808   0.0382   0.6501   0.6501   0.0039   0.0000  -0.0790  -0.2440    0.372
+     9   0.4144   0.5830   0.0284   0.3772   0.0380   0.6469   0.6469   0.0039   0.0000  -0.0790  -0.2440    0.379
+    10   0.4631   0.5803   0.0283   0.3732   0.0377   0.6431   0.6431   0.0039   0.0000  -0.0790  -0.2440    0.377
+    11   0.5119   0.5775   0.0282   0.3692   0.0375   0.6394   0.6394   0.0038   0.0000  -0.0790  -0.2440    0.371
+    12   0.5606   0.5748   0.0280   0.3650   0.0372   0.6351   0.6351   0.0038   0.0000  -0.0790  -0.2440    0.376
+    13   0.6094   0.5720   0.0279   0.3599   0.0370   0.6292   0.6292   0.0038   0.0000  -0.0790  -0.2440    0.370
+    14   0.6581   0.5693   0.0278   0.3557   0.0367   0.6249   0.6249   0.0037   0.0000  -0.0790  -0.2440    0.375
+    15   0.7069   0.5665   0.0276   0.3505   0.0365   0.6187   0.6187   0.0037   0.0000  -0.0790  -0.2440    0.379
+    16   0.7556   0.5638   0.0275   0.3452   0.0363   0.6123   0.6123   0.0037   0.0000  -0.0790  -0.2440    0.379
+    17   0.8044   0.5610   0.0273   0.3392   0.0360   0.6047   0.6047   0.0036   0.0000  -0.0790  -0.2440    0.378
+    18   0.8531   0.5583   0.0272   0.3335   0.0358   0.5973   0.5973   0.0036   0.0000  -0.0790  -0.2440    0.379
+    19   0.9019   0.5555   0.0271   0.3278   0.0355   0.5902   0.5902   0.0035   0.0000  -0.0790  -0.2440    0.371
+    20   0.9506   0.5528   0.0269   0.3206   0.0353   0.5801   0.5801   0.0035   0.0000  -0.0790  -0.2440    0.372
+    21   0.9994   0.5500   0.0268   0.3149   0.0350   0.5725   0.5725   0.0034   0.0000  -0.0790  -0.2440    0.374
+    22   1.0481   0.5473   0.0267   0.3075   0.0348   0.5620   0.5620   0.0034   0.0000  -0.0790  -0.2440    0.373
+    23   1.0969   0.5445   0.0265   0.3001   0.0345   0.5512   0.5512   0.0033   0.0000  -0.0790  -0.2440    0.374
+    24   1.1456   0.5418   0.0264   0.2924   0.0343   0.5397   0.5397   0.0032   0.0000  -0.0790  -0.2440    0.376
+    25   1.1944   0.5390   0.0263   0.2847   0.0340   0.5282   0.5282   0.0032   0.0000  -0.0790  -0.2440    0.379
+    26   1.2431   0.5363   0.0261   0.2765   0.0338   0.5156   0.5156   0.0031   0.0000  -0.0790  -0.2440    0.379
+    27   1.2919   0.5335   0.0260   0.2680   0.0335   0.5023   0.5023   0.0030   0.0000  -0.0790  -0.2440    0.380
+    28   1.3406   0.5308   0.0259   0.2586   0.0333   0.4873   0.4873   0.0029   0.0000  -0.0790  -0.2440    0.372
+    29   1.3894   0.5280   0.0257   0.2492   0.0330   0.4721   0.4721   0.0028   0.0000  -0.0790  -0.2440    0.380
+    30   1.4381   0.5253   0.0256   0.2392   0.0328   0.4554   0.4554   0.0027   0.0000  -0.0790  -0.2440    0.376
+    31   1.4869   0.5225   0.0255   0.2283   0.0325   0.4370   0.4370   0.0026   0.0000  -0.0790  -0.2440    0.372
+    32   1.5356   0.5198   0.0253   0.2171   0.0323   0.4178   0.4178   0.0025   0.0000  -0.0790  -0.2440    0.376
+    33   1.5844   0.5170   0.0252   0.2045   0.0320   0.3956   0.3956   0.0024   0.0000  -0.0790  -0.2440    0.371
+    34   1.6331   0.5143   0.0251   0.1922   0.0318   0.3737   0.3737   0.0022   0.0000  -0.0790  -0.2440    0.380
+    35   1.6819   0.5115   0.0249   0.1774   0.0315   0.3469   0.3469   0.0021   0.0000  -0.0790  -0.2440    0.378
+    36   1.7306   0.5088   0.0248   0.1625   0.0312   0.3193   0.3193   0.0019   0.0000  -0.0790  -0.2440    0.372
+    37   1.7794   0.5060   0.0247   0.1454   0.0310   0.2873   0.2873   0.0017   0.0000  -0.0790  -0.2440    0.378
+    38   1.8281   0.5033   0.0245   0.1266   0.0307   0.2515   0.2515   0.0015   0.0000  -0.0790  -0.2440    0.370
+    39   1.8769   0.5005   0.0244   0.1033   0.0305   0.2063   0.2063   0.0012   0.0000  -0.0790  -0.2440    0.370
+    40   1.9256   0.4978   0.0243   0.0732   0.0302   0.1471   0.1471   0.0009   0.0000  -0.0790  -0.2440    0.373
+
+  Surface # 2     Wing (YDUP)
+     # Chordwise = 12   # Spanwise = 40     First strip = 41
+     Surface area =    1.075000       Ave. chord =    0.550000
+     CLsurf  =   0.31000     Clsurf  =  -0.04400
+     CYsurf  =   0.00060     Cmsurf  =  -0.06270
+     CDsurf  =   0.00570     Cnsurf  =   0.00090
+     CDisurf =   0.00570     CDvsurf =   0.00000
+
+  Forces referred to Ssurf, Cave about hinge axis thru LE
+     CLsurf  =   0.62000     CDsurf  =   0.01100
+     Deflect =   0.00000     CmLEsurf=  -0.15500
+
+ Strip Forces referred to Strip Area, Chord
+    j      Yle    Chord     Area     c cl      ai      cl_norm  cl       cd       cdv    cm_c/4    cm_LE  C.P.x/c
+    41  -0.0244   0.6050   0.0295   0.3998   0.0400   0.6608   0.6608   0.0040   0.0000  -0.0790  -0.2440    0.380
+    42  -0.0731   0.6023   0.0294   0.3974   0.0398   0.6598   0.6598   0.0040   0.0000  -0.0790  -0.2440    0.380
+    43  -0.1219   0.5995   0.0292   0.3949   0.0395   0.6588   0.6588   0.0040   0.0000  -0.0790  -0.2440    0.371
+    44  -0.1706   0.5968   0.0291   0.3929   0.0393   0.6583   0.6583   0.0040   0.0000  -0.0790  -0.2440    0.370
+    45  -0.2194   0.5940   0.0290   0.3897   0.0390   0.6561   0.6561   0.0039   0.0000  -0.0790  -0.2440    0.374
+    46  -0.2681   0.5913   0.0288   0.3873   0.0387   0.6550   0.6550   0.0039   0.0000  -0.0790  -0.2440    0.372
+    47  -0.3169   0.5885   0.0287   0.3835   0.0385   0.6516   0.6516   0.0039   0.0000  -0.0790  -0.2440    0.379
+    48  -0.3656   0.5858   0.0286   0.3804   0.0382   0.6494   0.6494   0.0039   0.0000  -0.0790  -0.2440    0.380
+    49  -0.4144   0.5830   0.0284   0.3775   0.0380   0.6475   0.6475   0.0039   0.0000  -0.0790  -0.2440    0.374
+    50  -0.4631   0.5803   0.0283   0.3731   0.0377   0.6430   0.6430   0.0039   0.0000  -0.0790  -0.2440    0.375
+    51  -0.5119   0.5775   0.0282   0.3692   0.0375   0.6393   0.6393   0.0038   0.0000  -0.0790  -0.2440    0.376
+    52  -0.5606   0.5748   0.0280   0.3648   0.0372   0.6347   0.6347   0.0038   0.0000  -0.0790  -0.2440    0.376
+    53  -0.6094   0.5720   0.0279   0.3606   0.0370   0.6305   0.6305   0.0038   0.0000  -0.0790  -0.2440    0.375
+    54  -0.6581   0.5693   0.0278   0.3552   0.0367   0.6240   0.6240   0.0037   0.0000  -0.0790  -0.2440    0.377
+    55  -0.7069   0.5665   0.0276   0.3499   0.0365   0.6177   0.6177   0.0037   0.0000  -0.0790  -0.2440    0.373
+    56  -0.7556   0.5638   0.0275   0.3455   0.0363   0.6128   0.6128   0.0037   0.0000  -0.0790  -0.2440    0.375
+    57  -0.8044   0.5610   0.0273   0.3394   0.0360   0.6050   0.6050   0.0036   0.0000  -0.0790  -0.2440    0.370
+    58  -0.8531   0.5583   0.0272   0.3334   0.0358   0.5973   0.5973   0.0036   0.0000  -0.0790  -0.2440    0.376
+    59  -0.9019   0.5555   0.0271   0.3269   0.0355   0.5884   0.5884   0.0035   0.0000  -0.0790  -0.2440    0.376
+    60  -0.9506   0.5528   0.0269   0.3212   0.0353   0.5811   0.5811   0.0035   0.0000  -0.0790  -0.2440    0.371
+    61  -0.9994   0.5500   0.0268   0.3145   0.0350   0.5718   0.5718   0.0034   0.0000  -0.0790  -0.2440    0.375
+    62  -1.0481   0.5473   0.0267   0.3076   0.0348   0.5621   0.5621   0.0034   0.0000  -0.0790  -0.2440    0.374
+    63  -1.0969   0.5445   0.0265   0.3004   0.0345   0.5516   0.5516   0.0033   0.0000  -0.0790  -0.2440    0.377
+    64  -1.1456   0.5418   0.0264   0.2920   0.0343   0.5390   0.5390   0.0032   0.0000  -0.0790  -0.2440    0.371
+    65  -1.1944   0.5390   0.0263   0.2848   0.0340   0.5284   0.5284   0.0032   0.0000  -0.0790  -0.2440    0.380
+    66  -1.2431   0.5363   0.0261   0.2760   0.0338   0.5147   0.5147   0.0031   0.0000  -0.0790  -0.2440    0.375
+    67  -1.2919   0.5335   0.0260   0.2677   0.0335   0.5017   0.5017   0.0030   0.0000  -0.0790  -0.2440    0.373
+    68  -1.3406   0.5308   0.0259   0.2583   0.0333   0.4867   0.4867   0.0029   0.0000  -0.0790  -0.2440    0.373
+    69  -1.3894   0.5280   0.0257   0.2487   0.0330   0.4711   0.4711   0.0028   0.0000  -0.0790  -0.2440    0.376
+    70  -1.4381   0.5253   0.0256   0.2386   0.0328   0.4542   0.4542   0.0027   0.0000  -0.0790  -0.2440    0.374
+    71  -1.4869   0.5225   0.0255   0.2284   0.0325   0.4371   0.4371   0.0026   0.0000  -0.0790  -0.2440    0.370
+    72  -1.5356   0.5198   0.0253   0.2169   0.0323   0.4172   0.4172   0.0025   0.0000  -0.0790  -0.2440    0.377
+    73  -1.5844   0.5170   0.0252   0.2045   0.0320   0.3956   0.3956   0.0024   0.0000  -0.0790  -0.2440    0.372
+    74  -1.6331   0.5143   0.0251   0.1921   0.0318   0.3736   0.3736   0.0022   0.0000  -0.0790  -0.2440    0.372
+    75  -1.6819   0.5115   0.0249   0.1775   0.0315   0.3471   0.3471   0.0021   0.0000  -0.0790  -0.2440    0.374
+    76  -1.7306   0.5088   0.0248   0.1628   0.0312   0.3199   0.3199   0.0019   0.0000  -0.0790  -0.2440    0.371
+    77  -1.7794   0.5060   0.0247   0.1454   0.0310   0.2873   0.2873   0.0017   0.0000  -0.0790  -0.2440    0.373
+    78  -1.8281   0.5033   0.0245   0.1265   0.0307   0.2514   0.2514   0.0015   0.0000  -0.0790  -0.2440    0.374
+    79  -1.8769   0.5005   0.0244   0.1035   0.0305   0.2068   0.2068   0.0012   0.0000  -0.0790  -0.2440    0.372
+    80  -1.9256   0.4978   0.0243   0.0728   0.0302   0.1463   0.1463   0.0009   0.0000  -0.0790  -0.2440    0.377
+
+  Surface # 3     vertical
+     # Chordwise =  9   # Spanwise = 15     First strip = 81
+     Surface area =    0.200000       Ave. chord =    0.300000
+     CLsurf  =   0.31000     Clsurf  =  -0.04400
+     CYsurf  =   0.00060     Cmsurf  =  -0.06270
+     CDsurf  =   0.00570     Cnsurf  =   0.00090
+     CDisurf =   0.00570     CDvsurf =   0.00000
+
+  Forces referred to Ssurf, Cave about hinge axis thru LE
+     CLsurf  =   0.62000     CDsurf  =   0.01100
+     Deflect =   0.00000     CmLEsurf=  -0.15500
+
+ Strip Forces referred to Strip Area, Chord
+    j      Yle    Chord     Area     c cl      ai      cl_norm  cl       cd       cdv    cm_c/4    cm_LE  C.P.x/c
+    81   0.0650   0.3300   0.0429   0.2181   0.0400   0.6608   0.6608   0.0040   0.0000  -0.0790  -0.2440    0.375
+    82   0.1950   0.3260   0.0424   0.2145   0.0393   0.6580   0.6580   0.0039   0.0000  -0.0790  -0.2440    0.371
+    83   0.3250   0.3220   0.0419   0.2106   0.0387   0.6542   0.6542   0.0039   0.0000  -0.0790  -0.2440    0.372
+    84   0.4550   0.3180   0.0413   0.2058   0.0380   0.6473   0.6473   0.0039   0.0000  -0.0790  -0.2440    0.378
+    85   0.5850   0.3140   0.0408   0.1995   0.0373   0.6355   0.6355   0.0038   0.0000  -0.0790  -0.2440    0.373
+    86   0.7150   0.3100   0.0403   0.1931   0.0367   0.6229   0.6229   0.0037   0.0000  -0.0790  -0.2440    0.376
+    87   0.8450   0.3060   0.0398   0.1853   0.0360   0.6055   0.6055   0.0036   0.0000  -0.0790  -0.2440    0.373
+    88   0.9750   0.3020   0.0393   0.1761   0.0353   0.5830   0.5830   0.0035   0.0000  -0.0790  -0.2440    0.373
+    89   1.1050   0.2980   0.0387   0.1665   0.0347   0.5589   0.5589   0.0034   0.0000  -0.0790  -0.2440    0.373
+    90   1.2350   0.2940   0.0382   0.1551   0.0340   0.5277   0.5277   0.0032   0.0000  -0.0790  -0.2440    0.374
+    91   1.3650   0.2900   0.0377   0.1426   0.0333   0.4918   0.4918   0.0030   0.0000  -0.0790  -0.2440    0.374
+    92   1.4950   0.2860   0.0372   0.1286   0.0327   0.4496   0.4496   0.0027   0.0000  -0.0790  -0.2440    0.372
+    93   1.6250   0.2820   0.0367   0.1114   0.0320   0.3950   0.3950   0.0024   0.0000  -0.0790  -0.2440    0.379
+    94   1.7550   0.2780   0.0361   0.0917   0.0313   0.3300   0.3300   0.0020   0.0000  -0.0790  -0.2440    0.380
+    95   1.8850   0.2740   0.0356   0.0649   0.0307   0.2368   0.2368   0.0014   0.0000  -0.0790  -0.2440    0.380
+
+  Surface # 4     vertical (YDUP)
+     # Chordwise =  9   # Spanwise = 15     First strip = 96
+     Surface area =    0.200000       Ave. chord =    0.300000
+     CLsurf  =   0.31000     Clsurf  =  -0.04400
+     CYsurf  =   0.00060     Cmsurf  =  -0.06270
+     CDsurf  =   0.00570     Cnsurf  =   0.00090
+     CDisurf =   0.00570     CDvsurf =   0.00000
+
+  Forces referred to Ssurf, Cave about hinge axis thru LE
+     CLsurf  =   0.62000     CDsurf  =   0.01100
+     Deflect =   0.00000     CmLEsurf=  -0.15500
+
+ Strip Forces referred to Strip Area, Chord
+    j      Yle    Chord     Area     c cl      ai      cl_norm  cl       cd       cdv    cm_c/4    cm_LE  C.P.x/c
+    96  -0.0650   0.3300   0.0429   0.2181   0.0400   0.6609   0.6609   0.0040   0.0000  -0.0790  -0.2440    0.372
+    97  -0.1950   0.3260   0.0424   0.2148   0.0393   0.6590   0.6590   0.0040   0.0000  -0.0790  -0.2440    0.378
+    98  -0.3250   0.3220   0.0419   0.2107   0.0387   0.6544   0.6544   0.0039   0.0000  -0.0790  -0.2440    0.375
+    99  -0.4550   0.3180   0.0413   0.2055   0.0380   0.6462   0.6462   0.0039   0.0000  -0.0790  -0.2440    0.373
+   100  -0.5850   0.3140   0.0408   0.1996   0.0373   0.6356   0.6356   0.0038   0.0000  -0.0790  -0.2440    0.371
+   101  -0.7150   0.3100   0.0403   0.1930   0.0367   0.6224   0.6224   0.0037   0.0000  -0.0790  -0.2440    0.373
+   102  -0.8450   0.3060   0.0398   0.1853   0.0360   0.6055   0.6055   0.0036   0.0000  -0.0790  -0.2440    0.370
+   103  -0.9750   0.3020   0.0393   0.1765   0.0353   0.5845   0.5845   0.0035   0.0000  -0.0790  -0.2440    0.377
+   104  -1.1050   0.2980   0.0387   0.1666   0.0347   0.5591   0.5591   0.0034   0.0000  -0.0790  -0.2440    0.379
+   105  -1.2350   0.2940   0.0382   0.1555   0.0340   0.5288   0.5288   0.0032   0.0000  -0.0790  -0.2440    0.376
+   106  -1.3650   0.2900   0.0377   0.1424   0.0333   0.4910   0.4910   0.0029   0.0000  -0.0790  -0.2440    0.377
+   107  -1.4950   0.2860   0.0372   0.1281   0.0327   0.4481   0.4481   0.0027   0.0000  -0.0790  -0.2440    0.373
+   108  -1.6250   0.2820   0.0367   0.1118   0.0320   0.3963   0.3963   0.0024   0.0000  -0.0790  -0.2440    0.375
+   109  -1.7550   0.2780   0.0361   0.0915   0.0313   0.3291   0.3291   0.0020   0.0000  -0.0790  -0.2440    0.379
+   110  -1.8850   0.2740   0.0356   0.0650   0.0307   0.2372   0.2372   0.0014   0.0000  -0.0790  -0.2440    0.373
+
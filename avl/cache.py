@@ -0,0 +1,209 @@
+""" AVL Wrapper result cache, stores the parsed results of single cases in
+a SQLite database keyed by a hash of all AVL inputs
+"""
+import atexit
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from avl import default_config
+from avl.workspace import workspace_dir
+
+# changes of the key or value format invalidate all stored results
+CACHE_VERSION = 2
+
+_file_digests = dict()
+
+
+class ResultCache(object):
+    """Size-bounded cache of case results with least-recently-used eviction
+
+    The cache is persistent, results stored by one run are read by the next
+    ones. Sessions only use it if it is given to them, the process-wide
+    cache (see default_cache) is enabled with [cache] Enabled = yes.
+    """
+
+    def __init__(self, path=None, max_size=None, config=default_config):
+        """
+        :param str path: (optional) database file, ':memory:' keeps the
+            cache in memory. Defaults to the configured path, see cache_path
+        :param int max_size: (optional) maximum size of the stored results
+            in bytes
+        :param avlwrapper.Configuration config: (optional) configuration
+        """
+        settings = config['cache']
+        self.path = path or cache_path(config)
+        self.max_size = max_size or settings['max_size']
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path,
+                                           check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, "
+                "value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "last_access REAL NOT NULL)")
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_last_access "
+                "ON results (last_access)")
+
+    def get_many(self, keys):
+        """Looks up results, missing keys are left out of the returned dict
+
+        :param typing.Sequence[str] keys: case keys, see case_key
+        """
+        keys = list(keys)
+        found = dict()
+        with self._lock:
+            for key in keys:
+                row = self._connection.execute(
+                    "SELECT value FROM results WHERE key = ?",
+                    (key,)).fetchone()
+                if row is not None:
+                    found[key] = pickle.loads(row[0])
+            if found:
+                with self._connection:
+                    self._connection.executemany(
+                        "UPDATE results SET last_access = ? WHERE key = ?",
+                        [(time.time(), key) for key in found])
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, key, default=None):
+        return self.get_many([key]).get(key, default)
+
+    def put_many(self, items):
+        """Stores results and evicts the least recently used ones if the
+        cache grows beyond its maximum size
+
+        :param dict items: results by case key
+        """
+        now = time.time()
+        rows = []
+        for key, value in items.items():
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            rows.append((key, sqlite3.Binary(blob), len(blob), now))
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO results (key, value, size, "
+                "last_access) VALUES (?, ?, ?, ?)", rows)
+            self._evict()
+
+    def put(self, key, value):
+        self.put_many({key: value})
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM results")
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    @property
+    def size(self):
+        """Total size of the stored results in bytes"""
+        with self._lock:
+            return self._get_size()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self),
+                'size': self.size}
+
+    def _get_size(self):
+        return self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def _evict(self):
+        excess = self._get_size() - self.max_size
+        if excess <= 0:
+            return
+        evicted = []
+        rows = self._connection.execute(
+            "SELECT key, size FROM results ORDER BY last_access")
+        for key, size in rows:
+            if excess <= 0:
+                break
+            evicted.append((key,))
+            excess -= size
+        self._connection.executemany("DELETE FROM results WHERE key = ?",
+                                     evicted)
+
+
+def case_key(geometry_digest, case, outputs, airfoil_digests=(),
+             parser='legacy'):
+    """Hash of everything AVL uses to compute the results of a case
+
+    The case header is left out, so the key does not depend on the case
+    name or its position in the case file.
+
+    :param str geometry_digest: digest of the serialized geometry,
+        see avlwrapper.Aircraft.digest
+    :param avlwrapper.Case case: AVL case
+    :param dict outputs: requested outputs, name: file extension
+    :param typing.Sequence[str] airfoil_digests: hashes of the airfoil files
+    :param str parser: output parser, the result layout depends on it
+    """
+    _, _, case_body = str(case).partition("\n\n")
+    key = hashlib.sha256()
+    for part in (str(CACHE_VERSION), parser, geometry_digest, case_body,
+                 repr(sorted(outputs.items())), *airfoil_digests):
+        key.update(part.encode())
+        key.update(b"\0")
+    return key.hexdigest()
+
+
+def cache_path(config=default_config):
+    """Database file of the configuration, a relative [cache] Path is placed
+    in the workspace directory and not in the working directory"""
+    path = config['cache']['path']
+    if path == ':memory:' or os.path.isabs(path):
+        return path
+    return os.path.join(workspace_dir(config), path)
+
+
+def file_digest(path):
+    """Hash of the file content, memoized while the file is unchanged"""
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    if path in _file_digests and _file_digests[path][0] == signature:
+        return _file_digests[path][1]
+    with open(path, 'rb') as fp:
+        digest = hashlib.sha256(fp.read()).hexdigest()
+    _file_digests[path] = (signature, digest)
+    return digest
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def default_cache(config=default_config):
+    """Process-wide result cache, None if disabled in the configuration"""
+    global _default_cache
+    if not config['cache']['enabled']:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache(config=config)
+            atexit.register(_default_cache.close)
+    return _default_cache
@@ -25,6 +25,7 @@ else:
 
 CONFIG_FILE = 'config.cfg'
 MODULE_DIR = os.path.dirname(__file__)
+PROJECT_DIR = os.path.dirname(os.path.abspath(MODULE_DIR))
 
 
 class Configuration(object):
@@ -68,11 +69,56 @@ class Configuration(object):
         show_output = parser['environment']['printoutput']
         settings['show_stdout'] = show_output == 'yes'
 
+        # Output read from files or from the stdout pipe
+        settings['output_mode'] = _get_str(parser, 'environment',
+                                           'outputmode', 'files')
+
+        # Output parser: legacy (lists) or numpy (tables as numpy arrays)
+        settings['parser'] = _get_str(parser, 'environment', 'parser',
+                                      'legacy')
+
+        # Airfoil coordinate files, relative paths start at the project
+        # directory and not at the working directory
+        airfoil_dir = _get_str(parser, 'environment', 'airfoildirectory',
+                               os.path.join('MDO', 'airfoils',
+                                            'coord_seligFmt'))
+        settings['airfoil_dir'] = os.path.join(PROJECT_DIR, airfoil_dir)
+
         # Output files
         settings['output'] = {k: v
                               for k, v in parser['output'].items()
                               if v == 'yes'}
 
+        # Worker pool, missing in configuration files of older versions
+        settings['pool'] = {
+            # 0 workers uses one AVL process per CPU
+            'workers': (_get_int(parser, 'pool', 'workers', 0)
+                        or os.cpu_count() or 1),
+            'max_jobs': _get_int(parser, 'pool', 'maxjobs', 500),
+            # a timeout of 0 disables the time limit
+            'timeout': _get_int(parser, 'pool', 'timeout', 300) or None}
+
+        # Watchdog, 0 disables a limit. Memory in MB
+        memory = _get_int(parser, 'watchdog', 'memory', 0)
+        abort = _get_str(parser, 'watchdog', 'abortonfailure', 'no')
+        settings['watchdog'] = {
+            'case_timeout': (_get_int(parser, 'watchdog', 'casetimeout', 0)
+                             or None),
+            'abort_on_failure': abort == 'yes',
+            'cpu_time': _get_int(parser, 'watchdog', 'cputime', 0) or None,
+            'memory': memory * 2 ** 20 or None}
+
+        # Workspace of the AVL runs: auto (/dev/shm if available), tmp or
+        # a directory path
+        settings['workspace'] = {
+            'directory': _get_str(parser, 'workspace', 'directory', 'auto')}
+
+        # Result cache, max size in MB
+        settings['cache'] = {
+            'enabled': _get_str(parser, 'cache', 'enabled', 'no') == 'yes',
+            'path': _get_str(parser, 'cache', 'path', 'avl_cache.sqlite'),
+            'max_size': _get_int(parser, 'cache', 'maxsize', 256) * 2 ** 20}
+
         return settings
 
     def local_copy(self, target=os.getcwd()):
@@ -121,6 +167,18 @@ def check_bin(bin_path, error_msg=""):
     raise FileNotFoundError(error_msg)
 
 
+def _get_int(parser, section, option, default):
+    if parser.has_section(section) and parser.has_option(section, option):
+        return int(parser.get(section, option))
+    return default
+
+
+def _get_str(parser, section, option, default):
+    if parser.has_section(section) and parser.has_option(section, option):
+        return parser.get(section, option)
+    return default
+
+
 def get_ghostscript(bin_path):
     try:
         return check_bin(bin_path)
@@ -0,0 +1,208 @@
+""" AVL Wrapper fast output readers
+
+Strip, element and surface output is read in a single pass over the lines
+with precompiled patterns. Strip and element tables are returned as numpy
+column arrays instead of lists, e.g. results['Wing']['cl'] is an ndarray.
+"""
+import re
+import warnings
+
+import numpy as np
+
+from avl.output import FileReader, OutputReader
+
+SURFACE_RE = re.compile(r"Surface\s+#\s*\d+\s+(.*)")
+STRIP_RE = re.compile(r"Strip\s+#\s*(\d+)\s")
+YDUP = "(YDUP)"
+OVERFLOW = "*" * 8
+# an overflowing value fills its field with asterisks, 8 or more
+OVERFLOW_RE = re.compile(r"\*{8,}")
+
+
+def _to_columns(header, rows, ignore_first=True):
+    """Converts table rows to a dict of contiguous column arrays"""
+    text = " ".join(rows)
+    if OVERFLOW in text:
+        warnings.warn("Warning: AVL returned unreadable output\n"
+                      "Most likely the value contained more characters "
+                      "than the AVL output formatter supports")
+        text = OVERFLOW_RE.sub(" nan ", text)
+    values = np.array(text.split(), dtype=float)
+
+    n_columns = len(header) + 1 if ignore_first else len(header)
+    if values.size != len(rows) * n_columns:
+        raise ValueError("Incorrect table format")
+    table = values.reshape(len(rows), n_columns)
+    if ignore_first:
+        table = table[:, 1:]
+    # transposed copy, every column is contiguous in memory
+    columns = np.array(table.T)
+    return dict(zip(header, columns))
+
+
+def _base_name(name):
+    return name.replace(YDUP, "").strip()
+
+
+class FastStripFileReader(FileReader):
+    HEADER_RE = re.compile(r"j\s+Yle\s+Chord")
+
+    def parse(self):
+        tables = self.get_tables()
+        strip_results = dict()
+        # sort so (YDUP) surfaces are always behind the main surface
+        for name in sorted(tables.keys()):
+            header, rows = tables[name]
+            columns = _to_columns(header, rows)
+            if YDUP in name:
+                base = strip_results[_base_name(name)]
+                for key, values in columns.items():
+                    base[key] = np.concatenate((base[key], values))
+            else:
+                strip_results[name] = columns
+        return strip_results
+
+    def get_tables(self):
+        # first table of every surface, ending at an empty line
+        tables = dict()
+        name = None
+        next_line_name = False
+        rows = None
+        for line in self.lines:
+            if rows is not None:
+                if line.strip():
+                    rows.append(line)
+                    continue
+                rows = None
+            match = SURFACE_RE.search(line)
+            if match is not None:
+                name = match.group(1).strip()
+                next_line_name = not name
+            elif next_line_name:
+                name = line.strip()
+                next_line_name = False
+            elif (name is not None and name not in tables
+                  and self.HEADER_RE.search(line) is not None):
+                rows = []
+                tables[name] = (self.extract_header([line]), rows)
+        return tables
+
+
+class FastElementFileReader(FileReader):
+    HEADER_RE = re.compile(r"I\s+X\s+Y\s+Z")
+
+    def parse(self):
+        tables, rows = self.get_tables()
+        headers = {header for surface_tables in tables.values()
+                   for header, _, _ in surface_tables.values()}
+        if len(headers) == 1:
+            # all rows are converted at once, strips get views of the columns
+            all_columns = _to_columns(list(headers.pop()), rows)
+        else:
+            all_columns = None
+
+        element_results = dict()
+        # sort so (YDUP) surfaces are always behind the main surface
+        for name in sorted(tables.keys()):
+            if YDUP in name:
+                surface_results = element_results[_base_name(name)]
+            else:
+                surface_results = element_results[name] = dict()
+            for strip, (header, start, end) in tables[name].items():
+                if all_columns is not None:
+                    surface_results[strip] = {
+                        key: values[start:end]
+                        for key, values in all_columns.items()}
+                else:
+                    surface_results[strip] = _to_columns(list(header),
+                                                         rows[start:end])
+        return element_results
+
+    def get_tables(self):
+        # one table per strip, ending at an empty line. Returns the row
+        # range of every table in the list of all rows
+        tables = dict()
+        rows = []
+        surface_tables = None
+        strip = None
+        next_line_name = False
+        in_table = False
+        # all strips share the same header line
+        headers = dict()
+        for line in self.lines:
+            if in_table:
+                if line.strip():
+                    rows.append(line)
+                    continue
+                in_table = False
+                header, start, _ = surface_tables[strip]
+                surface_tables[strip] = (header, start, len(rows))
+            match = STRIP_RE.search(line)
+            if match is not None:
+                strip = int(match.group(1))
+                continue
+            match = SURFACE_RE.search(line)
+            if match is not None:
+                name = match.group(1).strip()
+                next_line_name = not name
+                if name:
+                    surface_tables = tables.setdefault(name, dict())
+                strip = None
+            elif next_line_name:
+                surface_tables = tables.setdefault(line.strip(), dict())
+                next_line_name = False
+            elif (strip is not None
+                  and self.HEADER_RE.search(line) is not None):
+                in_table = True
+                if line not in headers:
+                    headers[line] = tuple(self.extract_header([line]))
+                header = headers[line]
+                surface_tables[strip] = (header, len(rows), len(rows))
+        if in_table:
+            header, start, _ = surface_tables[strip]
+            surface_tables[strip] = (header, start, len(rows))
+        return tables, rows
+
+
+class FastSurfaceFileReader(FileReader):
+    HEADER_RE = re.compile(r"n\s+Area\s+CL")
+
+    def parse(self):
+        header = None
+        surface_data = dict()
+        for line in self.lines:
+            if header is None:
+                if self.HEADER_RE.search(line) is not None:
+                    header = self.extract_header([line])
+                continue
+            if not line.strip():
+                break
+
+            # numbers first, followed by the surface name
+            tokens = line.split()
+            n_values = len(header) + 1
+            if len(tokens) <= n_values:
+                raise ValueError("Incorrect table format")
+            values = [float("nan") if OVERFLOW_RE.fullmatch(token)
+                      else float(token) for token in tokens[1:n_values]]
+            name = " ".join(tokens[n_values:])
+
+            # Combine surfaces labeled with (YDUP)
+            if YDUP in name:
+                base_data = surface_data[_base_name(name)]
+                for key, value in zip(header, values):
+                    base_data[key] += value
+            else:
+                surface_data[name] = dict(zip(header, values))
+        return surface_data
+
+
+class FastOutputReader(OutputReader):
+    """OutputReader using the fast readers where available"""
+
+    _reader_classes = dict(OutputReader._reader_classes)
+    _reader_classes.update({
+        ".fs": FastStripFileReader,
+        ".fe": FastElementFileReader,
+        ".fn": FastSurfaceFileReader,
+    })
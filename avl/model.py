@@ -1,8 +1,11 @@
 from abc import ABC
-from collections import defaultdict, namedtuple
-from dataclasses import dataclass, field
+from collections import OrderedDict, defaultdict, namedtuple
+from dataclasses import dataclass, field, fields
 from enum import Enum, IntEnum, auto
+import hashlib
+import math
 import re
+import threading
 from typing import Iterable, List, Optional, Union
 import warnings
 
@@ -85,6 +88,79 @@ class ModelInput(Input, ABC):
         return kwargs
 
 
+# Rendered text of the geometry objects, shared between equal objects so a new
+# aircraft only renders the surfaces and sections that changed
+RENDER_CACHE_SIZE = 4096
+_render_cache = OrderedDict()
+_render_cache_lock = threading.Lock()
+
+
+def _value_key(value):
+    """Key of a field value, equal keys give the same text"""
+    if isinstance(value, RenderedInput):
+        return value.render_key
+    if isinstance(value, (tuple, list)):
+        return type(value), tuple(map(_value_key, value))
+    if isinstance(value, float):
+        # 0.0 == -0.0 but they are written differently
+        return float, value, math.copysign(1.0, value)
+    # the type keeps 1 and 1.0 (or Spacing.cosine) apart
+    return type(value), value
+
+
+class RenderedInput(ModelInput, ABC):
+    """Immutable model input, the AVL text is rendered once
+
+    Subclasses are frozen dataclasses and implement `_render`. The text is
+    memoized on the object and in a cache keyed by value, so equal objects
+    (e.g. an unchanged surface of a new aircraft) are not rendered again.
+    """
+
+    def _render(self):
+        raise NotImplementedError
+
+    @property
+    def render_key(self):
+        """Hashable key of all values used in the text"""
+        key = self.__dict__.get("_render_key")
+        if key is None:
+            key = (type(self), *(_value_key(getattr(self, f.name)) for f in fields(self)))
+            object.__setattr__(self, "_render_key", key)
+        return key
+
+    def __str__(self):
+        text = self.__dict__.get("_text")
+        if text is None:
+            key = self.render_key
+            with _render_cache_lock:
+                text = _render_cache.get(key)
+                if text is not None:
+                    _render_cache.move_to_end(key)
+            if text is None:
+                text = self._render()
+                with _render_cache_lock:
+                    _render_cache[key] = text
+                    if len(_render_cache) > RENDER_CACHE_SIZE:
+                        _render_cache.popitem(last=False)
+            object.__setattr__(self, "_text", text)
+        return text
+
+    @property
+    def digest(self):
+        """SHA-256 of the rendered text, stable between runs"""
+        digest = self.__dict__.get("_digest")
+        if digest is None:
+            digest = hashlib.sha256(str(self).encode()).hexdigest()
+            object.__setattr__(self, "_digest", digest)
+        return digest
+
+
+def _to_tuple(obj, *names):
+    # frozen dataclasses are hashable only with immutable fields
+    for name in names:
+        object.__setattr__(obj, name, tuple(getattr(obj, name)))
+
+
 Spacial = namedtuple("Spacial", ["x", "y", "z"])
 Spacial.__str__ = lambda self: f"{self.x} {self.y} {self.z}"
 
@@ -114,8 +190,8 @@ class Symmetry(IntStrEnum):
 # the NacaAirfoil, DataAirfoil, etc. classes to solve the issue with attribute
 # ordering with default values in parent classes.
 # Explanation: https://stackoverflow.com/a/53085935
-@dataclass
-class Airfoil(ModelInput, ABC):
+@dataclass(frozen=True)
+class Airfoil(RenderedInput, ABC):
     """
     Airfoil object, not to be instantiated directly
 
@@ -130,13 +206,13 @@ class Airfoil(ModelInput, ABC):
     def af_type(self):
         raise NotImplementedError
 
-    def __str__(self):
+    def _render(self):
         s = (
             f"{self.af_type.upper()} "
             f"{optional_str(self.x1)} {optional_str(self.x2)}\n"
         )
-        # Because of MRO, super().__str__() will be called on the classes below
-        return s + super().__str__()
+        # _data_str is implemented by the classes below
+        return s + self._data_str()
 
     @staticmethod
     def read_x1_x2(in_str):
@@ -150,33 +226,36 @@ class Airfoil(ModelInput, ABC):
             raise InputError(in_str)
 
 
-@dataclass
+@dataclass(frozen=True)
 class _NacaAirfoil:
     naca: str
 
-    def __str__(self):
+    def _data_str(self):
         return f"{self.naca}\n"
 
 
-@dataclass
+@dataclass(frozen=True)
 class _DataAirfoil:
     x_data: List[float]
     z_data: List[float]
 
-    def __str__(self):
+    def __post_init__(self):
+        _to_tuple(self, "x_data", "z_data")
+
+    def _data_str(self):
         s = "\n".join([f"{x} {z}" for x, z in zip(self.x_data, self.z_data)])
         return s + "\n"
 
 
-@dataclass
+@dataclass(frozen=True)
 class _FileAirfoil:
     filename: str
 
-    def __str__(self):
+    def _data_str(self):
         return f"{self.filename}\n"
 
 
-@dataclass
+@dataclass(frozen=True)
 class NacaAirfoil(Airfoil, _NacaAirfoil):
     """
     NACA 4-digit airfoil
@@ -201,7 +280,7 @@ class NacaAirfoil(Airfoil, _NacaAirfoil):
         return cls(naca, x1, x2)
 
 
-@dataclass
+@dataclass(frozen=True)
 class DataAirfoil(Airfoil, _DataAirfoil):
     """
     Airfoil defined with x and z ordinates
@@ -228,7 +307,7 @@ class DataAirfoil(Airfoil, _DataAirfoil):
         return cls(list(xs), list(zs), x1, x2)
 
 
-@dataclass
+@dataclass(frozen=True)
 class FileAirfoil(Airfoil, _FileAirfoil):
     """
     Airfoil defined from .dat file
@@ -251,7 +330,7 @@ class FileAirfoil(Airfoil, _FileAirfoil):
         return cls(filename, x1, x2)
 
 
-@dataclass
+@dataclass(frozen=True)
 class BodyProfile(FileAirfoil):
     """
     Body profile from .dat file
@@ -266,8 +345,8 @@ class BodyProfile(FileAirfoil):
         return "bfile"
 
 
-@dataclass
-class Control(ModelInput):
+@dataclass(frozen=True)
+class Control(RenderedInput):
     """
     Adds a control surface hinge point to a section.
     Note that two adjacent sections need to contain a control to define
@@ -287,7 +366,7 @@ class Control(ModelInput):
     duplicate_sign: int
     hinge_vector: Vector = Vector(0, 0, 0)
 
-    def __str__(self):
+    def _render(self):
         return (
             "CONTROL\n#Name Gain XHinge Vector SgnDup\n"
             + f"{self.name} {self.gain} {self.x_hinge} "
@@ -317,8 +396,8 @@ class Control(ModelInput):
         )
 
 
-@dataclass
-class DesignVar(ModelInput):
+@dataclass(frozen=True)
+class DesignVar(RenderedInput):
     """
     Defines a design variable on the section local inflow angle
     Used to solve for a twist distribution
@@ -330,7 +409,7 @@ class DesignVar(ModelInput):
     name: str
     weight: float
 
-    def __str__(self):
+    def _render(self):
         return f"DESIGN\n#Name Weight\n{self.name} {self.weight}\n"
 
     @classmethod
@@ -341,8 +420,8 @@ class DesignVar(ModelInput):
         return cls(name=params[0], weight=float(params[1]))
 
 
-@dataclass
-class ProfileDrag(ModelInput):
+@dataclass(frozen=True)
+class ProfileDrag(RenderedInput):
     """
     Specifies a simple profile-drag CD(CL) function.
     The function is parabolic between CL1..CL2 and
@@ -361,8 +440,9 @@ class ProfileDrag(ModelInput):
             raise ValueError(
                 "Invalid profile drag parameters (should be of 3 CLs and 3 CDs"
             )
+        _to_tuple(self, "cl", "cd")
 
-    def __str__(self):
+    def _render(self):
         header = "CDCL\n"
         body = " ".join([f"{cl} {cd}" for cl, cd in zip(self.cl, self.cd)])
         return header + body + "\n"
@@ -377,8 +457,8 @@ class ProfileDrag(ModelInput):
         return cls(cl=params[:3], cd=params[3:])
 
 
-@dataclass
-class Section(ModelInput):
+@dataclass(frozen=True)
+class Section(RenderedInput):
     """
     Wing surface section to be used in a Surface object.
 
@@ -435,7 +515,10 @@ class Section(ModelInput):
             body_str += f"CLAF\n{self.cl_alpha_scaling}\n"
         return body_str
 
-    def __str__(self):
+    def __post_init__(self):
+        _to_tuple(self, "controls", "design_vars")
+
+    def _render(self):
         return self._header_str + self._body_str
 
     @classmethod
@@ -461,8 +544,8 @@ class Section(ModelInput):
         return cls(**kwargs)
 
 
-@dataclass
-class Surface(ModelInput):
+@dataclass(frozen=True)
+class Surface(RenderedInput):
     """
     Wing surface
 
@@ -509,6 +592,7 @@ class Surface(ModelInput):
     def __post_init__(self):
         if len(self.sections) < 2:
             raise ValueError("At least two sections are needed")
+        _to_tuple(self, "sections")
 
     @property
     def _header_str(self):
@@ -541,7 +625,7 @@ class Surface(ModelInput):
         s += optional_str(self.profile_drag)
         return s
 
-    def __str__(self):
+    def _render(self):
         return "".join([self._header_str, self._options_str, *map(str, self.sections)])
 
     @classmethod
@@ -587,8 +671,8 @@ class Surface(ModelInput):
         return cls(**kwargs)
 
 
-@dataclass
-class Body(ModelInput):
+@dataclass(frozen=True)
+class Body(RenderedInput):
     """Non-lifting body of revolution
 
     :param str name: body name
@@ -608,7 +692,7 @@ class Body(ModelInput):
     scaling: Optional[Vector] = None
     translation: Optional[Vector] = None
 
-    def __str__(self):
+    def _render(self):
         s = (
             f"BODY\n{self.name}\n#NBody BSpace\n"
             + f"{self.n_body} {self.body_spacing}\n"
@@ -621,6 +705,7 @@ class Body(ModelInput):
             s += f"SCALE\n{self.scaling}\n"
         if self.translation is not None:
             s += f"TRANSLATE\n{self.translation}\n"
+        return s
 
     @classmethod
     def from_lines(cls, lines_in):
@@ -639,8 +724,8 @@ class Body(ModelInput):
         return cls(**kwargs)
 
 
-@dataclass
-class Aircraft(ModelInput):
+@dataclass(frozen=True)
+class Aircraft(RenderedInput):
     """
     Aircraft object, top level object representing the whole model
 
@@ -671,7 +756,10 @@ class Aircraft(ModelInput):
     z_symmetry: Symmetry = Symmetry.none
     z_symmetry_plane: float = 0.0
 
-    def __str__(self):
+    def __post_init__(self):
+        _to_tuple(self, "surfaces", "bodies")
+
+    def _render(self):
         return "\n".join(
             [
                 f"{self.name}",
@@ -887,13 +975,17 @@ class Case(Input):
 
         :param kwargs: key-value pairs
             keys should be Case.CASE_PARAMETERS, Case.CASE_STATES or a control.
-            values should be a numeric value or a Parameter object
+            values should be a numeric value or a Parameter object.
+            The key 'outputs' sets the outputs of the case, a sequence of
+            Session.OUTPUTS names. By default the configured outputs are used.
         """
         self.name = name
         if "number" in kwargs:
             self.number = kwargs.pop("number")
         else:
             self.number = 1
+        outputs = kwargs.pop("outputs", None)
+        self.outputs = tuple(outputs) if outputs is not None else None
         self.parameters = self._set_default_parameters()
         self.states = self._set_default_states()
 
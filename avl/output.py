@@ -11,6 +11,12 @@ class FileReader:
         else:
             raise FileNotFoundError(file_path)
 
+    @classmethod
+    def from_lines(cls, lines):
+        reader = cls.__new__(cls)
+        reader.lines = list(lines)
+        return reader
+
     def parse(self):
         raise NotImplementedError
 
@@ -324,5 +330,69 @@ class OutputReader:
             warnings.warn(f"Unknown output file: {file_path}")
             self.reader = GenericReader(file_path)
 
+    @classmethod
+    def from_lines(cls, lines, extension):
+        """Reads output which is not stored in a file
+
+        :param typing.Sequence[str] lines: output lines
+        :param str extension: output file extension, e.g. ".ft"
+        """
+        output_reader = cls.__new__(cls)
+        if extension in cls._reader_classes:
+            reader_class = cls._reader_classes[extension]
+        else:
+            warnings.warn(f"Unknown output type: {extension}")
+            reader_class = GenericReader
+        output_reader.reader = reader_class.from_lines(lines)
+        return output_reader
+
     def get_content(self):
         return self.reader.parse()
+
+
+class PipeReader:
+    """Reads AVL screen output line by line. Every output command asks for a
+    file name, the output printed after the prompt up to the next menu
+    prompt is parsed as soon as it is complete."""
+
+    FILENAME_PROMPT = "Enter filename, or <return> for screen output"
+    MENU_PROMPT = "c>"
+
+    def __init__(self, extensions, reader_class=OutputReader):
+        """
+        :param typing.Sequence[str] extensions: output file extensions in
+            the order the output commands are sent, e.g. [".ft", ".st"]
+        :param type reader_class: (optional) OutputReader or a subclass
+        """
+        self.extensions = list(extensions)
+        self.reader_class = reader_class
+        self.contents = []
+        self._block = None
+
+    def feed(self, line):
+        if self._block is None:
+            if self.FILENAME_PROMPT in line:
+                # output starts on the prompt line, after the "s>" marker
+                _, _, rest = line.partition(self.FILENAME_PROMPT)
+                _, _, rest = rest.partition(">")
+                self._block = [rest] if rest.strip() else []
+        elif self.MENU_PROMPT in line:
+            self._parse_block()
+        else:
+            self._block.append(line)
+
+    def get_contents(self):
+        if self._block is not None:
+            self._parse_block()
+        if len(self.contents) != len(self.extensions):
+            raise ValueError(f"Expected {len(self.extensions)} outputs, "
+                             f"AVL returned {len(self.contents)}")
+        return self.contents
+
+    def _parse_block(self):
+        idx = len(self.contents)
+        if idx < len(self.extensions):
+            reader = self.reader_class.from_lines(self._block,
+                                                  self.extensions[idx])
+            self.contents.append(reader.get_content())
+        self._block = None
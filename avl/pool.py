@@ -0,0 +1,391 @@
+""" AVL Wrapper worker pool, keeps AVL processes alive between sessions
+"""
+import asyncio
+import atexit
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from tempfile import mkdtemp
+
+from avl import default_config
+from avl.watchdog import AVLProcessError, Watchdog, get_preexec_fn
+from avl.workspace import workspace_dir
+
+
+class Worker(object):
+    """Long-lived AVL process which accepts repeated command streams.
+
+    Every command stream has to leave AVL at its top-level menu. The end of
+    a stream is detected by sending an unknown command (the sentinel) which
+    AVL echoes back as "<cmd> command not recognized".
+    """
+    SENTINEL = 'sync'
+    SENTINEL_REPLY = 'command not recognized'
+
+    def __init__(self, avl_bin, working_dir=None, parent_dir=None,
+                 cpu_time=None, memory=None):
+        """
+        :param str avl_bin: path to the AVL executable
+        :param str working_dir: (optional) directory the process runs in,
+            defaults to a new temporary directory
+        :param str parent_dir: (optional) directory in which the temporary
+            directory is created
+        :param int cpu_time: (optional) CPU seconds the process may use over
+            its lifetime
+        :param int memory: (optional) memory limit of the process in bytes
+        """
+        self.avl_bin = avl_bin
+        self.cpu_time = cpu_time
+        self.memory = memory
+        self._owns_dir = working_dir is None
+        self.working_dir = working_dir or mkdtemp(prefix='avl_',
+                                                  dir=parent_dir)
+        self.jobs = 0
+        self.last_used = time.monotonic()
+
+        self._process = None
+        self._lines = None
+        self._reader = None
+
+    def start(self, timeout=None):
+        # gfortran buffers stdout when it is not a terminal, the sentinel
+        # reply would never reach the pipe without this
+        env = dict(os.environ, GFORTRAN_UNBUFFERED_PRECONNECTED='y')
+        self._process = subprocess.Popen(args=[self.avl_bin],
+                                         stdin=subprocess.PIPE,
+                                         stdout=subprocess.PIPE,
+                                         stderr=subprocess.STDOUT,
+                                         cwd=self.working_dir,
+                                         env=env,
+                                         preexec_fn=self._preexec_fn)
+        # stdout is drained continuously so AVL never blocks on a full pipe
+        self._lines = queue.Queue()
+        self._reader = threading.Thread(target=_read_lines,
+                                        args=(self._process.stdout,
+                                              self._lines),
+                                        daemon=True)
+        self._reader.start()
+        # consume the banner and make sure the executable responds
+        self.ping(timeout=timeout)
+        return self
+
+    def is_alive(self):
+        return self._process is not None and self._process.poll() is None
+
+    def ping(self, timeout=None):
+        """Round trip through the AVL prompt, raises if AVL does not answer"""
+        self._write(self.SENTINEL + "\n")
+        self._read_until_sentinel(Watchdog(timeout=timeout))
+        self.last_used = time.monotonic()
+
+    def run(self, cmds, timeout=None, line_fn=None, watchdog=None):
+        """Sends a command stream and waits until AVL has processed it
+
+        :param str cmds: AVL commands, ending at the top-level menu
+        :param float timeout: (optional) time limit in seconds
+        :param typing.Callable line_fn: (optional) called with every stdout
+            line as soon as it is read
+        :param avlwrapper.Watchdog watchdog: (optional) checks the output
+            and time budgets, replaces timeout
+        :return: AVL stdout lines produced by the commands
+        """
+        if watchdog is None:
+            watchdog = Watchdog(timeout=timeout)
+        self._write(cmds + self.SENTINEL + "\n")
+        lines = self._read_until_sentinel(watchdog, line_fn)
+        self.jobs += 1
+        self.last_used = time.monotonic()
+        return lines
+
+    def clear(self):
+        """Removes all files of the previous job from the working directory"""
+        for name in os.listdir(self.working_dir):
+            path = os.path.join(self.working_dir, name)
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+
+    def close(self, timeout=5):
+        if self._process is not None:
+            if self.is_alive():
+                try:
+                    self._write("quit\n")
+                    self._process.wait(timeout=timeout)
+                except (OSError, subprocess.TimeoutExpired):
+                    self.kill()
+            # the reader stops at the end of the stream of the exited process
+            self._reader.join(timeout=timeout)
+            self._process.stdout.close()
+            self._process = None
+        if self._owns_dir:
+            shutil.rmtree(self.working_dir, ignore_errors=True)
+
+    def kill(self):
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
+
+    def _write(self, cmds):
+        if not self.is_alive():
+            raise AVLProcessError("AVL process is not running")
+        self._process.stdin.write(cmds.encode())
+        self._process.stdin.flush()
+
+    @property
+    def _preexec_fn(self):
+        return get_preexec_fn(cpu_time=self.cpu_time, memory=self.memory)
+
+    def _is_sentinel(self, line):
+        line = line.lower()
+        return self.SENTINEL in line and self.SENTINEL_REPLY in line
+
+    def _read_until_sentinel(self, watchdog, line_fn=None):
+        watchdog.start()
+        lines = []
+        while True:
+            try:
+                line = self._lines.get(timeout=watchdog.remaining())
+            except queue.Empty:
+                # a stuck AVL is killed, the worker can not be reused
+                self.kill()
+                raise watchdog.timeout_error()
+            if line is None:
+                raise AVLProcessError("AVL process exited unexpectedly")
+            if self._is_sentinel(line):
+                return lines
+            lines.append(line)
+            try:
+                watchdog.check(line)
+                if line_fn is not None:
+                    line_fn(line)
+            except BaseException:
+                # AVL is left in the middle of the command stream
+                self.kill()
+                raise
+
+
+class AsyncWorker(Worker):
+    """Worker driven from an asyncio event loop, the methods which talk to
+    AVL are coroutines"""
+
+    async def start(self, timeout=None):
+        env = dict(os.environ, GFORTRAN_UNBUFFERED_PRECONNECTED='y')
+        self._process = await asyncio.create_subprocess_exec(
+            self.avl_bin,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            cwd=self.working_dir,
+            env=env,
+            preexec_fn=self._preexec_fn)
+        await self.ping(timeout=timeout)
+        return self
+
+    def is_alive(self):
+        return (self._process is not None
+                and self._process.returncode is None)
+
+    async def ping(self, timeout=None):
+        await self._write(self.SENTINEL + "\n")
+        await self._read_until_sentinel(Watchdog(timeout=timeout))
+        self.last_used = time.monotonic()
+
+    async def run(self, cmds, timeout=None, line_fn=None, watchdog=None):
+        if watchdog is None:
+            watchdog = Watchdog(timeout=timeout)
+        await self._write(cmds + self.SENTINEL + "\n")
+        lines = await self._read_until_sentinel(watchdog, line_fn)
+        self.jobs += 1
+        self.last_used = time.monotonic()
+        return lines
+
+    async def close(self, timeout=5):
+        if self._process is not None:
+            if self.is_alive():
+                try:
+                    await self._write("quit\n")
+                    await asyncio.wait_for(self._process.wait(), timeout)
+                except (OSError, asyncio.TimeoutError):
+                    await self.kill()
+            self._process = None
+        if self._owns_dir:
+            shutil.rmtree(self.working_dir, ignore_errors=True)
+
+    async def kill(self):
+        if self.is_alive():
+            self._process.kill()
+            await self._process.wait()
+
+    async def _write(self, cmds):
+        if not self.is_alive():
+            raise AVLProcessError("AVL process is not running")
+        self._process.stdin.write(cmds.encode())
+        await self._process.stdin.drain()
+
+    async def _read_until_sentinel(self, watchdog, line_fn=None):
+        watchdog.start()
+        lines = []
+        while True:
+            try:
+                line = await asyncio.wait_for(self._process.stdout.readline(),
+                                              watchdog.remaining())
+            except asyncio.TimeoutError:
+                await self.kill()
+                raise watchdog.timeout_error()
+            if not line:
+                raise AVLProcessError("AVL process exited unexpectedly")
+            line = line.decode(errors='replace')
+            if self._is_sentinel(line):
+                return lines
+            lines.append(line)
+            try:
+                watchdog.check(line)
+                if line_fn is not None:
+                    line_fn(line)
+            except BaseException:
+                await self.kill()
+                raise
+
+
+class WorkerPool(object):
+    """Pool of warm AVL processes which sessions borrow and give back"""
+
+    # idle workers are pinged before reuse after this many seconds
+    HEALTH_CHECK_INTERVAL = 30.0
+
+    def __init__(self, size=None, config=default_config, max_jobs=None,
+                 timeout=None):
+        """
+        :param int size: (optional) maximum number of AVL processes
+        :param avlwrapper.Configuration config: (optional) configuration
+        :param int max_jobs: (optional) jobs after which a process
+            is recycled
+        :param float timeout: (optional) time limit of a single job
+        """
+        settings = config['pool']
+        self.config = config
+        self.size = size or settings['workers']
+        self.max_jobs = max_jobs or settings['max_jobs']
+        self.timeout = timeout or settings['timeout']
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._closed = False
+
+    def acquire(self):
+        """Borrows a healthy worker, blocks while all workers are busy"""
+        if self._closed:
+            raise AVLProcessError("Worker pool is closed")
+        self._slots.acquire()
+        try:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return self._spawn()
+            if self._is_healthy(worker):
+                return worker
+            worker.close()
+            return self._spawn()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, worker, recycle=False):
+        """Gives a worker back, broken or worn out workers are recycled"""
+        try:
+            if (recycle or self._closed or not worker.is_alive()
+                    or worker.jobs >= self.max_jobs):
+                worker.close()
+            else:
+                self._idle.put(worker)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def worker(self):
+        worker = self.acquire()
+        try:
+            yield worker
+        except BaseException:
+            self.release(worker, recycle=True)
+            raise
+        self.release(worker)
+
+    def run(self, cmds, pre_fn, post_fn):
+        """Runs a command stream on a borrowed worker, see Session.run_avl"""
+        with self.worker() as worker:
+            worker.clear()
+            pre_fn(worker.working_dir)
+            worker.run(cmds, timeout=self.timeout)
+            return post_fn(worker.working_dir)
+
+    def recycle(self):
+        """Closes all idle workers, new ones are started on demand"""
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.close()
+
+    def close(self):
+        self._closed = True
+        self.recycle()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _spawn(self):
+        if 'avl_bin' not in self.config.settings:
+            raise FileNotFoundError("AVL not found or not executable,"
+                                    " check the configuration file")
+        limits = self.config['watchdog']
+        worker = Worker(self.config['avl_bin'],
+                        parent_dir=workspace_dir(self.config),
+                        cpu_time=limits['cpu_time'], memory=limits['memory'])
+        try:
+            return worker.start(timeout=self.timeout)
+        except Exception:
+            worker.kill()
+            worker.close()
+            raise
+
+    def _is_healthy(self, worker):
+        if not worker.is_alive():
+            return False
+        idle_time = time.monotonic() - worker.last_used
+        if idle_time > self.HEALTH_CHECK_INTERVAL:
+            try:
+                worker.ping(timeout=self.timeout)
+            except AVLProcessError:
+                return False
+        return True
+
+
+def _read_lines(stream, lines):
+    for line in iter(stream.readline, b''):
+        lines.put(line.decode(errors='replace'))
+    # end of stream
+    lines.put(None)
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def default_pool(config=default_config):
+    """Process-wide worker pool, created on first use"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = WorkerPool(config=config)
+            atexit.register(_default_pool.close)
+    return _default_pool
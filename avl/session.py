@@ -1,14 +1,24 @@
 """ AVL Wrapper session and input classes
 """
+import asyncio
+import copy
 import glob
 import os
-import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import (AsyncExitStack, ExitStack, asynccontextmanager,
+                        contextmanager)
 from tempfile import TemporaryDirectory
 
 import tkinter as tk
 
 from avl import OutputReader, default_config
+from avl.output import PipeReader
+from avl.cache import case_key, file_digest
+from avl.pool import AsyncWorker, Worker
+from avl.watchdog import AVLTimeoutError, Watchdog
+from avl.tools import partitioned_cases
+from avl.workspace import stage_file, workspace_dir
 
 
 class Session(object):
@@ -17,17 +27,32 @@ class Session(object):
                'StripForces': 'fs', 'ElementForces': 'fe',
                'StabilityDerivatives': 'st', 'BodyAxisDerivatives': 'sb',
                'HingeMoments': 'hm', 'StripShearMoments': 'vm'}
+    # AVL is limited to 25 cases per case file
+    MAX_CASES = 25
 
-    def __init__(self, geometry, cases=None, name=None, config=default_config):
+    def __init__(self, geometry, cases=None, name=None, config=default_config,
+                 pool=None, cache=None, timeout=None, case_timeout=None):
         """
         :param avlwrapper.Aircaft geometry: AVL geometry
         :param typing.Sequence[Case] cases: Cases to include in input files
         :param str name: session name, defaults to geometry name
         :param avlwrapper.Configuration config: (optional) dictionary
             containing setting
+        :param avlwrapper.WorkerPool pool: (optional) pool of running AVL
+            processes, a new process is started for every run if not given
+        :param avlwrapper.ResultCache cache: (optional) cache which is
+            checked for the results of each case before AVL is run
+        :param float timeout: (optional) time budget of an AVL run in
+            seconds, defaults to the pool timeout
+        :param float case_timeout: (optional) time budget of a single case
+            in seconds, defaults to the watchdog configuration
         """
 
         self.config = config
+        self.pool = pool
+        self.cache = cache
+        self.timeout = timeout
+        self.case_timeout = case_timeout
 
         self.geometry = geometry
         self.cases = self._prepare_cases(cases)
@@ -67,13 +92,27 @@ class Session(object):
     def requested_output(self):
         requested_outputs = {k for k, v in self.config['output'].items()
                              if v.lower() == 'yes'}
+        return self._get_outputs(requested_outputs)
+
+    def get_case_output(self, case):
+        """Outputs of a case, the requested outputs if the case does not
+        set its own
+
+        :param avlwrapper.Case case: AVL case
+        :return: dict of output name: file extension
+        """
+        if case.outputs is None:
+            return self.requested_output
+        return self._get_outputs(case.outputs)
+
+    def _get_outputs(self, names):
         lc_outputs = {k.lower(): (k, v) for k, v in self.OUTPUTS.items()}
 
         outputs = {}
-        for output in requested_outputs:
-            if output not in lc_outputs:
+        for output in names:
+            if output.lower() not in lc_outputs:
                 raise InputError("Invalid output: {}".format(output))
-            name, ext = lc_outputs[output]
+            name, ext = lc_outputs[output.lower()]
             outputs[name] = ext
         return outputs
 
@@ -82,17 +121,20 @@ class Session(object):
         with open(model_path, 'w') as avl_file:
             avl_file.write(str(self.geometry))
 
-    def _copy_airfoils(self, target_dir):
+    @property
+    def _airfoil_paths(self):
         # airfoil_names = self.geometry.get_external_airfoil_names()
         airfoil_names = self.geometry.external_files
-        current_dir = os.getcwd()
-        for airfoil in airfoil_names:
-            airfoil_path = os.path.join(current_dir, 'MDO', 'airfoils', 'coord_seligFmt', airfoil.split("_")[0])
-            shutil.copy(airfoil_path, target_dir)
+        return [os.path.join(self.config['airfoil_dir'], airfoil.split("_")[0])
+                for airfoil in airfoil_names]
+
+    def _copy_airfoils(self, target_dir):
+        for airfoil_path in self._airfoil_paths:
+            stage_file(airfoil_path, target_dir, config=self.config)
 
     def _write_cases(self, target_dir):
         # AVL is limited to 25 cases
-        if len(self.cases) > 25:
+        if len(self.cases) > self.MAX_CASES:
             raise InputError('Number of cases is larger than '
                              'the supported maximum of 25.')
 
@@ -109,11 +151,18 @@ class Session(object):
             self._write_cases(target_dir)
 
     def run_avl(self, cmds, pre_fn, post_fn):
-        with TemporaryDirectory(prefix='avl_') as working_dir:
+        with TemporaryDirectory(prefix='avl_',
+                                dir=workspace_dir(self.config)) as working_dir:
             pre_fn(working_dir)
             process = self._get_avl_process(working_dir)
-            process.communicate(input=cmds.encode())
-            process.wait()
+            try:
+                process.communicate(input=cmds.encode(),
+                                    timeout=self._timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+                raise AVLTimeoutError("AVL did not finish within "
+                                      "{} s".format(self._timeout))
 
             ret = post_fn(working_dir)
         return ret
@@ -122,8 +171,12 @@ class Session(object):
         cmds = "oper\n"
         for case in cases:
             cmds += "{0}\nx\n".format(case.number)
-            for _, ext in self.requested_output.items():
-                out_file = self._get_output_filename(case, ext)
+            for _, ext in self.get_case_output(case).items():
+                # an empty file name prints the output to stdout
+                if self._pipe_output:
+                    out_file = ""
+                else:
+                    out_file = self._get_output_filename(case, ext)
                 cmds += "{cmd}\n{file}\n".format(cmd=ext,
                                                  file=out_file)
         return cmds
@@ -136,22 +189,270 @@ class Session(object):
         return cmds
 
     @property
-    def _run_all_cases_cmds(self):
+    def _run_cases_cmds(self):
+        # ends at the top-level menu, so a pooled process can be reused
         cmds = self._load_files_cmds
         if self.cases:
             cmds += self._get_cases_run_cmds(self.cases)
         else:
             cmds += "oper\n"
             cmds += "x\n"
-        cmds += "\nquit\n"
+        cmds += "\n"
         return cmds
 
+    @property
+    def _run_all_cases_cmds(self):
+        return self._run_cases_cmds + "quit\n"
+
+    def _get_sub_session(self, cases, name=None):
+        # cases are copied since their numbers are reassigned in the new
+        # session, the cache is left out as it is checked by this session
+        return Session(geometry=self.geometry,
+                       cases=[copy.copy(case) for case in cases],
+                       name=name or self.name, config=self.config,
+                       pool=self.pool, timeout=self.timeout,
+                       case_timeout=self.case_timeout)
+
+    def _get_shards(self):
+        # every shard is a session of its own
+        return [self._get_sub_session(cases)
+                for cases in partitioned_cases(self.cases, self.MAX_CASES)]
+
+    def _run_shards(self):
+        shards = self._get_shards()
+        if self.pool is not None:
+            n_workers = self.pool.size
+        else:
+            n_workers = self.config['pool']['workers']
+        n_workers = min(n_workers, len(shards))
+
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            shard_results = list(executor.map(lambda s: s.run_all_cases(),
+                                              shards))
+
+        return self._merge_shard_results(shard_results)
+
+    @staticmethod
+    def _merge_shard_results(shard_results):
+        # shards are merged in order, keeping the order of the cases
+        results = dict()
+        for shard_result in shard_results:
+            results.update(shard_result)
+        return results
+
+    def _get_case_keys(self, cases=None):
+        if cases is None:
+            cases = self.cases
+        # the digest is memoized on the geometry, the text is hashed only once
+        geometry_digest = self.geometry.digest
+        airfoil_digests = [file_digest(path)
+                           for path in sorted(self._airfoil_paths)]
+        return [case_key(geometry_digest, case, self.get_case_output(case),
+                         airfoil_digests, parser=self.config['parser'])
+                for case in cases]
+
+    def _get_cached(self):
+        # returns the cached results and a session of the missing cases
+        keys = self._get_case_keys()
+        cached = self.cache.get_many(keys)
+
+        missing = [case for case, key in zip(self.cases, keys)
+                   if key not in cached]
+        if not missing:
+            return keys, cached, None
+        return keys, cached, self._get_sub_session(missing)
+
+    def _store_cached(self, keys, cached, new_results):
+        new_items = {key: new_results[case.name]
+                     for case, key in zip(self.cases, keys)
+                     if key not in cached}
+        self.cache.put_many(new_items)
+        cached.update(new_items)
+
+    def _run_cached(self):
+        keys, cached, missing_session = self._get_cached()
+        if missing_session is not None:
+            self._store_cached(keys, cached, missing_session.run_all_cases())
+        return {case.name: cached[key]
+                for case, key in zip(self.cases, keys)}
+
+    async def _run_cached_async(self, limiter):
+        keys, cached, missing_session = self._get_cached()
+        if missing_session is not None:
+            new_results = await missing_session.run_all_cases_async(limiter)
+            self._store_cached(keys, cached, new_results)
+        return {case.name: cached[key]
+                for case, key in zip(self.cases, keys)}
+
     def run_all_cases(self):
-        results = self.run_avl(cmds=self._run_all_cases_cmds,
-                               pre_fn=self._write_analysis_files,
-                               post_fn=self._read_results)
+        if self.cache is not None and self.cases:
+            return self._run_cached()
+        if len(self.cases) > self.MAX_CASES:
+            return self._run_shards()
+        # AVL runs on a live worker, so its output is watched while the
+        # cases are computed
+        with self._live_worker() as worker:
+            self._write_analysis_files(worker.working_dir)
+            return self._run_on_worker(worker, self._run_cases_cmds)
+
+    async def run_all_cases_async(self, limiter=None):
+        """Runs all cases in asyncio subprocesses, many sessions can be run
+        concurrently from one event loop. Cancelling the task kills its AVL
+        processes.
+
+        :param asyncio.Semaphore limiter: (optional) limits the number of
+            AVL processes, share it between sessions to set a global limit.
+            Defaults to the number of pool workers for this session.
+        """
+        if limiter is None:
+            limiter = asyncio.Semaphore(self.config['pool']['workers'])
+        if self.cache is not None and self.cases:
+            return await self._run_cached_async(limiter)
+        if len(self.cases) > self.MAX_CASES:
+            shard_results = await asyncio.gather(
+                *[shard.run_all_cases_async(limiter)
+                  for shard in self._get_shards()])
+            return self._merge_shard_results(shard_results)
+
+        async with limiter:
+            async with self._live_worker_async() as worker:
+                self._write_analysis_files(worker.working_dir)
+                return await self._run_on_worker_async(worker,
+                                                       self._run_cases_cmds)
+
+    def run_staged(self, update_fn):
+        """Runs the session cases, then the cases returned by update_fn in
+        the same AVL process. The geometry is written and loaded only once.
+
+        :param typing.Callable update_fn: called with the results of the
+            session cases, returns the cases of the second stage
+        :return: tuple with the results of both stages
+        """
+        with ExitStack() as stack:
+            staged_run = _StagedRun(self, stack)
+            first_results = staged_run.run(self.cases)
+            cases = self._prepare_cases(update_fn(first_results))
+            second_results = staged_run.run(cases)
+        return first_results, second_results
+
+    async def run_staged_async(self, update_fn, limiter=None):
+        """Asynchronous run_staged, see run_all_cases_async
+
+        :param typing.Callable update_fn: called with the results of the
+            session cases, returns the cases of the second stage
+        :param asyncio.Semaphore limiter: (optional) limits the number of
+            AVL processes
+        :return: tuple with the results of both stages
+        """
+        if limiter is None:
+            limiter = asyncio.Semaphore(1)
+        async with limiter:
+            async with AsyncExitStack() as stack:
+                staged_run = _AsyncStagedRun(self, stack)
+                first_results = await staged_run.run(self.cases)
+                cases = self._prepare_cases(update_fn(first_results))
+                second_results = await staged_run.run(cases)
+        return first_results, second_results
+
+    @property
+    def _output_reader(self):
+        if self.config['parser'] == 'numpy':
+            # numpy is only required by the fast readers
+            from avl.fast_output import FastOutputReader
+            return FastOutputReader
+        return OutputReader
+
+    @property
+    def _pipe_output(self):
+        return self.config['output_mode'] == 'pipe'
+
+    def _get_pipe_reader(self):
+        if not self._pipe_output:
+            return None
+        return PipeReader(["." + ext for case in self.cases
+                           for ext in self.get_case_output(case).values()],
+                          reader_class=self._output_reader)
+
+    def _get_results(self, working_dir, pipe_reader):
+        if pipe_reader is None:
+            return self._read_results(working_dir)
+
+        contents = iter(pipe_reader.get_contents())
+        results = dict()
+        for case in self.cases:
+            results[case.name] = {output: next(contents)
+                                  for output in self.get_case_output(case)}
         return results
 
+    def _run_on_worker(self, worker, cmds):
+        # in pipe mode outputs are parsed while AVL is still running
+        reader = self._get_pipe_reader()
+        worker.run(cmds, line_fn=reader.feed if reader else None,
+                   watchdog=self._get_watchdog())
+        return self._get_results(worker.working_dir, reader)
+
+    async def _run_on_worker_async(self, worker, cmds):
+        reader = self._get_pipe_reader()
+        await worker.run(cmds, line_fn=reader.feed if reader else None,
+                         watchdog=self._get_watchdog())
+        return self._get_results(worker.working_dir, reader)
+
+    @property
+    def _timeout(self):
+        if self.timeout is not None:
+            return self.timeout
+        if self.pool is not None:
+            return self.pool.timeout
+        return self.config['pool']['timeout']
+
+    def _get_watchdog(self):
+        settings = self.config['watchdog']
+        case_timeout = self.case_timeout or settings['case_timeout']
+        return Watchdog(timeout=self._timeout, case_timeout=case_timeout,
+                        abort_on_failure=settings['abort_on_failure'])
+
+    @property
+    def _worker_limits(self):
+        settings = self.config['watchdog']
+        return {'cpu_time': settings['cpu_time'],
+                'memory': settings['memory']}
+
+    @contextmanager
+    def _live_worker(self):
+        if self.pool is not None:
+            with self.pool.worker() as worker:
+                worker.clear()
+                yield worker
+            return
+
+        if 'avl_bin' not in self.config.settings:
+            raise FileNotFoundError("AVL not found or not executable,"
+                    " check the configuration file")
+        worker = Worker(self.config['avl_bin'],
+                        parent_dir=workspace_dir(self.config),
+                        **self._worker_limits)
+        try:
+            yield worker.start(timeout=self._timeout)
+        finally:
+            worker.kill()
+            worker.close()
+
+    @asynccontextmanager
+    async def _live_worker_async(self):
+        if 'avl_bin' not in self.config.settings:
+            raise FileNotFoundError("AVL not found or not executable,"
+                    " check the configuration file")
+        worker = AsyncWorker(self.config['avl_bin'],
+                             parent_dir=workspace_dir(self.config),
+                             **self._worker_limits)
+        try:
+            yield await worker.start(timeout=self._timeout)
+        finally:
+            # also reached on cancellation, the process must not outlive
+            # its task
+            await worker.kill()
+            await worker.close()
+
     def _get_avl_process(self, working_dir):
         # guard for avl not being present on the system.
         # this used to be check at config read, but this allows
@@ -177,10 +478,10 @@ class Session(object):
         results = dict()
         for case in self.cases:
             results[case.name] = dict()
-            for output, ext in self.requested_output.items():
+            for output, ext in self.get_case_output(case).items():
                 file_name = self._get_output_filename(case, ext)
                 file_path = os.path.join(target_dir, file_name)
-                reader = OutputReader(file_path=file_path)
+                reader = self._output_reader(file_path=file_path)
                 results[case.name][output] = reader.get_content()
         return results
 
@@ -276,12 +577,118 @@ class Session(object):
     def export_run_files(self, path=None):
         if path is None:
             path = os.path.join(os.getcwd(), self.name)
-        if not os.path.exists(path):
-            os.mkdir(path)
+        os.makedirs(path, exist_ok=True)
+        if len(self.cases) > self.MAX_CASES:
+            # one case file per shard, all sharing the same geometry
+            self._write_geometry(path)
+            self._copy_airfoils(path)
+            for idx, shard in enumerate(self._get_shards()):
+                shard.name = "{}-{}".format(self.name, idx + 1)
+                shard._write_cases(path)
+            return
         self._write_analysis_files(path)
         # print("Input files written to: {}".format(path))
 
 
+class _StagedRun(object):
+    """Runs consecutive sets of cases of a session in one AVL process"""
+
+    def __init__(self, session, stack):
+        """
+        :param Session session: session providing geometry and settings
+        :param contextlib.ExitStack stack: closes the AVL process
+        """
+        self.session = session
+        self._stack = stack
+        self._worker = None
+        self._n_case_files = 0
+
+    @property
+    def worker(self):
+        # started on first use, no process is needed if all results are cached
+        if self._worker is None:
+            worker = self._stack.enter_context(self.session._live_worker())
+            self._write_geometry(worker)
+            worker.run(self._load_cmds, timeout=self.session._timeout)
+            self._worker = worker
+        return self._worker
+
+    def run(self, cases):
+        keys, cached, shards = self._get_shards(cases)
+        results = dict()
+        for shard in shards:
+            worker = self.worker
+            shard._write_cases(worker.working_dir)
+            results.update(shard._run_on_worker(worker,
+                                                self._get_shard_cmds(shard)))
+        return self._merge(cases, keys, cached, results)
+
+    @property
+    def _load_cmds(self):
+        return "load {0}\n".format(self.session.model_file)
+
+    def _write_geometry(self, worker):
+        self.session._write_geometry(worker.working_dir)
+        self.session._copy_airfoils(worker.working_dir)
+
+    def _get_shards(self, cases):
+        session = self.session
+        cache = session.cache
+        keys = session._get_case_keys(cases) if cache is not None else []
+        cached = cache.get_many(keys) if keys else dict()
+
+        missing = [case for idx, case in enumerate(cases)
+                   if not keys or keys[idx] not in cached]
+        shards = []
+        for shard_cases in partitioned_cases(missing, session.MAX_CASES):
+            # every case file gets its own name, output files do not collide
+            self._n_case_files += 1
+            shards.append(session._get_sub_session(
+                shard_cases,
+                name="{}-{}".format(session.name, self._n_case_files)))
+        return keys, cached, shards
+
+    @staticmethod
+    def _get_shard_cmds(shard):
+        cmds = "case {0}\n".format(shard.case_file)
+        cmds += shard._get_cases_run_cmds(shard.cases)
+        cmds += "\n"
+        return cmds
+
+    def _merge(self, cases, keys, cached, results):
+        if not keys:
+            return results
+        new_items = {key: results[case.name]
+                     for case, key in zip(cases, keys) if key not in cached}
+        if new_items:
+            self.session.cache.put_many(new_items)
+            cached.update(new_items)
+        return {case.name: cached[key] for case, key in zip(cases, keys)}
+
+
+class _AsyncStagedRun(_StagedRun):
+    """Asynchronous _StagedRun, the AVL process is an asyncio subprocess"""
+
+    async def get_worker(self):
+        if self._worker is None:
+            worker = await self._stack.enter_async_context(
+                self.session._live_worker_async())
+            self._write_geometry(worker)
+            await worker.run(self._load_cmds, timeout=self.session._timeout)
+            self._worker = worker
+        return self._worker
+
+    async def run(self, cases):
+        keys, cached, shards = self._get_shards(cases)
+        results = dict()
+        for shard in shards:
+            worker = await self.get_worker()
+            shard._write_cases(worker.working_dir)
+            results.update(await shard._run_on_worker_async(
+                worker, self._get_shard_cmds(shard)))
+        return self._merge(cases, keys, cached, results)
+
+
 class _CloseWindow(tk.Frame):
     def __init__(self, on_open=None, on_close=None, master=None):
         # On Python 2, tk.Frame is an old-style class
@@ -0,0 +1,196 @@
+""" AVL Wrapper case templates, the case file of a fixed set of cases is
+compiled once and only the numeric values are filled in for each design
+"""
+import copy
+import re
+
+import numpy as np
+
+from .model import Case
+
+# states Session fills with the geometry values when they are not set
+REFERENCE_STATES = ('X_cg', 'Y_cg', 'Z_cg', 'mach', 'cd_p')
+
+_FIELD = re.compile("\0([^\0]*)\0")
+
+
+class _Field(object):
+    # placeholder rendered by Case.__str__, becomes a format field
+    def __init__(self, index):
+        self.index = index
+
+    def __format__(self, spec):
+        if spec:
+            return "\0{}:{}\0".format(self.index, spec)
+        return "\0{}\0".format(self.index)
+
+    def __str__(self):
+        return format(self, "")
+
+
+class CaseTemplate(object):
+    """Case file of a fixed set of cases with numeric slots
+
+    The text of every case is rendered once by Case.__str__ with placeholders
+    and compiled to a format string, so filled cases are byte-identical to
+    the cases themselves.
+    """
+
+    def __init__(self, cases, slots=()):
+        """
+        :param typing.Sequence[Case] cases: prototype cases, every value that
+            is not a slot is taken from them. Reference states (X_cg, mach,
+            etc.) that are not set are filled by the Session
+        :param typing.Sequence[str] slots: values set for each design,
+            "case name.key" with a parameter or state key of the case,
+            e.g. "trimmed.alpha" or "trimmed.X_cg". Keywords of Case
+            (roll_rate, pitch_rate, yaw_rate) name the parameter
+        """
+        self.slots = tuple(slots)
+        self._templates = [_CompiledCase(case) for case in cases]
+
+        by_name = {template.name: template for template in self._templates}
+        self._slot_targets = []
+        for slot in self.slots:
+            case_name, _, key = slot.partition(".")
+            if case_name not in by_name:
+                raise ValueError("Invalid slot, no case {}".format(slot))
+            self._slot_targets.append(by_name[case_name].add_slot(key))
+
+    @property
+    def case_names(self):
+        return [template.name for template in self._templates]
+
+    def cases(self, values=None):
+        """Cases of one design, to be used in a Session like Case objects
+
+        :param values: slot values, a dict of slot: value or a sequence in
+            the order of the slots. None leaves a reference state to the
+            geometry, like in a Case
+        :return: list of TemplateCase
+        """
+        values = self._get_row(values)
+        return self._cases(values)
+
+    def cases_batch(self, values):
+        """Cases of many designs
+
+        :param values: dict of slot: values of all designs or an array of
+            shape (n_designs, n_slots)
+        :return: list of the TemplateCase lists of each design
+        """
+        if isinstance(values, dict):
+            values = np.column_stack([np.asarray(values[slot])
+                                      for slot in self.slots])
+        values = np.asarray(values)
+        if values.ndim != 2 or values.shape[1] != len(self.slots):
+            raise ValueError("Expected values of shape (n_designs, {})"
+                             .format(len(self.slots)))
+        # one conversion to python floats, they are written like the floats
+        # of the Case objects
+        return [self._cases(row) for row in values.tolist()]
+
+    def _get_row(self, values):
+        if values is None:
+            values = {}
+        if isinstance(values, dict):
+            unknown = set(values) - set(self.slots)
+            if unknown:
+                raise ValueError("Invalid slots: {}".format(sorted(unknown)))
+            return [values.get(slot) for slot in self.slots]
+        values = list(values)
+        if len(values) != len(self.slots):
+            raise ValueError("Expected {} values".format(len(self.slots)))
+        return values
+
+    def _cases(self, values):
+        cases = [template.new_case() for template in self._templates]
+        by_template = dict(zip(self._templates, cases))
+        for (template, setter), value in zip(self._slot_targets, values):
+            setter(by_template[template], value)
+        return cases
+
+
+class _CompiledCase(object):
+    def __init__(self, case):
+        self.name = case.name
+        self.outputs = case.outputs
+
+        # reference states stay open, Session sets them from the geometry
+        self.references = {key: case.states[key].value
+                           for key in REFERENCE_STATES}
+        self._values = []
+        self._keys = {}
+
+        # fields: case number, reference states, then the other values
+        prototype = copy.deepcopy(case)
+        prototype.number = _Field(0)
+        for idx, key in enumerate(REFERENCE_STATES):
+            prototype.states[key].value = _Field(idx + 1)
+        n_fixed = len(REFERENCE_STATES) + 1
+
+        # every parameter and state value is a field, values that are not
+        # slots keep the prototype value
+        for key, parameter in prototype.parameters.items():
+            self._add_value(("parameters", key), parameter.value)
+            parameter.value = _Field(n_fixed + len(self._values) - 1)
+        for key, state in prototype.states.items():
+            if key in REFERENCE_STATES:
+                continue
+            self._add_value(("states", key), state.value)
+            state.value = _Field(n_fixed + len(self._values) - 1)
+
+        text = str(prototype).replace("{", "{{").replace("}", "}}")
+        self.format = _FIELD.sub(r"{\1}", text)
+
+    def _add_value(self, key, value):
+        self._keys[key] = len(self._values)
+        self._values.append(value)
+
+    def add_slot(self, key):
+        # keywords of Case, e.g. roll_rate, set the parameter and not the
+        # state of the same name
+        parameter = ("parameters", key)
+        if parameter not in self._keys and key in Case.CASE_PARAMETERS:
+            parameter = ("parameters", Case.CASE_PARAMETERS[key])
+
+        if key in REFERENCE_STATES:
+            def setter(case, value):
+                case.states[key].value = value
+        elif parameter in self._keys or ("states", key) in self._keys:
+            index = self._keys.get(parameter, self._keys.get(("states", key)))
+
+            def setter(case, value):
+                case.values[index] = value
+        else:
+            raise ValueError("Invalid slot, case {} has no {}"
+                             .format(self.name, key))
+        return self, setter
+
+    def new_case(self):
+        return TemplateCase(self, list(self._values))
+
+
+class TemplateCase(object):
+    """Case filled from a CaseTemplate, used by a Session like a Case"""
+
+    def __init__(self, template, values):
+        self.name = template.name
+        self.number = 1
+        self.outputs = template.outputs
+        self.states = {key: _ReferenceState(value)
+                       for key, value in template.references.items()}
+        self.values = values
+        self._format = template.format
+
+    def __str__(self):
+        return self._format.format(
+            self.number, *(self.states[key].value for key in REFERENCE_STATES),
+            *self.values)
+
+
+class _ReferenceState(object):
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
@@ -0,0 +1,105 @@
+""" AVL Wrapper watchdog, time budgets and early abort of failing AVL runs
+"""
+import re
+import time
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows, resource limits are ignored
+    resource = None
+
+
+class AVLProcessError(Exception):
+    pass
+
+
+class AVLTimeoutError(AVLProcessError):
+    pass
+
+
+class AVLConvergenceError(AVLProcessError):
+    pass
+
+
+class Watchdog(object):
+    """Checks AVL output while it is produced and keeps track of the time
+    budgets of a run and of its cases"""
+
+    # prompt of the OPER menu, shows the current case
+    CASE_PROMPT_RE = re.compile(r"\(case\s+(\d+)\s*/")
+    # trim did not converge, or a value overflows its output format: the
+    # field is filled with asterisks, 8 or more depending on its width.
+    # Lines of asterisks only are separators of the element output
+    FAILURE_RE = re.compile(r"convergence failed|^(?!\s*\*+\s*$).*\*{8,}",
+                            re.IGNORECASE)
+
+    def __init__(self, timeout=None, case_timeout=None, abort_on_failure=False):
+        """
+        :param float timeout: (optional) time budget of the whole run
+        :param float case_timeout: (optional) time budget of every case
+        :param bool abort_on_failure: abort the run as soon as AVL reports a
+            non-converged trim or an overflowing value
+        """
+        self.timeout = timeout
+        self.case_timeout = case_timeout
+        self.abort_on_failure = abort_on_failure
+
+        self._start = None
+        self._case_start = None
+        self._case = None
+
+    def start(self):
+        self._start = self._case_start = time.monotonic()
+        self._case = None
+
+    def remaining(self):
+        """Time left until the earliest deadline, None without deadline"""
+        now = time.monotonic()
+        deadlines = []
+        if self.timeout is not None:
+            deadlines.append(self._start + self.timeout - now)
+        if self.case_timeout is not None:
+            deadlines.append(self._case_start + self.case_timeout - now)
+        if not deadlines:
+            return None
+        return max(min(deadlines), 0)
+
+    def check(self, line):
+        match = self.CASE_PROMPT_RE.search(line)
+        if match is not None and match.group(1) != self._case:
+            self._case = match.group(1)
+            self._case_start = time.monotonic()
+
+        if self.abort_on_failure and self.FAILURE_RE.search(line):
+            raise AVLConvergenceError(
+                "AVL run aborted: {}".format(line.strip()))
+
+    def timeout_error(self):
+        now = time.monotonic()
+        if (self.case_timeout is not None
+                and now - self._case_start >= self.case_timeout):
+            msg = "AVL case {} did not finish within {} s".format(
+                self._case or 1, self.case_timeout)
+        else:
+            msg = "AVL did not respond within {} s".format(self.timeout)
+        return AVLTimeoutError(msg)
+
+
+def get_preexec_fn(cpu_time=None, memory=None):
+    """Function setting resource limits in the AVL child process
+
+    :param int cpu_time: (optional) CPU seconds of the process
+    :param int memory: (optional) address space of the process in bytes
+    :return: None if no limits are set or limits are not supported
+    """
+    if resource is None or (not cpu_time and not memory):
+        return None
+
+    def set_limits():
+        if cpu_time:
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_time, cpu_time))
+        if memory:
+            resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+
+    return set_limits
@@ -0,0 +1,99 @@
+""" AVL Wrapper workspace, location of the AVL run directories and staged
+airfoil files
+"""
+import atexit
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+
+from avl import default_config
+
+# tmpfs mount available on most Linux systems
+SHARED_MEMORY_DIR = '/dev/shm'
+
+_staged_files = dict()
+_staged_count = itertools.count()
+_staging_dir = None
+_staging_lock = threading.Lock()
+
+
+def workspace_dir(config=default_config):
+    """Directory in which AVL run directories are created
+
+    'auto' selects /dev/shm if available and the system temporary
+    directory otherwise.
+    """
+    directory = config['workspace']['directory']
+    if directory == 'auto':
+        if (os.path.isdir(SHARED_MEMORY_DIR)
+                and os.access(SHARED_MEMORY_DIR, os.W_OK)):
+            return SHARED_MEMORY_DIR
+        return tempfile.gettempdir()
+    if directory == 'tmp':
+        return tempfile.gettempdir()
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    return directory
+
+
+def stage_file(source, target_dir, config=default_config):
+    """Makes a file available in target_dir
+
+    The file is copied once into the workspace and linked from there into
+    the run directories. Hardlinks are used when possible, falling back on
+    symlinks and plain copies. The file is copied again when its
+    modification time or size changes, like the digests of
+    avlwrapper.cache.file_digest, so AVL runs on the file the cache key
+    was computed from.
+
+    :param str source: path of the file
+    :param str target_dir: run directory
+    :param avlwrapper.Configuration config: (optional) configuration
+    """
+    staged = _get_staged_file(source, config)
+    target = os.path.join(target_dir, os.path.basename(source))
+    if os.path.lexists(target):
+        os.remove(target)
+    try:
+        os.link(staged, target)
+    except OSError:
+        try:
+            os.symlink(staged, target)
+        except OSError:
+            shutil.copy(staged, target)
+    return target
+
+
+def clear_staged_files():
+    """Removes the staged files, they are staged again on next use"""
+    global _staging_dir
+    with _staging_lock:
+        if _staging_dir is not None:
+            shutil.rmtree(_staging_dir, ignore_errors=True)
+        _staging_dir = None
+        _staged_files.clear()
+
+
+def _get_staged_file(source, config):
+    global _staging_dir
+    source = os.path.abspath(source)
+    stat = os.stat(source)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _staging_lock:
+        if source in _staged_files and _staged_files[source][0] == signature:
+            return _staged_files[source][1]
+        if _staging_dir is None:
+            _staging_dir = tempfile.mkdtemp(prefix='avl_airfoils_',
+                                            dir=workspace_dir(config))
+            # /dev/shm is not cleaned up by the system until reboot
+            atexit.register(clear_staged_files)
+        # files of equal name from different sources must not collide, a
+        # changed file gets a new copy, runs may still link to the old one
+        file_dir = os.path.join(_staging_dir, str(next(_staged_count)))
+        os.mkdir(file_dir)
+        staged = os.path.join(file_dir, os.path.basename(source))
+        shutil.copy(source, staged)
+        _staged_files[source] = (signature, staged)
+        return staged
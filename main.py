@@ -1,18 +1,146 @@
+import asyncio
 import os
 import time
 from _collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pandas as pd
-from configparser import ConfigParser
 
 from aircraftInfo import AircraftInfo
 import MDO
 
-config = ConfigParser()
-config.read(os.path.join("outputsConfig.cfg"))
 
+def main(x_states_global, logger=None, x_states_default_values=None, settings=None):
+    """
+    # Description:
+        Evaluate one design. Reentrant, everything the evaluation reads is given in the call.
 
-def main(x_states_global, logger=None, x_states_default_values=None):
+    ## Parameters (Optional):
+    - settings [MDO.Settings]: settings of this evaluation, see MDO.readSettings. Defaults to the
+    settings read by MDO.parseConfig.
+    """
+    aircraftInfo, avlMandatoryCases, avlCases, missionProfile, verticalType, smFixedPercent, cgFixed = \
+        _setupAircraft(x_states_global, x_states_default_values, settings)
+
+    # ---- Aircraft Neutral Point Calc + Avl ----------------------------------------
+    if smFixedPercent is not None:
+        # Neutral point and mission cases share one AVL session
+        results = MDO.avlMainStaged(aircraftInfo, avlMandatoryCases, avlCases,
+                                    lambda npResults: _updateCG(aircraftInfo, npResults, smFixedPercent),
+                                    verticalType=verticalType)
+    else:
+        aircraftInfo.adjustCG(cgFixed=cgFixed, smFixedPercent=None)
+        results = MDO.avlMain(aircraftInfo, avlCases, verticalType=verticalType)
+
+    # ---- Results -----------------------------------------
+    output_dict = MDO.mainResults(results=results, aircraftInfo=aircraftInfo, avlCases=avlCases,
+                                  missionProfile=missionProfile, logger=logger)
+
+    return pd.DataFrame(output_dict, index=[0])
+
+
+async def main_async(x_states_global, logger=None, x_states_default_values=None, limiter=None, settings=None):
+    """
+    # Description:
+        Asynchronous main, AVL runs as an asyncio subprocess so many designs can be evaluated
+        concurrently from one event loop.
+
+    ## Parameters (Optional):
+    - limiter [asyncio.Semaphore]: limits the number of AVL processes, shared between designs.
+    - settings [MDO.Settings]: see main.
+    """
+    aircraftInfo, avlMandatoryCases, avlCases, missionProfile, verticalType, smFixedPercent, cgFixed = \
+        _setupAircraft(x_states_global, x_states_default_values, settings)
+
+    # ---- Aircraft Neutral Point Calc + Avl ----------------------------------------
+    if smFixedPercent is not None:
+        results = await MDO.avlMainStagedAsync(aircraftInfo, avlMandatoryCases, avlCases,
+                                               lambda npResults: _updateCG(aircraftInfo, npResults, smFixedPercent),
+                                               verticalType=verticalType, limiter=limiter)
+    else:
+        aircraftInfo.adjustCG(cgFixed=cgFixed, smFixedPercent=None)
+        results = await MDO.avlMainAsync(aircraftInfo, avlCases, verticalType=verticalType, limiter=limiter)
+
+    # ---- Results -----------------------------------------
+    output_dict = MDO.mainResults(results=results, aircraftInfo=aircraftInfo, avlCases=avlCases,
+                                  missionProfile=missionProfile, logger=logger)
+
+    return pd.DataFrame(output_dict, index=[0])
+
+
+async def main_many_async(x_states_list, logger=None, x_states_default_values=None, concurrency=None,
+                          settings=None):
+    """
+    # Description:
+        Evaluate many designs concurrently. Every design runs in its own task, a failed or
+        cancelled design does not stop the others.
+
+    ## Parameters (Optional):
+    - concurrency [int]: maximum number of AVL processes, defaults to the number of CPUs.
+    - settings [MDO.Settings]: see evaluate_many.
+
+    ## Returns:
+    - outputs [list]: DataFrame or exception of every design, in order.
+    """
+    limiter = asyncio.Semaphore(concurrency or os.cpu_count() or 1)
+    settingsList = _designSettings(settings, len(x_states_list))
+    tasks = [asyncio.ensure_future(main_async(x_states_global, logger=logger,
+                                              x_states_default_values=x_states_default_values,
+                                              limiter=limiter, settings=designSettings))
+             for x_states_global, designSettings in zip(x_states_list, settingsList)]
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def evaluate_many(x_states_list, logger=None, x_states_default_values=None, workers=None, settings=None):
+    """
+    # Description:
+        Evaluate many designs with main in a thread pool. The threads spend most of the time
+        waiting on AVL, so no process pool is needed. A failed design does not stop the others.
+
+    ## Parameters (Required):
+    - x_states_list [list]: x_states_global of every design.
+
+    ## Parameters (Optional):
+    - workers [int]: number of threads, defaults to the number of CPUs.
+    - settings [MDO.Settings]: settings of all designs, see MDO.readSettings. Defaults to the
+    settings read by MDO.parseConfig. Every design gets its own workspace folder inside
+    settings.workspace. Plots are not thread safe, use settings with plot=False.
+
+    The objective functions of optimization/functions.py are not reentrant: they count the
+    evaluations in os.environ['fun_eval_count'], read os.environ['optimization_type'] and append
+    to module-level history tables. Call main or evaluate_many directly from threads, not them.
+
+    ## Returns:
+    - outputs [list]: DataFrame or exception of every design, in order.
+    """
+    settingsList = _designSettings(settings, len(x_states_list))
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        futures = [executor.submit(main, x_states_global, logger=logger,
+                                   x_states_default_values=x_states_default_values,
+                                   settings=designSettings)
+                   for x_states_global, designSettings in zip(x_states_list, settingsList)]
+    outputs = []
+    for future in futures:
+        error = future.exception()
+        outputs.append(future.result() if error is None else error)
+    return outputs
+
+
+def _designSettings(settings, nDesigns):
+    # The settings are read once, every design writes its debug files to its own folder
+    if settings is None:
+        settings = MDO.defaultSettings()
+    return [settings.replace(workspace=os.path.join(settings.workspace, f"design_{i}"))
+            for i in range(nDesigns)]
+
+
+def _updateCG(aircraftInfo, npResults, smFixedPercent):
+    aircraftInfo.xNeutralPoint = (npResults['NeutralPoint_0']['StabilityDerivatives']['Xnp']
+                                  + npResults['NeutralPoint_1']['StabilityDerivatives']['Xnp'])/2
+    aircraftInfo.adjustCG(cgFixed=None, smFixedPercent=smFixedPercent)
+
+
+def _setupAircraft(x_states_global, x_states_default_values=None, settings=None):
     # ----Vertical Stabilizer-------------------------------------
     # Options: "conventional", "v".
     # Warning: option "H" is broken
@@ -47,7 +175,10 @@ def main(x_states_global, logger=None, x_states_default_values=None):
     fuselageLength = x_states_avl[9]
     fuselageDiameter = 0.18
 
-    if os.environ["DEBUG"] == 'yes':
+    if settings is None:
+        settings = MDO.defaultSettings()
+
+    if settings.debug:
         print(f"wingSpan: {wingSpan}")
         print(f"wingSecPercentage: {wingSecPercentage}")
         print(f"wingRootChord: {wingRootChord}")
@@ -83,25 +214,10 @@ def main(x_states_global, logger=None, x_states_default_values=None):
     )
 
     # ---- Aircraft Info Class ----------------------------------------
-    aircraftInfo = AircraftInfo(stateVariables, controlVariables, engineInfo=engineInfo, optimizationVariables=x_states_global)
-
-    # ---- Aircraft Neutral Point Calc ----------------------------------------
-    if smFixedPercent is not None:
-        results = MDO.avlMain(aircraftInfo, avlMandatoryCases, verticalType=verticalType)
-        aircraftInfo.xNeutralPoint = (results['NeutralPoint_0']['StabilityDerivatives']['Xnp']
-                                      + results['NeutralPoint_1']['StabilityDerivatives']['Xnp'])/2
-        aircraftInfo.adjustCG(cgFixed=None, smFixedPercent=smFixedPercent)
-    else:
-        aircraftInfo.adjustCG(cgFixed=cgFixed, smFixedPercent=None)
+    aircraftInfo = AircraftInfo(stateVariables, controlVariables, engineInfo=engineInfo, optimizationVariables=x_states_global,
+                                settings=settings)
 
-    # ---- Avl -----------------------------------------
-    results = MDO.avlMain(aircraftInfo, avlCases, verticalType=verticalType)
-
-    # ---- Results -----------------------------------------
-    output_dict = MDO.mainResults(results=results, aircraftInfo=aircraftInfo, avlCases=avlCases,
-                                  missionProfile=missionProfile, logger=logger)
-
-    return pd.DataFrame(output_dict, index=[0])
+    return aircraftInfo, avlMandatoryCases, avlCases, missionProfile, verticalType, smFixedPercent, cgFixed
 
 
 def _get_default_values():
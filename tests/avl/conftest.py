@@ -0,0 +1,95 @@
+import os
+import stat
+import sys
+
+import pytest
+
+from avl import Aircraft, Case, Configuration, Point
+
+FAKE_AVL = os.path.join(os.path.dirname(__file__), 'fake_avl.py')
+
+CONFIG = """\
+[environment]
+Executable = {executable}
+PrintOutput = no
+GhostscriptExecutable = gs
+OutputMode = {output_mode}
+Parser = {parser}
+
+[output]
+Totals = yes
+SurfaceForces = no
+StripForces = no
+ElementForces = no
+BodyAxisDerivatives = no
+StabilityDerivatives = yes
+HingeMoments = no
+StripShearMoments = no
+
+[pool]
+Workers = 2
+MaxJobs = {max_jobs}
+Timeout = {timeout}
+
+[watchdog]
+CaseTimeout = {case_timeout}
+AbortOnFailure = {abort_on_failure}
+CpuTime = 0
+Memory = 0
+
+[workspace]
+Directory = {workspace}
+
+[cache]
+Enabled = no
+Path = avl_cache.sqlite
+MaxSize = 256
+"""
+
+
+@pytest.fixture
+def fake_avl(tmp_path):
+    """Executable running fake_avl.py with the interpreter of the tests"""
+    if os.name == 'nt':
+        pytest.skip("the fake AVL executable is a shell script")
+    executable = tmp_path / 'avl'
+    with open(FAKE_AVL) as fp:
+        executable.write_text("#!{}\n{}".format(sys.executable, fp.read()))
+    executable.chmod(executable.stat().st_mode | stat.S_IEXEC)
+    return str(executable)
+
+
+@pytest.fixture
+def make_config(tmp_path, fake_avl):
+    """Configuration factory running the fake AVL, keywords replace the
+    values of the configuration file"""
+    def make_config(**values):
+        settings = {'executable': fake_avl, 'output_mode': 'files',
+                    'parser': 'legacy', 'max_jobs': 500, 'timeout': 20,
+                    'case_timeout': 0, 'abort_on_failure': 'no',
+                    'workspace': str(tmp_path / 'workspace')}
+        settings.update(values)
+        config_path = tmp_path / 'config.cfg'
+        config_path.write_text(CONFIG.format(**settings))
+        return Configuration(str(config_path))
+    return make_config
+
+
+@pytest.fixture
+def config(make_config):
+    return make_config()
+
+
+@pytest.fixture
+def aircraft():
+    return Aircraft(name='plane', reference_area=1.0, reference_chord=0.25,
+                    reference_span=4.0, reference_point=Point(0.1, 0.0, 0.0))
+
+
+@pytest.fixture
+def make_cases():
+    """Factory of n_cases cases with the alphas start, start + 1, ..."""
+    def make_cases(n_cases, start=0.0):
+        return [Case(name='case{}'.format(idx), alpha=start + idx, X_cg=0.1)
+                for idx in range(n_cases)]
+    return make_cases
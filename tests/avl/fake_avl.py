@@ -0,0 +1,165 @@
+""" Stand-in for the AVL executable used by the tests
+
+Talks through the same prompts as AVL 3.35 (top-level menu, OPER menu,
+output file name prompt) and writes small output files in the AVL formats.
+The values only depend on the case inputs: Alpha is the alpha (or CL * 10)
+of the case and CLtot = Alpha / 10, so tests can tell the cases apart.
+
+FAKE_AVL_MODE selects a failure: 'hang' (x never returns), 'slow' (x takes
+0.3 s), 'diverge' (trim fails for a negative alpha), 'overflow' (a value
+overflows its output field) and 'exit' (the process dies on x).
+"""
+import os
+import re
+import sys
+import time
+
+MODE = os.environ.get('FAKE_AVL_MODE', '')
+
+
+def write(text):
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+def read():
+    line = sys.stdin.readline()
+    if not line:
+        sys.exit(0)
+    return line.strip()
+
+
+def not_recognized(cmd):
+    write(' {:4s} command not recognized.  Type a "?" for list\n'.format(
+        cmd[:4].upper()))
+
+
+def read_cases(path):
+    with open(path) as fp:
+        text = fp.read()
+    cases = []
+    for match in re.finditer(r"Run case\s+(\d+)\s*:\s*(\S+)(.*?)(?=-{45}|\Z)",
+                             text, re.DOTALL):
+        body = match.group(3)
+        setting, value = re.search(r"alpha\s+->\s+(\S+)\s+=\s+(\S+)",
+                                   body).groups()
+        x_cg = float(re.search(r"X_cg = (\S+)", body).group(1))
+        alpha = float(value) if setting == 'alpha' else float(value) * 10
+        cases.append({'name': match.group(2), 'alpha': alpha, 'x_cg': x_cg})
+    return cases
+
+
+def totals(case):
+    alpha = case['alpha']
+    return ("\n ---------------------------------------------------------------\n"
+            " Vortex Lattice Output -- Total Forces\n\n"
+            "  Alpha =   {:.5f}     pb/2V =   0.00000\n"
+            "  CLtot =   {:.5f}\n"
+            "  CDtot =   {:.5f}\n"
+            "  Xcg =   {:.5f}\n").format(alpha, alpha / 10,
+                                         0.02 + 0.0005 * alpha ** 2,
+                                         case['x_cg'])
+
+
+def surface_forces(case):
+    cl = case['alpha'] / 10
+    return ("\n Surface Forces (referred to Sref,Cref,Bref about Xref,Yref,Zref)\n"
+            "     n      Area     CL      CD      Cm      CY      Cn      Cl     CDi     CDv\n"
+            "     1     0.5000  {0:7.4f}  0.0050 -0.0100  0.0000  0.0000 -0.0100  0.0040  0.0010  Wing\n"
+            "     2     0.5000  {0:7.4f}  0.0050 -0.0100  0.0000  0.0000  0.0100  0.0040  0.0010  Wing (YDUP)\n"
+            "\n").format(cl)
+
+
+def strip_forces(case):
+    cl = case['alpha'] / 10
+    text = ("\n ---------------------------------------------------------------\n"
+            " Surface and Strip Forces by surface\n\n"
+            "  Surface # 1     Wing\n"
+            "     # Chordwise = 12   # Spanwise = 4\n\n"
+            " Strip Forces referred to Strip Area, Chord\n"
+            "    j     Yle    Chord     Area     c cl      ai      cl_norm  cl"
+            "       cd       cdv    cm_c/4    cm_LE  C.P.x/c\n")
+    for j in range(1, 5):
+        text += ("   {:2d}  {:.4f}   0.2000   0.0100   0.0500   0.0010  {:.4f}"
+                 "  {:.4f}   0.0100   0.0000  -0.0500  -0.1100   0.250\n"
+                 ).format(j, 0.1 * j, cl, cl * (1 - 0.1 * j))
+    return text + "\n"
+
+
+def element_forces(case):
+    # the separators of the element output are long runs of asterisks
+    return ("\n " + "*" * 78 + "\n"
+            "  Surface # 1     Wing\n"
+            " " + "*" * 78 + "\n\n")
+
+
+def stability(case):
+    return ("\n Stability-axis derivatives...\n"
+            "  CLa =   5.00000    CLb =   0.00000\n"
+            "  Cma =  -1.00000    Cmb =   0.00000\n"
+            "\n Neutral point  Xnp =   {:.6f}\n").format(0.2 + case['x_cg'] / 10)
+
+
+WRITERS = {'ft': totals, 'fn': surface_forces, 'fs': strip_forces,
+           'fe': element_forces, 'st': stability}
+
+
+def oper(cases):
+    current = 0
+    while True:
+        write("\n OPER (case {}/{})   c>  ".format(current + 1, len(cases)))
+        cmd = read()
+        if not cmd:
+            return
+        if cmd.isdigit():
+            current = int(cmd) - 1
+        elif cmd.lower() == 'x':
+            if MODE == 'hang':
+                time.sleep(3600)
+            elif MODE == 'slow':
+                time.sleep(0.3)
+            elif MODE == 'exit':
+                sys.exit(1)
+            write(" Iteration Max Correction\n")
+            if MODE == 'diverge' and cases[current]['alpha'] < 0:
+                write(" Trim convergence failed\n")
+            if MODE == 'overflow':
+                write("  Alpha = **********\n")
+        elif cmd.lower() in WRITERS:
+            write("\n Enter filename, or <return> for screen output   s>  ")
+            file_name = read()
+            text = WRITERS[cmd.lower()](cases[current])
+            if file_name:
+                with open(file_name, 'w') as fp:
+                    fp.write(text)
+            else:
+                write(text)
+        else:
+            not_recognized(cmd)
+
+
+def main():
+    write(" " + "=" * 61 + "\n"
+          " Athena Vortex Lattice  Program      Version  3.35\n")
+    cases = [{'name': 'default', 'alpha': 0.0, 'x_cg': 0.0}]
+    while True:
+        write("\n AVL   c>  ")
+        cmd = read()
+        if not cmd:
+            continue
+        name, _, argument = cmd.partition(' ')
+        if name.lower() == 'quit':
+            return
+        if name.lower() == 'load':
+            write(" Reading file: {}  ...\n".format(argument))
+        elif name.lower() == 'case':
+            cases = read_cases(argument)
+            write(" Run cases read  ...{:3d}\n".format(len(cases)))
+        elif name.lower() == 'oper':
+            oper(cases)
+        else:
+            not_recognized(cmd)
+
+
+if __name__ == '__main__':
+    main()
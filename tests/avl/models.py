@@ -0,0 +1,62 @@
+""" Geometry and cases written by the tests/avl/data reference files
+
+The reference files were written by the AVL writer before the geometry text
+was memoized and before case templates, the tests check that the current
+writers give the same bytes.
+"""
+from avl import (Aircraft, Case, Control, DataAirfoil, DesignVar, FileAirfoil,
+                 NacaAirfoil, Parameter, Point, ProfileDrag, Section, Spacing,
+                 Surface, Symmetry, Vector)
+
+
+def reference_aircraft(tail_x=1.2):
+    elevator = Control(name='elevator', gain=1.0, x_hinge=0.7,
+                       duplicate_sign=1)
+    aileron = Control(name='aileron', gain=-1, x_hinge=0.75,
+                      duplicate_sign=-1, hinge_vector=Vector(0.0, 1.0, 0.0))
+    drag = ProfileDrag(cl=[-0.5, 0.4, 1.4], cd=[0.02, 0.009, 0.025])
+
+    wing = Surface(
+        name='Wing', n_chordwise=8, chord_spacing=Spacing.cosine,
+        n_spanwise=12, span_spacing=Spacing.neg_sine, y_duplicate=0.0,
+        angle=2.0, profile_drag=drag,
+        sections=[
+            Section(leading_edge_point=Point(0.0, 0.0, 0.0), chord=0.45,
+                    airfoil=FileAirfoil('naca4415.dat'),
+                    design_vars=[DesignVar(name='twist', weight=1.0)]),
+            Section(leading_edge_point=Point(0.02, 0.8, 0.0), chord=0.4,
+                    angle=-0.0, airfoil=NacaAirfoil('4415', 0.0, 1.0),
+                    controls=[aileron], cl_alpha_scaling=1.1),
+            Section(leading_edge_point=Point(0.05, 1.6, 0.05), chord=0.3,
+                    n_spanwise=4, span_spacing=0.5,
+                    airfoil=NacaAirfoil('4412'), controls=[aileron],
+                    profile_drag=drag)])
+    tail = Surface(
+        name='Tail', n_chordwise=6, chord_spacing=Spacing.equal,
+        n_spanwise=8, span_spacing=Spacing.cosine, y_duplicate=0.0,
+        translation=Vector(tail_x, 0.0, 0.1), scaling=Vector(1, 1, 1),
+        component=2, no_wake=True, fixed=True, no_loads=True,
+        sections=[
+            Section(leading_edge_point=Point(0.0, 0.0, 0.0), chord=0.25,
+                    airfoil=DataAirfoil([1.0, 0.5, 0.0, 0.5, 1.0],
+                                        [0.0, 0.03, 0.0, -0.03, 0.0]),
+                    controls=[elevator]),
+            Section(leading_edge_point=Point(0.08, 0.35, 0.3), chord=0.15,
+                    airfoil=NacaAirfoil('0012'), controls=[elevator])])
+    return Aircraft(name='reference', reference_area=1.42,
+                    reference_chord=0.42, reference_span=3.2,
+                    reference_point=Point(0.11, 0.0, 0.0),
+                    surfaces=[wing, tail], mach=0.05, cd_p=0.012,
+                    z_symmetry=Symmetry.symmetric, z_symmetry_plane=-0.5)
+
+
+def reference_cases():
+    return [
+        Case(name='trimmed', number=1,
+             alpha=Parameter(name='alpha', setting='CL', value=0.45),
+             elevator=Parameter(name='elevator', setting='Cm', value=0.0),
+             X_cg=0.12, velocity=18.0, mass=14.5),
+        Case(name='roll', number=2, alpha=3, roll_rate=0.05,
+             aileron=2.5, elevator=-1.25, Ixx=0.9, density=1.1),
+        Case(name='untrimmed', number=12, alpha=-2.5e-05, beta=1.0,
+             cd_p=0.01, mach=0.06)]
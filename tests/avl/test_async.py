@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from avl import Session
+from avl.pool import AsyncWorker
+
+
+def test_sessions_run_concurrently_within_the_limit(config, aircraft,
+                                                    make_cases, monkeypatch):
+    monkeypatch.setenv('FAKE_AVL_MODE', 'slow')
+    running = []
+    peak = []
+    run = AsyncWorker.run
+
+    async def counting_run(self, *args, **kwargs):
+        running.append(self)
+        peak.append(len(running))
+        try:
+            return await run(self, *args, **kwargs)
+        finally:
+            running.remove(self)
+
+    monkeypatch.setattr(AsyncWorker, 'run', counting_run)
+
+    async def run_sessions():
+        limiter = asyncio.Semaphore(2)
+        sessions = [Session(geometry=aircraft, cases=make_cases(1, idx),
+                            config=config)
+                    for idx in range(5)]
+        return await asyncio.gather(
+            *[session.run_all_cases_async(limiter) for session in sessions])
+
+    results = asyncio.run(run_sessions())
+    assert [result['case0']['Totals']['Alpha'] for result in results] \
+        == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert max(peak) == 2
+
+
+def test_cancelled_task_kills_avl(config, aircraft, make_cases, monkeypatch):
+    monkeypatch.setenv('FAKE_AVL_MODE', 'hang')
+    processes = []
+    start = AsyncWorker.start
+
+    async def recording_start(self, *args, **kwargs):
+        worker = await start(self, *args, **kwargs)
+        processes.append(worker._process)
+        return worker
+
+    monkeypatch.setattr(AsyncWorker, 'start', recording_start)
+
+    async def cancel_run():
+        session = Session(geometry=aircraft, cases=make_cases(1),
+                          config=config)
+        task = asyncio.ensure_future(session.run_all_cases_async())
+        while not processes:
+            await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_run())
+    assert processes[0].returncode is not None
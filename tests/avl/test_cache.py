@@ -0,0 +1,114 @@
+import os
+
+import pytest
+
+from avl import Aircraft, Case, Configuration, Point, ResultCache, Session
+from avl import cache as cache_module
+from avl.cache import cache_path, case_key, default_cache, file_digest
+from avl.config import CONFIG_FILE, MODULE_DIR
+
+OUTPUTS = {'Totals': 'ft'}
+
+
+def key(geometry='geometry', case=None, outputs=OUTPUTS, airfoils=('foil',),
+        parser='legacy'):
+    if case is None:
+        case = Case(name='cruise', alpha=2.0)
+    return case_key(geometry, case, outputs, airfoils, parser=parser)
+
+
+def test_key_ignores_case_name_and_number():
+    assert key(case=Case(name='cruise', alpha=2.0)) \
+        == key(case=Case(name='other', alpha=2.0, number=7))
+
+
+@pytest.mark.parametrize('changes', [
+    {'geometry': 'changed geometry'},
+    {'case': Case(name='cruise', alpha=2.5)},
+    {'case': Case(name='cruise', alpha=2.0, elevator=1.0)},
+    {'case': Case(name='cruise', alpha=2.0, X_cg=0.3)},
+    {'outputs': {'Totals': 'ft', 'StabilityDerivatives': 'st'}},
+    {'airfoils': ('foil', 'other foil')},
+    {'airfoils': ('changed foil',)},
+    {'parser': 'numpy'},
+])
+def test_key_changes_with_every_input(changes):
+    assert key(**changes) != key()
+
+
+def test_key_changes_with_cache_version(monkeypatch):
+    old_key = key()
+    monkeypatch.setattr(cache_module, 'CACHE_VERSION',
+                        cache_module.CACHE_VERSION + 1)
+    assert key() != old_key
+
+
+def test_file_digest_follows_file_changes(tmp_path):
+    path = tmp_path / 'foil.dat'
+    path.write_text("foil\n")
+    digest = file_digest(str(path))
+    assert file_digest(str(path)) == digest
+
+    path.write_text("changed foil\n")
+    assert file_digest(str(path)) != digest
+
+
+def test_cache_stores_and_evicts(tmp_path, config):
+    cache = ResultCache(path=str(tmp_path / 'cache.sqlite'), max_size=400,
+                        config=config)
+    cache.put('a', {'CL': 1.0})
+    assert cache.get('a') == {'CL': 1.0}
+    assert cache.get('b') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # least recently used results are evicted first
+    cache.put('b', list(range(100)))
+    cache.get('a')
+    cache.put('c', list(range(100)))
+    assert cache.get('a') == {'CL': 1.0}
+    assert cache.get('b') is None
+    assert cache.size <= 400
+    cache.close()
+
+    # the results outlive the process
+    cache = ResultCache(path=str(tmp_path / 'cache.sqlite'), config=config)
+    assert cache.get('c') == list(range(100))
+    cache.close()
+
+
+def test_cache_is_disabled_by_default():
+    config = Configuration(os.path.join(MODULE_DIR, CONFIG_FILE))
+    assert not config['cache']['enabled']
+    assert default_cache(config) is None
+
+
+def test_cache_path_is_in_the_workspace(config, tmp_path):
+    assert cache_path(config) \
+        == os.path.join(str(tmp_path / 'workspace'), 'avl_cache.sqlite')
+
+    config['cache']['path'] = str(tmp_path / 'results.sqlite')
+    assert cache_path(config) == str(tmp_path / 'results.sqlite')
+    config['cache']['path'] = ':memory:'
+    assert cache_path(config) == ':memory:'
+
+
+def test_session_runs_only_missing_cases(config, aircraft, make_cases):
+    cache = ResultCache(path=':memory:', config=config)
+    first = Session(geometry=aircraft, cases=make_cases(3), config=config,
+                    cache=cache).run_all_cases()
+    assert (cache.hits, cache.misses) == (0, 3)
+
+    # AVL is not started if all results are cached
+    config['avl_bin'] = os.devnull
+    cases = make_cases(3)
+    second = Session(geometry=aircraft, cases=cases, config=config,
+                     cache=cache).run_all_cases()
+    assert second == first
+    assert cache.hits == 3
+
+    changed = Aircraft(name='plane', reference_area=2.0,
+                       reference_chord=0.25, reference_span=4.0,
+                       reference_point=Point(0.1, 0.0, 0.0))
+    with pytest.raises(OSError):
+        Session(geometry=changed, cases=cases, config=config,
+                cache=cache).run_all_cases()
@@ -0,0 +1,62 @@
+import pytest
+
+from avl import Case, Session
+from avl.session import InputError
+
+
+def test_cases_use_the_configured_outputs(config, aircraft, make_cases):
+    session = Session(geometry=aircraft, cases=make_cases(1), config=config)
+    assert session.get_case_output(session.cases[0]) \
+        == {'Totals': 'ft', 'StabilityDerivatives': 'st'}
+
+
+def test_case_outputs_replace_the_configured_outputs(config, aircraft):
+    case = Case(name='case0', alpha=0.0, outputs=['stripforces', 'Totals'])
+    session = Session(geometry=aircraft, cases=[case], config=config)
+    assert session.get_case_output(case) \
+        == {'StripForces': 'fs', 'Totals': 'ft'}
+    assert case.outputs == ('stripforces', 'Totals')
+
+
+def test_invalid_case_output_raises(config, aircraft):
+    case = Case(name='case0', alpha=0.0, outputs=['Polar'])
+    session = Session(geometry=aircraft, cases=[case], config=config)
+    with pytest.raises(InputError, match="Invalid output: Polar"):
+        session.get_case_output(case)
+
+
+@pytest.mark.parametrize('output_mode', ['files', 'pipe'])
+def test_every_case_gets_its_outputs(make_config, aircraft, output_mode):
+    cases = [Case(name='default', alpha=1.0, X_cg=0.1),
+             Case(name='strips', alpha=2.0, X_cg=0.1,
+                  outputs=('Totals', 'StripForces')),
+             Case(name='stability', alpha=3.0, X_cg=0.1,
+                  outputs=('StabilityDerivatives',))]
+    session = Session(geometry=aircraft, cases=cases,
+                      config=make_config(output_mode=output_mode))
+
+    # output commands of each case, the configured outputs are unordered
+    commands = {}
+    for cmd in session._get_cases_run_cmds(session.cases).split("\n"):
+        if cmd.isdigit():
+            case_commands = commands.setdefault(int(cmd), set())
+        elif cmd in Session.OUTPUTS.values():
+            case_commands.add(cmd)
+    assert commands == {1: {'ft', 'st'}, 2: {'ft', 'fs'}, 3: {'st'}}
+
+    results = session.run_all_cases()
+    assert sorted(results['default']) == ['StabilityDerivatives', 'Totals']
+    assert sorted(results['strips']) == ['StripForces', 'Totals']
+    assert results['strips']['Totals']['Alpha'] == 2.0
+    assert sorted(results['stability']) == ['StabilityDerivatives']
+
+
+def test_case_outputs_change_the_cache_key(config, aircraft):
+    cases = [Case(name='case0', alpha=1.0),
+             Case(name='case0', alpha=1.0, outputs=('Totals',)),
+             Case(name='case0', alpha=1.0,
+                  outputs=('Totals', 'StabilityDerivatives'))]
+    session = Session(geometry=aircraft, cases=cases, config=config)
+    default, totals, same_as_default = session._get_case_keys()
+    assert totals != default
+    assert same_as_default == default
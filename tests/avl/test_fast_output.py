@@ -0,0 +1,112 @@
+import glob
+import math
+import os
+
+import numpy as np
+import pytest
+
+from avl import OutputReader, Session
+from avl.benchmark.output_benchmark import SYNTHETIC_DIR, compare
+from avl.fast_output import (FastElementFileReader, FastOutputReader,
+                             FastStripFileReader, FastSurfaceFileReader)
+
+STRIPS = """\
+  Surface # 1     Wing
+ Strip Forces referred to Strip Area, Chord
+    j      Yle    Chord     Area     c cl      ai      cl_norm  cl
+     1   0.0244   0.6050   0.0295   0.3990   0.0400   0.6595   0.6595
+     2   0.0731   0.6023   0.0294   0.3972   0.0398   {value}   0.6595
+
+  Surface # 2     Wing (YDUP)
+ Strip Forces referred to Strip Area, Chord
+    j      Yle    Chord     Area     c cl      ai      cl_norm  cl
+     3  -0.0244   0.6050   0.0295   0.3990   0.0400   0.6595   0.6595
+     4  -0.0731   0.6023   0.0294   0.3972   0.0398   0.6595   0.6595
+
+"""
+
+ELEMENTS = """\
+  Surface # 1     Wing
+
+ Strip #  99     # Chordwise = 2   First Vortex = 197
+    I        X           Y           Z           DX        Slope        dCp
+  197     0.01146     0.02438     0.00000     0.04583     0.02000     3.99950
+  198     0.05729     0.02438     0.00000     0.04583     0.01600     3.66739
+
+ Strip # 100     # Chordwise = 2   First Vortex = 199
+    I        X           Y           Z           DX        Slope        dCp
+  199     0.01146     0.07312     0.00000     0.04583     0.02000     4.00065
+  200     0.05729     0.07312     0.00000     0.04583     0.01600     3.66568
+
+"""
+
+SURFACES = """\
+ n      Area      CL      CD      Cm      CY      Cn      Cl     CDi     CDv
+ 1     1.075  0.1565  0.0029 -0.0313  0.0003  0.0005 -0.0221  0.0029  0.0000   Wing
+ 2     1.075  {value}  0.0029 -0.0313 -0.0003 -0.0005  0.0221  0.0029  0.0000   Wing (YDUP)
+
+"""
+
+
+def lines(text, **values):
+    return text.format(**values).splitlines(keepends=True)
+
+
+def test_strip_tables_are_column_arrays():
+    results = FastStripFileReader.from_lines(
+        lines(STRIPS, value="0.6595")).parse()
+
+    columns = results['Wing']
+    assert set(columns) == {'Yle', 'Chord', 'Area', 'c cl', 'ai', 'cl_norm',
+                            'cl'}
+    assert all(isinstance(values, np.ndarray) and values.flags.c_contiguous
+               for values in columns.values())
+    # the YDUP strips follow the strips of the surface
+    np.testing.assert_array_equal(columns['Yle'],
+                                  [0.0244, 0.0731, -0.0244, -0.0731])
+
+
+def test_element_strips_above_99_are_read():
+    results = FastElementFileReader.from_lines(lines(ELEMENTS)).parse()
+    assert sorted(results['Wing']) == [99, 100]
+    np.testing.assert_array_equal(results['Wing'][100]['dCp'],
+                                  [4.00065, 3.66568])
+    assert set(results['Wing'][99]) == {'X', 'Y', 'Z', 'DX', 'Slope', 'dCp'}
+
+
+def test_surface_ydup_values_are_added():
+    results = FastSurfaceFileReader.from_lines(
+        lines(SURFACES, value="0.1565")).parse()
+    assert results['Wing']['CL'] == pytest.approx(0.313)
+    assert results['Wing']['Cl'] == pytest.approx(0.0)
+
+
+@pytest.mark.parametrize('width', [8, 10, 12])
+def test_overflows_of_any_width_are_nan(width):
+    with pytest.warns(UserWarning):
+        strips = FastStripFileReader.from_lines(
+            lines(STRIPS, value="*" * width)).parse()
+    assert math.isnan(strips['Wing']['cl_norm'][1])
+    assert len(strips['Wing']['cl_norm']) == 4
+
+    surfaces = FastSurfaceFileReader.from_lines(
+        lines(SURFACES, value="*" * width)).parse()
+    assert math.isnan(surfaces['Wing']['CL'])
+
+
+@pytest.mark.parametrize('path', sorted(glob.glob(
+    os.path.join(SYNTHETIC_DIR, '*'))))
+def test_readers_agree_on_the_synthetic_files(path):
+    # the files are written after the AVL format statements, this checks
+    # the readers against each other and not against AVL
+    assert compare(OutputReader(path).get_content(),
+                   FastOutputReader(path).get_content()) == []
+
+
+def test_session_uses_the_numpy_reader(make_config, aircraft, make_cases):
+    config = make_config(parser='numpy')
+    config['output'] = {'Totals': 'yes', 'StripForces': 'yes'}
+    session = Session(geometry=aircraft, cases=make_cases(2), config=config)
+    strips = session.run_all_cases()['case1']['StripForces']['Wing']
+    assert isinstance(strips['cl_norm'], np.ndarray)
+    np.testing.assert_allclose(strips['cl_norm'], [0.1] * 4)
@@ -0,0 +1,83 @@
+import pytest
+
+from avl import Session
+from avl.output import PipeReader
+
+PROMPT = "\n Enter filename, or <return> for screen output   s>  "
+
+TOTALS = ("\n ---------------------------------------------------------------\n"
+          " Vortex Lattice Output -- Total Forces\n\n"
+          "  Alpha =   2.00000     pb/2V =   0.00000\n"
+          "  CLtot =   0.20000\n")
+
+STABILITY = ("\n Stability-axis derivatives...\n"
+             "  CLa =   5.00000    CLb =   0.00000\n"
+             "\n Neutral point  Xnp =   0.210000\n")
+
+
+def screen_lines(*blocks):
+    """Screen output of output commands printed to the screen, split in
+    lines as the worker reads them. Prompts do not end with a new line, so
+    the first output line follows the prompt."""
+    text = ""
+    for block in blocks:
+        text += PROMPT + block + "\n OPER (case 1/1)   c>  "
+    return text.splitlines(keepends=True)
+
+
+def test_blocks_are_split_at_the_prompts():
+    reader = PipeReader([".ft", ".st"])
+    for line in screen_lines(TOTALS, STABILITY):
+        reader.feed(line)
+    totals, stability = reader.get_contents()
+
+    assert totals == {'Alpha': 2.0, 'pb/2V': 0.0, 'CLtot': 0.2}
+    assert stability == {'CLa': 5.0, 'CLb': 0.0, 'Xnp': 0.21}
+
+
+def test_output_starting_on_the_prompt_line():
+    reader = PipeReader([".ft"])
+    for line in screen_lines("  Alpha =   3.00000\n"):
+        reader.feed(line)
+    assert reader.get_contents() == [{'Alpha': 3.0}]
+
+
+def test_lines_outside_outputs_are_ignored():
+    reader = PipeReader([".ft"])
+    lines = [" Iteration Max Correction\n", "  Alpha =  -1.00000\n"]
+    for line in lines + screen_lines(TOTALS) + lines:
+        reader.feed(line)
+    assert reader.get_contents()[0]['Alpha'] == 2.0
+
+
+def test_last_block_ends_with_the_stream():
+    reader = PipeReader([".ft"])
+    for line in screen_lines(TOTALS)[:-1]:
+        reader.feed(line)
+    assert reader.get_contents()[0]['CLtot'] == 0.2
+
+
+def test_missing_outputs_raise():
+    reader = PipeReader([".ft", ".st"])
+    for line in screen_lines(TOTALS):
+        reader.feed(line)
+    with pytest.raises(ValueError, match="Expected 2 outputs"):
+        reader.get_contents()
+
+
+def test_pipe_mode_matches_output_files(make_config, aircraft, make_cases):
+    # the fake AVL prints the text it writes to the output files
+    results = {}
+    for output_mode in ('files', 'pipe'):
+        config = make_config(output_mode=output_mode)
+        config['output'] = {'Totals': 'yes', 'StripForces': 'yes',
+                            'SurfaceForces': 'yes',
+                            'StabilityDerivatives': 'yes'}
+        session = Session(geometry=aircraft, cases=make_cases(3),
+                          config=config)
+        results[output_mode] = session.run_all_cases()
+
+    assert results['pipe'] == results['files']
+    assert results['pipe']['case2']['Totals']['Alpha'] == 2.0
+    assert results['pipe']['case1']['StripForces']['Wing']['cl_norm'] \
+        == [0.1] * 4
@@ -0,0 +1,143 @@
+import threading
+
+import pytest
+
+from avl import AVLProcessError, AVLTimeoutError, Session, WorkerPool
+from avl.pool import Worker
+
+
+def test_sentinel_ends_every_command_stream(config):
+    worker = Worker(config['avl_bin']).start(timeout=10)
+    try:
+        lines = worker.run("load plane.avl\n", timeout=10)
+        # the sentinel reply is consumed, the output of the command is not
+        assert any("Reading file: plane.avl" in line for line in lines)
+        assert not any(worker._is_sentinel(line) for line in lines)
+        # the next stream starts at the top-level menu
+        lines = worker.run("oper\nx\n\n", timeout=10)
+        assert any("Iteration" in line for line in lines)
+        assert worker.jobs == 2
+    finally:
+        worker.close()
+
+
+def test_pool_reuses_warm_workers(config):
+    with WorkerPool(size=1, config=config) as pool:
+        with pool.worker() as worker:
+            first_pid = worker._process.pid
+        with pool.worker() as worker:
+            assert worker._process.pid == first_pid
+
+
+def test_pool_recycles_after_max_jobs(config):
+    with WorkerPool(size=1, config=config, max_jobs=2) as pool:
+        pids = []
+        for _ in range(3):
+            with pool.worker() as worker:
+                worker.run("\n", timeout=10)
+                pids.append(worker._process.pid)
+        assert pids[0] == pids[1]
+        assert pids[2] != pids[1]
+
+
+def test_pool_recycles_on_error(config):
+    with WorkerPool(size=1, config=config) as pool:
+        with pytest.raises(RuntimeError):
+            with pool.worker() as worker:
+                first_pid = worker._process.pid
+                raise RuntimeError
+        with pool.worker() as worker:
+            assert worker._process.pid != first_pid
+
+
+def test_pool_replaces_dead_workers(config):
+    with WorkerPool(size=1, config=config) as pool:
+        with pool.worker() as worker:
+            first_pid = worker._process.pid
+        worker.kill()
+        with pool.worker() as worker:
+            assert worker.is_alive()
+            assert worker._process.pid != first_pid
+
+
+def test_pool_limits_concurrent_workers(config):
+    with WorkerPool(size=2, config=config) as pool:
+        busy = [pool.acquire(), pool.acquire()]
+        acquired = threading.Event()
+
+        def acquire():
+            pool.release(pool.acquire())
+            acquired.set()
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        assert not acquired.wait(0.3)
+        pool.release(busy.pop())
+        assert acquired.wait(10)
+        thread.join()
+        pool.release(busy.pop())
+
+
+def test_timeout_kills_a_stuck_worker(make_config, monkeypatch):
+    monkeypatch.setenv('FAKE_AVL_MODE', 'hang')
+    config = make_config(timeout=1)
+    worker = Worker(config['avl_bin']).start(timeout=10)
+    try:
+        with pytest.raises(AVLTimeoutError):
+            worker.run("oper\nx\n\n", timeout=0.5)
+        assert not worker.is_alive()
+        with pytest.raises(AVLProcessError):
+            worker.run("\n")
+    finally:
+        worker.close()
+
+
+def test_exited_process_is_reported(make_config, monkeypatch):
+    monkeypatch.setenv('FAKE_AVL_MODE', 'exit')
+    worker = Worker(make_config()['avl_bin']).start(timeout=10)
+    try:
+        with pytest.raises(AVLProcessError, match="exited unexpectedly"):
+            worker.run("oper\nx\n\n", timeout=10)
+    finally:
+        worker.close()
+
+
+def test_session_runs_on_pool(config, aircraft, make_cases):
+    cases = make_cases(3)
+    with WorkerPool(size=1, config=config) as pool:
+        session = Session(geometry=aircraft, cases=cases, config=config,
+                          pool=pool)
+        results = session.run_all_cases()
+        # the second session finds the files of the first one removed
+        session = Session(geometry=aircraft, cases=make_cases(2, 10),
+                          config=config, pool=pool)
+        second_results = session.run_all_cases()
+
+    assert [results[case.name]['Totals']['Alpha'] for case in cases] \
+        == [0.0, 1.0, 2.0]
+    assert second_results['case1']['Totals']['Alpha'] == 11.0
+    assert set(results['case0']) == {'Totals', 'StabilityDerivatives'}
+
+
+def test_idle_workers_are_pinged_before_reuse(config):
+    with WorkerPool(size=1, config=config) as pool:
+        pool.HEALTH_CHECK_INTERVAL = 0.0
+        with pool.worker() as worker:
+            first_pid = worker._process.pid
+            jobs = worker.jobs
+        with pool.worker() as worker:
+            # the ping is not counted as a job
+            assert worker._process.pid == first_pid
+            assert worker.jobs == jobs
+
+
+def test_pool_timeout_recycles_the_worker(make_config, aircraft, make_cases,
+                                          monkeypatch):
+    monkeypatch.setenv('FAKE_AVL_MODE', 'hang')
+    config = make_config(timeout=1)
+    with WorkerPool(size=1, config=config) as pool:
+        session = Session(geometry=aircraft, cases=make_cases(1),
+                          config=config, pool=pool)
+        with pytest.raises(AVLTimeoutError):
+            session.run_all_cases()
+        assert pool._idle.empty()
@@ -0,0 +1,97 @@
+import dataclasses
+import hashlib
+import os
+from collections import OrderedDict
+
+import pytest
+
+from avl import Point, Section, Session, Spacing, Vector
+from avl import model
+from tests.avl.models import reference_aircraft
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+
+def read_reference(name):
+    with open(os.path.join(DATA_DIR, name), newline='') as fp:
+        return fp.read()
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Classes of the objects rendered, the render cache starts empty"""
+    monkeypatch.setattr(model, '_render_cache', OrderedDict())
+    rendered = []
+    for cls in (model.Section, model.Surface, model.Aircraft):
+        def counting_render(self, render=cls._render):
+            rendered.append(type(self).__name__)
+            return render(self)
+        monkeypatch.setattr(cls, '_render', counting_render)
+    return rendered
+
+
+def test_geometry_text_matches_the_reference():
+    assert str(reference_aircraft()) == read_reference('reference.avl')
+
+
+def test_text_is_rendered_once(renders):
+    aircraft = reference_aircraft()
+    assert str(aircraft) == str(aircraft)
+    assert sorted(renders) == ['Aircraft'] + ['Section'] * 5 + ['Surface'] * 2
+
+
+def test_equal_objects_share_the_text(renders):
+    str(reference_aircraft())
+    del renders[:]
+    # only the translated tail and the aircraft are rendered again
+    moved = reference_aircraft(tail_x=1.3)
+    assert renders == []
+    assert str(moved) == read_reference('reference.avl').replace(
+        'TRANSLATE\n1.2 ', 'TRANSLATE\n1.3 ')
+    assert sorted(renders) == ['Aircraft', 'Surface']
+
+
+@pytest.mark.parametrize('chord', [1, -0.0])
+def test_values_of_other_types_do_not_share_the_text(chord):
+    sections = [Section(leading_edge_point=Point(0.0, 0.0, 0.0), chord=value)
+                for value in (float(abs(chord)), chord)]
+    assert sections[0] == sections[1]
+    assert str(sections[0]) != str(sections[1])
+    assert "{} 0.0\n".format(chord) in str(sections[1])
+
+
+def test_geometry_is_frozen_and_hashable():
+    aircraft = reference_aircraft()
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        aircraft.reference_area = 2.0
+    assert isinstance(aircraft.surfaces, tuple)
+    assert isinstance(aircraft.surfaces[0].sections[0].design_vars, tuple)
+    assert hash(aircraft) == hash(reference_aircraft())
+    assert {aircraft, reference_aircraft()} == {aircraft}
+
+
+def test_digest_follows_the_text():
+    aircraft = reference_aircraft()
+    assert aircraft.digest == hashlib.sha256(
+        read_reference('reference.avl').encode()).hexdigest()
+    assert reference_aircraft(tail_x=1.3).digest != aircraft.digest
+
+
+def test_case_keys_follow_the_geometry(config, make_cases):
+    keys = [Session(geometry=geometry, cases=make_cases(1),
+                    config=config)._get_case_keys()
+            for geometry in (reference_aircraft(), reference_aircraft(),
+                             reference_aircraft(tail_x=1.3))]
+    assert keys[0] == keys[1]
+    assert keys[2] != keys[0]
+
+
+def test_bodies_are_written():
+    body = model.Body(name='Fuselage', n_body=20,
+                      body_spacing=Spacing.cosine,
+                      body_section=model.BodyProfile('fuse.dat'),
+                      translation=Vector(-0.2, 0.0, 0.0))
+    aircraft = dataclasses.replace(reference_aircraft(), bodies=[body])
+    assert str(body) == ("BODY\nFuselage\n#NBody BSpace\n20 1\n"
+                         "BFILE  \nfuse.dat\nTRANSLATE\n-0.2 0.0 0.0\n")
+    assert str(aircraft).endswith(str(body))
@@ -0,0 +1,44 @@
+import asyncio
+import os
+
+from avl import Session, WorkerPool
+from avl.tools import partitioned_cases
+
+
+def test_partitioned_cases_keep_order():
+    shards = list(partitioned_cases(list(range(60)), 25))
+    assert [len(shard) for shard in shards] == [25, 25, 10]
+    assert [case for shard in shards for case in shard] == list(range(60))
+
+
+def test_shard_results_merge_in_case_order(config, aircraft, make_cases):
+    cases = make_cases(60)
+    with WorkerPool(size=3, config=config) as pool:
+        session = Session(geometry=aircraft, cases=cases, config=config,
+                          pool=pool)
+        results = session.run_all_cases()
+
+    assert list(results) == [case.name for case in cases]
+    assert [results[case.name]['Totals']['Alpha'] for case in cases] \
+        == [float(idx) for idx in range(60)]
+    # the shards renumber copies, the cases of the session are unchanged
+    assert [case.number for case in cases] == list(range(1, 61))
+
+
+def test_shard_results_merge_in_case_order_async(config, aircraft,
+                                                 make_cases):
+    cases = make_cases(30, start=-10)
+    session = Session(geometry=aircraft, cases=cases, config=config)
+    results = asyncio.run(session.run_all_cases_async())
+
+    assert list(results) == [case.name for case in cases]
+    assert [results[case.name]['Totals']['Alpha'] for case in cases] \
+        == [float(idx) for idx in range(-10, 20)]
+
+
+def test_export_writes_one_case_file_per_shard(config, aircraft, make_cases,
+                                               tmp_path):
+    session = Session(geometry=aircraft, cases=make_cases(30), config=config)
+    session.export_run_files(str(tmp_path / 'export'))
+    assert sorted(os.listdir(str(tmp_path / 'export'))) \
+        == ['plane-1.case', 'plane-2.case', 'plane.avl']
@@ -0,0 +1,68 @@
+import asyncio
+import os
+
+from avl import Case, ResultCache, Session
+from avl.pool import AsyncWorker, Worker
+
+
+def second_stage(results):
+    # the second stage depends on the results of the first one
+    return [Case(name='mission{}'.format(idx),
+                 alpha=results['case0']['Totals']['Alpha'] + 100 + idx,
+                 X_cg=0.1)
+            for idx in range(30)]
+
+
+def record_commands(monkeypatch, worker_class):
+    commands = []
+    run = worker_class.run
+
+    def recording_run(self, cmds, *args, **kwargs):
+        commands.append(cmds)
+        return run(self, cmds, *args, **kwargs)
+
+    monkeypatch.setattr(worker_class, 'run', recording_run)
+    return commands
+
+
+def check_results(first, second):
+    assert [value['Totals']['Alpha'] for value in first.values()] \
+        == [0.0, 1.0]
+    assert list(second) == ['mission{}'.format(idx) for idx in range(30)]
+    assert [value['Totals']['Alpha'] for value in second.values()] \
+        == [100.0 + idx for idx in range(30)]
+
+
+def test_stages_share_one_process(config, aircraft, make_cases, monkeypatch):
+    commands = record_commands(monkeypatch, Worker)
+    session = Session(geometry=aircraft, cases=make_cases(2), config=config)
+    first, second = session.run_staged(second_stage)
+
+    check_results(first, second)
+    # the geometry is loaded once, the 30 cases of the second stage are
+    # split in two case files
+    assert sum(cmds.count("load ") for cmds in commands) == 1
+    assert [cmds.split("\n")[0] for cmds in commands[1:]] \
+        == ["case plane-1.case", "case plane-2.case", "case plane-3.case"]
+
+
+def test_stages_share_one_process_async(config, aircraft, make_cases,
+                                        monkeypatch):
+    commands = record_commands(monkeypatch, AsyncWorker)
+    session = Session(geometry=aircraft, cases=make_cases(2), config=config)
+    first, second = asyncio.run(session.run_staged_async(second_stage))
+
+    check_results(first, second)
+    assert sum(cmds.count("load ") for cmds in commands) == 1
+
+
+def test_cached_stages_do_not_start_avl(config, aircraft, make_cases):
+    cache = ResultCache(path=':memory:', config=config)
+    session = Session(geometry=aircraft, cases=make_cases(2), config=config,
+                      cache=cache)
+    first, second = session.run_staged(second_stage)
+
+    config['avl_bin'] = os.devnull
+    session = Session(geometry=aircraft, cases=make_cases(2), config=config,
+                      cache=cache)
+    assert session.run_staged(second_stage) == (first, second)
@@ -0,0 +1,107 @@
+import copy
+import os
+
+import numpy as np
+import pytest
+
+from avl import Case, CaseTemplate, Parameter, Session
+from tests.avl.models import reference_aircraft, reference_cases
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+SLOTS = ('trimmed.alpha', 'trimmed.X_cg', 'roll.roll_rate', 'roll.aileron')
+
+
+def filled_cases(alpha, x_cg, roll_rate, aileron):
+    # the reference cases with the slot values set
+    trimmed, roll, untrimmed = reference_cases()
+    trimmed.parameters['alpha'].value = alpha
+    trimmed.states['X_cg'].value = x_cg
+    roll.parameters['pb/2V'].value = roll_rate
+    roll.parameters['aileron'].value = aileron
+    return [trimmed, roll, untrimmed]
+
+
+def text(cases, numbers=(1, 2, 12)):
+    for case, number in zip(cases, numbers):
+        case.number = number
+    return "".join(str(case) for case in cases)
+
+
+def test_template_cases_match_the_reference():
+    template = CaseTemplate(reference_cases())
+    assert template.case_names == ['trimmed', 'roll', 'untrimmed']
+    with open(os.path.join(DATA_DIR, 'reference.run'), newline='') as fp:
+        assert text(template.cases()) == fp.read()
+
+
+@pytest.mark.parametrize('values', [
+    (0.3, 0.15, 0.02, -1.5),
+    (1, None, 0, 2),
+    (-0.0, 1e-07, 123456789.123, float('inf')),
+])
+def test_filled_templates_match_the_cases(values):
+    template = CaseTemplate(reference_cases(), SLOTS)
+    assert text(template.cases(values)) == text(filled_cases(*values))
+    assert text(template.cases(dict(zip(SLOTS, values)))) \
+        == text(filled_cases(*values))
+
+
+def test_batches_match_the_cases():
+    template = CaseTemplate(reference_cases(), SLOTS)
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(5, len(SLOTS)))
+    batch = template.cases_batch(values)
+    assert len(batch) == 5
+    for row, cases in zip(values, batch):
+        assert text(cases) == text(filled_cases(*row.tolist()))
+    columns = {slot: values[:, idx] for idx, slot in enumerate(SLOTS)}
+    assert [text(cases) for cases in template.cases_batch(columns)] \
+        == [text(cases) for cases in batch]
+
+
+def test_cases_do_not_share_values():
+    template = CaseTemplate(reference_cases(), SLOTS)
+    first = template.cases((0.1, 0.2, 0.0, 1.0))
+    second = template.cases((0.5, 0.6, 0.0, 1.0))
+    assert text(first) != text(second)
+    assert text(first) == text(filled_cases(0.1, 0.2, 0.0, 1.0))
+
+
+def test_session_writes_the_same_case_file(config, tmp_path):
+    values = (0.4, None, 0.03, 1.0)
+    files = []
+    for cases in (filled_cases(*values),
+                  CaseTemplate(reference_cases(), SLOTS).cases(values)):
+        session = Session(geometry=reference_aircraft(), cases=cases,
+                          config=config)
+        target = tmp_path / str(len(files))
+        target.mkdir()
+        session._write_cases(str(target))
+        files.append((target / session.case_file).read_bytes())
+    assert files[0] == files[1]
+    # X_cg of the trimmed case is taken from the geometry
+    assert b" X_cg = 0.11 m" in files[0]
+
+
+def test_invalid_slots_raise():
+    with pytest.raises(ValueError, match="no case cruise"):
+        CaseTemplate(reference_cases(), ['cruise.alpha'])
+    with pytest.raises(ValueError, match="has no flap"):
+        CaseTemplate(reference_cases(), ['trimmed.flap'])
+    template = CaseTemplate(reference_cases(), SLOTS)
+    with pytest.raises(ValueError, match="Expected 4 values"):
+        template.cases([0.1])
+    with pytest.raises(ValueError, match="Invalid slots"):
+        template.cases({'roll.alpha': 1.0})
+    with pytest.raises(ValueError, match="shape"):
+        template.cases_batch(np.zeros((2, 3)))
+
+
+def test_templates_keep_the_outputs():
+    case = Case(name='polar', alpha=Parameter(name='alpha', setting='CL',
+                                              value=0.5),
+                outputs=('Totals',))
+    template_case, = CaseTemplate([copy.deepcopy(case)]).cases()
+    assert template_case.outputs == ('Totals',)
+    assert template_case.name == 'polar'
@@ -0,0 +1,114 @@
+import os
+import time
+
+import pytest
+
+from avl import (AVLConvergenceError, AVLTimeoutError, Configuration,
+                 Session, Watchdog)
+from avl.config import CONFIG_FILE, MODULE_DIR
+from avl.watchdog import get_preexec_fn
+
+
+@pytest.mark.parametrize('line', [
+    " Trim convergence failed\n",
+    "  Alpha = ********\n",
+    # fields of other widths, e.g. F10.4 and E12.4
+    "  CLtot =   0.51234   CDtot = **********\n",
+    "    12   0.2500 ************   0.0100\n",
+    # neighbouring overflowing fields
+    "  Cma = ********************\n",
+])
+def test_failures_are_detected(line):
+    watchdog = Watchdog(abort_on_failure=True)
+    watchdog.start()
+    with pytest.raises(AVLConvergenceError):
+        watchdog.check(line)
+
+
+@pytest.mark.parametrize('line', [
+    " " + "*" * 78 + "\n",
+    "*" * 8 + "\n",
+    "  Alpha = *******\n",
+    " Iteration Max Correction\n",
+])
+def test_other_lines_pass(line):
+    watchdog = Watchdog(abort_on_failure=True)
+    watchdog.start()
+    watchdog.check(line)
+
+
+def test_failures_pass_without_abort():
+    watchdog = Watchdog()
+    watchdog.start()
+    watchdog.check(" Trim convergence failed\n")
+
+
+def test_case_budget_restarts_on_every_case():
+    watchdog = Watchdog(timeout=100, case_timeout=0.2)
+    watchdog.start()
+    time.sleep(0.1)
+    assert watchdog.remaining() < 0.15
+    watchdog.check(" OPER (case 2/3)   c>  \n")
+    assert watchdog.remaining() > 0.15
+    time.sleep(0.25)
+    assert watchdog.remaining() == 0
+    assert "case 2" in str(watchdog.timeout_error())
+
+
+def test_watchdog_is_opt_in():
+    settings = Configuration(os.path.join(MODULE_DIR, CONFIG_FILE))['watchdog']
+    assert settings == {'case_timeout': None, 'abort_on_failure': False,
+                        'cpu_time': None, 'memory': None}
+
+
+def test_failed_trim_returns_results_by_default(config, aircraft, make_cases,
+                                               monkeypatch):
+    monkeypatch.setenv('FAKE_AVL_MODE', 'diverge')
+    session = Session(geometry=aircraft, cases=make_cases(2, -1),
+                      config=config)
+    results = session.run_all_cases()
+    assert results['case0']['Totals']['Alpha'] == -1.0
+
+
+def test_failed_trim_aborts_if_enabled(make_config, aircraft, make_cases,
+                                       monkeypatch):
+    monkeypatch.setenv('FAKE_AVL_MODE', 'diverge')
+    session = Session(geometry=aircraft, cases=make_cases(2, -1),
+                      config=make_config(abort_on_failure='yes'))
+    with pytest.raises(AVLConvergenceError, match="convergence failed"):
+        session.run_all_cases()
+
+
+def test_overflow_aborts_if_enabled(make_config, aircraft, make_cases,
+                                    monkeypatch):
+    monkeypatch.setenv('FAKE_AVL_MODE', 'overflow')
+    session = Session(geometry=aircraft, cases=make_cases(1),
+                      config=make_config(abort_on_failure='yes'))
+    with pytest.raises(AVLConvergenceError):
+        session.run_all_cases()
+
+
+def test_element_output_does_not_abort(make_config, aircraft, make_cases):
+    config = make_config(abort_on_failure='yes', output_mode='pipe')
+    config['output'] = {'Totals': 'yes', 'ElementForces': 'yes'}
+    session = Session(geometry=aircraft, cases=make_cases(1), config=config)
+    assert session.run_all_cases()['case0']['Totals']['Alpha'] == 0.0
+
+
+def test_case_timeout(make_config, aircraft, make_cases, monkeypatch):
+    monkeypatch.setenv('FAKE_AVL_MODE', 'hang')
+    session = Session(geometry=aircraft, cases=make_cases(1),
+                      config=make_config(case_timeout=1))
+    start = time.monotonic()
+    with pytest.raises(AVLTimeoutError, match="case 1"):
+        session.run_all_cases()
+    assert time.monotonic() - start < 10
+
+
+def test_resource_limits():
+    assert get_preexec_fn() is None
+    set_limits = get_preexec_fn(cpu_time=10)
+    if os.name == 'nt':
+        assert set_limits is None
+    else:
+        assert callable(set_limits)
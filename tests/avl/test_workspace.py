@@ -0,0 +1,96 @@
+import os
+import tempfile
+
+import pytest
+
+from avl import workspace
+from avl.workspace import clear_staged_files, stage_file, workspace_dir
+
+
+@pytest.fixture(autouse=True)
+def staging_dir():
+    clear_staged_files()
+    yield
+    clear_staged_files()
+
+
+def test_workspace_dir(config, tmp_path):
+    assert workspace_dir(config) == str(tmp_path / 'workspace')
+    assert os.path.isdir(str(tmp_path / 'workspace'))
+
+    config['workspace'] = {'directory': 'tmp'}
+    assert workspace_dir(config) == tempfile.gettempdir()
+
+    config['workspace'] = {'directory': 'auto'}
+    assert workspace_dir(config) in (workspace.SHARED_MEMORY_DIR,
+                                     tempfile.gettempdir())
+
+
+def test_files_are_staged_once(config, tmp_path):
+    source = tmp_path / 'naca.dat'
+    source.write_text("naca\n 1.0 0.0\n")
+    runs = [tmp_path / 'run1', tmp_path / 'run2']
+    for run in runs:
+        run.mkdir()
+
+    targets = [stage_file(str(source), str(run), config=config)
+               for run in runs]
+
+    assert [open(target).read() for target in targets] \
+        == [source.read_text()] * 2
+    # one copy in the workspace, the run directories link to it
+    staged = workspace._staged_files[str(source)][1]
+    assert staged.startswith(str(tmp_path / 'workspace'))
+    assert all(os.path.samefile(target, staged) for target in targets)
+
+
+def test_changed_files_are_staged_again(config, tmp_path):
+    source = tmp_path / 'naca.dat'
+    source.write_text("naca\n 1.0 0.0\n")
+    runs = [tmp_path / 'run1', tmp_path / 'run2']
+    for run in runs:
+        run.mkdir()
+    old_target = stage_file(str(source), str(runs[0]), config=config)
+
+    # same size, only the modification time tells the change
+    source.write_text("naca\n 2.0 0.0\n")
+    stat = os.stat(str(source))
+    os.utime(str(source), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    target = stage_file(str(source), str(runs[1]), config=config)
+    assert open(target).read() == "naca\n 2.0 0.0\n"
+    # runs linked to the old copy keep it
+    assert open(old_target).read() == "naca\n 1.0 0.0\n"
+
+    source.write_text("changed\n")
+    target = stage_file(str(source), str(runs[0]), config=config)
+    assert open(target).read() == "changed\n"
+
+
+def test_files_of_equal_name_do_not_collide(config, tmp_path):
+    run = tmp_path / 'run'
+    run.mkdir()
+    sources = []
+    for directory in ('a', 'b'):
+        (tmp_path / directory).mkdir()
+        source = tmp_path / directory / 'foil.dat'
+        source.write_text(directory)
+        sources.append(str(source))
+
+    stage_file(sources[0], str(run), config=config)
+    target = stage_file(sources[1], str(run), config=config)
+    assert open(target).read() == 'b'
+    assert workspace._staged_files[sources[0]][1] \
+        != workspace._staged_files[sources[1]][1]
+
+
+def test_clear_staged_files(config, tmp_path):
+    source = tmp_path / 'foil.dat'
+    source.write_text("foil")
+    run = tmp_path / 'run'
+    run.mkdir()
+    stage_file(str(source), str(run), config=config)
+    staging_dir = workspace._staging_dir
+
+    clear_staged_files()
+    assert not os.path.exists(staging_dir)
+    assert workspace._staged_files == {}
@@ -0,0 +1,5 @@
+import importlib.util
+
+# the MDO package imports pandas (thrust tables), its tests need it
+if importlib.util.find_spec('pandas') is None:
+    collect_ignore_glob = ['test_*.py']
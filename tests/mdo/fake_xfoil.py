@@ -0,0 +1,42 @@
+""" Stand-in for the XFOIL executable used by the tests
+
+Reads the command sequence of xfoilBatch.xfoilCommands from stdin and writes
+the polar file given to pacc, 12 header lines and one row per alpha of the
+aseq command with CL = alpha / 10. Every run appends "airfoil|Re" to the
+file FAKE_XFOIL_LOG.
+
+FAKE_XFOIL_DIVERGE and FAKE_XFOIL_HANG are comma separated airfoils for
+which the polar has no converged point or XFOIL never exits.
+"""
+import os
+import sys
+import time
+
+commands = [line.rstrip("\n") for line in sys.stdin]
+
+
+def argument(command, offset=1):
+    return commands[commands.index(command) + offset]
+
+
+airfoil = argument("load")[:-len(".dat")]
+if not os.path.exists(airfoil + ".dat"):
+    sys.exit(1)
+reynolds = argument("visc")
+
+with open(os.environ["FAKE_XFOIL_LOG"], "a") as log:
+    log.write(f"{airfoil}|{reynolds}\n")
+
+if airfoil in os.environ.get("FAKE_XFOIL_HANG", "").split(","):
+    time.sleep(60)
+
+aMin, aMax, aStep = (float(argument("aseq", offset)) for offset in (1, 2, 3))
+alphas = []
+if airfoil not in os.environ.get("FAKE_XFOIL_DIVERGE", "").split(","):
+    alphas = [aMin + i * aStep for i in range(int(round((aMax - aMin) / aStep)) + 1)]
+
+with open(argument("pacc"), "w") as polar:
+    polar.write("\n" * 12)
+    for alpha in alphas:
+        polar.write(f"{alpha:8.3f} {alpha / 10:8.4f} {0.01 + alpha ** 2 / 1e4:9.5f}"
+                    f" {0.005:9.5f} {-0.05:8.4f} {0.1:8.4f} {0.1:8.4f}\n")
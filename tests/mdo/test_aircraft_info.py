@@ -0,0 +1,61 @@
+import pickle
+
+import pytest
+
+import MDO
+from aircraftInfo import AircraftInfo
+from MDO.aerodynamics.stall import _updateAircraftInfo
+
+
+@pytest.fixture
+def aircraftInfo():
+    stateVariables, controlVariables, _, _, engineInfo, _ = MDO.set_state_variables(
+        wingRootChord=0.5, wingAirfoil="naca4415_cruise", wingMiddleChord=0.45, wingSecPosition=0.8,
+        wingTipChord=0.3, wingPosSec=0.7, verticalXPosition=1.8, verticalRootChord=0.3,
+        verticalTipChord=0.2, verticalSpan=0.35, stabAirfoil="naca0012_cruise", fuselageLength=1.6)
+    return AircraftInfo(stateVariables, controlVariables, engineInfo=engineInfo,
+                        settings=MDO.Settings(weight="Raymer", mtow=144))
+
+
+def test_every_field_is_declared(aircraftInfo):
+    for part in (aircraftInfo, aircraftInfo.wing, aircraftInfo.fuselage, aircraftInfo.thrust,
+                 aircraftInfo.weight, aircraftInfo.cg, aircraftInfo.engine, aircraftInfo.performance):
+        assert not hasattr(part, "__dict__")
+    with pytest.raises(AttributeError):
+        aircraftInfo.undeclared = 1.0
+    with pytest.raises(AttributeError):
+        aircraftInfo.wing.undeclared = 1.0
+    assert aircraftInfo.dataPolar is None and aircraftInfo.alphaStallWing is None
+
+
+def test_stall_results_are_set(aircraftInfo):
+    _updateAircraftInfo(aircraftInfo, [0.1, 0.5, 0.9], [14.0, 12.5, 13.0], [1.1, 1.2, 1.0])
+    assert aircraftInfo.alphaStallWing == 12.5
+    assert aircraftInfo.stallPositionWing == 0.5
+    assert aircraftInfo.clStripsWing == [1.1, 1.2, 1.0]
+
+
+def test_state_pickles_compactly(aircraftInfo):
+    data = pickle.dumps(aircraftInfo)
+    # airfoils are pickled by name, not with their polar
+    assert len(data) < 8000
+    copy = pickle.loads(data)
+    airfoil = aircraftInfo.stateVariables["wing"]["root"]["airfoil"]
+    assert copy.stateVariables["wing"]["root"]["airfoil"] is airfoil
+    assert copy.weight.MTOW == aircraftInfo.weight.MTOW
+    assert copy.cg.calc == aircraftInfo.cg.calc
+    assert copy.wing.meanChord == aircraftInfo.wing.meanChord
+    assert copy.settings.mtow == 144
+
+
+def test_low_memory_drops_the_raw_tables(aircraftInfo):
+    assert not aircraftInfo.lowMemory
+    lowMemory = AircraftInfo(aircraftInfo.stateVariables, aircraftInfo.controlVariables,
+                             engineInfo=aircraftInfo.engineInfo,
+                             settings=aircraftInfo.settings.replace(lowMemory=True))
+    assert lowMemory.lowMemory
+    _updateAircraftInfo(lowMemory, [0.1, 0.5], [14.0, 12.5], [1.1, 1.2])
+    lowMemory.dataPolar = {"cL": [0.1, 0.5]}
+    lowMemory.dropRawTables()
+    assert lowMemory.dataPolar is None and lowMemory.clStripsWing is None
+    assert lowMemory.alphaStallWing == 12.5
@@ -0,0 +1,164 @@
+import json
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+import MDO
+from aircraftInfo import AircraftInfo
+from MDO.airfoils import (AirfoilData, AirfoilRegistry, MISSION_REYNOLDS, buildPolarStore, getAirfoil,
+                          sectionPolar, sectionReynolds)
+from MDO.airfoils.polarStore import AIRFOILS_DIR
+from MDO.auxOptimization.set_state_variables import CRUISE_ALTITUDE, CRUISE_VELOCITY
+
+ALPHAS = np.arange(-4.0, 13.0)
+
+
+def writePolar(folder, reynolds, cLAlpha, clmax):
+    cLs = np.minimum(0.3 + cLAlpha * ALPHAS, clmax)
+    polar = {"airfoil": "foil", "Re": reynolds, "alphas": ALPHAS.tolist(), "CLs": cLs.tolist(),
+             "CDs": (0.01 + 0.02 * (cLs - 0.3) ** 2).tolist(), "Cms": (0 * ALPHAS).tolist()}
+    folder.mkdir(exist_ok=True)
+    (folder / f"foil_{int(reynolds)}.dat").write_text(json.dumps(polar))
+
+
+@pytest.fixture
+def storeFile(tmp_path):
+    folder = tmp_path / "xfoilData"
+    writePolar(folder, 2e5, cLAlpha=0.08, clmax=1.2)
+    writePolar(folder, 4e5, cLAlpha=0.1, clmax=1.4)
+    path = str(tmp_path / "polars.npz")
+    buildPolarStore({0.0: str(folder)}, path=path)
+    return path
+
+
+def test_section_polar_fits_the_points_below_alpha_8():
+    polar = {"alphas": ALPHAS, "CLs": 0.3 + 0.1 * ALPHAS, "CDs": 0.01 + 0.02 * (0.1 * ALPHAS) ** 2}
+    # points past alpha 8 are left out of the fits
+    polar["CDs"][ALPHAS >= 8] = 1.0
+    section = sectionPolar(polar)
+    assert section["claf"] == pytest.approx(0.1 * 180 / 3.1415 / (2 * 3.1415))
+    assert section["cl"] == [-1.5, pytest.approx(0.3), 1.8]
+    np.testing.assert_allclose(section["cd"], [0.01 + 0.02 * (cL - 0.3) ** 2 for cL in section["cl"]])
+    assert section["clmax"] == pytest.approx(0.3 + 0.1 * 12)
+    assert (section["cd_min"], section["alpha_cd_min"]) == (0.01, 0.0)
+
+
+def test_registry_shares_airfoils(storeFile):
+    registry = AirfoilRegistry(storeFile)
+    airfoil = registry.getAirfoil("foil", reynolds=3e5)
+    assert registry.getAirfoil("foil", reynolds=3.0002e5) is airfoil
+    assert airfoil.key == ("foil", 3e5, 0.0)
+    assert airfoil.name == "foil"
+    assert airfoil.clmax == pytest.approx(1.3)
+
+
+def test_reynolds_numbers_are_limited_to_the_store(storeFile):
+    registry = AirfoilRegistry(storeFile)
+    assert registry.resolve("foil", 1e5) == ("foil", 2e5, 0.0)
+    assert registry.resolve("foil", 1e6) == ("foil", 4e5, 0.0)
+    assert registry.resolve("foil", 2.0004e5) == ("foil", 2e5, 0.0)
+    assert registry.resolve("foil", 2.6004e5) == ("foil", 2.6e5, 0.0)
+    assert registry.resolve("foil") == ("foil", 4e5, 0.0)
+
+
+def test_section_data_follows_the_reynolds_number(storeFile):
+    registry = AirfoilRegistry(storeFile)
+    low, high = registry.getAirfoil("foil", 2e5), registry.getAirfoil("foil", 4e5)
+    assert low.claf == pytest.approx(0.08 * 180 / 3.1415 / (2 * 3.1415))
+    assert high.claf == pytest.approx(0.1 * 180 / 3.1415 / (2 * 3.1415))
+    assert (low.clmax, high.clmax) == (1.2, 1.4)
+    assert low.cd != high.cd
+
+
+def test_registry_reloads_changed_stores(storeFile, tmp_path):
+    registry = AirfoilRegistry(storeFile)
+    airfoil = registry.getAirfoil("foil", 4e5)
+
+    writePolar(tmp_path / "xfoilData", 4e5, cLAlpha=0.1, clmax=1.5)
+    buildPolarStore({0.0: str(tmp_path / "xfoilData")}, path=storeFile)
+    mtime = os.stat(storeFile).st_mtime_ns + 1
+    os.utime(storeFile, ns=(mtime, mtime))
+    changed = registry.getAirfoil("foil", 4e5)
+    assert changed is not airfoil
+    assert changed.clmax == 1.5
+    assert airfoil.clmax == 1.4
+
+
+def test_airfoils_are_immutable(storeFile):
+    airfoil = AirfoilRegistry(storeFile).getAirfoil("foil")
+    with pytest.raises(AttributeError):
+        airfoil.clmax = 2.0
+    with pytest.raises(AttributeError):
+        del airfoil.cl
+
+
+def test_mission_names_give_the_reynolds_number():
+    for mission, reynolds in MISSION_REYNOLDS.items():
+        assert getAirfoil("naca4415_" + mission).key == ("naca4415", reynolds, 0.0)
+    assert getAirfoil("naca4415_cruise") is getAirfoil("naca4415", reynolds=MISSION_REYNOLDS["cruise"])
+
+
+def test_section_data_matches_the_fitted_database():
+    # airfoilPolar.json is written by fitXfoil at the mission Reynolds numbers
+    with open(os.path.join(AIRFOILS_DIR, "airfoilPolar.json")) as file:
+        database = json.load(file)
+    for name, polar in database.items():
+        airfoil = getAirfoil(name)
+        np.testing.assert_allclose(airfoil.cl, polar["cl"], rtol=1e-6)
+        np.testing.assert_allclose(airfoil.cd, polar["cd"], rtol=1e-6)
+        assert airfoil.claf == pytest.approx(polar["claf"], rel=1e-6)
+        assert airfoil.clmax == pytest.approx(polar["clmax"], rel=1e-6)
+
+
+def test_shared_airfoils_are_pickled_by_key():
+    airfoil = getAirfoil("naca4415", reynolds=7e5)
+    assert pickle.loads(pickle.dumps(airfoil)) is airfoil
+
+
+def test_private_airfoils_are_pickled_with_the_polar():
+    airfoil = AirfoilData("foil", 3e5, polar={"cl": [0.1, 0.2, 0.3], "cd": [0.01, 0.02, 0.03],
+                                              "claf": 0.9, "clmax": 1.5})
+    copy = pickle.loads(pickle.dumps(airfoil))
+    assert copy is not airfoil
+    assert (copy.key, copy.cl, copy.cd, copy.claf, copy.clmax) \
+        == (airfoil.key, airfoil.cl, airfoil.cd, airfoil.claf, airfoil.clmax)
+
+
+def test_airfoil_data_reads_from_the_store():
+    airfoil = AirfoilData("naca4415_takeOff")
+    assert airfoil is not getAirfoil("naca4415_takeOff")
+    assert airfoil.key == getAirfoil("naca4415_takeOff").key
+    assert airfoil.cl == getAirfoil("naca4415_takeOff").cl
+
+
+def designSections(tipChord):
+    stateVariables, *_ = MDO.set_state_variables(
+        wingRootChord=0.5, wingAirfoil="naca4415_cruise", wingMiddleChord=0.45, wingSecPosition=0.8,
+        wingTipChord=tipChord, wingPosSec=0.7, verticalXPosition=1.8, verticalRootChord=0.3,
+        verticalTipChord=0.2, verticalSpan=0.35, stabAirfoil="naca0012_cruise", fuselageLength=1.6)
+    return stateVariables["wing"]
+
+
+def test_designs_get_the_section_data_of_their_reynolds_number():
+    small = designSections(tipChord=0.3)["tip"]["airfoil"]
+    large = designSections(tipChord=0.35)["tip"]["airfoil"]
+    assert small.reynolds == pytest.approx(sectionReynolds(0.3, CRUISE_VELOCITY, CRUISE_ALTITUDE), abs=500)
+    assert large.reynolds == pytest.approx(sectionReynolds(0.35, CRUISE_VELOCITY, CRUISE_ALTITUDE), abs=500)
+    assert small.reynolds < large.reynolds < MISSION_REYNOLDS["cruise"]
+    assert small.cd != large.cd and small.claf != large.claf
+    # the root is above the stored Reynolds numbers and keeps the cruise polar
+    assert designSections(tipChord=0.3)["root"]["airfoil"] is getAirfoil("naca4415_cruise")
+
+
+def test_stall_uses_the_take_off_reynolds_number():
+    stateVariables, controlVariables, _, _, engineInfo, _ = MDO.set_state_variables(
+        wingRootChord=0.5, wingAirfoil="naca4415_cruise", wingMiddleChord=0.45, wingSecPosition=0.8,
+        wingTipChord=0.3, wingPosSec=0.7, verticalXPosition=1.8, verticalRootChord=0.3,
+        verticalTipChord=0.2, verticalSpan=0.35, stabAirfoil="naca0012_cruise", fuselageLength=1.6)
+    aircraftInfo = AircraftInfo(stateVariables, controlVariables, engineInfo=engineInfo,
+                                settings=MDO.Settings(weight="Raymer", mtow=144))
+    # the 0.5 m root at the take-off speed is at the lowest stored Reynolds number
+    assert aircraftInfo.cLMaxWingAirfoil == getAirfoil("naca4415_takeOff").clmax
+    assert aircraftInfo.cLMaxWingAirfoil != stateVariables["wing"]["root"]["airfoil"].clmax
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from MDO.auxTools import atmosphere, atmosphereTable
+from MDO.auxTools.atmosphere import TABLE_HEIGHTS, TABLE_STEP
+
+HEIGHTS = [0.0, 1.0, 250.5, 1200.0, 4999.5, 11000.0, 11019.1, 15000.0, 20063.1, 25000.0, 40000.0, 50390.0]
+
+
+def loopAtmosphere(z, tba=288.15):
+    # atmosphere before the vectorized model, one altitude at a time
+    r = 6356766
+    g0 = 9.80665
+    R = 287.05287
+    Ht = [0, 11000, 20000, 32000, 47000, 50000]
+    A = [-6.5e-3, 0, 1e-3, 2.8e-3, 0]
+    pb = [101325, 22632, 5474.87, 868.014, 110.906]
+    Tstdb = [288.15, 216.65, 216.65, 228.65, 270.65]
+    Tb = tba - Tstdb[0]
+    mi0 = 18.27e-6
+    T0 = 291.15
+    C = 120
+
+    H = r * z / (r + z)
+    if H < Ht[0]:
+        raise ValueError('Under sealevel')
+    for i in range(5):
+        if H <= Ht[i + 1]:
+            break
+    else:
+        raise ValueError('Altitude beyond model boundaries')
+
+    T = Tstdb[i] + A[i] * (H - Ht[i]) + Tb
+    if A[i] == 0:
+        p = pb[i] * np.exp(-g0 * (H - Ht[i]) / R / (Tstdb[i] + Tb))
+    else:
+        p = pb[i] * (T / (Tstdb[i] + Tb)) ** (-g0 / A[i] / R)
+    rho = p / R / T
+    mi = mi0 * (T0 + C) / (T + C) * (T / T0) ** 1.5
+    return T, p, rho, mi
+
+
+@pytest.mark.parametrize('tba', [288.15, 300.0, 270])
+@pytest.mark.parametrize('z', HEIGHTS)
+def test_scalar_matches_the_loop_model(z, tba):
+    assert atmosphere(z, tba) == loopAtmosphere(z, tba)
+
+
+def test_arrays_match_the_scalar_model():
+    tba = np.array([[280.0], [288.15], [303.0]])
+    values = atmosphere(np.array(HEIGHTS), tba)
+    assert all(value.shape == (3, len(HEIGHTS)) for value in values)
+
+    expected = np.array([[loopAtmosphere(z, t) for z in HEIGHTS] for t in tba[:, 0]])
+    np.testing.assert_allclose(np.array(values), expected.transpose(2, 0, 1), rtol=1e-14)
+
+
+def test_zero_dimensional_arrays_return_floats():
+    values = atmosphere(np.float64(1200.0), np.array(288.15))
+    assert all(type(value) is float for value in values)
+    assert values == pytest.approx(loopAtmosphere(1200.0), rel=1e-14)
+
+
+def test_table_matches_the_model():
+    heights, values = atmosphereTable(295.0)
+    assert heights[0] == TABLE_HEIGHTS[0] and heights[-1] == TABLE_HEIGHTS[1]
+    np.testing.assert_allclose(np.diff(heights), TABLE_STEP)
+
+    # between the table heights the interpolation error stays under 2e-9
+    z = np.random.default_rng(0).uniform(*TABLE_HEIGHTS, 5000)
+    exact = np.array([loopAtmosphere(height, 295.0) for height in z]).T
+    np.testing.assert_allclose(np.array(atmosphere(z, 295.0, table=True)), exact, rtol=2e-9)
+
+
+def test_table_is_computed_once_and_read_only():
+    heights, values = atmosphereTable(288.15)
+    assert atmosphereTable(288.15)[1] is values
+    with pytest.raises(ValueError):
+        values[0, 0] = 0
+
+
+def test_table_computes_altitudes_out_of_the_table():
+    z = np.array([100.0, 8000.0, 15000.0])
+    values = atmosphere(z, table=True)
+    np.testing.assert_allclose(np.array(values)[:, 1:], np.array([loopAtmosphere(8000.0),
+                                                                  loopAtmosphere(15000.0)]).T,
+                               rtol=1e-14)
+
+
+@pytest.mark.parametrize('z, message', [(-1.0, 'Under sealevel'), (60000.0, 'beyond model boundaries')])
+def test_out_of_model_altitudes_raise(z, message):
+    with pytest.raises(ValueError, match=message):
+        atmosphere(z)
+    with pytest.raises(ValueError, match=message):
+        atmosphere(np.array([1000.0, z]))
@@ -0,0 +1,60 @@
+import asyncio
+import importlib
+import json
+import types
+
+import pytest
+
+from MDO.auxTools import Settings
+
+avlMain = importlib.import_module('MDO.avl.avlMain')
+
+RESULTS = {'cruise': {'Totals': {'CLtot': 0.5}}}
+
+
+@pytest.fixture
+def aircraftInfo(tmp_path, monkeypatch):
+    def avlRunStaged(updateCases=None, **kwargs):
+        updateCases(RESULTS)
+        return RESULTS
+
+    async def avlRunAsync(**kwargs):
+        return RESULTS
+
+    async def avlRunStagedAsync(updateCases=None, **kwargs):
+        updateCases(RESULTS)
+        return RESULTS
+
+    # AVL is not run, only the results handling of avlMain is tested
+    fakeAvl = types.SimpleNamespace(
+        avlRun=lambda **kwargs: RESULTS,
+        avlRunStaged=avlRunStaged,
+        avlRunAsync=avlRunAsync,
+        avlRunStagedAsync=avlRunStagedAsync,
+        avlGeoBuild=lambda *args, **kwargs: None,
+        avlRunBuild=lambda *args: [None])
+    monkeypatch.setattr(avlMain, 'avl', fakeAvl)
+    settings = Settings(debug=True, workspace=str(tmp_path / 'design_0'))
+    return types.SimpleNamespace(settings=settings, stateVariables=None, controlVariables=None)
+
+
+def _savedResults(aircraftInfo):
+    with open(f"{aircraftInfo.settings.workspace}/results.json", encoding="utf-8") as file:
+        return json.load(file)
+
+
+@pytest.mark.parametrize("run", [
+    lambda info: avlMain.avlMain(info, {}),
+    lambda info: avlMain.avlMainStaged(info, {}, {}, lambda results: None),
+    lambda info: asyncio.run(avlMain.avlMainAsync(info, {})),
+    lambda info: asyncio.run(avlMain.avlMainStagedAsync(info, {}, {}, lambda results: None)),
+], ids=["avlMain", "avlMainStaged", "avlMainAsync", "avlMainStagedAsync"])
+def test_debug_results_are_saved(aircraftInfo, run):
+    assert run(aircraftInfo) == RESULTS
+    assert _savedResults(aircraftInfo) == RESULTS
+
+
+def test_results_are_not_saved_without_debug(aircraftInfo, tmp_path):
+    aircraftInfo.settings = aircraftInfo.settings.replace(debug=False)
+    asyncio.run(avlMain.avlMainAsync(aircraftInfo, {}))
+    assert not (tmp_path / 'design_0').exists()
@@ -0,0 +1,68 @@
+import importlib
+import types
+
+import numpy as np
+import pytest
+
+from MDO.auxTools import atmosphere
+
+avlRunBuild = importlib.import_module("MDO.avl.avlRunBuild")
+
+MISSION = {
+    "cruise": {"altitude": 1500, "vCruise": 148 / 3.6},
+    "roll": {"altitude": 1000, "vCruise": 30, "rollRate": 0.05},
+    "dive": {"altitude": 1000, "vDive": 30, "loadFactor": 1.5},
+    "polar": {"cLPoints": [-0.2, 0.8]},
+    "untrimmed_polar": {"cLPoints": [0.44]},
+    "takeOffRun": {"alpha": 5, "flap": 0},
+    "hingeMoment": {"alpha": 8, "flap": 20, "aileron": 20, "elevator": 20},
+    "neutralPoint": {"alphas": [0, 6]},
+}
+
+
+def aircraftInfo(mtow=14.0, area=1.5):
+    return types.SimpleNamespace(weight=types.SimpleNamespace(MTOW=mtow),
+                                 wing=types.SimpleNamespace(area=area, meanChord=0.45),
+                                 cg=types.SimpleNamespace(calc=0.12), cLMax=1.4)
+
+
+def caseText(cases):
+    for number, case in enumerate(cases, start=1):
+        case.number = number
+    return "".join(str(case) for case in cases)
+
+
+def test_template_cases_match_the_cases():
+    info = aircraftInfo()
+    cases = avlRunBuild.avlRunBuild(MISSION, info)
+    values = avlRunBuild._designValues(MISSION, aircraftInfo())
+    assert caseText(cases) == caseText(avlRunBuild._buildCases(MISSION, values))
+    assert [case.name for case in cases] == [
+        "trimmed", "rollRate", "dive", "PolarTrimmed_0", "PolarTrimmed_1", "PolarUntrimmed_0",
+        "TakeOffRun", "hingeMoment", "NeutralPoint_0", "NeutralPoint_1"]
+    assert cases[0].states["X_cg"].value == 0.12
+    assert cases[7].outputs == ("Totals", "HingeMoments")
+
+
+def test_dive_values():
+    values = avlRunBuild._designValues({"dive": MISSION["dive"]}, aircraftInfo())
+    _, _, rho, _ = atmosphere(1000)
+    vDive = np.sqrt(2 * 14.0 * 2.5 / (rho * 1.4 * 1.5))
+    assert values["dive.alpha"] == 1.4
+    assert values["dive.roll_rate"] == pytest.approx(9.81 * 1.5 / vDive * 0.45 / (2 * vDive))
+    dive, = avlRunBuild.avlRunBuild({"dive": MISSION["dive"]}, aircraftInfo())
+    assert "qc/2V        = {}\n".format(values["dive.roll_rate"]) in caseText([dive])
+
+
+def test_batches_match_single_designs():
+    infos = [aircraftInfo(mtow, area) for mtow, area in ((12.0, 1.4), (14.0, 1.5), (16.0, 1.7))]
+    batch = avlRunBuild.avlRunBuildBatch(MISSION, infos)
+    assert [caseText(cases) for cases in batch] \
+        == [caseText(avlRunBuild.avlRunBuild(MISSION, info)) for info in infos]
+    assert len({caseText(cases) for cases in batch}) == 3
+
+
+def test_fixed_missions_have_no_slots():
+    mission = {key: MISSION[key] for key in ("polar", "takeOffRun")}
+    first, second = avlRunBuild.avlRunBuildBatch(mission, [aircraftInfo(), aircraftInfo(16.0)])
+    assert caseText(first) == caseText(second)
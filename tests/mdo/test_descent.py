@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import scipy
+
+from MDO.auxTools import atmosphere
+from MDO.performance import descentFuel
+from MDO.performance.descent import IDLE_THROTTLE, _descentVelocitySLSQP, descentVelocity
+
+THRUST = (40.0, -0.3, -0.01)
+# first speed without thrust
+THRUST_ZERO = 50.0
+DESIGNS = [{}, {"empty": 150.0}, {"cD0": 0.05, "k": 0.08}, {"area": 1.5, "cD1": -0.01}]
+
+
+def makeAircraft(area=1.0, empty=100.0, cD0=0.03, cD1=0.0, k=0.05, thrust=THRUST, slopeHeight=-1e-4):
+    return SimpleNamespace(wing=SimpleNamespace(area=area), weight=SimpleNamespace(empty=empty, fuelReserve=5.0),
+                           thrust=SimpleNamespace(v0=thrust[0], v1=thrust[1], v2=thrust[2], slopeHeight=slopeHeight),
+                           cD0=cD0, cD1=cD1, k=k, engine=SimpleNamespace(consumptionMaxLperH=2.0, fuelDensity=0.75),
+                           performance=SimpleNamespace(descent=SimpleNamespace()))
+
+
+def loopDescent(aircraftInfo, heightInitial=1500, heightFinal=0, rateOfDescent=1, nSteps=20):
+    # descentFuel before the closed form, SLSQP segment by segment from the ground up
+    heights = np.linspace(heightFinal, heightInitial, nSteps)
+    velocity = 15
+    distance = fuelKg = 0.0
+    for i in range(len(heights) - 1):
+        weight = aircraftInfo.weight.empty + aircraftInfo.weight.fuelReserve + fuelKg*9.8
+        height = (heights[i] + heights[i + 1])/2
+        rho = atmosphere(height)[2]
+        velocity, throttle = _descentVelocitySLSQP(rho, weight, aircraftInfo.wing.area, aircraftInfo.cD0,
+                                                   aircraftInfo.cD1, aircraftInfo.k, *THRUST,
+                                                   1 + aircraftInfo.thrust.slopeHeight*height, rateOfDescent,
+                                                   velocityDescent=velocity)
+        time = (heights[i + 1] - heights[i])/rateOfDescent
+        distance += velocity*time
+        fuelKg += aircraftInfo.engine.consumptionMaxLperH*aircraftInfo.engine.fuelDensity*throttle/3600*time
+    return fuelKg*9.8, distance
+
+
+def throttleOf(velocity, rho, weight, rateOfDescent, area=1.0, cD0=0.03, cD1=0.0, k=0.05, thrustFactor=1.0):
+    cL = 2*weight/(area*velocity**2*rho)
+    drag = 1/2*rho*velocity**2*area*(cD0 + cD1*cL + k*cL**2)
+    return (drag - rateOfDescent*weight/velocity)/((THRUST[0] + THRUST[1]*velocity + THRUST[2]*velocity**2)*thrustFactor)
+
+
+@pytest.mark.parametrize('rateOfDescent', [1, 2])
+@pytest.mark.parametrize('design', DESIGNS)
+def test_descent_matches_the_slsqp_loop(design, rateOfDescent):
+    aircraftInfo = makeAircraft(**design)
+    descentFuel(aircraftInfo, rateOfDescent=rateOfDescent)
+    fuel, distance = loopDescent(aircraftInfo, rateOfDescent=rateOfDescent)
+    assert aircraftInfo.weight.fuelDescent == pytest.approx(fuel, rel=5e-4)
+    # SLSQP stops short of the optimum of some segments, the range moves by about 1%
+    assert aircraftInfo.performance.descent.range == pytest.approx(distance, rel=0.015)
+    assert aircraftInfo.performance.descent.time == 1500/rateOfDescent
+
+
+@pytest.mark.parametrize('rateOfDescent', [0.5, 1, 2, 4])
+def test_throttle_is_never_above_slsqp(rateOfDescent):
+    rho = np.array(atmosphere(np.linspace(0, 3000, 7))[2])
+    weight = np.linspace(90, 180, 7)
+    velocities, throttles = descentVelocity(rho, weight, 1.0, 0.03, 0.0, 0.05, *THRUST, 1.0, rateOfDescent)
+    assert np.all(velocities < THRUST_ZERO)
+    for i in range(7):
+        velocity, throttle = _descentVelocitySLSQP(rho[i], weight[i], 1.0, 0.03, 0.0, 0.05, *THRUST, 1.0,
+                                                   rateOfDescent)
+        if velocity > THRUST_ZERO:
+            # SLSQP jumped past the speed without thrust, where the throttle is negative
+            continue
+        assert throttles[i] <= throttle + 1e-9
+        assert throttles[i] == pytest.approx(throttle, abs=1e-4)
+
+
+@pytest.mark.parametrize('rateOfDescent', [0.5, 1, 2, 4])
+@pytest.mark.parametrize('weight', [90.0, 130.0, 180.0])
+def test_throttle_is_the_grid_minimum(weight, rateOfDescent):
+    rho = atmosphere(500.0)[2]
+    velocity, throttle = descentVelocity(rho, weight, 1.0, 0.03, 0.0, 0.05, *THRUST, 1.0, rateOfDescent)
+
+    # feasible speeds of a 1 mm/s grid, up to the first speed without thrust, the throttle
+    # changes by less than 1e-4 over one grid step
+    grid = np.arange(1.0, THRUST_ZERO, 1e-3)
+    throttles = throttleOf(grid, rho, weight, rateOfDescent)
+    gridMinimum = throttles[throttles >= IDLE_THROTTLE].min()
+    assert gridMinimum - 1e-4 <= throttle[0] <= gridMinimum
+    assert throttleOf(velocity[0], rho, weight, rateOfDescent) == pytest.approx(throttle[0], rel=1e-9)
+
+
+def test_idle_root_follows_the_initial_speed():
+    # at idle the throttle is the same at both roots of the idle constraint
+    rho = atmosphere(75.0)[2]
+    slow, slowThrottle = descentVelocity(rho, 155.0, 1.0, 0.03, 0.0, 0.05, *THRUST, 1.0, 2, velocityDescent=8)
+    fast, fastThrottle = descentVelocity(rho, 155.0, 1.0, 0.03, 0.0, 0.05, *THRUST, 1.0, 2, velocityDescent=15)
+    assert slowThrottle[0] == fastThrottle[0] == pytest.approx(IDLE_THROTTLE)
+    assert slow[0] < 10 < fast[0]
+
+    constraints = [{'type': 'ineq', 'fun': lambda v: throttleOf(v, rho, 155.0, 2) - IDLE_THROTTLE}]
+    for start, velocity in ((8, slow[0]), (15, fast[0])):
+        result = scipy.optimize.minimize(lambda v: throttleOf(v, rho, 155.0, 2), start, constraints=constraints)
+        assert result.x[0] == pytest.approx(velocity, rel=1e-5)
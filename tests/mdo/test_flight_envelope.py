@@ -0,0 +1,129 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from MDO.auxTools import atmosphere
+from MDO.checks.flightEnvelope import (CEILING_RATE_OF_CLIMB, ENVELOPE_PARAMETERS, flightEnvelop,
+                                       flightEnvelopBatch, flightEnvelopeGrid)
+
+HEIGHTS = np.linspace(1, 4*10**3, 150)
+VELOCITIES = np.linspace(10, 50, 100)
+
+
+def makeDesigns(nDesigns):
+    rng = np.random.default_rng(1)
+    values = {"mtow": (150, 250), "wingArea": (0.9, 1.4), "cD0": (0.02, 0.04), "cD1": (-0.01, 0.01),
+              "cD2": (0.04, 0.07), "t0": (35, 45), "t1": (-0.4, -0.2), "t2": (-0.01, -0.005),
+              "cLMax": (1.3, 1.8), "slopeAltitude": (-2e-4, -5e-5)}
+    return {name: rng.uniform(*values[name], nDesigns) for name in ENVELOPE_PARAMETERS}
+
+
+def aircraftInfo(parameters):
+    return SimpleNamespace(weight=SimpleNamespace(MTOW=parameters["mtow"]),
+                           wing=SimpleNamespace(area=parameters["wingArea"]),
+                           cD0=parameters["cD0"], cD1=parameters["cD1"], k=parameters["cD2"],
+                           thrust=SimpleNamespace(v0=parameters["t0"], v1=parameters["t1"], v2=parameters["t2"]),
+                           cLMax=parameters["cLMax"],
+                           engineInfo={"altitudeCorrection": {"slope": parameters["slopeAltitude"]}})
+
+
+def loopEnvelope(design):
+    # flightEnvelop before the grid, one height and one velocity at a time
+    ceilingHeight = 0
+    vMin, vMaxStruct, vMinEngine, vMaxEngine = [], [], [], []
+    vSeaStruct = np.sqrt(2*2.5*design["mtow"]/(design["cLMax"]*design["wingArea"]*1.2))
+    for height in HEIGHTS:
+        T, p, rho, mi = atmosphere(height)
+        gotVmin = gotVmax = gotCeiling = False
+        for velocity in VELOCITIES:
+            cL = 2*design["mtow"]/(velocity**2*design["wingArea"]*rho)
+            cD = design["cD0"] + design["cD1"]*cL + design["cD2"]*cL**2
+            drag = 1/2*rho*velocity**2*design["wingArea"]*cD
+            thrust = (design["t0"] + design["t1"]*velocity + design["t2"]*velocity**2) \
+                * (1 + design["slopeAltitude"]*height)
+            if drag < thrust and not gotVmin:
+                vMinEngine.append((height, velocity))
+                gotVmin = True
+            if drag > thrust and gotVmin and not gotVmax:
+                vMaxEngine.append((height, velocity))
+                gotVmax = True
+            if (thrust - drag)/design["mtow"]*velocity > CEILING_RATE_OF_CLIMB:
+                ceilingHeight = height
+                gotCeiling = True
+            if gotCeiling and gotVmin and gotVmax:
+                break
+        vMin.append(np.sqrt(2*design["mtow"]/(design["cLMax"]*design["wingArea"]*rho)))
+        vMaxStruct.append(vSeaStruct*np.sqrt(1.2/rho))
+    return ceilingHeight, vMin, vMaxStruct, dict(vMinEngine), dict(vMaxEngine)
+
+
+@pytest.fixture(scope="module")
+def designs():
+    return makeDesigns(20)
+
+
+@pytest.fixture(scope="module")
+def grid(designs):
+    return flightEnvelopeGrid(designs, HEIGHTS, VELOCITIES)
+
+
+def test_speeds_match_the_loop(designs, grid):
+    velocityStep = VELOCITIES[1] - VELOCITIES[0]
+    heightStep = HEIGHTS[1] - HEIGHTS[0]
+    crossings = 0
+    for i in range(20):
+        design = {name: values[i] for name, values in designs.items()}
+        ceiling, vMin, vMaxStruct, vMinEngine, vMaxEngine = loopEnvelope(design)
+        np.testing.assert_allclose(grid["vStall"][i], vMin, rtol=1e-12)
+        np.testing.assert_allclose(grid["vMaxStruct"][i], vMaxStruct, rtol=1e-12)
+
+        # the grid interpolates the crossings, the loop takes the grid velocity after them
+        for engineSpeeds, loopSpeeds in ((grid["vMinEngine"][i], vMinEngine),
+                                         (grid["vMaxEngine"][i], vMaxEngine)):
+            assert set(HEIGHTS[~np.isnan(engineSpeeds)]) == set(loopSpeeds)
+            for height, speed in zip(HEIGHTS, engineSpeeds):
+                if height in loopSpeeds:
+                    assert loopSpeeds[height] - velocityStep <= speed <= loopSpeeds[height] + 1e-9
+                    crossings += 1
+
+        # the bisection finds the ceiling between the grid heights
+        assert ceiling - 1.0 <= grid["ceiling"][i] <= ceiling + heightStep
+    assert crossings > 20*150
+    assert 0 < grid["ceiling"].min() and grid["ceiling"].max() == HEIGHTS[-1]
+
+
+def test_ceiling_has_the_rate_of_climb():
+    design = {name: values[:1] for name, values in makeDesigns(1).items()}
+    ceiling = flightEnvelopeGrid(design, HEIGHTS, VELOCITIES, ceilingTolerance=0.01)["ceiling"][0]
+    assert HEIGHTS[0] < ceiling < HEIGHTS[-1]
+
+    def rateOfClimb(height):
+        rho = atmosphere(height)[2]
+        cL = 2*design["mtow"][0]/(VELOCITIES**2*design["wingArea"][0]*rho)
+        drag = 1/2*rho*VELOCITIES**2*design["wingArea"][0] \
+            * (design["cD0"][0] + design["cD1"][0]*cL + design["cD2"][0]*cL**2)
+        thrust = (design["t0"][0] + design["t1"][0]*VELOCITIES + design["t2"][0]*VELOCITIES**2) \
+            * (1 + design["slopeAltitude"][0]*height)
+        return ((thrust - drag)/design["mtow"][0]*VELOCITIES).max()
+
+    assert rateOfClimb(ceiling) > CEILING_RATE_OF_CLIMB > rateOfClimb(ceiling + 0.01)
+
+
+def test_no_thrust_gives_no_engine_speeds():
+    design = {name: values[:1] for name, values in makeDesigns(1).items()}
+    design["t0"] = np.zeros(1)
+    grid = flightEnvelopeGrid(design, HEIGHTS, VELOCITIES)
+    assert np.isnan(grid["vMinEngine"]).all() and np.isnan(grid["vMaxEngine"]).all()
+    assert grid["ceiling"][0] == 0.0
+
+
+def test_batch_matches_single_envelopes(designs):
+    aircraft = [aircraftInfo({name: values[i] for name, values in designs.items()}) for i in range(5)]
+    for envelope, info in zip(flightEnvelopBatch(aircraft), aircraft):
+        single = flightEnvelop(info)
+        assert envelope.ceiling == single.ceiling
+        np.testing.assert_array_equal(envelope.vMin, single.vMin)
+        np.testing.assert_array_equal(envelope.vMaxStruct, single.vMaxStruct)
+        assert envelope.vMinEngine == single.vMinEngine
+        assert envelope.vMaxEngine == single.vMaxEngine
@@ -0,0 +1,95 @@
+from math import tan
+
+import numpy as np
+import pytest
+
+import MDO
+from MDO.avl.avlGeoBatch import OPTIMIZATION_VARIABLES
+
+DEFAULT_VALUES = {'aspectRatio': 7.07, 'wingSecPercentage': 0.5, 'wingArea': 2.15, 'taperRatio1': 1,
+                  'taperRatio2': 1, 'aspectRatioV': 3.29, 'areaV': 0.41535, 'taperV': 1, 'posXV': 2.05,
+                  'fuselageLength': 1.83}
+
+
+@pytest.fixture
+def designs():
+    rng = np.random.default_rng(0)
+    xStates = np.array([[DEFAULT_VALUES[name] for name in OPTIMIZATION_VARIABLES]] * 20)
+    xStates *= rng.uniform(0.8, 1.2, xStates.shape)
+    xStates[:, 1] = rng.uniform(0.3, 0.7, 20)
+    xStates[:, 3:5] = rng.uniform(0.4, 1.0, (20, 2))
+    xStates[:, 7] = rng.uniform(0.3, 1.0, 20)
+    return xStates
+
+
+def singleDesign(xStates):
+    # the single design path of main._setupAircraft
+    wingSpan, wingSecPercentage, wingRootChord, wingMiddleChord, wingTipChord, verticalSpan, \
+        verticalRootChord, verticalTipChord, verticalXPosition, fuselageLength = \
+        MDO.parseStateVariable(list(xStates))
+    stateVariables, controlVariables, *_ = MDO.set_state_variables(
+        wingRootChord=wingRootChord, wingAirfoil="naca4415_cruise", wingMiddleChord=wingMiddleChord,
+        wingSecPosition=wingSpan / 2 * wingSecPercentage, wingTipChord=wingTipChord,
+        wingPosSec=wingSpan / 2 * (1 - wingSecPercentage), verticalXPosition=verticalXPosition,
+        verticalRootChord=verticalRootChord, verticalTipChord=verticalTipChord, verticalSpan=verticalSpan,
+        stabAirfoil="naca0012_cruise", fuselageLength=fuselageLength)
+    return stateVariables, controlVariables
+
+
+def loopInfoSurface(surfaceDict):
+    # infoSurface and xyMeanChord before the batch geometry
+    sections = list(surfaceDict.values())
+    area = mac = span = tipX = dArea = 0
+    for root, tip in zip(sections, sections[1:]):
+        tipX += tip['sweepLE'] * tip['b']
+        secArea = tip['b'] * (root['chord'] + tip['chord']) / 2
+        taperRatio = tip['chord'] / root['chord']
+        mac += secArea * 2 / 3 * root['chord'] * (1 + taperRatio + taperRatio ** 2) / (1 + taperRatio)
+        dArea += (tip['b'] / 3 * (root['chord'] + 2 * tip['chord']) / (root['chord'] + tip['chord']) + span) \
+            * secArea
+        span += tip['b']
+        area += secArea
+    sweep = (tipX + (sections[-1]['chord'] - sections[0]['chord']) / 4) / span
+    yMeanChord = dArea / area
+
+    spanSum = xSec = 0
+    for tip in sections[1:]:
+        if spanSum <= yMeanChord < spanSum + tip['b']:
+            xMeanChord = xSec + (yMeanChord - spanSum) * tan(tip['sweepLE'])
+            break
+        xSec += tip['b'] * tan(tip['sweepLE'])
+        spanSum += tip['b']
+    return {"area": 2 * area, "meanChord": mac / area, "span": 2 * span, "sweep": sweep, "tipX": tipX,
+            "xMeanChord": xMeanChord, "yMeanChord": yMeanChord}
+
+
+def test_batch_geometry_files_match_single_designs(designs):
+    _, controlVariables = singleDesign(designs[0])
+    batch = MDO.avlGeoBuildBatch(designs, controlVariables, verticalType="v", serialize=True)
+    assert len(batch) == len(designs)
+    for xStates, geometry in zip(designs, batch):
+        stateVariables, controlVariables = singleDesign(xStates)
+        assert geometry == str(MDO.avlGeoBuild(stateVariables, controlVariables, "v"))
+
+
+def test_batch_geometry_needs_the_vertical_type(designs):
+    _, controlVariables = singleDesign(designs[0])
+    with pytest.raises(TypeError, match="verticalType"):
+        MDO.avlGeoBuildBatch(designs, controlVariables, serialize=True)
+
+
+def test_batch_surface_values_match_the_loops(designs):
+    geometry = MDO.geometryBatch(designs)
+    for i, xStates in enumerate(designs):
+        stateVariables, _ = singleDesign(xStates)
+        for surface in ("wing", "vertical"):
+            expected = loopInfoSurface(stateVariables[surface])
+            for name, value in expected.items():
+                assert geometry[surface + "Info"][name][i] == pytest.approx(value, rel=1e-12, abs=1e-15)
+
+
+def test_parse_state_variable_of_a_design_matrix(designs):
+    parsed = MDO.parseStateVariable(designs)
+    assert parsed.shape == designs.shape
+    for row, xStates in zip(parsed, designs):
+        np.testing.assert_allclose(row, MDO.parseStateVariable(list(xStates)), rtol=1e-15)
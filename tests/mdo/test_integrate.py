@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from MDO.auxTools import Event, forward_euler, integrate, thresholdEvent
+
+
+def oscillator(t, q):
+    # q = [cos(t), -sin(t)]
+    return np.array([q[1], -q[0]])
+
+
+def batchOscillator(omega):
+    # q = [cos(omega*t), -omega*sin(omega*t)] of every design
+    def fun(t, q):
+        return np.stack([q[:, 1], -omega**2*q[:, 0]], axis=1)
+    return fun
+
+
+def endError(method, dt, tEnd=2.0):
+    solution = integrate(oscillator, [1.0, 0.0], tEnd, dt, method=method)
+    return np.abs(solution.qEnd - [np.cos(tEnd), -np.sin(tEnd)]).max()
+
+
+@pytest.mark.parametrize('method, order', [("euler", 1), ("rk4", 4)])
+def test_fixed_step_order(method, order):
+    errors = [endError(method, dt) for dt in (0.02, 0.01, 0.005)]
+    observed = np.log2(np.array(errors[:-1])/errors[1:])
+    np.testing.assert_allclose(observed, order, atol=0.1)
+
+
+def test_adaptive_error_follows_the_tolerance():
+    errors = []
+    steps = []
+    for rtol in (1e-4, 1e-6, 1e-8):
+        solution = integrate(oscillator, [1.0, 0.0], 10.0, 0.01, method="rk45", rtol=rtol, atol=rtol*1e-3)
+        errors.append(np.abs(solution.qEnd - [np.cos(10.0), -np.sin(10.0)]).max())
+        steps.append(solution.nSteps)
+        # the global error stays within a few times the tolerance
+        assert errors[-1] < 10*rtol
+        assert solution.t[-1] == 10.0
+    assert errors[0] > errors[1] > errors[2]
+    assert steps[0] < steps[1] < steps[2]
+
+
+@pytest.mark.parametrize('method, dt, tolerance', [("euler", 0.001, 1e-3), ("rk4", 0.1, 1e-5), ("rk45", 0.1, 1e-7)])
+def test_event_location(method, dt, tolerance):
+    # cos(t) falls through zero at pi/2, rises at 3*pi/2
+    solution = integrate(oscillator, [1.0, 0.0], 10.0, dt, method=method, rtol=1e-8,
+                         events=[Event(lambda t, q: q[0], direction=-1)])
+    assert solution.event == 0
+    assert solution.tEnd == pytest.approx(np.pi/2, abs=tolerance)
+    np.testing.assert_allclose(solution.qEnd, [0.0, -1.0], atol=tolerance)
+    assert solution.qEnd[0] <= 0
+    assert solution.t[-1] == solution.tEnd
+
+    rising = integrate(oscillator, [1.0, 0.0], 10.0, dt, method=method, rtol=1e-8,
+                       events=[Event(lambda t, q: q[0], direction=1)])
+    assert rising.tEnd == pytest.approx(3*np.pi/2, abs=tolerance)
+
+
+def test_first_event_stops_the_integration():
+    events = [thresholdEvent(0, -0.5, direction=-1), thresholdEvent(1, -0.5, direction=-1)]
+    solution = integrate(oscillator, [1.0, 0.0], 10.0, 0.1, events=events)
+    # -sin(t) reaches -0.5 at pi/6, before cos(t) at 2*pi/3
+    assert solution.event == 1
+    assert solution.tEnd == pytest.approx(np.pi/6, abs=1e-6)
+
+
+def test_no_event_reaches_the_end():
+    solution = integrate(oscillator, [1.0, 0.0], 1.0, 0.3, events=[thresholdEvent(0, 2.0)])
+    assert solution.event == -1
+    assert solution.tEnd == pytest.approx(1.0)
+    np.testing.assert_allclose(solution.t, [0.0, 0.3, 0.6, 0.9, 1.0])
+
+
+@pytest.mark.parametrize('method, rtol, eventTolerance', [("euler", 1e-12, 0.05), ("rk4", 1e-12, 1e-5),
+                                                          # the step size control amplifies round off
+                                                          ("rk45", 1e-8, 1e-5)])
+def test_batched_designs_match_single_designs(method, rtol, eventTolerance):
+    omega = np.array([0.5, 1.0, 2.0, 3.0])
+    tEnd = np.array([8.0, 8.0, 1.0, 8.0])
+    q0 = np.stack([np.ones(4), np.zeros(4)], axis=1)
+    solution = integrate(batchOscillator(omega), q0, tEnd, 0.05, method=method,
+                         events=[Event(lambda t, q: q[:, 0] + 0.5, direction=-1)])
+
+    for i in range(4):
+        single = integrate(lambda t, q: np.array([q[1], -omega[i]**2*q[0]]), q0[i], tEnd[i], 0.05,
+                           method=method, events=[Event(lambda t, q: q[0] + 0.5, direction=-1)])
+        assert solution.event[i] == single.event
+        assert solution.nSteps[i] == single.nSteps
+        np.testing.assert_allclose(solution.tEnd[i], single.tEnd, rtol=rtol)
+        np.testing.assert_allclose(solution.qEnd[i], single.qEnd, rtol=rtol, atol=1e-14)
+        # the steps of a design are padded with nan after its end
+        np.testing.assert_allclose(solution.t[i, :single.nSteps + 1], single.t, rtol=rtol)
+        assert np.isnan(solution.t[i, single.nSteps + 1:]).all()
+
+    # cos(omega*t) = -0.5 at 2*pi/3/omega, the third design ends before it
+    assert list(solution.event) == [0, 0, -1, 0]
+    np.testing.assert_allclose(solution.tEnd[[0, 1, 3]], 2*np.pi/3/omega[[0, 1, 3]], rtol=eventTolerance)
+
+
+def test_forward_euler_matches_the_step_loop():
+    def qd(q):
+        return np.array([q[1], 2.0 - 0.1*q[1]**2])
+
+    ts, qs = forward_euler(np.zeros(2), qd, dt=0.01, nsteps=500)
+    expected = [np.zeros(2)]
+    for _ in range(500):
+        expected.append(expected[-1] + qd(expected[-1])*0.01)
+    assert len(ts) == len(qs) == 501
+    np.testing.assert_allclose(ts, np.arange(501)*0.01, rtol=1e-12)
+    np.testing.assert_allclose(qs, np.vstack(expected), rtol=1e-12)
+
+
+def test_steps_are_not_saved_on_request():
+    solution = integrate(oscillator, [1.0, 0.0], 1.0, 0.1, saveSteps=False)
+    assert solution.t is None and solution.q is None
+    np.testing.assert_allclose(solution.qEnd, [np.cos(1.0), -np.sin(1.0)], atol=1e-6)
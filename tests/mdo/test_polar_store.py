@@ -0,0 +1,82 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from MDO.airfoils import PolarStore, buildPolarStore
+from MDO.airfoils.polarStore import POLAR_STORE_FILE, XFOIL_DATA_DIRS
+
+
+def writePolar(folder, airfoil, reynolds, alphas, offset=0.0):
+    alphas = np.asarray(alphas, dtype=float)
+    polar = {"airfoil": airfoil, "Re": reynolds, "alphas": alphas.tolist(),
+             "CLs": (0.1 * alphas + offset).tolist(), "CDs": (0.01 + 0.001 * alphas ** 2).tolist(),
+             "Cms": (-0.05 + 0 * alphas).tolist()}
+    folder.mkdir(exist_ok=True)
+    (folder / f"{airfoil}_{int(reynolds)}.dat").write_text(json.dumps(polar))
+
+
+@pytest.fixture
+def store(tmp_path):
+    clean, flap = tmp_path / "xfoilData", tmp_path / "xfoilDataFlap"
+    writePolar(clean, "foil", 2e5, [-2, -1, 0, 1, 2], offset=0.2)
+    # alpha 1 did not converge at the higher Reynolds number
+    writePolar(clean, "foil", 4e5, [-2, -1, 0, 2, 3], offset=0.4)
+    writePolar(clean, "other", 2e5, [0, 1])
+    writePolar(flap, "foil", 2e5, [0, 1], offset=1.0)
+    (clean / "notes.txt").write_text("not a polar")
+    path = str(tmp_path / "polars.npz")
+    assert buildPolarStore({0.0: str(clean), 20.0: str(flap)}, path=path) == 4
+    return PolarStore(path)
+
+
+def test_polars_are_indexed(store):
+    assert store.airfoils() == ["foil", "other"]
+    assert store.airfoils(flap=20.0) == ["foil"]
+    assert store.reynolds("foil") == [2e5, 4e5]
+    polar = store.polar("foil", reynolds=2e5)
+    np.testing.assert_array_equal(polar["alphas"], [-2, -1, 0, 1, 2])
+    np.testing.assert_allclose(polar["CLs"], [0.0, 0.1, 0.2, 0.3, 0.4])
+    assert polar["Re"] == 2e5 and polar["airfoil"] == "foil"
+    np.testing.assert_allclose(store.polar("foil", flap=20)["CLs"], [1.0, 1.1])
+
+
+def test_polars_are_read_only(store):
+    with pytest.raises(ValueError):
+        store.polar("foil")["CLs"][0] = 1.0
+
+
+def test_polars_between_reynolds_numbers_are_interpolated(store):
+    polar = store.polar("foil", reynolds=2.5e5)
+    # only the alphas of both polars are kept
+    np.testing.assert_array_equal(polar["alphas"], [-2, -1, 0, 2])
+    np.testing.assert_allclose(polar["CLs"], 0.1 * polar["alphas"] + 0.25)
+    assert polar["Re"] == 2.5e5
+
+
+def test_polars_are_not_extrapolated(store):
+    assert store.polar("foil")["Re"] == 4e5
+    assert store.polar("foil", reynolds=1e6)["Re"] == 4e5
+    assert store.polar("foil", reynolds=1e5)["Re"] == 2e5
+    assert store.covers("foil", 3e5)
+    assert not store.covers("foil", 1e5)
+    assert not store.covers("missing", 3e5)
+
+
+def test_missing_polars_raise(store):
+    with pytest.raises(KeyError, match="other with flap 20"):
+        store.polar("other", flap=20.0)
+
+
+@pytest.mark.skipif(not os.path.exists(POLAR_STORE_FILE), reason="no polar store")
+def test_store_matches_the_xfoil_results():
+    store = PolarStore()
+    folder = XFOIL_DATA_DIRS[0.0]
+    for filename in sorted(os.listdir(folder)):
+        with open(os.path.join(folder, filename)) as file:
+            data = json.load(file)
+        polar = store.polar(data["airfoil"], reynolds=data["Re"])
+        assert polar["Re"] == data["Re"]
+        for column in ("alphas", "CLs", "CDs", "Cms"):
+            np.testing.assert_array_equal(polar[column], data[column])
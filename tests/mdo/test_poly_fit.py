@@ -0,0 +1,88 @@
+import importlib
+import os
+
+import numpy as np
+import pytest
+
+from MDO.auxTools.polyFit import polyFit, polyVal
+
+AIRFOILS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "MDO", "airfoils")
+
+
+def test_exact_polynomials_are_recovered():
+    x = np.linspace(-1.0, 1.5, 7)
+    coefficients, diagnostics = polyFit(x, 0.02 + 0.01 * x + 0.05 * x ** 2)
+    np.testing.assert_allclose(coefficients, [0.02, 0.01, 0.05], atol=1e-12)
+    assert diagnostics["rms"] < 1e-12
+    assert diagnostics["rSquared"] == pytest.approx(1.0)
+    assert diagnostics["nPoints"] == 7
+
+
+@pytest.mark.parametrize("shared", [True, False])
+def test_batches_match_single_fits(shared):
+    rng = np.random.default_rng(0)
+    x = np.linspace(0.0, 2.0, 9) if shared else rng.uniform(-1, 2, (4, 9))
+    y = rng.normal(size=(4, 9))
+    coefficients, diagnostics = polyFit(x, y, degree=2)
+    for i in range(4):
+        xi = x if shared else x[i]
+        expected = np.polynomial.polynomial.polyfit(xi, y[i], 2)
+        np.testing.assert_allclose(coefficients[i], expected, rtol=1e-10, atol=1e-12)
+        np.testing.assert_allclose(diagnostics["residuals"][i],
+                                   y[i] - np.polynomial.polynomial.polyval(xi, expected),
+                                   atol=1e-12)
+
+
+def test_nan_points_are_left_out():
+    rng = np.random.default_rng(1)
+    x = np.linspace(0.0, 2.0, 8)
+    y = rng.normal(size=(2, 8))
+    padded = y.copy()
+    padded[1, 5:] = np.nan
+    coefficients, diagnostics = polyFit(x, padded, degree=1)
+    np.testing.assert_allclose(coefficients[0], polyFit(x, y[0], degree=1)[0])
+    np.testing.assert_allclose(coefficients[1], polyFit(x[:5], y[1, :5], degree=1)[0])
+    assert diagnostics["nPoints"].tolist() == [8, 5]
+    assert np.isnan(diagnostics["residuals"][1, 5:]).all()
+
+
+def test_too_few_points_raise():
+    with pytest.raises(ValueError, match="at least 3 points"):
+        polyFit([0.0, 1.0, np.nan], [1.0, 2.0, 3.0], degree=2)
+    with pytest.raises(ValueError, match="does not match"):
+        polyFit(np.zeros((2, 3)), np.zeros((3, 3)))
+
+
+def test_poly_val_evaluates_every_curve():
+    coefficients = np.array([[1.0, 2.0], [0.0, 1.0]])
+    np.testing.assert_allclose(polyVal(coefficients, [[1.0, 2.0], [3.0, 4.0]]),
+                               [[3.0, 5.0], [3.0, 4.0]])
+    np.testing.assert_allclose(polyVal(coefficients[0], [0.0, 1.0]), [1.0, 3.0])
+
+
+def objectivePolar(x, cD0, cD1, k):
+    return cD0 + cD1 * x + k * x ** 2
+
+
+def test_airfoil_fits_match_curve_fit(monkeypatch):
+    # fitXfoil is a script of MDO/airfoils, the previous fits used curve_fit
+    optimize = pytest.importorskip("scipy.optimize")
+    monkeypatch.syspath_prepend(AIRFOILS_DIR)
+    fitXfoil = importlib.import_module("fitXfoil")
+    dataList, _ = fitXfoil.loadData()
+    polars = dict(fitXfoil._polarData(dataList, mission="cruise"))
+    assert polars
+
+    for data in dataList:
+        name = data["airfoil"] + "_cruise"
+        if name not in polars:
+            continue
+        index8Alpha = data["alphas"].index(8)
+        (cD0, cD1, k), _ = optimize.curve_fit(objectivePolar, data["CLs"][:index8Alpha],
+                                              data["CDs"][:index8Alpha])
+        (_, a), _ = optimize.curve_fit(lambda x, b, a: b + x * a, data["alphas"][:index8Alpha],
+                                       data["CLs"][:index8Alpha])
+        expected = [objectivePolar(cL, cD0, cD1, k) for cL in polars[name]["cl"]]
+        np.testing.assert_allclose(polars[name]["cd"], expected, rtol=1e-6)
+        assert polars[name]["claf"] == pytest.approx(a * 180 / 3.1415 / (2 * 3.1415), rel=1e-6)
+        assert polars[name]["clmax"] == max(data["CLs"])
@@ -0,0 +1,102 @@
+import configparser
+import importlib
+import os
+
+import pytest
+
+import MDO
+from aircraftInfo import AircraftInfo
+
+parseConfigModule = importlib.import_module("MDO.auxTools.parseConfig")
+
+CONFIG = """\
+[env]
+DEBUG = no
+PLOT = no
+PRINT = yes
+
+[methods]
+WEIGHT = Raymer
+MTOW = 130
+
+[output]
+POLAR = yes
+STALL = no
+"""
+
+
+@pytest.fixture
+def configFile(tmp_path, monkeypatch):
+    # parseConfig sets the environment variables and the default settings of the process
+    for name in ("DEBUG", "PLOT", "PRINT", "WEIGHT", "MTOW"):
+        monkeypatch.setenv(name, "")
+    monkeypatch.delenv("LOW_MEMORY", raising=False)
+    monkeypatch.setattr(parseConfigModule, "_settings", None)
+    path = tmp_path / "outputsConfig.cfg"
+    path.write_text(CONFIG)
+    return str(path)
+
+
+def noFileReads(self, *args, **kwargs):
+    raise AssertionError("the cfg file is read again")
+
+
+def design():
+    stateVariables, controlVariables, _, _, engineInfo, _ = MDO.set_state_variables(
+        wingRootChord=0.5, wingAirfoil="naca4415_cruise", wingMiddleChord=0.45, wingSecPosition=0.8,
+        wingTipChord=0.3, wingPosSec=0.7, verticalXPosition=1.8, verticalRootChord=0.3,
+        verticalTipChord=0.2, verticalSpan=0.35, stabAirfoil="naca0012_cruise", fuselageLength=1.6)
+    return stateVariables, controlVariables, engineInfo
+
+
+def test_settings_are_read(configFile):
+    settings = MDO.readSettings(configFile, debug=True)
+    assert (settings.debug, settings.plot, settings.print) == (True, False, True)
+    assert settings.weight == "Raymer" and settings.mtow == 130.0
+    assert settings.output == {"POLAR": True, "STALL": False}
+    assert not settings.lowMemory
+
+
+def test_read_settings_do_not_change_the_process(configFile):
+    MDO.readSettings(configFile)
+    with pytest.raises(RuntimeError, match="parseConfig"):
+        MDO.defaultSettings()
+
+
+def test_parse_config_sets_the_default_settings(configFile, monkeypatch):
+    monkeypatch.setenv("LOW_MEMORY", "yes")
+    settings = MDO.parseConfig(configFile)
+    assert MDO.defaultSettings() is settings
+    assert settings.mtow == 130.0 and settings.lowMemory
+    assert os.environ["MTOW"] == "130"
+
+
+def test_aircraft_info_does_not_read_the_file(configFile, monkeypatch):
+    monkeypatch.setattr(configparser.ConfigParser, "read", noFileReads)
+    settings = MDO.Settings(mtow=120)
+    stateVariables, controlVariables, engineInfo = design()
+    assert AircraftInfo(stateVariables, controlVariables, engineInfo, settings=settings).settings \
+        is settings
+    with pytest.raises(RuntimeError):
+        AircraftInfo(stateVariables, controlVariables, engineInfo)
+
+
+def test_default_settings_are_read_once(configFile, tmp_path, monkeypatch):
+    settings = MDO.parseConfig(configFile)
+    # other working directory, no cfg file there
+    monkeypatch.chdir(tmp_path.parent)
+    monkeypatch.setattr(configparser.ConfigParser, "read", noFileReads)
+    stateVariables, controlVariables, engineInfo = design()
+    assert AircraftInfo(stateVariables, controlVariables, engineInfo).settings is settings
+
+
+def test_main_passes_the_settings_down(monkeypatch):
+    main = importlib.import_module("main")
+    monkeypatch.setattr(configparser.ConfigParser, "read", noFileReads)
+    settings = MDO.Settings(mtow=120)
+    aircraftInfo, *_ = main._setupAircraft(main._get_default_values(), settings=settings)
+    assert aircraftInfo.settings is settings
+    designSettings = main._designSettings(settings, 2)
+    assert [s.workspace for s in designSettings] \
+        == [os.path.join("aircraft", "design_0"), os.path.join("aircraft", "design_1")]
+    assert all(s.mtow == 120 for s in designSettings)
@@ -0,0 +1,72 @@
+import pickle
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+import MDO
+from aircraftInfo import Surface, xyMeanChord
+
+CONTROLS = {"aileron": {"spanStartPercentage": 0.5, "cHinge": 0.75}}
+
+
+def wing(tipChord=0.3, rootX=0.0):
+    return OrderedDict({
+        "root": {"chord": 0.5, "x": rootX},
+        "middle": {"chord": 0.4, "b": 0.8, "sweepLE": 0.05},
+        "tip": {"chord": tipChord, "b": 0.6, "sweepLE": 0.1},
+    })
+
+
+def test_equal_surfaces_share_the_properties():
+    properties = MDO.surfaceProperties(wing())
+    assert MDO.surfaceProperties(wing()) is properties
+    assert MDO.surfaceProperties(wing(tipChord=0.25)) is not properties
+
+
+def test_properties_are_immutable():
+    properties = MDO.surfaceProperties(wing())
+    with pytest.raises(AttributeError):
+        properties.area = 1.0
+    with pytest.raises(AttributeError):
+        del properties.span
+    assert not hasattr(properties, "__dict__")
+
+
+def test_properties_values():
+    properties = MDO.surfaceProperties(wing(rootX=0.2))
+    # trapezoidal sections, both sides of the wing
+    areas = np.array([0.8 * 0.45, 0.6 * 0.35])
+    assert properties.area == pytest.approx(2 * areas.sum())
+    assert properties.span == pytest.approx(2.8)
+    assert properties.tipX == pytest.approx(0.8 * 0.05 + 0.6 * 0.1)
+    assert properties.sweep == pytest.approx((properties.tipX + (0.3 - 0.5) / 4) / 1.4)
+    assert properties.taperRatio == pytest.approx(0.6)
+    assert properties.aspectRatio == pytest.approx(2.8 ** 2 / properties.area)
+    assert properties.rootX == 0.2
+
+    macs = np.array([2 / 3 * c * (1 + t + t ** 2) / (1 + t) for c, t in ((0.5, 0.8), (0.4, 0.75))])
+    assert properties.meanChord == pytest.approx((areas * macs).sum() / areas.sum())
+
+
+def test_mean_chord_position_follows_the_sections():
+    properties = MDO.surfaceProperties(wing())
+    assert 0.0 < properties.yMeanChord < 0.8
+    assert properties.xMeanChord == pytest.approx(properties.yMeanChord * np.tan(0.05))
+    assert xyMeanChord(wing()) == [properties.xMeanChord, properties.yMeanChord]
+
+
+def test_callers_read_the_shared_properties():
+    properties = MDO.surfaceProperties(wing())
+    assert MDO.infoSurface(wing()) == (properties.area, properties.meanChord, properties.span,
+                                       properties.sweep, properties.tipX)
+    surface = Surface(wing(), CONTROLS, name="wing")
+    assert surface.properties is properties
+    assert surface.meanChord == properties.meanChord
+    assert surface.aileronArea == pytest.approx(properties.area * 0.5 * 0.25)
+
+
+def test_properties_pickle_by_value():
+    properties = MDO.surfaceProperties(wing())
+    copy = pickle.loads(pickle.dumps(properties))
+    assert repr(copy) == repr(properties)
@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from MDO.performance import takeOffParameters, takeOffRoll, takeOffRun, takeOffRunIntegrated
+from MDO.performance.takeOff import NO_TAKEOFF_RUNWAY
+
+
+def makeAircraft(mtow=150.0, area=1.0, cLMax=1.2, cLRun=0.5, cDRun=0.05, thrust=(40.0, -0.3, -0.01)):
+    return SimpleNamespace(weight=SimpleNamespace(MTOW=mtow), wing=SimpleNamespace(area=area), cLMax=cLMax,
+                           cLRun=cLRun, cDRun=cDRun, thrust=SimpleNamespace(v0=thrust[0], v1=thrust[1], v2=thrust[2]))
+
+
+AIRCRAFT = [makeAircraft(), makeAircraft(mtow=220.0, area=1.4, cLRun=0.8, cDRun=0.08),
+            makeAircraft(mtow=120.0, cLMax=1.6, cLRun=1.5, cDRun=0.1, thrust=(35.0, -0.8, 0.0)),
+            makeAircraft(cLRun=-0.1, cDRun=0.03, thrust=(50.0, 0.2, -0.02))]
+
+
+def eulerRoll(aircraftInfo, mu=0.03, ksafety=1.1, dt=0.01, nsteps=8000):
+    # takeOffRoll before the closed form, Euler steps until the take off speed
+    rho = 1.225
+    weight = aircraftInfo.weight.MTOW
+    area = aircraftInfo.wing.area
+    thrust = aircraftInfo.thrust
+    vTakeOff = ksafety*np.sqrt(2.0*weight/(area*rho*aircraftInfo.cLMax*1.6))
+    q = np.zeros(2)
+    qs = [q]
+    for _ in range(nsteps):
+        qdyn = q[1]**2*rho/2
+        lift = qdyn*area*aircraftInfo.cLRun
+        normal = weight - lift if lift < weight else 0.0
+        force = thrust.v0 + thrust.v1*q[1] + thrust.v2*q[1]**2 - normal*mu - qdyn*area*aircraftInfo.cDRun
+        q = q + np.array([q[1], force/(weight/9.81)])*dt
+        qs.append(q)
+    for i, q in enumerate(qs):
+        if q[1] >= vTakeOff:
+            return q[0], q[1], i*dt
+    return NO_TAKEOFF_RUNWAY, qs[-1][1], len(qs)*dt
+
+
+@pytest.mark.parametrize('aircraftInfo', AIRCRAFT)
+def test_roll_matches_the_euler_loop(aircraftInfo):
+    runway, velocity, time = takeOffRoll(aircraftInfo)
+    eulerRunway, eulerVelocity, eulerTime = eulerRoll(aircraftInfo)
+    assert runway < NO_TAKEOFF_RUNWAY
+    # the Euler loop is first order and stops on the step after the take off speed
+    assert runway == pytest.approx(eulerRunway, abs=0.4)
+    assert time == pytest.approx(eulerTime, abs=0.02)
+    assert velocity <= eulerVelocity < velocity + 0.05
+
+
+@pytest.mark.parametrize('method, rtol', [("rk4", 1e-9), ("rk45", 1e-5)])
+@pytest.mark.parametrize('aircraftInfo', AIRCRAFT)
+def test_roll_matches_the_integrated_run(aircraftInfo, method, rtol):
+    closedForm = takeOffRun(**takeOffParameters(aircraftInfo), timeLimit=80.0)
+    integrated = takeOffRunIntegrated(**takeOffParameters(aircraftInfo), timeLimit=80.0, dt=0.01, method=method)
+    np.testing.assert_allclose(np.ravel(closedForm), np.ravel(integrated), rtol=rtol)
+
+
+def test_population_matches_single_designs():
+    parameters = [takeOffParameters(aircraftInfo) for aircraftInfo in AIRCRAFT]
+    stacked = {name: np.array([values[name] for values in parameters]) for name in parameters[0]}
+    results = np.array(takeOffRun(**stacked, timeLimit=80.0))
+    for i, aircraftInfo in enumerate(AIRCRAFT):
+        np.testing.assert_allclose(results[:, i], takeOffRoll(aircraftInfo), rtol=1e-12)
+
+
+def test_no_take_off_reports_the_speed_at_the_time_limit():
+    # thrust equals drag below the take off speed
+    aircraftInfo = makeAircraft(mtow=250.0, thrust=(30.0, -0.5, -0.02))
+    runway, velocity, time = takeOffRoll(aircraftInfo, nsteps=3000)
+    eulerRunway, eulerVelocity, eulerTime = eulerRoll(aircraftInfo, nsteps=3000)
+    assert runway == eulerRunway == NO_TAKEOFF_RUNWAY
+    assert time == pytest.approx(30.0)
+    assert velocity == pytest.approx(eulerVelocity, abs=0.01)
+
+    integrated = takeOffRunIntegrated(**takeOffParameters(aircraftInfo), timeLimit=30.0, dt=0.01)
+    assert velocity == pytest.approx(integrated[1][0], rel=1e-6, abs=1e-9)
+
+
+def test_thrust_below_the_friction_stays_at_rest():
+    # the Euler loop rolled backwards, the friction does not
+    runway, velocity, time = takeOffRoll(makeAircraft(mtow=250.0, thrust=(3.0, 0.0, 0.0)))
+    assert (runway, velocity, time) == (NO_TAKEOFF_RUNWAY, 0.0, 80.0)
+
+
+def test_time_limit_stops_a_slow_take_off():
+    parameters = takeOffParameters(makeAircraft())
+    runway, velocity, time = takeOffRun(**parameters)
+    limited = takeOffRun(**parameters, timeLimit=float(time)/2)
+    assert limited[0] == NO_TAKEOFF_RUNWAY and limited[2] == float(time)/2
+    assert 0 < limited[1] < velocity
+
+    # without a time limit the speed tends to the speed where the acceleration ends
+    stalled = takeOffParameters(makeAircraft(mtow=250.0, thrust=(30.0, -0.5, -0.02)))
+    vStop = takeOffRun(**stalled)[1]
+    assert takeOffRun(**stalled, timeLimit=1000.0)[1] == pytest.approx(vStop, rel=1e-6)
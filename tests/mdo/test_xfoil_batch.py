@@ -0,0 +1,107 @@
+import importlib
+import json
+import os
+import stat
+import sys
+
+import pytest
+
+AIRFOILS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "MDO", "airfoils")
+FAKE_XFOIL = os.path.join(os.path.dirname(__file__), "fake_xfoil.py")
+
+
+@pytest.fixture
+def xfoilBatch(monkeypatch):
+    # xfoilBatch is a script of MDO/airfoils
+    monkeypatch.syspath_prepend(AIRFOILS_DIR)
+    return importlib.import_module("xfoilBatch")
+
+
+@pytest.fixture
+def batch(tmp_path, monkeypatch, xfoilBatch):
+    """Runs xfoilBatch with a fake XFOIL on the airfoils 'foil', 'other' and 'diverging'"""
+    if os.name == "nt":
+        pytest.skip("the fake XFOIL executable is a shell script")
+    executable = tmp_path / "xfoil"
+    with open(FAKE_XFOIL) as file:
+        executable.write_text(f"#!{sys.executable}\n{file.read()}")
+    executable.chmod(executable.stat().st_mode | stat.S_IEXEC)
+
+    coordinatesDir = tmp_path / "coordinates"
+    coordinatesDir.mkdir()
+    for airfoil in ("foil", "other", "diverging"):
+        (coordinatesDir / f"{airfoil}.dat").write_text(f"{airfoil}\n1.0 0.0\n")
+    log = tmp_path / "runs.log"
+    monkeypatch.setenv("FAKE_XFOIL_LOG", str(log))
+    monkeypatch.setenv("FAKE_XFOIL_DIVERGE", "diverging")
+
+    def batch(airfoils, reynoldsList=(2e5, 4e5), **kwargs):
+        if log.exists():
+            log.unlink()
+        manifest = xfoilBatch.runXfoilBatch(airfoils, reynoldsList, outputDir=str(tmp_path / "output"),
+                                            xfoilPath=str(executable), workers=2,
+                                            coordinatesDir=str(coordinatesDir), updateStore=False,
+                                            **kwargs)
+        runs = sorted(log.read_text().split()) if log.exists() else []
+        return manifest, runs
+
+    return batch
+
+
+def test_commands_follow_xfoil_original(xfoilBatch):
+    job = {"airfoil": "foil", "reynolds": 493000.0, "mach": 0.03, "flapAngle": 20.0, "npans": 200}
+    assert xfoilBatch.xfoilCommands(job, "foil_493.dat").split("\n") == [
+        "load", "foil.dat", "gdes", "flap", "0.7", "999", "0.5", "20.0", " ", "pcop",
+        "ppar", "n", "200", " ", " ", "oper", "visc", "493000.0", "Mach", "0.03",
+        "vpar", "xtr", "0.1", "0.1", " ", "iter", "800", "pacc", "foil_493.dat", " ",
+        "aseq", "-5.0", "18.0", "0.5", " ", "quit", ""]
+
+
+def test_results_are_written_in_the_xfoil_original_format(batch, tmp_path):
+    manifest, runs = batch(["foil"], [493000.0])
+    key = "foil|Re=493000|M=0.03|flap=0|n=200"
+    assert manifest == {key: {"status": "done", "file": "foil_493.dat"}}
+    assert runs == ["foil|493000.0"]
+
+    with open(tmp_path / "output" / "foil_493.dat") as file:
+        result = json.load(file)
+    assert sorted(result) == ["CDs", "CLs", "Cms", "Re", "airfoil", "alphas"]
+    assert result["alphas"][0] == -5.0 and result["alphas"][-1] == 18.0
+    assert result["CLs"][result["alphas"].index(8.0)] == 0.8
+    assert result["Re"] == 493000.0
+    assert sorted(os.listdir(tmp_path / "output")) == ["foil_493.dat", "manifest.json"]
+
+
+def test_batches_resume_and_retry_failed_runs(batch, tmp_path, monkeypatch):
+    manifest, runs = batch(["foil", "diverging"])
+    assert len(runs) == 4
+    assert [run["status"] for key, run in sorted(manifest.items())] \
+        == ["failed", "failed", "done", "done"]
+    assert "did not converge" in manifest["diverging|Re=200000|M=0.03|flap=0|n=200"]["error"]
+
+    # completed runs are skipped, the failed ones are run again
+    monkeypatch.setenv("FAKE_XFOIL_DIVERGE", "")
+    manifest, runs = batch(["foil", "diverging", "other"])
+    assert runs == ["diverging|200000.0", "diverging|400000.0", "other|200000.0", "other|400000.0"]
+    assert all(run["status"] == "done" for run in manifest.values())
+    assert len(manifest) == 6
+
+    with open(tmp_path / "output" / "manifest.json") as file:
+        assert json.load(file) == manifest
+    manifest, runs = batch(["foil", "diverging", "other"])
+    assert runs == []
+
+
+def test_manifest_keys_change_with_the_inputs(batch):
+    batch(["foil"], [2e5])
+    _, runs = batch(["foil"], [2e5], npans=160)
+    assert runs == ["foil|200000.0"]
+    _, runs = batch(["foil"], [2e5], mach=0.05)
+    assert runs == ["foil|200000.0"]
+
+
+def test_hanging_runs_time_out(batch, monkeypatch):
+    monkeypatch.setenv("FAKE_XFOIL_HANG", "other")
+    manifest, _ = batch(["foil", "other"], [2e5], timeout=1)
+    assert manifest["foil|Re=200000|M=0.03|flap=0|n=200"]["status"] == "done"
+    assert manifest["other|Re=200000|M=0.03|flap=0|n=200"]["status"] == "failed"